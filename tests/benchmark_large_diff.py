@@ -0,0 +1,102 @@
+"""
+Benchmark of large-file line diffing for VAITP-Auditor.
+
+Compares LineMatcher, used by CodeDiffer for inputs over 100KB, with the
+positional chunking it replaced (1000-line windows matched independently)
+and optionally with a single difflib.SequenceMatcher over the whole input.
+For each scenario it reports the time taken and the number of lines the
+diff marks as changed; the size of a minimal diff is listed for reference.
+
+Usage:
+    python tests/benchmark_large_diff.py [--lines 100000] [--sequence-matcher]
+"""
+
+import argparse
+import difflib
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vaitp_auditor.core.line_matcher import LineMatcher
+
+
+Opcodes = List[Tuple[str, int, int, int, int]]
+
+
+def positional_chunk_opcodes(a: List[str], b: List[str], chunk_size: int = 1000) -> Opcodes:
+    """Match aligned chunk_size-line windows independently, as the replaced chunked path did."""
+    opcodes = []
+    for start in range(0, max(len(a), len(b)), chunk_size):
+        a_start, a_end = min(start, len(a)), min(start + chunk_size, len(a))
+        b_start, b_end = min(start, len(b)), min(start + chunk_size, len(b))
+        matcher = difflib.SequenceMatcher(None, a[a_start:a_end], b[b_start:b_end])
+        opcodes.extend(
+            (tag, a_start + i1, a_start + i2, b_start + j1, b_start + j2)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        )
+    return opcodes
+
+
+def changed_lines(opcodes: Opcodes) -> int:
+    """Count the removed and added lines of a diff."""
+    return sum((i2 - i1) + (j2 - j1) for tag, i1, i2, j1, j2 in opcodes if tag != 'equal')
+
+
+def make_scenarios(line_count: int) -> Dict[str, Tuple[List[str], List[str], int]]:
+    """Build (expected, generated, changed lines of a minimal diff) inputs for each scenario."""
+    base = [f"    value_{i} = compute({i % 97})" if i % 5 else "" for i in range(line_count)]
+    
+    inserted = list(base)
+    inserted.insert(10, "inserted = True")
+    
+    edited = list(base)
+    edits = 0
+    for i in range(0, line_count, 997):
+        edited[i] = f"{edited[i]}  # edited"
+        edits += 2
+    
+    moved = base[line_count // 2:] + base[:line_count // 2]
+    
+    return {
+        'one line inserted near the top': (base, inserted, 1),
+        'scattered line edits': (base, edited, edits),
+        'halves swapped': (base, moved, line_count),
+    }
+
+
+def run_benchmark(line_count: int, with_sequence_matcher: bool) -> None:
+    """Time each matcher on each scenario and print the results."""
+    matchers: Dict[str, Callable[[List[str], List[str]], Opcodes]] = {
+        'LineMatcher': lambda a, b: LineMatcher(a, b).get_opcodes(),
+        'positional chunks': positional_chunk_opcodes,
+    }
+    if with_sequence_matcher:
+        matchers['SequenceMatcher'] = lambda a, b: difflib.SequenceMatcher(None, a, b).get_opcodes()
+    
+    print(f"{'scenario':<34} {'matcher':<18} {'seconds':>9} {'changed lines':>14}")
+    for scenario, (expected, generated, actual_changes) in make_scenarios(line_count).items():
+        print(f"{scenario:<34} {'(minimal diff)':<18} {'':>9} {actual_changes:>14}")
+        for name, matcher in matchers.items():
+            start_time = time.perf_counter()
+            opcodes = matcher(expected, generated)
+            duration = time.perf_counter() - start_time
+            print(f"{'':<34} {name:<18} {duration:>9.3f} {changed_lines(opcodes):>14}")
+
+
+def main():
+    """Main entry point for the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark large-file line diffing")
+    parser.add_argument('--lines', type=int, default=100000, help="Lines per generated document")
+    parser.add_argument('--sequence-matcher', action='store_true',
+                        help="Also time a single SequenceMatcher (can take minutes)")
+    args = parser.parse_args()
+    
+    run_benchmark(args.lines, args.sequence_matcher)
+
+
+if __name__ == "__main__":
+    main()
@@ -193,6 +193,23 @@ class TestDiffHighlighter(unittest.TestCase):
         self.assertEqual(generated_diff[0].tag, 'equal')
         self.assertEqual(generated_diff[1].tag, 'add')
     
+    def test_modified_lines_highlight_changed_text(self):
+        """Test that paired replaced lines become 'modify' lines with changed spans."""
+        expected_diff, generated_diff = self.highlighter.create_diff_view(
+            "total = price * 2\nreturn total", "total = price * 3\nreturn total"
+        )
+        
+        self.assertEqual(expected_diff[0], DiffLine('modify', 'total = price * 2', 1, spans=((16, 17),)))
+        self.assertEqual(generated_diff[0], DiffLine('modify', 'total = price * 3', 1, spans=((16, 17),)))
+        self.assertEqual(expected_diff[1].tag, 'equal')
+        
+        mock_textbox = Mock()
+        self.highlighter.apply_diff_tags(mock_textbox, generated_diff)
+        
+        mock_textbox.tag_remove.assert_any_call("diff_modify_change", "1.0", "end")
+        mock_textbox.tag_add.assert_any_call("diff_modify", "1.0", "1.end")
+        mock_textbox.tag_add.assert_any_call("diff_modify_change", "1.16", "1.17")
+    
     def test_apply_diff_to_panels(self):
         """Test applying diff highlighting to both panels."""
         mock_expected_panel = Mock()
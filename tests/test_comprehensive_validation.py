@@ -10,7 +10,7 @@ import pytest
 from pathlib import Path
 from unittest.mock import patch, Mock
 
-from vaitp_auditor.core.models import CodePair, ReviewResult, SessionConfig
+from vaitp_auditor.core.models import CodePair, DiffResult, ReviewResult, SessionConfig
 from vaitp_auditor.data_sources.filesystem import FileSystemSource
 from vaitp_auditor.data_sources.factory import DataSourceFactory
 from vaitp_auditor.core.differ import CodeDiffer
@@ -345,7 +345,7 @@ class TestIntegrationValidation:
             differ = CodeDiffer()
             for pair in code_pairs:
                 diff_result = differ.compute_diff(pair.expected_code, pair.generated_code)
-                assert isinstance(diff_result, list)
+                assert isinstance(diff_result, DiffResult)
             
             # Test report generation
             with patch('vaitp_auditor.reporting.report_manager.Path.cwd') as mock_cwd:
@@ -401,14 +401,16 @@ class TestIntegrationValidation:
                 
                 # Create mock data source
                 mock_source = Mock()
-                mock_source.load_data.return_value = [
+                mock_source.iter_pairs.return_value = iter([
                     CodePair(
                         identifier="test1",
                         expected_code="expected",
                         generated_code="generated",
                         source_info={}
                     )
-                ]
+                ])
+                mock_source.sample_size_hint = 1
+                mock_source.source_ref.return_value = None
                 
                 # Start session
                 session_id = session_manager.start_session(config, mock_source)
@@ -10,6 +10,7 @@ from rich.panel import Panel
 from rich.columns import Columns
 
 from vaitp_auditor.ui.diff_renderer import DiffRenderer
+from vaitp_auditor.core.differ import CodeDiffer
 from vaitp_auditor.core.models import DiffLine
 
 
@@ -264,6 +265,31 @@ class TestDiffRenderer:
         # Should include separator for gaps
         assert '...' in result_str
 
+    def test_diff_result_renders_like_diff_lines(self):
+        """Test that a compact DiffResult renders like the equivalent DiffLine list."""
+        expected = "\n".join(f"line {i}" for i in range(12))
+        generated = expected.replace("line 3", "line three").replace("line 10\n", "")
+        diff_result = CodeDiffer().compute_diff(expected, generated)
+        diff_lines = [DiffLine(*row) for row in diff_result.iter_span_rows()]
+        
+        assert self.diff_renderer.render_diff_lines(diff_result) == self.diff_renderer.render_diff_lines(diff_lines)
+        assert str(self.diff_renderer.create_diff_summary(diff_result)) == str(self.diff_renderer.create_diff_summary(diff_lines))
+        assert (str(self.diff_renderer.render_diff_with_context(diff_result, context_lines=1))
+                == str(self.diff_renderer.render_diff_with_context(diff_lines, context_lines=1)))
+
+    def test_changed_text_is_emphasized(self):
+        """Test that the changed spans of a modified line get the change style."""
+        diff_lines = [
+            DiffLine(tag='remove', line_content='x = compute(1)', line_number=1, spans=((12, 13),)),
+            DiffLine(tag='add', line_content='x = compute(2)', line_number=2, spans=((12, 13),)),
+        ]
+        
+        result = self.diff_renderer.render_diff_lines(diff_lines)
+        
+        assert 'x = compute(1)' in result.plain
+        emphasized = [result.plain[span.start:span.end] for span in result.spans if span.style == "bold white on green"]
+        assert emphasized == ['2']
+
     def test_get_color_legend(self):
         """Test color legend generation."""
         result = self.diff_renderer.get_color_legend()
@@ -2,9 +2,10 @@
 Unit tests for the CodeDiffer class.
 """
 
+import difflib
 import unittest
 from vaitp_auditor.core.differ import CodeDiffer
-from vaitp_auditor.core.models import DiffLine
+from vaitp_auditor.core.models import DiffLine, DiffResult
 
 
 class TestCodeDiffer(unittest.TestCase):
@@ -259,6 +260,79 @@ class TestCodeDiffer(unittest.TestCase):
         self.assertEqual(remove_count, 2)
         self.assertEqual(add_count, 2)
 
+    
+    def test_diff_result_reads_like_diff_lines(self):
+        """Test that the compact result matches the per-line representation."""
+        expected = "a\nb\nc\nd"
+        generated = "a\nB\nc\nd\ne"
+        
+        result = self.differ.compute_diff(expected, generated)
+        
+        self.assertIsInstance(result, DiffResult)
+        expected_lines = [
+            DiffLine('equal', 'a', 1),
+            DiffLine('remove', 'b', 2),
+            DiffLine('add', 'B', 3),
+            DiffLine('equal', 'c', 4),
+            DiffLine('equal', 'd', 5),
+            DiffLine('add', 'e', 6),
+        ]
+        self.assertEqual(list(result), expected_lines)
+        self.assertEqual(result, expected_lines)
+        self.assertEqual(result[-1], expected_lines[-1])
+        self.assertEqual(result[1:3], expected_lines[1:3])
+        self.assertEqual(list(result.iter_rows())[2], ('add', 'B', 3))
+        self.assertEqual(list(result.tag_runs()), [
+            ('equal', 0, 1), ('remove', 1, 2), ('add', 2, 3), ('equal', 3, 5), ('add', 5, 6)
+        ])
+        self.assertEqual(result.tag_counts(), {'equal': 3, 'remove': 1, 'add': 2})
+        with self.assertRaises(IndexError):
+            result[6]
+    
+    def test_get_diff_text_matches_unified_diff(self):
+        """Test that diff text built from the diff result matches difflib."""
+        expected = "\n".join(f"line {i}" for i in range(40))
+        generated = expected.replace("line 5\n", "line five\n").replace("line 30\n", "")
+        
+        reference = "\n".join(difflib.unified_diff(
+            expected.splitlines(), generated.splitlines(),
+            fromfile='expected_code', tofile='generated_code', lineterm=''
+        ))
+        
+        self.assertEqual(self.differ.get_diff_text(expected, generated), reference)
+    
+    def test_large_diff_aligns_after_insertion(self):
+        """Test that an insertion near the top of a large file is the only change."""
+        expected_lines = [f"value_{i} = {i}" if i % 4 else "" for i in range(20000)]
+        generated_lines = expected_lines[:10] + ["inserted = True"] + expected_lines[10:]
+        
+        result = self.differ.compute_diff("\n".join(expected_lines), "\n".join(generated_lines))
+        
+        self.assertEqual(result.tag_counts(), {'equal': 20000, 'add': 1})
+        self.assertEqual(result[10], DiffLine('add', 'inserted = True', 11))
+        self.assertEqual([dl.line_number for dl in result[-2:]], [20000, 20001])
+
+    
+    def test_modifications_pair_replaced_lines(self):
+        """Test that similar replaced lines are paired with their changed spans."""
+        expected = "def area(r):\n    return 3.14 * r * r\n# done"
+        generated = "def area(radius):\n    return math.pi * radius ** 2\nimport math\n# done"
+        
+        result = self.differ.compute_diff(expected, generated)
+        modifications = result.get_modifications()
+        
+        self.assertEqual([(m.expected_index, m.generated_index) for m in modifications], [(0, 0), (1, 1)])
+        self.assertEqual(modifications[0].expected_spans, ((9, 10),))
+        self.assertEqual(modifications[0].generated_spans, ((9, 15),))
+        # Output lines: 2 removed, then 3 added
+        self.assertEqual(result.line_spans(0), ((9, 10),))
+        self.assertEqual(result.line_spans(2), ((9, 15),))
+        self.assertEqual(result.line_spans(1), modifications[1].expected_spans)
+        self.assertIsNone(result.line_spans(4))
+        self.assertIsNone(result.line_spans(5))
+        # The line diff itself is unchanged
+        self.assertEqual(result.tag_counts(), {'remove': 2, 'add': 3, 'equal': 1})
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
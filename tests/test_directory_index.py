@@ -0,0 +1,146 @@
+"""
+Unit tests for the persistent directory index.
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from vaitp_auditor.data_sources import directory_index
+from vaitp_auditor.data_sources.directory_index import DirectoryIndexCache, scan_directory_tree
+from vaitp_auditor.data_sources.filesystem import FileSystemSource
+
+
+def _age_tree(root: Path, seconds: int = 60) -> None:
+    """Move the mtime of every directory below root into the past."""
+    past = time.time() - seconds
+    for directory, _, _ in os.walk(root):
+        os.utime(directory, (past, past))
+
+
+class TestDirectoryIndex:
+    """Test cases for DirectoryIndexCache and scan_directory_tree."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.generated = self.temp_path / "generated"
+        self.expected = self.temp_path / "expected"
+        for folder in (self.generated, self.expected):
+            (folder / "sub").mkdir(parents=True)
+        for index in range(5):
+            (self.generated / f"case_{index}.py").write_text(f"generated = {index}")
+            (self.expected / f"case_{index}.py").write_text(f"expected = {index}")
+        (self.generated / "sub" / "nested.py").write_text("nested = True")
+        (self.expected / "sub" / "nested.py").write_text("nested = False")
+        _age_tree(self.temp_path)
+        self.cache = DirectoryIndexCache(cache_dir=self.temp_path / "index")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    def _source(self) -> FileSystemSource:
+        fs_source = FileSystemSource(index_cache=self.cache)
+        fs_source.generated_folder = self.generated
+        fs_source.expected_folder = self.expected
+        return fs_source
+
+    def test_scan_records_sizes_and_subdirectories(self):
+        """Test that a scan records code files with their sizes."""
+        tree, rescanned = scan_directory_tree(self.generated, lambda name: name.endswith('.py'))
+
+        assert rescanned is True
+        assert set(tree) == {'', 'sub'}
+        assert tree['']['subdirs'] == ['sub']
+        assert ['nested.py', len("nested = True")] == tree['sub']['files'][0][:2]
+
+    def test_unchanged_directories_are_not_listed_again(self):
+        """Test that trusted directories are reused from the previous tree."""
+        file_filter = lambda name: name.endswith('.py')
+        tree, _ = scan_directory_tree(self.generated, file_filter)
+
+        with patch.object(directory_index, '_list_directory', wraps=directory_index._list_directory) as mock_list:
+            second, rescanned = scan_directory_tree(self.generated, file_filter, tree, time.time_ns())
+
+        assert rescanned is False
+        assert mock_list.call_count == 0
+        assert second == tree
+
+    def test_recent_mtimes_are_not_trusted(self):
+        """Test that directories modified after the trust cutoff are listed again."""
+        file_filter = lambda name: name.endswith('.py')
+        tree, _ = scan_directory_tree(self.generated, file_filter)
+        cutoff = time.time_ns()
+
+        (self.generated / "sub" / "added.py").write_text("added = 1")
+        second, rescanned = scan_directory_tree(self.generated, file_filter, tree, cutoff)
+
+        assert rescanned is True
+        assert [entry[0] for entry in second['sub']['files']] == ['added.py', 'nested.py']
+        assert second[''] is tree['']
+
+    def test_save_and_load_roundtrip(self):
+        """Test that an index is stored per set of roots."""
+        roots = [self.generated, self.expected, None]
+        tree, _ = scan_directory_tree(self.generated, lambda name: True)
+
+        assert self.cache.save(roots, 123, [tree, {}, {}], [["a.py", None, None]]) is True
+        index = self.cache.load(roots)
+
+        assert index['scanned_at_ns'] == 123
+        assert index['trees'][0] == tree
+        assert index['triples'] == [["a.py", None, None]]
+        assert self.cache.load([self.generated, None, None]) is None
+
+    def test_unreadable_index_is_ignored(self):
+        """Test that a corrupt index falls back to a full scan."""
+        roots = [self.generated, self.expected, None]
+        self.cache.cache_dir.mkdir(parents=True)
+        self.cache.index_path(roots).write_text("{not json")
+
+        assert self.cache.load(roots) is None
+
+        fs_source = self._source()
+        fs_source._discover_file_pairs()
+        assert len(fs_source._file_pairs) == 6
+
+    def test_prune_keeps_most_recent_entries(self):
+        """Test that old index files are removed beyond max_entries."""
+        cache = DirectoryIndexCache(cache_dir=self.temp_path / "index", max_entries=2)
+        for index in range(4):
+            cache.save([self.temp_path / f"root_{index}", None, None], 0, [{}, {}, {}], [])
+
+        assert len(list(cache.cache_dir.glob('*.json'))) == 2
+
+    def test_filesystem_source_reuses_index(self):
+        """Test that a second discovery reuses the stored triples without listing directories."""
+        first = self._source()
+        first._discover_file_pairs()
+
+        index = self.cache.load([self.generated, self.expected, None])
+        assert len(index['triples']) == 6
+
+        second = self._source()
+        with patch.object(directory_index, '_list_directory', wraps=directory_index._list_directory) as mock_list:
+            second._discover_file_pairs()
+
+        assert mock_list.call_count == 0
+        assert second._file_pairs == first._file_pairs
+        assert second._file_pairs[0] == (self.generated / "case_0.py", self.expected / "case_0.py", None)
+        assert second._get_file_size(self.generated / "case_0.py") == len("generated = 0")
+
+    def test_filesystem_source_detects_new_files(self):
+        """Test that files added after the index was written are discovered."""
+        self._source()._discover_file_pairs()
+
+        (self.generated / "sub" / "late.py").write_text("late = True")
+        fs_source = self._source()
+        fs_source._discover_file_pairs()
+
+        generated_files = [generated for generated, _, _ in fs_source._file_pairs]
+        assert self.generated / "sub" / "late.py" in generated_files
+        assert len(generated_files) == 7
@@ -508,4 +508,189 @@ class TestExcelSource:
         
         sheets = self.source._get_available_sheets()
         
-        assert sheets == []
\ No newline at end of file
+        assert sheets == []
+
+class TestExcelSourceCsvStreaming:
+    """Test cases for the chunked CSV path of ExcelSource."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        fd, self.csv_path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        rows = 53
+        pd.DataFrame({
+            'id': [f'case_{i:03d}' for i in range(rows)],
+            'generated': [f'print({i})' if i % 10 else '' for i in range(rows)],
+            'expected': [f'print({i + 1})' for i in range(rows)],
+            'model': ['model-a' if i % 2 else 'model-b' for i in range(rows)],
+            'prompt_log': ['x' * 200 for _ in range(rows)],
+        }).to_csv(self.csv_path, index=False)
+        
+        self.source = ExcelSource()
+        self.source._file_path = self.csv_path
+        self.source._identifier_column = 'id'
+        self.source._generated_code_column = 'generated'
+        self.source._expected_code_column = 'expected'
+        self.source._model_column = 'model'
+        self.source._chunksize = 7
+        self.source._configured = True
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        os.unlink(self.csv_path)
+
+    def test_full_load_reads_only_configured_columns(self):
+        """Test that a full load streams configured columns in file order."""
+        with patch('vaitp_auditor.data_sources.excel.pd.read_csv', wraps=pd.read_csv) as mock_read:
+            code_pairs = self.source.load_data(100)
+        
+        assert mock_read.call_count == 1
+        assert mock_read.call_args.kwargs['usecols'] == ['id', 'generated', 'expected', 'model']
+        assert mock_read.call_args.kwargs['chunksize'] == 7
+        assert len(code_pairs) == 47
+        assert self.source.get_total_count() == 47
+        assert code_pairs[0].identifier == 'case_001'
+        assert code_pairs[0].source_info['row_number'] == 2
+        assert code_pairs[-1].source_info['row_number'] == 53
+        assert code_pairs[-1].source_info['model_name'] == 'model-b'
+
+    def test_filtering_is_applied_per_chunk(self):
+        """Test model filtering on streamed chunks."""
+        code_pairs = self.source.load_data(100, selected_model='model-a')
+        
+        assert len(code_pairs) == 26
+        assert all(pair.source_info['model_name'] == 'model-a' for pair in code_pairs)
+
+    def test_sample_selects_smallest_keys(self):
+        """Test that the streamed sample matches the pairs with the smallest keys."""
+        from vaitp_auditor.data_sources.sampling import sample_key
+        
+        full = [pair.identifier for pair in self.source.load_data(100)]
+        for seed in range(20):
+            sample = self.source.load_data(10, seed=seed)
+            
+            keys = [sample_key(seed, position) for position in range(len(full))]
+            expected = [full[i] for i in sorted(range(len(full)), key=keys.__getitem__)[:4]]
+            assert [pair.identifier for pair in sample] == expected
+            assert self.source._total_count == 47
+            assert self.source.last_sample_seed == seed
+    
+    def test_stratified_sample_matches_in_memory_sample(self):
+        """Test that streamed stratified sampling selects what select_sample selects."""
+        from vaitp_auditor.data_sources.sampling import select_sample, stratum_of
+        
+        full = self.source.load_data(100)
+        for seed in range(20):
+            sample = self.source.load_data(5, seed=seed, stratify_by=('model_name',))
+            expected = select_sample(full, 5, seed, lambda pair: stratum_of(pair, ('model_name',)))
+            
+            assert [pair.identifier for pair in sample] == [pair.identifier for pair in expected]
+            assert {pair.source_info['model_name'] for pair in sample} == {'model-a', 'model-b'}
+
+    def test_encoding_detected_once_from_prefix(self):
+        """Test that a latin-1 file is detected from its prefix and the result reused."""
+        with open(self.csv_path, 'wb') as f:
+            f.write('id,generated\ncafé,print("é")\n'.encode('latin-1'))
+        self.source._expected_code_column = None
+        self.source._model_column = None
+        
+        code_pairs = self.source.load_data(100)
+        
+        assert self.source._csv_encoding == 'latin-1'
+        assert code_pairs[0].identifier == 'café'
+        with patch.object(self.source, 'ENCODING_PROBE_BYTES', 0):
+            self.source.load_data(100)
+        assert self.source._csv_encoding == 'latin-1'
+
+    def test_encoding_fallback_past_prefix(self):
+        """Test that invalid UTF-8 beyond the probed prefix falls back to latin-1."""
+        with open(self.csv_path, 'wb') as f:
+            f.write(b'id,generated\n')
+            for i in range(200):
+                f.write(f'case_{i},print({i})\n'.encode('ascii'))
+            f.write('late,print("é")\n'.encode('latin-1'))
+        self.source._expected_code_column = None
+        self.source._model_column = None
+        self.source.ENCODING_PROBE_BYTES = 64
+        
+        code_pairs = self.source.load_data(100)
+        
+        assert self.source._csv_encoding == 'latin-1'
+        assert len(code_pairs) == 201
+        assert code_pairs[-1].generated_code == 'print("é")'
+
+
+class TestExcelSourceXlsxStreaming:
+    """Test cases for the read-only .xlsx path of ExcelSource."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        fd, self.xlsx_path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
+        rows = 23
+        data = pd.DataFrame({
+            'id': [f'case_{i:02d}' for i in range(rows)],
+            'prompt_log': ['x' * 100 for _ in range(rows)],
+            'generated': [f'print({i})' if i % 5 else None for i in range(rows)],
+            'model': [f'model-{i % 3}' for i in range(rows)],
+            'strategy': ['zero-shot' if i % 2 else 'few-shot' for i in range(rows)],
+        })
+        with pd.ExcelWriter(self.xlsx_path) as writer:
+            pd.DataFrame({'other': [1]}).to_excel(writer, sheet_name='Other', index=False)
+            data.to_excel(writer, sheet_name='Results', index=False)
+        
+        self.source = ExcelSource()
+        self.source._file_path = self.xlsx_path
+        self.source._sheet_name = 'Results'
+        self.source._identifier_column = 'id'
+        self.source._generated_code_column = 'generated'
+        self.source._model_column = 'model'
+        self.source._prompting_strategy_column = 'strategy'
+        self.source._chunksize = 4
+        self.source._configured = True
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        os.unlink(self.xlsx_path)
+
+    def test_load_data_streams_worksheet(self):
+        """Test that .xlsx files are streamed without pd.read_excel."""
+        with patch('vaitp_auditor.data_sources.excel.pd.read_excel') as mock_read_excel:
+            code_pairs = self.source.load_data(100, selected_strategy='zero-shot')
+        
+        mock_read_excel.assert_not_called()
+        assert [pair.identifier for pair in code_pairs] == [
+            f'case_{i:02d}' for i in range(23) if i % 2 and i % 5
+        ]
+        assert code_pairs[0].source_info['row_number'] == 2
+        assert code_pairs[0].source_info['model_name'] == 'model-1'
+
+    def test_distinct_values_collected_during_load(self):
+        """Test that model/strategy values come from the same pass as load_data."""
+        self.source.load_data(100)
+        
+        with patch.object(self.source, '_iter_chunks') as mock_iter:
+            values = self.source.get_distinct_values(['model', 'strategy'])
+        
+        mock_iter.assert_not_called()
+        assert values == {
+            'model': ['model-0', 'model-1', 'model-2'],
+            'strategy': ['few-shot', 'zero-shot'],
+        }
+
+    def test_distinct_values_without_load(self):
+        """Test listing filter values of an unconfigured source."""
+        source = ExcelSource()
+        source._file_path = self.xlsx_path
+        source._sheet_name = 'Results'
+        
+        values = source.get_distinct_values(['strategy', 'missing'])
+        
+        assert values == {'strategy': ['few-shot', 'zero-shot']}
+
+    def test_missing_column_raises(self):
+        """Test that a mapped column absent from the sheet fails the load."""
+        self.source._expected_code_column = 'expected'
+        
+        with pytest.raises(DataSourceError):
+            self.source.load_data(100)
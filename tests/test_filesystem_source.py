@@ -11,7 +11,8 @@ from io import StringIO
 
 from vaitp_auditor.data_sources.filesystem import FileSystemSource
 from vaitp_auditor.data_sources.base import DataSourceValidationError
-from vaitp_auditor.core.models import CodePair
+from vaitp_auditor.core.models import CodePair, SampleSpec
+from vaitp_auditor.utils.performance import ChunkedProcessor
 
 
 class TestFileSystemSource:
@@ -363,6 +364,170 @@ class TestFileSystemSource:
             assert count == 2
 
 
+class TestFileSystemSourceLazyLoading:
+    """Test deferred loading of large files."""
+
+    def test_large_files_are_not_read_at_load_time(self):
+        """Test that large files are only read when the pair is displayed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            large_file = temp_path / "large_file.py"
+            large_file.write_text("x = 1\n" * 30000)
+            
+            fs_source = FileSystemSource()
+            fs_source.generated_folder = temp_path
+            fs_source._file_pairs = [(large_file, None, None)]
+            fs_source._configured = True
+            
+            with patch('vaitp_auditor.data_sources.filesystem.FileContentLoader.__call__',
+                       autospec=True, side_effect=lambda loader: "x = 1\n" * 30000) as mock_read:
+                code_pairs = fs_source.load_data(100)
+                assert mock_read.call_count == 0
+                
+                code_pair = code_pairs[0]
+                assert code_pair.source_info["lazy_loaded"] is True
+                assert code_pair.has_deferred_content()
+                
+                assert code_pair.generated_code.startswith("x = 1")
+                assert mock_read.call_count == 1
+                
+                code_pair.release_content()
+                assert code_pair.generated_code.startswith("x = 1")
+                assert mock_read.call_count == 2
+
+
+class TestFileSystemSourceParallelDiscovery:
+    """Test concurrent folder scanning and parallel file reading."""
+
+    def _create_tree(self, root: Path) -> None:
+        generated = root / "generated"
+        expected = root / "expected"
+        for folder in (generated, expected):
+            (folder / "pkg" / "sub").mkdir(parents=True)
+        for index in range(25):
+            (generated / f"file_{index:02d}.py").write_text(f"generated = {index}")
+            (expected / f"file_{index:02d}.py").write_text(f"expected = {index}")
+            (generated / "pkg" / "sub" / f"nested_{index:02d}.js").write_text(f"// {index}")
+        (expected / "pkg" / "sub" / "nested_03.js").write_text("// expected 3")
+        (generated / "notes.bin").write_text("not code")
+
+    def _configured_source(self, root: Path, max_workers=None) -> FileSystemSource:
+        fs_source = FileSystemSource(max_workers=max_workers)
+        fs_source.generated_folder = root / "generated"
+        fs_source.expected_folder = root / "expected"
+        fs_source._discover_file_pairs()
+        fs_source._configured = True
+        return fs_source
+
+    def test_scan_returns_sorted_base_names(self):
+        """Test that the scandir walker yields relative base names in sorted order."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            self._create_tree(temp_path)
+            fs_source = FileSystemSource()
+            fs_source.generated_folder = temp_path / "generated"
+            
+            scanned = fs_source._scan_code_files(temp_path / "generated")
+            base_names = [base_name for base_name, _ in scanned]
+            
+            assert len(scanned) == 50
+            assert base_names == sorted(base_names)
+            assert os.path.join("pkg", "sub", "nested_03") in base_names
+            for base_name, file_path in scanned:
+                assert fs_source._get_base_name(file_path) == base_name
+
+    def test_discovery_matches_across_roots(self):
+        """Test that concurrently scanned roots are matched by base name."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            self._create_tree(temp_path)
+            fs_source = self._configured_source(temp_path)
+            
+            assert len(fs_source._file_pairs) == 50
+            matched = {generated.name: expected for generated, expected, _ in fs_source._file_pairs}
+            assert matched["file_07.py"] == temp_path / "expected" / "file_07.py"
+            assert matched["nested_03.js"] == temp_path / "expected" / "pkg" / "sub" / "nested_03.js"
+            assert matched["nested_04.js"] is None
+
+    def test_parallel_loading_is_deterministic(self):
+        """Test that parallel and serial reading produce the same ordered pairs."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            self._create_tree(temp_path)
+            
+            serial = self._configured_source(temp_path, max_workers=1).load_data(100)
+            parallel = self._configured_source(temp_path, max_workers=8).load_data(100)
+            
+            assert [pair.identifier for pair in parallel] == [pair.identifier for pair in serial]
+            assert [pair.generated_code for pair in parallel] == [pair.generated_code for pair in serial]
+            assert [pair.expected_code for pair in parallel] == [pair.expected_code for pair in serial]
+
+    def test_iter_pairs_reads_only_sampled_files(self):
+        """Test that iterating a sample reads the sampled files lazily."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            self._create_tree(temp_path)
+            fs_source = self._configured_source(temp_path, max_workers=1)
+            fs_source._chunked_processor = ChunkedProcessor(chunk_size=4)
+            
+            with patch.object(fs_source, '_load_file_pair', wraps=fs_source._load_file_pair) as mock_load:
+                pairs = fs_source.iter_pairs(SampleSpec(percentage=20, seed=3))
+                assert fs_source.sample_size_hint == 10
+                assert mock_load.call_count == 0
+                
+                first = next(pairs)
+                assert mock_load.call_count == 4
+                rest = list(pairs)
+            
+            assert mock_load.call_count == 10
+            sampled = [first] + rest
+            assert [pair.identifier for pair in sampled] == [
+                pair.identifier for pair in self._configured_source(temp_path).load_data(20, seed=3)
+            ]
+
+    def test_load_pairs_by_ref_reads_referenced_files(self):
+        """Test that snapshot references reload pairs without rescanning the folders."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            self._create_tree(temp_path)
+            fs_source = self._configured_source(temp_path, max_workers=1)
+            sampled = fs_source.load_data(20, seed=3)[:3]
+            references = [(pair.identifier, fs_source.source_ref(pair)) for pair in sampled]
+            
+            restored_source = self._configured_source(temp_path, max_workers=1)
+            with patch.object(restored_source, 'iter_pairs') as mock_iter:
+                restored = restored_source.load_pairs_by_ref(references)
+            
+            mock_iter.assert_not_called()
+            assert [pair.identifier for pair in restored] == [pair.identifier for pair in sampled]
+            assert [pair.generated_code for pair in restored] == [pair.generated_code for pair in sampled]
+
+    def test_sample_one_excluding_loads_only_the_drawn_pair(self):
+        """Test that a replacement is drawn from the file index without reading excluded files."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            self._create_tree(temp_path)
+            fs_source = self._configured_source(temp_path, max_workers=1)
+            all_ids = [fs_source._get_file_identifier(*file_pair) for file_pair in fs_source._file_pairs]
+            excluded = set(all_ids[:-2])
+            
+            drawn = []
+            with patch.object(fs_source, '_load_file_pair', wraps=fs_source._load_file_pair) as mock_load:
+                for _ in range(2):
+                    code_pair = fs_source.sample_one_excluding(excluded)
+                    excluded.add(code_pair.identifier)
+                    drawn.append(code_pair.identifier)
+                assert mock_load.call_count == 2
+            
+            assert sorted(drawn) == sorted(all_ids[-2:])
+            assert fs_source.sample_one_excluding(excluded) is None
+    
+    def test_max_workers_default(self):
+        """Test that the worker count defaults to a positive value."""
+        assert FileSystemSource().max_workers >= 1
+        assert FileSystemSource(max_workers=3).max_workers == 3
+
+
 class TestFileSystemSourceIntegration:
     """Integration tests for FileSystemSource."""
 
@@ -0,0 +1,75 @@
+"""
+Unit tests for the background verdict commit queue.
+"""
+
+import threading
+
+import pytest
+
+from vaitp_auditor.gui.commit_queue import VerdictCommitQueue
+
+
+class TestVerdictCommitQueue:
+    """Test cases for VerdictCommitQueue."""
+    
+    def test_commits_run_in_order(self):
+        """Test that commits are persisted in submission order."""
+        queue = VerdictCommitQueue(max_pending=4)
+        persisted = []
+        for index in range(20):
+            queue.submit(f"case{index}", lambda index=index: persisted.append(index))
+        
+        assert queue.drain(timeout=5.0)
+        assert persisted == list(range(20))
+        assert queue.pending == 0
+        assert queue.shutdown(timeout=5.0)
+    
+    def test_back_pressure(self):
+        """Test that a full queue makes submitters wait for the writer."""
+        queue = VerdictCommitQueue(max_pending=2)
+        release = threading.Event()
+        queue.submit("slow", lambda: release.wait(5.0))
+        queue.submit("queued", lambda: None)
+        
+        assert queue.is_full
+        assert not queue.wait_for_slot(timeout=0.05)
+        assert not queue.drain(timeout=0.05)
+        
+        release.set()
+        assert queue.wait_for_slot(timeout=5.0)
+        assert queue.drain(timeout=5.0)
+        queue.shutdown(timeout=5.0)
+    
+    def test_failures_are_reported_and_do_not_stop_the_writer(self):
+        """Test that a failing commit is kept for the UI and later commits still run."""
+        queue = VerdictCommitQueue()
+        persisted = []
+        
+        def failing_commit():
+            raise OSError("disk full")
+        
+        queue.submit("case1", failing_commit)
+        queue.submit("case2", lambda: persisted.append("case2"))
+        assert queue.drain(timeout=5.0)
+        
+        failures = queue.take_failures()
+        assert [(description, type(error)) for description, error in failures] == [("case1", OSError)]
+        assert queue.take_failures() == []
+        assert persisted == ["case2"]
+        queue.shutdown(timeout=5.0)
+    
+    def test_shutdown_drains_and_allows_reuse(self):
+        """Test that shutdown waits for pending commits."""
+        queue = VerdictCommitQueue()
+        persisted = []
+        queue.submit("case1", lambda: persisted.append("case1"))
+        
+        assert queue.shutdown(timeout=5.0)
+        assert persisted == ["case1"]
+        
+        queue.submit("case2", lambda: persisted.append("case2"))
+        assert queue.shutdown(timeout=5.0)
+        assert persisted == ["case1", "case2"]
+        
+        with pytest.raises(ValueError):
+            VerdictCommitQueue(max_pending=0)
@@ -0,0 +1,116 @@
+"""
+Unit tests for background preparation of code pairs.
+"""
+
+from vaitp_auditor.core.differ import CodeDiffer
+from vaitp_auditor.core.models import CodePair, DeferredContent
+from vaitp_auditor.gui.prefetch import (
+    NO_INPUT_CODE, CodePairPrefetcher, compute_diff_spans, compute_semantic_diff_spans, compute_syntax_spans,
+    prepare_code_pair
+)
+
+
+def _pair(identifier, expected="x = 1\n", generated="x = 2\n", input_code=None):
+    """Create a code pair for testing."""
+    return CodePair(
+        identifier=identifier,
+        expected_code=expected,
+        generated_code=generated,
+        source_info={},
+        input_code=input_code
+    )
+
+
+class TestPrefetchComputations:
+    """Test cases for the span computations."""
+    
+    def test_syntax_spans_use_text_indices(self):
+        """Test that spans are reported as line.column indices."""
+        code = "def f():\n    return 'a'  # done\n"
+        spans = compute_syntax_spans(code)
+        
+        assert ('keyword', '1.0', '1.3') in spans
+        assert ('keyword', '2.4', '2.10') in spans
+        assert ('string', '2.11', '2.14') in spans
+        assert ('comment', '2.16', '2.22') in spans
+    
+    def test_diff_spans_ignore_formatting(self):
+        """Test that normalized lines compare equal and blank lines are not tagged."""
+        spans1, spans2 = compute_diff_spans("a = 1;\nb = 2\n", "a  =  1\nc = 3\n\nd = 4", "exp_gen")
+        
+        assert spans1 == [('exp_gen_changed', '2.0', '2.end')]
+        assert spans2 == [('exp_gen_changed', '2.0', '2.end'), ('exp_gen_added', '4.0', '4.end')]
+    
+    def test_diff_spans_mark_changed_text(self):
+        """Test that intra-line spans tag the changed text of paired lines."""
+        spans1, spans2 = compute_diff_spans("x = 1\ny = f(a)\n", "x = 1\ny = f(a, b)\n", "exp_gen", intraline=True)
+        
+        assert spans1 == [('exp_gen_changed', '2.0', '2.end')]
+        assert spans2 == [('exp_gen_changed', '2.0', '2.end'), ('exp_gen_changed_text', '2.7', '2.10')]
+    
+    def test_semantic_diff_spans_tag_changed_tokens(self):
+        """Test that semantic spans ignore layout and tag only the changed tokens."""
+        comparison = CodeDiffer().compare_semantics(
+            "y = f(a, 'b')\nz = 1\n", "y = f(a,\n      \"b\")  # note\nz = 2\n"
+        )
+        spans1, spans2 = compute_semantic_diff_spans(comparison, "exp_gen")
+        
+        assert spans1 == [('exp_gen_changed', '2.0', '2.end'), ('exp_gen_changed_text', '2.4', '2.5')]
+        assert spans2 == [('exp_gen_changed', '3.0', '3.end'), ('exp_gen_changed_text', '3.4', '3.5')]
+    
+    def test_prepare_code_pair(self):
+        """Test that every toggle and the review diff are prepared."""
+        code_pair = _pair("case1", generated=DeferredContent(lambda: "x = 2\n"))
+        prepared = prepare_code_pair(code_pair, CodeDiffer())
+        
+        assert prepared.texts['generated'] == "x = 2\n"
+        assert prepared.texts['input'] == NO_INPUT_CODE
+        assert set(prepared.diff_spans) == {'exp_gen', 'inp_gen', 'inp_exp'}
+        assert set(prepared.syntax_spans) == {'expected', 'generated'}
+        assert "x = 2" in prepared.code_diff
+        assert set(prepared.semantic_diff_spans) == {'exp_gen', 'inp_gen', 'inp_exp'}
+        assert not prepared.generated_matches_input
+    
+    def test_prepare_code_pair_flags_unchanged_code(self):
+        """Test that generated code semantically identical to the input code is flagged."""
+        code_pair = _pair("case1", generated="x = 1  # fixed?\n", input_code="x = (1)\n")
+        prepared = prepare_code_pair(code_pair, CodeDiffer())
+        
+        assert prepared.generated_matches_input
+        assert prepared.semantic_diff_spans['inp_gen'] == ([], [])
+
+
+class TestCodePairPrefetcher:
+    """Test cases for CodePairPrefetcher."""
+    
+    def test_prefetch_window(self):
+        """Test that the head of the queue is prepared and older pairs are dropped."""
+        pairs = [_pair(f"case{i}") for i in range(4)]
+        prefetcher = CodePairPrefetcher(depth=1)
+        try:
+            prefetcher.prefetch(pairs)
+            assert prefetcher.get(pairs[0]).code_pair is pairs[0]
+            assert prefetcher.get(pairs[1]).code_pair is pairs[1]
+            assert prefetcher.get(pairs[2]) is None
+            
+            prefetcher.prefetch(pairs[1:])
+            assert prefetcher.get(pairs[0]) is None
+            assert prefetcher.get(pairs[2]) is not None
+            
+            # A different object with the same identifier is not served
+            assert prefetcher.get(_pair("case1")) is None
+        finally:
+            prefetcher.shutdown()
+    
+    def test_failed_preparation_returns_none(self):
+        """Test that a pair whose content cannot be prepared falls back to None."""
+        def failing_loader():
+            raise OSError("unreadable")
+        
+        code_pair = _pair("broken", generated=DeferredContent(failing_loader))
+        prefetcher = CodePairPrefetcher()
+        try:
+            prefetcher.prefetch([code_pair])
+            assert prefetcher.get(code_pair) is None
+        finally:
+            prefetcher.shutdown()
@@ -0,0 +1,70 @@
+"""
+Unit tests for intra-line modification detection.
+"""
+
+from vaitp_auditor.core.intraline import ModificationDetector, changed_spans, tokenize_line
+from vaitp_auditor.core.models import LineModification
+
+
+class TestChangedSpans:
+    """Test cases for token-level changed spans."""
+    
+    def test_tokenize_line(self):
+        """Test that lines split into words, whitespace and punctuation."""
+        assert tokenize_line("  x_1 = f(a, 'b')") == [
+            "  ", "x_1", " ", "=", " ", "f", "(", "a", ",", " ", "'", "b", "'", ")"
+        ]
+    
+    def test_changed_spans(self):
+        """Test that only changed tokens are reported, as character offsets."""
+        old_spans, new_spans = changed_spans("value = compute(x, y)", "value = compute(x, z)")
+        assert (old_spans, new_spans) == ([(19, 20)], [(19, 20)])
+        
+        # Insertions only change the new line
+        assert changed_spans("f(a)", "f(a, b)") == ([], [(3, 6)])
+    
+    def test_changes_separated_by_whitespace_are_merged(self):
+        """Test that neighbouring changed words form one span."""
+        assert changed_spans("return old value", "return new thing") == ([(7, 16)], [(7, 16)])
+
+
+class TestModificationDetector:
+    """Test cases for ModificationDetector."""
+    
+    def test_pairs_similar_lines_in_order(self):
+        """Test that each removed line is paired with its most similar added line."""
+        expected = ["a = load(path)", "b = parse(a)", "print(b)"]
+        generated = ["log('start')", "a = load(path, mode)", "b = parse(a, strict=True)", "x"]
+        opcodes = [('replace', 0, 3, 0, 4)]
+        
+        modifications = ModificationDetector().detect(expected, generated, opcodes)
+        
+        assert [(m.expected_index, m.generated_index) for m in modifications] == [(0, 1), (1, 2)]
+        assert modifications[0] == LineModification(0, 1, (), ((13, 19),))
+    
+    def test_dissimilar_lines_are_not_paired(self):
+        """Test that unrelated lines stay plain removals and additions."""
+        opcodes = [('replace', 0, 1, 0, 1)]
+        assert ModificationDetector().detect(["import os"], ["class Foo:"], opcodes) == []
+    
+    def test_edited_blocks_pair_line_by_line(self):
+        """Test that lines are paired at their own offset before searching the window."""
+        expected = [f"value_{i} = {i}" for i in range(50)]
+        generated = [f"value_{i} = {i + 1}" for i in range(50)]
+        
+        modifications = ModificationDetector().detect(expected, generated, [('replace', 0, 50, 0, 50)])
+        assert [(m.expected_index, m.generated_index) for m in modifications] == [(i, i) for i in range(50)]
+        
+        # An inserted line shifts the pairing by one
+        shifted = ["unrelated"] + generated
+        modifications = ModificationDetector().detect(expected, shifted, [('replace', 0, 50, 0, 51)])
+        assert [(m.expected_index, m.generated_index) for m in modifications] == [(i, i + 1) for i in range(50)]
+    
+    def test_pairing_work_is_capped(self):
+        """Test that the comparison budget bounds the pairing work."""
+        expected = [f"value_{i} = {i}" for i in range(50)]
+        generated = [f"value_{i} = {i + 1}" for i in range(50)]
+        opcodes = [('replace', 0, 50, 0, 50)]
+        
+        assert len(ModificationDetector(max_comparisons=10).detect(expected, generated, opcodes)) == 10
+        assert ModificationDetector(max_comparisons=0).detect(expected, generated, opcodes) == []
@@ -0,0 +1,74 @@
+"""
+Unit tests for the large-document LineMatcher.
+"""
+
+import difflib
+import random
+
+import pytest
+
+from vaitp_auditor.core import line_matcher
+from vaitp_auditor.core.line_matcher import LineMatcher
+
+
+def _apply_opcodes(a, b, opcodes):
+    """Rebuild b from a and the opcodes, checking that they are contiguous."""
+    rebuilt = []
+    i = j = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == (i, j)
+        if tag == 'equal':
+            assert a[i1:i2] == b[j1:j2]
+        rebuilt.extend(b[j1:j2])
+        i, j = i2, j2
+    assert (i, j) == (len(a), len(b))
+    return rebuilt
+
+
+class TestLineMatcher:
+    """Test cases for LineMatcher."""
+    
+    def test_matches_sequence_matcher_on_simple_edits(self):
+        """Test that simple edits produce the same opcodes as SequenceMatcher."""
+        a = ["def f():", "    x = 1", "    y = 2", "    return x + y"]
+        b = ["def f():", "    x = 1", "    y = 3", "    z = 4", "    return x + y"]
+        
+        assert LineMatcher(a, b).get_opcodes() == difflib.SequenceMatcher(None, a, b).get_opcodes()
+        assert LineMatcher([], []).get_opcodes() == []
+        assert LineMatcher([], ["a"]).get_opcodes() == [('insert', 0, 0, 0, 1)]
+        assert LineMatcher(["a"], ["b"]).get_matching_blocks() == [(1, 1, 0)]
+    
+    @pytest.mark.parametrize("small_range", [line_matcher.SMALL_RANGE_COMPARISONS, 4])
+    def test_opcodes_rebuild_generated_lines(self, monkeypatch, small_range):
+        """Test that random edits always yield a valid diff, also without the small-range fallback."""
+        monkeypatch.setattr(line_matcher, "SMALL_RANGE_COMPARISONS", small_range)
+        rng = random.Random(23)
+        
+        for _ in range(500):
+            alphabet = rng.choice([2, 5, 50])
+            a = [str(rng.randrange(alphabet)) for _ in range(rng.randint(0, 60))]
+            b = list(a)
+            for _ in range(rng.randint(0, 8)):
+                if b and rng.random() < 0.5:
+                    del b[rng.randrange(len(b))]
+                b.insert(rng.randint(0, len(b)), str(rng.randrange(alphabet)))
+            
+            assert _apply_opcodes(a, b, LineMatcher(a, b).get_opcodes()) == b
+    
+    def test_large_input_with_repeated_lines(self):
+        """Test accuracy on a 100k-line input with many blank and duplicate lines."""
+        a = [f"    value_{i} = compute({i % 97})" if i % 5 else "" for i in range(100000)]
+        b = list(a)
+        b.insert(10, "inserted")
+        del b[50000:50010]
+        b[80000] = "changed"
+        
+        opcodes = LineMatcher(a, b).get_opcodes()
+        
+        assert _apply_opcodes(a, b, opcodes) == b
+        changed = [opcode for opcode in opcodes if opcode[0] != 'equal']
+        assert changed == [
+            ('insert', 10, 10, 10, 11),
+            ('delete', 49999, 50009, 50000, 50000),
+            ('replace', 80009, 80010, 80000, 80001),
+        ]
@@ -2,13 +2,27 @@
 Unit tests for core data models.
 """
 
+import pickle
 import pytest
 from datetime import datetime
 from vaitp_auditor.core.models import (
-    CodePair, ReviewResult, DiffLine, SessionState, SessionConfig
+    CodePair, CompletedReviews, DeferredContent, ReviewQueue, ReviewResult, DiffLine, SessionState,
+    SessionConfig
 )
 
 
+class _CountingLoader:
+    """Picklable loader that counts how often it is called."""
+    
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+    
+    def __call__(self):
+        self.calls += 1
+        return self.content
+
+
 class TestCodePair:
     """Test cases for CodePair model."""
     
@@ -97,6 +111,78 @@ class TestCodePair:
         assert code_pair.validate_integrity() is False
 
 
+class TestDeferredContent:
+    """Test cases for CodePair fields backed by DeferredContent."""
+    
+    def test_content_loaded_on_first_access(self):
+        """Test that deferred content is only read when accessed."""
+        loader = _CountingLoader("print('lazy')")
+        code_pair = CodePair(
+            identifier="lazy_001",
+            expected_code=None,
+            generated_code=DeferredContent(loader),
+            source_info={}
+        )
+        
+        assert code_pair.validate_integrity()
+        assert code_pair.has_deferred_content()
+        assert loader.calls == 0
+        
+        assert code_pair.generated_code == "print('lazy')"
+        assert code_pair.generated_code == "print('lazy')"
+        assert loader.calls == 1
+    
+    def test_release_content_reloads_on_next_access(self):
+        """Test that released content is read again when needed."""
+        loader = _CountingLoader("x = 1")
+        content = DeferredContent(loader)
+        code_pair = CodePair("lazy_002", content, "y = 2", {})
+        
+        assert code_pair.expected_code == "x = 1"
+        code_pair.release_content()
+        assert not content.is_loaded
+        assert code_pair.expected_code == "x = 1"
+        assert loader.calls == 2
+    
+    def test_content_hash_computed_once(self):
+        """Test that content hashes are cached until the content may change."""
+        loader = _CountingLoader("x = 1")
+        code_pair = CodePair("lazy_005", DeferredContent(loader), "y = 2", {})
+        
+        expected_hash = code_pair.content_hash("expected_code")
+        assert code_pair.content_hash("expected_code") == expected_hash
+        assert loader.calls == 1
+        assert code_pair.content_hash("input_code") == CodePair("other", "", "", {}).content_hash("expected_code")
+        
+        code_pair.generated_code = "y = 3"
+        assert code_pair.content_hash("generated_code") != CodePair("other", None, "y = 2", {}).content_hash("generated_code")
+        
+        loader.content = "x = 2"
+        code_pair.release_content()
+        assert code_pair.content_hash("expected_code") != expected_hash
+        
+        with pytest.raises(ValueError):
+            code_pair.content_hash("identifier")
+    
+    def test_fallback_used_when_loader_fails(self):
+        """Test that the fallback value replaces an unreadable file."""
+        code_pair = CodePair("lazy_003", None, DeferredContent(lambda: None, fallback=""), {})
+        assert code_pair.generated_code == ""
+    
+    def test_pickle_does_not_store_loaded_content(self):
+        """Test that pickling keeps the loader but drops loaded content."""
+        code_pair = CodePair("lazy_004", None, DeferredContent(_CountingLoader("a" * 1000)), {})
+        unloaded_data = pickle.dumps(code_pair)
+        
+        assert code_pair.generated_code == "a" * 1000
+        loaded_data = pickle.dumps(code_pair)
+        assert len(loaded_data) == len(unloaded_data)
+        
+        restored = pickle.loads(loaded_data)
+        assert not restored.__dict__["generated_code"].is_loaded
+        assert restored.generated_code == "a" * 1000
+
+
 class TestReviewResult:
     """Test cases for ReviewResult model."""
     
@@ -428,6 +514,107 @@ class TestSessionState:
         assert session_state.get_progress_percentage() == 100.0
 
 
+class TestReviewQueue:
+    """Test cases for ReviewQueue and CompletedReviews."""
+    
+    @staticmethod
+    def _pairs(count):
+        return [CodePair(identifier=f"case{i}", expected_code="a", generated_code="b", source_info={})
+                for i in range(count)]
+    
+    def test_queue_operations_keep_index(self):
+        """Test dequeue, requeue, append and positions."""
+        pairs = self._pairs(4)
+        queue = ReviewQueue(pairs[:3])
+        
+        assert queue.popleft() is pairs[0]
+        assert "case0" not in queue
+        assert queue.position("case2") == 1
+        
+        queue.appendleft(pairs[0])
+        queue.append(pairs[3])
+        assert queue == pairs
+        assert [queue.position(f"case{i}") for i in range(4)] == [0, 1, 2, 3]
+        assert pairs[3] in queue and "case9" not in queue
+        
+        queue.remove("case1")
+        assert queue.identifiers() == ["case0", "case2", "case3"]
+        assert queue.position("case3") == 2
+        assert queue.pop(0) is pairs[0] and queue.pop() is pairs[3]
+        assert queue.peek() is pairs[2]
+        with pytest.raises(ValueError):
+            queue.remove("case1")
+    
+    def test_list_compatible_operations(self):
+        """Test the list operations used on remaining_queue."""
+        pairs = self._pairs(3)
+        queue = ReviewQueue()
+        assert not queue and queue.peek() is None
+        
+        queue.extend(pairs[1:])
+        queue.insert(0, pairs[0])
+        assert len(queue) == 3 and queue[0] is pairs[0] and queue[-1] is pairs[2]
+        assert queue[1:] == pairs[1:]
+        queue.prepend(pairs[:1])
+        assert queue.identifiers() == ["case0", "case0", "case1", "case2"]
+        
+        # Removing one of two duplicates keeps the identifier queued
+        queue.popleft()
+        assert "case0" in queue
+        with pytest.raises(IndexError):
+            ReviewQueue().popleft()
+    
+    def test_pickles_pairs_only(self):
+        """Test that pickling keeps the pairs and rebuilds the index."""
+        queue = ReviewQueue(self._pairs(3))
+        queue.popleft()
+        
+        restored = pickle.loads(pickle.dumps(queue))
+        assert restored == queue
+        assert restored.position("case1") == 0
+        assert set(restored.__getstate__()) == {'pairs'}
+    
+    def test_completed_reviews_index(self):
+        """Test set-backed membership of reviewed identifiers."""
+        completed = CompletedReviews(["a", "b"])
+        completed.append("c")
+        assert completed.pop() == "c"
+        assert "c" not in completed and "a" in completed
+        completed.extend(["d"])
+        del completed[0]
+        assert completed == ["b", "d"] and "a" not in completed
+        assert pickle.loads(pickle.dumps(completed)) == ["b", "d"]
+    
+    def test_session_state_converts_lists(self):
+        """Test that session fields become queue types, including old pickles."""
+        pairs = self._pairs(2)
+        session = SessionState(
+            session_id="s1",
+            experiment_name="exp",
+            data_source_config={},
+            completed_reviews=["x"],
+            remaining_queue=list(pairs),
+            created_timestamp=datetime.now()
+        )
+        assert isinstance(session.remaining_queue, ReviewQueue)
+        assert session.is_completed("x") and not session.is_completed("case0")
+        assert session.validate_integrity()
+        
+        session.remaining_queue = [pairs[0]]
+        assert isinstance(session.remaining_queue, ReviewQueue)
+        
+        # Pickles written before the queue types existed hold plain lists
+        session.__dict__['remaining_queue'] = list(pairs)
+        session.__dict__['completed_reviews'] = ["x"]
+        restored = pickle.loads(pickle.dumps(session))
+        assert isinstance(restored.remaining_queue, ReviewQueue)
+        assert isinstance(restored.completed_reviews, CompletedReviews)
+        assert restored.remaining_queue == pairs
+        
+        session.remaining_queue = "not a queue"
+        assert not session.validate_integrity()
+
+
 class TestSessionConfig:
     """Test cases for SessionConfig model."""
     
@@ -11,12 +11,13 @@ from pathlib import Path
 from unittest.mock import Mock, patch
 
 from vaitp_auditor.utils.performance import (
-    PerformanceMonitor, LazyLoader, ContentCache, ChunkedProcessor,
+    PerformanceMonitor, LazyLoader, ContentCache, ChunkedProcessor, DiffCache,
     performance_monitor, get_performance_monitor, get_content_cache
 )
 from vaitp_auditor.core.differ import CodeDiffer
 from vaitp_auditor.ui.display_manager import DisplayManager
 from vaitp_auditor.data_sources.filesystem import FileSystemSource
+from vaitp_auditor.data_sources.excel import ExcelSource
 from vaitp_auditor.core.models import CodePair
 
 
@@ -163,6 +164,37 @@ class TestContentCache:
         assert stats["evictions"] > 0
 
 
+class TestDiffCache:
+    """Test the byte-bounded LRU diff cache."""
+    
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test that eviction is bounded by bytes and follows recency."""
+        monitor = PerformanceMonitor()
+        cache = DiffCache(max_size_mb=300 / 1024 / 1024, name="test_diffs", monitor=monitor)
+        
+        cache.put(("a", "b"), ["diff ab"], 100)
+        cache.put(("a", "c"), ["diff ac"], 100)
+        assert cache.get(("a", "b")) == ["diff ab"]  # ("a", "c") is now least recently used
+        cache.put(("b", "c"), ["diff bc"], 150)
+        
+        assert cache.get(("a", "c")) is None
+        assert cache.get(("a", "b")) == ["diff ab"]
+        assert cache.get(("b", "c")) == ["diff bc"]
+        assert cache.size_bytes == 250
+        
+        # Values larger than the whole cache are not stored
+        assert not cache.put(("x", "y"), ["huge"], 1000)
+        assert len(cache) == 2
+        
+        assert monitor.get_counters("test_diffs.") == {
+            "test_diffs.hits": 3,
+            "test_diffs.misses": 1,
+            "test_diffs.evictions": 1,
+        }
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"]) == (3, 1, 1)
+
+
 class TestChunkedProcessor:
     """Test chunked processing functionality."""
     
@@ -229,6 +261,21 @@ class TestCodeDifferPerformance:
         # Second computation should be faster (cached)
         assert second_duration < first_duration
     
+    def test_diff_cache_keyed_by_content_hashes(self):
+        """Test that diffs are cached under the code pair's content hashes."""
+        monitor = PerformanceMonitor()
+        differ = CodeDiffer(diff_cache=DiffCache(name="pair_diffs", monitor=monitor))
+        code_pair = CodePair("pair_001", "x = 1\ny = 2", "x = 1\ny = 3", {})
+        hashes = (code_pair.content_hash("expected_code"), code_pair.content_hash("generated_code"))
+        
+        result1 = differ.compute_diff(code_pair.expected_code, code_pair.generated_code, content_hashes=hashes)
+        result2 = differ.compute_diff(code_pair.expected_code, code_pair.generated_code, content_hashes=hashes)
+        # Without precomputed hashes the same key is derived from the content
+        result3 = differ.compute_diff(code_pair.expected_code, code_pair.generated_code)
+        
+        assert result2 is result1 and result3 is result1
+        assert monitor.get_counters("pair_diffs.") == {"pair_diffs.misses": 1, "pair_diffs.hits": 2}
+    
     def test_large_file_diff_handling(self):
         """Test handling of large file diffs."""
         differ = CodeDiffer()
@@ -365,6 +412,62 @@ class TestFileSystemSourcePerformance:
             assert len(code_pairs) == 50
 
 
+class TestExcelSourcePerformance:
+    """Benchmark for the columnar ExcelSource conversion."""
+    
+    ROWS = 100_000
+    
+    def _create_source_and_dataframe(self):
+        import numpy as np
+        import pandas as pd
+        
+        ids = np.arange(self.ROWS).astype(object)
+        generated = np.array([f"  def func_{i}():\n    return {i}  " for i in range(self.ROWS)], dtype=object)
+        generated[::50] = np.nan  # Some rows without generated code
+        generated[1::50] = "   "  # Some rows with whitespace only
+        df = pd.DataFrame({
+            "id": ids,
+            "generated": generated,
+            "expected": [f"def func_{i}():\n    return {i + 1}" for i in range(self.ROWS)],
+            "model": np.where(np.arange(self.ROWS) % 2, "model-a", "model-b"),
+        })
+        
+        source = ExcelSource()
+        source._file_path = "benchmark.csv"
+        source._identifier_column = "id"
+        source._generated_code_column = "generated"
+        source._expected_code_column = "expected"
+        source._model_column = "model"
+        return source, df
+    
+    def test_columnar_conversion_beats_row_iteration(self):
+        """Test that converting 100k rows is faster than merely cleaning them with iterrows."""
+        import pandas as pd
+        
+        source, df = self._create_source_and_dataframe()
+        
+        start_time = time.perf_counter()
+        code_pairs = source._convert_dataframe_to_code_pairs(df)
+        columnar_duration = time.perf_counter() - start_time
+        
+        # Reference: only the per-cell cleaning done by the former iterrows loop
+        start_time = time.perf_counter()
+        cleaned = 0
+        for _, row in df.iterrows():
+            values = [row[column] for column in ("id", "generated", "expected", "model")]
+            if not any(pd.isna(value) for value in values[:2]):
+                if all(str(value).strip() for value in values[:2]):
+                    cleaned += 1
+        row_duration = time.perf_counter() - start_time
+        
+        expected_count = self.ROWS - 2 * (self.ROWS // 50)
+        assert len(code_pairs) == cleaned == expected_count
+        assert code_pairs[0].generated_code == "def func_2():\n    return 2"
+        assert code_pairs[0].source_info["row_number"] == 3
+        assert code_pairs[0].source_info["model_name"] == "model-b"
+        assert columnar_duration < row_duration
+
+
 class TestIntegrationPerformance:
     """Integration tests for performance optimizations."""
     
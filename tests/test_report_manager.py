@@ -126,11 +126,14 @@ class TestReportManager(unittest.TestCase):
         self.assertEqual(len(self.report_manager._review_data), 1)
         self.assertEqual(self.report_manager._last_review_id, 1)
         
-        # Check that temp file contains the data
-        df = pd.read_excel(self.report_manager._temp_file_path, engine='openpyxl')
+        # Check that the journal contains the data
+        df = pd.read_csv(self.report_manager._temp_file_path)
         self.assertEqual(len(df), 1)
         self.assertEqual(df.iloc[0]['review_id'], 1)
         self.assertEqual(df.iloc[0]['source_identifier'], 'test_file_1')
+        
+        # The workbook is only materialised on finalization
+        self.assertFalse(Path(self.report_manager._output_file_path).exists())
 
     def test_append_review_result_without_initialization(self):
         """Test that appending fails without initialization."""
@@ -447,8 +450,8 @@ class TestReportManager(unittest.TestCase):
         # Add a review
         self.report_manager.append_review_result(self.sample_review_result)
         
-        # Mock the file write method to fail
-        with patch.object(self.report_manager, '_write_data_to_temp_file_with_locking', return_value=False):
+        # Mock the journal truncation to fail
+        with patch.object(self.report_manager, '_truncate_journal', return_value=False):
             success = self.report_manager.remove_last_review()
             self.assertFalse(success)
             
@@ -478,8 +481,8 @@ class TestReportManager(unittest.TestCase):
         self.report_manager.append_review_result(result1)
         self.report_manager.append_review_result(result2)
         
-        # Mock the file write method to raise an exception
-        with patch.object(self.report_manager, '_write_data_to_temp_file_with_locking', side_effect=Exception("Test exception")):
+        # Mock the journal truncation to raise an exception
+        with patch.object(self.report_manager, '_truncate_journal', side_effect=Exception("Test exception")):
             success = self.report_manager.remove_last_review()
             self.assertFalse(success)
             
@@ -604,8 +607,14 @@ class TestReportManager(unittest.TestCase):
         self.assertEqual(len(self.report_manager._review_data), 1)
         self.assertEqual(self.report_manager._last_review_id, 1)
         
-        # Verify Excel file was updated correctly
-        df = pd.read_excel(self.report_manager._temp_file_path, engine='openpyxl')
+        # Verify the journal was truncated correctly
+        df = pd.read_csv(self.report_manager._temp_file_path)
+        self.assertEqual(len(df), 1)
+        self.assertEqual(df.iloc[0]['review_id'], 1)
+        
+        # Verify the finalized workbook only contains the remaining review
+        output_path = self.report_manager.finalize_report()
+        df = pd.read_excel(output_path, engine='openpyxl')
         self.assertEqual(len(df), 1)
         self.assertEqual(df.iloc[0]['review_id'], 1)
 
@@ -614,8 +623,8 @@ class TestReportManager(unittest.TestCase):
         self.report_manager.initialize_report(self.test_session_id, 'csv')
         
         # Mock both write methods to fail
-        with patch.object(self.report_manager, '_write_data_to_temp_file_with_locking', return_value=False):
-            with patch.object(self.report_manager, '_write_data_to_temp_file', side_effect=OSError("Write failed")):
+        with patch.object(self.report_manager, '_append_journal_record', return_value=False):
+            with patch.object(self.report_manager, '_rewrite_journal', side_effect=OSError("Write failed")):
                 with self.assertRaises(OSError) as context:
                     self.report_manager.append_review_result(self.sample_review_result)
                 
@@ -625,6 +634,60 @@ class TestReportManager(unittest.TestCase):
                 self.assertEqual(len(self.report_manager._review_data), 0)
                 self.assertIsNone(self.report_manager._last_review_id)
 
+    def test_append_does_not_rewrite_journal(self):
+        """Test that appending only writes the new record to the journal."""
+        self.report_manager.initialize_report(self.test_session_id, 'csv')
+        header_size = os.path.getsize(self.report_manager._temp_file_path)
+        
+        with patch.object(self.report_manager, '_rewrite_journal') as mock_rewrite:
+            for i in range(3):
+                result = ReviewResult(
+                    review_id=i + 1,
+                    source_identifier=f"test_file_{i + 1}",
+                    experiment_name="test_experiment",
+                    review_timestamp_utc=datetime(2023, 1, 1, 12, i, 0),
+                    reviewer_verdict="Success",
+                    reviewer_comment="multi\nline, \"quoted\" comment",
+                    time_to_review_seconds=10.0,
+                    expected_code="def f():\n    pass",
+                    generated_code="def f():\n    return 1",
+                    code_diff="+ return 1"
+                )
+                self.report_manager.append_review_result(result)
+            mock_rewrite.assert_not_called()
+        
+        # Each record starts where the previous one ended
+        offsets = list(self.report_manager._record_offsets)
+        self.assertEqual(len(offsets), 3)
+        self.assertEqual(offsets[0], header_size)
+        self.assertEqual(offsets, sorted(offsets))
+        
+        # Undo truncates exactly to the start of the last record
+        self.assertTrue(self.report_manager.remove_last_review())
+        self.assertEqual(os.path.getsize(self.report_manager._temp_file_path), offsets[-1])
+        
+        with open(self.report_manager._temp_file_path, 'r', newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(len(rows), 3)  # Header + 2 data rows
+        self.assertEqual(rows[2][5], 'multi\nline, "quoted" comment')
+
+    def test_resume_report_seeds_journal(self):
+        """Test that resuming a report rebuilds the journal and its offsets."""
+        self.report_manager.initialize_report(self.test_session_id, 'csv')
+        self.report_manager.append_review_result(self.sample_review_result)
+        output_path = self.report_manager.finalize_report()
+        
+        resumed = ReportManager()
+        resumed.resume_report(self.test_session_id, output_path, 'csv')
+        self.assertEqual(len(resumed._record_offsets), 1)
+        self.assertEqual(resumed.get_last_review_id(), 1)
+        
+        # Undo of a resumed review truncates the journal to headers only
+        self.assertTrue(resumed.remove_last_review())
+        with open(resumed._temp_file_path, 'r', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(len(rows), 1)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -191,6 +191,24 @@ class TestReviewUIController:
                 source_identifier=self.sample_code_pair.identifier
             )
 
+    def test_render_code_pair_display_suggests_no_change(self):
+        """Test that generated code matching the input code is flagged."""
+        code_pair = CodePair(
+            identifier="unchanged",
+            expected_code="x = safe(y)",
+            generated_code="x = f('y')  # same as input",
+            source_info={},
+            input_code='x = f("y")'
+        )
+        with patch.object(self.controller.display_manager, 'render_code_panels'), \
+             patch.object(self.controller.display_manager, 'show_warning') as mock_warning:
+            
+            self.controller._render_code_pair_display(code_pair, self.progress_info)
+            self.controller._render_code_pair_display(self.sample_code_pair, self.progress_info)
+            
+            mock_warning.assert_called_once()
+            assert "Failure - No Change" in mock_warning.call_args[0][0]
+
     def test_render_fallback_display(self):
         """Test _render_fallback_display method."""
         with patch.object(self.controller.console, 'clear') as mock_clear, \
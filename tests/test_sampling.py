@@ -0,0 +1,104 @@
+"""
+Unit tests for the reproducible sampling primitives.
+"""
+
+import pytest
+
+from vaitp_auditor.core.models import CodePair, SampleSpec, SessionConfig
+from vaitp_auditor.data_sources.sampling import (
+    ShuffledIndex, reservoir_sample, sample_key, sample_keys, sample_size, select_sample, stratum_of
+)
+
+
+def _pairs(models):
+    """Create one code pair per model name."""
+    return [
+        CodePair(
+            identifier=f'case_{index}',
+            expected_code=None,
+            generated_code=f'print({index})',
+            source_info={'model_name': model, 'prompting_strategy': 'zero-shot'}
+        )
+        for index, model in enumerate(models)
+    ]
+
+
+class TestSampling:
+    """Test cases for the sampling module."""
+
+    def test_sample_size_bounds(self):
+        """Test that samples are never empty for a non-empty population."""
+        assert sample_size(0, 50) == 0
+        assert sample_size(10, 1) == 1
+        assert sample_size(10, 55) == 5
+        assert sample_size(10, 100) == 10
+
+    def test_vectorised_keys_match_scalar_keys(self):
+        """Test that sample_keys computes the same keys as sample_key."""
+        for seed in (0, 7, 2 ** 63 - 1):
+            assert sample_keys(seed, 100, 50).tolist() == [sample_key(seed, 100 + i) for i in range(50)]
+
+    def test_same_seed_same_sample(self):
+        """Test that a seed fully determines the sample and its order."""
+        items = list(range(1000))
+
+        first = select_sample(items, 10, seed=5)
+        assert first == select_sample(items, 10, seed=5)
+        assert first != select_sample(items, 10, seed=6)
+        assert len(first) == 100
+        assert first == sorted(first, key=lambda item: sample_key(5, item))
+
+    def test_reservoir_matches_select_sample(self):
+        """Test that single-pass reservoir sampling selects the same items as select_sample."""
+        items = list(range(1000))
+
+        assert reservoir_sample(iter(items), 100, seed=11) == select_sample(items, 10, seed=11)
+        assert reservoir_sample(iter(items[:5]), 100, seed=11) == select_sample(items[:5], 100, seed=11)
+
+    def test_stratified_sample_keeps_small_strata(self):
+        """Test that every stratum contributes its share and at least one item."""
+        code_pairs = _pairs(['large'] * 200 + ['small'] * 5)
+
+        sampled = select_sample(code_pairs, 10, seed=3, stratum=lambda pair: stratum_of(pair, ('model_name',)))
+
+        models = [pair.source_info['model_name'] for pair in sampled]
+        assert models.count('large') == 20
+        assert models.count('small') == 1
+
+    def test_shuffled_index_draws_each_accepted_position_once(self):
+        """Test that draws skip rejected positions and rescan once when exhausted."""
+        index = ShuffledIndex(20, seed=4)
+        taken = set()
+
+        drawn = [index.draw(lambda position: position % 2 == 0 and position not in taken) for _ in range(10)]
+        for position in drawn:
+            taken.add(position)
+        assert sorted(drawn) == list(range(0, 20, 2))
+        assert drawn != sorted(drawn)
+
+        # Exhausted: the reshuffled order still finds a position freed since
+        taken.discard(6)
+        assert index.draw(lambda position: position % 2 == 0 and position not in taken) == 6
+        assert index.draw(lambda position: False) is None
+
+    def test_sample_spec_validation(self):
+        """Test SampleSpec validation and derivation from a session config."""
+        with pytest.raises(ValueError):
+            SampleSpec(percentage=0)
+        with pytest.raises(ValueError):
+            SampleSpec(stratify_by=('file_path',))
+
+        config = SessionConfig(
+            experiment_name='exp',
+            data_source_type='sqlite',
+            data_source_params={},
+            sample_percentage=20,
+            output_format='csv',
+            selected_model='m1',
+            sample_seed=9,
+            stratify_by=['prompting_strategy']
+        )
+        spec = config.to_sample_spec()
+
+        assert spec == SampleSpec(20, 9, ('prompting_strategy',), 'm1', None)
+        assert spec.with_seed(10).seed == 10
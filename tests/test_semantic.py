@@ -0,0 +1,81 @@
+"""
+Unit tests for semantic code comparison.
+"""
+
+from vaitp_auditor.core.models import CodePair
+from vaitp_auditor.core.semantic import (
+    DEDENT, INDENT, STATEMENT_END, SemanticDiffer, SemanticToken, compute_fingerprint
+)
+from vaitp_auditor.utils.performance import DiffCache
+
+
+class TestFingerprint:
+    """Test cases for code normalization."""
+    
+    def test_python_tokens_are_normalized(self):
+        """Test that comments and layout are dropped and literals compared by value."""
+        fingerprint = compute_fingerprint("if x:  # check\n    y = 'a'; z = 0x10\n")
+        
+        assert [token.text for token in fingerprint.tokens] == [
+            'if', 'x', ':', STATEMENT_END, INDENT, 'y', '=', "'a'", STATEMENT_END,
+            'z', '=', '16', STATEMENT_END, DEDENT
+        ]
+        assert fingerprint.tokens[7] == SemanticToken("'a'", (1, 8), (1, 11))
+        assert fingerprint.syntax_tree is not None
+    
+    def test_code_python_cannot_tokenize_uses_generic_tokens(self):
+        """Test that other languages are compared by words, strings and symbols."""
+        fingerprint = compute_fingerprint("if (x) {\n  s = 'it\\'s';\n")
+        
+        assert fingerprint.syntax_tree is None
+        assert [token.text for token in fingerprint.tokens] == [
+            'if', '(', 'x', ')', '{', 's', '=', '"it\\\'s"', ';'
+        ]
+
+
+class TestSemanticDiffer:
+    """Test cases for SemanticDiffer."""
+    
+    def test_formatting_comments_and_quotes_are_ignored(self):
+        """Test that reformatted Python code is equivalent."""
+        expected = "def f(x):\n    # add a suffix\n    return x + 'a'\n"
+        generated = 'def f(x):\n  return (x +\n          "a")  # suffix\n'
+        
+        comparison = SemanticDiffer(DiffCache()).compare(expected, generated)
+        
+        assert comparison.equivalent
+        assert comparison.method == 'ast'
+        assert comparison.changes == ()
+    
+    def test_changed_tokens_are_reported(self):
+        """Test that a semantic change is located at its tokens and lines."""
+        expected = "def f(x):\n    return x + 'a'\n"
+        generated = "def f(x):\n\n    return x + 'b'\n"
+        
+        comparison = SemanticDiffer(DiffCache()).compare(expected, generated)
+        
+        assert not comparison.equivalent
+        assert comparison.changes == (('replace', 11, 12, 11, 12),)
+        assert comparison.changed_lines() == ([1], [2])
+    
+    def test_results_are_cached_per_content_hash(self):
+        """Test that fingerprints and comparisons are computed once."""
+        cache = DiffCache()
+        differ = SemanticDiffer(cache)
+        
+        first = differ.compare("a = 1", "a = 2")
+        assert differ.compare("a = 1", "a = 2") is first
+        assert differ.compare("a = 1", "a = 2", content_hashes=('h1', 'h2')) is not first
+        # Entries are keyed by the given hashes: four fingerprints and two comparisons
+        assert len(cache) == 6
+    
+    def test_generated_matches_input(self):
+        """Test that pairs whose generated code equals the input code are detected."""
+        differ = SemanticDiffer(DiffCache())
+        
+        def pair(generated, input_code):
+            return CodePair("case", None, generated, {}, input_code=input_code)
+        
+        assert differ.generated_matches_input(pair("x = f('y')  # fixed", 'x = f("y")'))
+        assert not differ.generated_matches_input(pair("x = f('y')", "x = g('y')"))
+        assert not differ.generated_matches_input(pair("x = 1", None))
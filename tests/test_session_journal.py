@@ -0,0 +1,75 @@
+"""
+Unit tests for the write-ahead session journal.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from vaitp_auditor.core.models import SessionState
+from vaitp_auditor.session_journal import (
+    FLAG, REPLACEMENT, UNDO, VERDICT, JournalRecord, SessionJournal, replay_record
+)
+
+
+class TestSessionJournal:
+    """Test cases for SessionJournal."""
+
+    def test_append_and_read_round_trip(self, tmp_path):
+        """Test that appended records are read back in order."""
+        journal = SessionJournal(tmp_path / "session.journal")
+        records = [
+            JournalRecord(1, VERDICT, {'identifier': 'a', 'ref': {'rowid': 1}}),
+            JournalRecord(2, UNDO, {'identifier': 'a', 'ref': None}),
+        ]
+        for record in records:
+            journal.append(record)
+
+        assert journal.read() == records
+        journal.reset()
+        assert journal.is_empty()
+        assert journal.read() == []
+
+    def test_read_stops_at_damaged_record(self, tmp_path):
+        """Test that replay is deterministic after a corrupted or torn record."""
+        path = tmp_path / "session.journal"
+        journal = SessionJournal(path)
+        for seq in range(1, 4):
+            journal.append(JournalRecord(seq, VERDICT, {'identifier': f'case{seq}'}))
+
+        lines = path.read_bytes().splitlines(keepends=True)
+        path.write_bytes(lines[0] + lines[1].replace(b'case2', b'case9') + lines[2])
+        assert [record.seq for record in journal.read()] == [1]
+
+        # A torn tail (no trailing newline) is ignored as well
+        path.write_bytes(lines[0] + lines[1] + lines[2][:-5])
+        assert [record.seq for record in journal.read()] == [1, 2]
+
+    def test_invalid_event_type(self):
+        """Test that unknown events are rejected."""
+        with pytest.raises(ValueError):
+            JournalRecord(1, 'rename', {'identifier': 'a'})
+
+    def test_replay_record(self):
+        """Test applying events to a reference snapshot."""
+        session = SessionState(
+            session_id="s1",
+            experiment_name="exp",
+            data_source_config={},
+            completed_reviews=[],
+            remaining_queue=[],
+            created_timestamp=datetime.utcnow(),
+            pending_count=3
+        )
+        queued_refs = [('a', None), ('b', None)]
+
+        replay_record(session, queued_refs, JournalRecord(1, VERDICT, {'identifier': 'a'}))
+        replay_record(session, queued_refs, JournalRecord(2, VERDICT, {'identifier': 'b'}))
+        replay_record(session, queued_refs, JournalRecord(3, UNDO, {'identifier': 'b', 'ref': {'rowid': 2}}))
+        replay_record(session, queued_refs, JournalRecord(4, FLAG, {'identifier': 'b', 'kind': 'vulnerable'}))
+        replay_record(session, queued_refs, JournalRecord(5, REPLACEMENT, {'identifier': 'z', 'ref': None}))
+
+        assert session.completed_reviews == ['a']
+        assert queued_refs == [('z', None)]
+        assert session.pending_count == 2
+        assert session.flagged_entries == [{'source_identifier': 'b'}]
@@ -13,10 +13,25 @@ from unittest.mock import Mock, patch, MagicMock
 from vaitp_auditor.core.models import CodePair, ReviewResult, SessionState, SessionConfig
 from vaitp_auditor.data_sources.base import DataSource
 from vaitp_auditor.session_manager import SessionManager
+from vaitp_auditor.session_journal import VERDICT
 from vaitp_auditor.ui.review_controller import ReviewUIController
 from vaitp_auditor.reporting.report_manager import ReportManager
 
 
+def _stream_via_load_data(mock_data_source):
+    """Make a mocked data source stream (and rehydrate) whatever its load_data returns."""
+    mock_data_source.iter_pairs.side_effect = (
+        lambda spec: DataSource.iter_pairs(mock_data_source, spec)
+    )
+    mock_data_source.sample_size_hint = None
+    mock_data_source.source_ref.return_value = None
+    mock_data_source._load_referenced_pairs.return_value = {}
+    mock_data_source.load_pairs_by_ref.side_effect = (
+        lambda references, spec=None: DataSource.load_pairs_by_ref(mock_data_source, references, spec)
+    )
+    return mock_data_source
+
+
 class TestSessionManagerCore(unittest.TestCase):
     """Test SessionManager core functionality."""
 
@@ -25,7 +40,7 @@ class TestSessionManagerCore(unittest.TestCase):
         self.temp_dir = tempfile.mkdtemp()
         self.mock_ui = Mock(spec=ReviewUIController)
         self.mock_report_manager = Mock(spec=ReportManager)
-        self.mock_data_source = Mock(spec=DataSource)
+        self.mock_data_source = _stream_via_load_data(Mock(spec=DataSource))
         
         # Create session manager with mocked dependencies
         with patch('vaitp_auditor.session_manager.Path.home') as mock_home:
@@ -76,8 +91,12 @@ class TestSessionManagerCore(unittest.TestCase):
         self.assertIsNotNone(session_id)
         self.assertTrue(session_id.startswith("test_experiment_"))
         
-        # Verify data source was called correctly
-        self.mock_data_source.load_data.assert_called_once_with(100.0)
+        # Verify data source was called with the seed stored in the session
+        sample_spec = self.session_manager._current_session.sample_spec
+        self.assertIsNotNone(sample_spec.seed)
+        self.mock_data_source.load_data.assert_called_once_with(
+            100.0, seed=sample_spec.seed, stratify_by=()
+        )
         
         # Verify report manager was initialized
         self.mock_report_manager.initialize_report.assert_called_once_with(session_id, "excel")
@@ -130,6 +149,167 @@ class TestSessionManagerCore(unittest.TestCase):
         self.assertIn('next_review_id', session_data)
         self.assertEqual(session_data['session_state'].session_id, session_id)
         self.assertEqual(session_data['session_state'].experiment_name, "test_experiment")
+        self.assertEqual(session_data['session_state'].sample_spec,
+                         self.session_manager._current_session.sample_spec)
+
+    def test_queue_is_bounded_prefetch_window(self):
+        """Test that only a window of the sample is held and refilled on demand."""
+        code_pairs = [
+            CodePair(identifier=f"case{i}", expected_code=None, generated_code=f"x = {i}", source_info={})
+            for i in range(5)
+        ]
+        self.mock_data_source.load_data.return_value = code_pairs
+        self.mock_data_source.iter_pairs.side_effect = lambda spec: iter(code_pairs)
+        self.mock_data_source.sample_size_hint = 5
+        self.session_manager.prefetch_window = 2
+        
+        self.session_manager.start_session(self.sample_config, self.mock_data_source)
+        session = self.session_manager._current_session
+        
+        self.assertEqual([pair.identifier for pair in session.remaining_queue], ["case0", "case1"])
+        self.assertEqual(session.pending_count, 3)
+        self.assertEqual(self.session_manager.get_session_progress()['total_reviews'], 5)
+        
+        session.remaining_queue.pop(0)
+        self.assertTrue(self.session_manager.refill_queue())
+        self.assertEqual([pair.identifier for pair in session.remaining_queue], ["case1", "case2"])
+        self.assertEqual(session.pending_count, 2)
+        
+        session.remaining_queue.clear()
+        self.session_manager.refill_queue()
+        session.remaining_queue.clear()
+        self.assertFalse(self.session_manager.refill_queue())
+        self.assertEqual(session.pending_count, 0)
+
+    def test_draw_replacement_excludes_session_pairs(self):
+        """Test that replacements exclude reviewed and queued pairs and are not streamed twice."""
+        code_pairs = [
+            CodePair(identifier=f"case{i}", expected_code=None, generated_code=f"x = {i}", source_info={})
+            for i in range(4)
+        ]
+        self.mock_data_source.load_data.return_value = code_pairs
+        self.mock_data_source.sample_size_hint = 4
+        self.mock_data_source.sample_one_excluding.return_value = code_pairs[3]
+        self.session_manager.prefetch_window = 2
+        self.session_manager.start_session(self.sample_config, self.mock_data_source)
+        session = self.session_manager._current_session
+        session.completed_reviews.append(session.remaining_queue.popleft().identifier)
+        
+        replacement = self.session_manager.draw_replacement({"flagged"})
+        
+        self.assertIs(replacement, code_pairs[3])
+        excluded, sample_spec = self.mock_data_source.sample_one_excluding.call_args[0]
+        self.assertEqual(excluded, {"case0", "case1", "flagged"})
+        self.assertEqual(sample_spec, session.sample_spec)
+        
+        # The replacement is reviewed before the stream reaches it; it is not served again
+        session.remaining_queue.append(replacement)
+        session.completed_reviews.append(session.remaining_queue.popleft().identifier)
+        self.session_manager.refill_queue()
+        self.assertEqual([pair.identifier for pair in session.remaining_queue], ["case3", "case2"])
+        session.completed_reviews.append(session.remaining_queue.popleft().identifier)
+        self.session_manager.refill_queue()
+        self.assertEqual([pair.identifier for pair in session.remaining_queue], ["case2"])
+        
+        self.session_manager._data_source = None
+        self.assertIsNone(self.session_manager.draw_replacement())
+
+    def test_rederive_queue_from_sample_spec(self):
+        """Test that a resumed window continues from the stored seed without reviewed pairs."""
+        code_pairs = [
+            CodePair(identifier=f"case{i}", expected_code=None, generated_code=f"x = {i}", source_info={})
+            for i in range(4)
+        ]
+        self.mock_data_source.load_data.return_value = code_pairs
+        self.mock_data_source.sample_size_hint = 4
+        self.session_manager.prefetch_window = 2
+        self.session_manager.start_session(self.sample_config, self.mock_data_source)
+        seed = self.session_manager._current_session.sample_spec.seed
+        
+        # Review the first pair, then lose the stream as on resume
+        session = self.session_manager._current_session
+        session.completed_reviews.append(session.remaining_queue.pop(0).identifier)
+        self.session_manager._pair_stream = None
+        
+        self.assertTrue(self.session_manager.rederive_queue(self.mock_data_source))
+        
+        self.mock_data_source.load_data.assert_called_with(100.0, seed=seed, stratify_by=())
+        self.assertEqual([pair.identifier for pair in session.remaining_queue], ["case1", "case2"])
+        self.assertTrue(self.session_manager.refill_queue())
+        session.remaining_queue.clear()
+        self.session_manager.refill_queue()
+        self.assertEqual([pair.identifier for pair in session.remaining_queue], ["case3"])
+
+    def test_snapshot_stores_references_not_code(self):
+        """Test that snapshots hold queued identifiers only and are rehydrated on resume."""
+        self.mock_data_source.load_data.return_value = self.sample_code_pairs
+        self.mock_data_source.source_ref.side_effect = lambda pair: {"file": pair.source_info["file"]}
+        session_id = self.session_manager.start_session(self.sample_config, self.mock_data_source)
+
+        session_file = self.session_manager._session_dir / f"{session_id}.pkl"
+        with open(session_file, 'rb') as f:
+            session_data = pickle.load(f)
+
+        self.assertEqual(session_data['session_state'].remaining_queue, [])
+        self.assertEqual(session_data['queued_refs'], [("test1", {"file": "test1.py"}), ("test2", {"file": "test2.py"})])
+        self.assertNotIn(b"def test(): return True", session_file.read_bytes())
+        self.assertEqual(self.session_manager.get_session_info(session_id)['remaining_reviews'], 2)
+
+        # Resume and rehydrate the queue from the data source
+        self.session_manager._current_session = None
+        self.assertTrue(self.session_manager.resume_session(session_id))
+        self.assertEqual(self.session_manager.get_session_progress()['remaining_reviews'], 2)
+
+        self.session_manager.rederive_queue(self.mock_data_source)
+        session = self.session_manager._current_session
+        self.assertEqual([pair.identifier for pair in session.remaining_queue], ["test1", "test2"])
+        self.assertEqual(session.remaining_queue[1].generated_code, "print('world')")
+        self.assertEqual(session.pending_count, 0)
+
+    def test_events_are_journaled_and_replayed(self):
+        """Test that verdicts are appended to the journal and replayed on resume."""
+        self.mock_data_source.load_data.return_value = self.sample_code_pairs
+        session_id = self.session_manager.start_session(self.sample_config, self.mock_data_source)
+        session_file = self.session_manager._session_dir / f"{session_id}.pkl"
+        snapshot = session_file.read_bytes()
+
+        session = self.session_manager._current_session
+        code_pair = session.remaining_queue.pop(0)
+        session.completed_reviews.append(code_pair.identifier)
+        self.session_manager.record_event(VERDICT, code_pair)
+
+        # The snapshot is left alone; the verdict only went to the journal
+        self.assertEqual(session_file.read_bytes(), snapshot)
+        self.assertEqual(len(self.session_manager._journal.read()), 1)
+
+        self.session_manager._current_session = None
+        self.assertTrue(self.session_manager.resume_session(session_id))
+        progress = self.session_manager.get_session_progress()
+        self.assertEqual(progress['completed_reviews'], 1)
+        self.assertEqual(progress['remaining_reviews'], 1)
+        self.assertEqual(self.session_manager._queued_refs, [("test2", None)])
+
+        # Replay compacted the journal into a new snapshot
+        self.assertTrue(self.session_manager._journal.is_empty())
+        with open(session_file, 'rb') as f:
+            self.assertEqual(pickle.load(f)['journal_seq'], 1)
+
+    def test_journal_compaction(self):
+        """Test that the journal is compacted every JOURNAL_COMPACT_EVERY events."""
+        self.mock_data_source.load_data.return_value = self.sample_code_pairs
+        self.session_manager.JOURNAL_COMPACT_EVERY = 2
+        self.session_manager.start_session(self.sample_config, self.mock_data_source)
+        session = self.session_manager._current_session
+
+        with patch.object(self.session_manager, 'save_session_state',
+                          wraps=self.session_manager.save_session_state) as mock_save:
+            for code_pair in list(session.remaining_queue):
+                session.remaining_queue.remove(code_pair)
+                session.completed_reviews.append(code_pair.identifier)
+                self.session_manager.record_event(VERDICT, code_pair)
+
+        mock_save.assert_called_once()
+        self.assertTrue(self.session_manager._journal.is_empty())
 
     def test_get_review_for_pair(self):
         """Test getting review for a code pair."""
@@ -313,6 +493,32 @@ class TestSessionManagerCore(unittest.TestCase):
         self.assertEqual(info['completed_reviews'], 0)
         self.assertEqual(info['remaining_reviews'], 2)
 
+    def test_session_info_served_from_store(self):
+        """Test that listing and progress come from the session store, not the snapshot."""
+        self.mock_data_source.load_data.return_value = self.sample_code_pairs
+        session_id = self.session_manager.start_session(self.sample_config, self.mock_data_source)
+
+        session = self.session_manager._current_session
+        code_pair = session.remaining_queue.pop(0)
+        session.completed_reviews.append(code_pair.identifier)
+        self.session_manager.record_event(VERDICT, code_pair)
+
+        with patch('vaitp_auditor.session_manager.pickle.load') as mock_load:
+            self.assertEqual(self.session_manager.list_available_sessions(), [session_id])
+            info = self.session_manager.get_session_info(session_id)
+        mock_load.assert_not_called()
+        self.assertEqual(info['completed_reviews'], 1)
+        self.assertEqual(info['remaining_reviews'], 1)
+
+        # Snapshots unknown to the store are read once and registered
+        self.session_manager._session_store.delete_session(session_id)
+        self.assertEqual(self.session_manager.get_session_info(session_id)['completed_reviews'], 1)
+        self.assertIsNotNone(self.session_manager._session_store.get_session(session_id))
+
+        self.assertTrue(self.session_manager.delete_session(session_id))
+        self.assertEqual(self.session_manager.list_available_sessions(), [])
+        self.assertIsNone(self.session_manager._session_store.get_session(session_id))
+
     def test_get_session_info_nonexistent(self):
         """Test getting info for nonexistent session."""
         info = self.session_manager.get_session_info("nonexistent")
@@ -385,7 +591,7 @@ class TestSessionManagerErrorHandling(unittest.TestCase):
     def test_process_queue_with_ui_error(self):
         """Test processing queue when UI raises an error."""
         # Start a session
-        mock_data_source = Mock(spec=DataSource)
+        mock_data_source = _stream_via_load_data(Mock(spec=DataSource))
         sample_code_pairs = [
             CodePair(
                 identifier="test1",
@@ -459,7 +665,7 @@ class TestSessionResumption(unittest.TestCase):
     def test_resume_session_success(self):
         """Test successful session resumption."""
         # Create a session first
-        mock_data_source = Mock(spec=DataSource)
+        mock_data_source = _stream_via_load_data(Mock(spec=DataSource))
         mock_data_source.load_data.return_value = self.sample_code_pairs
         session_id = self.session_manager.start_session(self.sample_config, mock_data_source)
         
@@ -576,7 +782,7 @@ class TestSessionResumption(unittest.TestCase):
     def test_prompt_for_session_resumption_with_sessions(self, mock_print, mock_input):
         """Test prompting with available sessions."""
         # Create a session first
-        mock_data_source = Mock(spec=DataSource)
+        mock_data_source = _stream_via_load_data(Mock(spec=DataSource))
         mock_data_source.load_data.return_value = self.sample_code_pairs
         session_id = self.session_manager.start_session(self.sample_config, mock_data_source)
         
@@ -591,7 +797,7 @@ class TestSessionResumption(unittest.TestCase):
     def test_prompt_for_session_resumption_new_session(self, mock_print, mock_input):
         """Test prompting and choosing new session."""
         # Create a session first
-        mock_data_source = Mock(spec=DataSource)
+        mock_data_source = _stream_via_load_data(Mock(spec=DataSource))
         mock_data_source.load_data.return_value = self.sample_code_pairs
         session_id = self.session_manager.start_session(self.sample_config, mock_data_source)
         
@@ -606,7 +812,7 @@ class TestSessionResumption(unittest.TestCase):
     def test_prompt_for_session_resumption_invalid_input(self, mock_print, mock_input):
         """Test prompting with invalid user input."""
         # Create a session first
-        mock_data_source = Mock(spec=DataSource)
+        mock_data_source = _stream_via_load_data(Mock(spec=DataSource))
         mock_data_source.load_data.return_value = self.sample_code_pairs
         session_id = self.session_manager.start_session(self.sample_config, mock_data_source)
         
@@ -619,7 +825,7 @@ class TestSessionResumption(unittest.TestCase):
     def test_resume_session_with_fallback_success(self):
         """Test successful session resumption with fallback method."""
         # Create a session first
-        mock_data_source = Mock(spec=DataSource)
+        mock_data_source = _stream_via_load_data(Mock(spec=DataSource))
         mock_data_source.load_data.return_value = self.sample_code_pairs
         session_id = self.session_manager.start_session(self.sample_config, mock_data_source)
         
@@ -648,7 +854,7 @@ class TestSessionResumption(unittest.TestCase):
         # Mock user choosing to start fresh session
         mock_input.side_effect = ['1']
         
-        mock_data_source = Mock(spec=DataSource)
+        mock_data_source = _stream_via_load_data(Mock(spec=DataSource))
         success = self.session_manager.resume_session_with_fallback(session_id, mock_data_source)
         
         # Should return False (fallback used)
@@ -0,0 +1,76 @@
+"""
+Unit tests for the SQLite session store.
+"""
+
+import sqlite3
+from datetime import datetime
+
+from vaitp_auditor.core.models import SessionState
+from vaitp_auditor.session_store import SessionStore
+
+
+def _session(session_id, completed, created=datetime(2024, 1, 1, 12, 0)):
+    """Create a session state with the given completed reviews."""
+    return SessionState(
+        session_id=session_id,
+        experiment_name="exp",
+        data_source_config={'data_source_type': 'sqlite', 'db_path': '/data/reviews.db'},
+        completed_reviews=list(completed),
+        remaining_queue=[],
+        created_timestamp=created
+    )
+
+
+class TestSessionStore:
+    """Test cases for SessionStore."""
+
+    def test_save_and_summarise(self, tmp_path):
+        """Test that progress is aggregated from queue entries and verdicts."""
+        store = SessionStore(tmp_path / "sessions.db")
+        session = _session("s1", ["a", "b"])
+        store.save_session(session, [("c", {'rowid': 3}), ("d", None)], 6, datetime(2024, 1, 2))
+
+        info = store.get_session("s1")
+        assert info['completed_reviews'] == 2
+        assert info['remaining_reviews'] == 8
+        assert info['total_reviews'] == 10
+        assert info['progress_percentage'] == 20.0
+        assert info['created_timestamp'] == datetime(2024, 1, 1, 12, 0)
+        assert info['data_source_config'] == session.data_source_config
+        assert store.get_session("missing") is None
+
+        with sqlite3.connect(str(tmp_path / "sessions.db")) as connection:
+            assert connection.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        store.close()
+
+    def test_incremental_verdict_updates(self, tmp_path):
+        """Test that only the tail of the verdicts is rewritten."""
+        store = SessionStore(tmp_path / "sessions.db")
+        session = _session("s1", ["a", "b"])
+        store.save_session(session, [], 0, datetime(2024, 1, 2))
+
+        # Undo "b", then review "c"
+        session.completed_reviews.pop()
+        store.save_session(session, [("b", None)], 0, datetime(2024, 1, 3), verdicts_from=1)
+        session.completed_reviews.append("c")
+        store.save_session(session, [("b", None)], 0, datetime(2024, 1, 4), verdicts_from=1)
+
+        with sqlite3.connect(str(tmp_path / "sessions.db")) as connection:
+            rows = connection.execute("SELECT identifier FROM verdicts ORDER BY position").fetchall()
+        assert [row[0] for row in rows] == ["a", "c"]
+        assert store.get_session("s1")['remaining_reviews'] == 1
+        store.close()
+
+    def test_list_and_delete(self, tmp_path):
+        """Test listing order and cascading deletes."""
+        store = SessionStore(tmp_path / "sessions.db")
+        store.save_session(_session("old", ["a"]), [("b", None)], 0, datetime(2024, 1, 2))
+        store.save_session(_session("new", []), [("x", None)], None, datetime(2024, 2, 1))
+
+        assert [info['session_id'] for info in store.list_sessions()] == ["new", "old"]
+
+        store.delete_session("old")
+        assert [info['session_id'] for info in store.list_sessions()] == ["new"]
+        with sqlite3.connect(str(tmp_path / "sessions.db")) as connection:
+            assert connection.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0] == 0
+        store.close()
@@ -9,7 +9,7 @@ import os
 from unittest.mock import patch, MagicMock, call
 from vaitp_auditor.data_sources.sqlite import SQLiteSource
 from vaitp_auditor.data_sources.base import DataSourceError, DataSourceConnectionError
-from vaitp_auditor.core.models import CodePair
+from vaitp_auditor.core.models import CodePair, SampleSpec
 
 
 class TestSQLiteSource:
@@ -406,4 +406,265 @@ class TestSQLiteSource:
         del self.source
         
         # Connection should be closed (though we can't easily test this)
-        # This test mainly ensures no exceptions are raised during cleanup
\ No newline at end of file
+        # This test mainly ensures no exceptions are raised during cleanup
+    def create_large_test_database(self, row_count=200):
+        """Create a temporary database with many rows for sampling tests."""
+        fd, self.temp_db = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        
+        conn = sqlite3.connect(self.temp_db)
+        conn.execute("""
+            CREATE TABLE test_table (
+                id INTEGER PRIMARY KEY,
+                identifier TEXT,
+                generated_code TEXT,
+                expected_code TEXT
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO test_table (id, identifier, generated_code, expected_code) VALUES (?, ?, ?, ?)",
+            [(i, f'test_{i}', f'print({i})', f'print("expected {i}")') for i in range(1, row_count + 1)]
+        )
+        conn.commit()
+        conn.close()
+        
+        return self.temp_db
+
+    @patch('builtins.input')
+    def test_seeded_sampling_is_reproducible(self, mock_input):
+        """Test that the same seed selects the same rows in the same order."""
+        db_path = self.create_large_test_database()
+        mock_input.side_effect = [db_path, '1', '3', '4', '2']
+        self.source.configure()
+        
+        first = self.source.load_data(10, seed=1234)
+        second = self.source.load_data(10, seed=1234)
+        other = self.source.load_data(10, seed=4321)
+        
+        assert len(first) == 20
+        assert [p.identifier for p in first] == [p.identifier for p in second]
+        assert [p.identifier for p in first] != [p.identifier for p in other]
+        assert len({p.identifier for p in first}) == 20
+        assert self.source.last_sample_seed == 4321
+        
+        # Rows are fully populated from the batched rowid lookup
+        for pair in first:
+            index = pair.identifier.split('_')[1]
+            assert pair.generated_code == f'print({index})'
+            assert pair.expected_code == f'print("expected {index}")'
+
+    @patch('builtins.input')
+    def test_sampling_does_not_load_full_table(self, mock_input):
+        """Test that sampling below 100% never materialises the whole table."""
+        db_path = self.create_large_test_database()
+        mock_input.side_effect = [db_path, '1', '3', '4', '2']
+        self.source.configure()
+        self.source._fetch_batch_size = 7  # Exercise multi-batch streaming
+        
+        with patch.object(self.source, '_load_all_data') as mock_load_all:
+            code_pairs = self.source.load_data(25, seed=7)
+            mock_load_all.assert_not_called()
+        
+        assert len(code_pairs) == 50
+        assert len({p.identifier for p in code_pairs}) == 50
+
+    def test_seeded_sample_key_is_deterministic(self):
+        """Test that sample keys are stable and fit in a signed 64-bit integer."""
+        keys = [SQLiteSource._seeded_sample_key(99, rowid) for rowid in range(1, 1000)]
+        
+        assert keys == [SQLiteSource._seeded_sample_key(99, rowid) for rowid in range(1, 1000)]
+        assert all(0 <= key < 2 ** 63 for key in keys)
+        assert len(set(keys)) == len(keys)
+
+    def test_stratified_sampling_covers_every_model(self):
+        """Test that stratified sampling draws the same share from every model."""
+        fd, self.temp_db = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        conn = sqlite3.connect(self.temp_db)
+        conn.execute("CREATE TABLE results (identifier TEXT, generated_code TEXT, model TEXT)")
+        models = ['large'] * 150 + ['medium'] * 40 + ['tiny'] * 3
+        conn.executemany(
+            "INSERT INTO results VALUES (?, ?, ?)",
+            [(f'case_{i}', f'print({i})', model) for i, model in enumerate(models)]
+        )
+        conn.commit()
+        conn.close()
+        
+        self.source._db_path = self.temp_db
+        self.source._table_name = 'results'
+        self.source._identifier_column = 'identifier'
+        self.source._generated_code_column = 'generated_code'
+        self.source._model_column = 'model'
+        self.source._configured = True
+        
+        code_pairs = self.source.load_data(10, seed=42, stratify_by=('model_name',))
+        counts = {}
+        for pair in code_pairs:
+            counts[pair.source_info['model_name']] = counts.get(pair.source_info['model_name'], 0) + 1
+        assert counts == {'large': 15, 'medium': 4, 'tiny': 1}
+        
+        # Rows are the ones with the smallest seeded keys per model, in key order
+        keys = {f'case_{i}': SQLiteSource._seeded_sample_key(42, i + 1) for i in range(len(models))}
+        expected = []
+        for model, size in counts.items():
+            rows = [f'case_{i}' for i, name in enumerate(models) if name == model]
+            expected.extend(sorted(rows, key=keys.get)[:size])
+        assert [pair.identifier for pair in code_pairs] == sorted(expected, key=keys.get)
+        assert self.source.load_data(10, seed=42, stratify_by=('model_name',)) == code_pairs
+        
+        with pytest.raises(ValueError):
+            self.source.load_data(10, seed=42, stratify_by=('file_path',))
+
+    @patch('builtins.input')
+    def test_iter_pairs_fetches_rows_lazily(self, mock_input):
+        """Test that iter_pairs fetches sampled rows batch by batch."""
+        db_path = self.create_large_test_database()
+        mock_input.side_effect = [db_path, '1', '3', '4', '2']
+        self.source.configure()
+        self.source._fetch_batch_size = 5
+        
+        pairs = self.source.iter_pairs(SampleSpec(percentage=10, seed=1234))
+        with patch.object(self.source, '_row_to_code_pair', wraps=self.source._row_to_code_pair) as mock_convert:
+            first = next(pairs)
+            assert mock_convert.call_count == 1
+            assert self.source.sample_size_hint == 20
+            rest = list(pairs)
+        
+        assert [first.identifier] + [pair.identifier for pair in rest] == [
+            pair.identifier for pair in self.source.load_data(10, seed=1234)
+        ]
+
+    @patch('builtins.input')
+    def test_load_pairs_by_ref_fetches_rowids(self, mock_input):
+        """Test that sampled pairs are rehydrated from their rowids."""
+        db_path = self.create_large_test_database()
+        mock_input.side_effect = [db_path, '1', '3', '4', '2']
+        self.source.configure()
+        
+        sampled = self.source.load_data(10, seed=1234)[:5]
+        references = [(pair.identifier, self.source.source_ref(pair)) for pair in sampled]
+        assert all(reference['rowid'] is not None for _, reference in references)
+        
+        with patch.object(self.source, 'iter_pairs') as mock_iter:
+            restored = self.source.load_pairs_by_ref(list(reversed(references)))
+        
+        mock_iter.assert_not_called()
+        assert [pair.identifier for pair in restored] == [pair.identifier for pair in reversed(sampled)]
+
+    @patch('builtins.input')
+    def test_sample_one_excluding_draws_inside_sqlite(self, mock_input):
+        """Test that a replacement row is drawn without streaming the table."""
+        db_path = self.create_large_test_database(row_count=50)
+        mock_input.side_effect = [db_path, '1', '3', '4', '2']
+        self.source.configure()
+        
+        excluded = {f'test_{i}' for i in range(1, 49)}
+        with patch.object(self.source, 'iter_pairs') as mock_iter:
+            first = self.source.sample_one_excluding(excluded)
+            excluded.add(first.identifier)
+            second = self.source.sample_one_excluding(excluded)
+            excluded.add(second.identifier)
+            assert self.source.sample_one_excluding(excluded) is None
+        
+        mock_iter.assert_not_called()
+        assert {first.identifier, second.identifier} == {'test_49', 'test_50'}
+        assert self.source.source_ref(first) == {'rowid': int(first.identifier.split('_')[1])}
+
+    @patch('builtins.input')
+    def test_queries_share_a_read_only_connection(self, mock_input):
+        """Test that queries reuse one read-only connection, reopened if the file is replaced."""
+        db_path = self.create_large_test_database(row_count=20)
+        mock_input.side_effect = [db_path, '1', '3', '4', '2']
+        self.source.configure()
+        
+        conn = self.source._get_connection()
+        assert len(self.source.load_data(100)) == 20
+        assert self.source.get_filtered_count() == 20
+        assert self.source._get_connection() is conn
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            conn.execute("DELETE FROM test_table")
+        
+        # Replace the database file
+        os.replace(self.create_large_test_database(row_count=5), db_path)
+        self.temp_db = db_path
+        assert self.source._get_connection() is not conn
+        assert len(self.source.load_data(100)) == 5
+
+    def test_covering_indexes_serve_filters_and_distinct_values(self):
+        """Test that the opt-in indexes cover filtered counts and distinct listings."""
+        fd, self.temp_db = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        conn = sqlite3.connect(self.temp_db)
+        conn.execute("CREATE TABLE runs (identifier TEXT, generated_code TEXT, model TEXT, strategy TEXT)")
+        conn.executemany(
+            "INSERT INTO runs VALUES (?, ?, ?, ?)",
+            [(f'case_{i}', f'print({i})', f'model-{i % 3}', f'strategy-{i % 2}') for i in range(30)]
+        )
+        conn.commit()
+        conn.close()
+        
+        self.source._db_path = self.temp_db
+        self.source._table_name = 'runs'
+        self.source._identifier_column = 'identifier'
+        self.source._generated_code_column = 'generated_code'
+        self.source._model_column = 'model'
+        self.source._prompting_strategy_column = 'strategy'
+        
+        assert self.source.get_distinct_values(['model', 'strategy', 'missing']) == {
+            'model': ['model-0', 'model-1', 'model-2'],
+            'strategy': ['strategy-0', 'strategy-1'],
+        }
+        assert self.source.create_covering_indexes() == ['vaitp_runs_filters', 'vaitp_runs_strategy']
+        assert self.source.create_covering_indexes() == ['vaitp_runs_filters', 'vaitp_runs_strategy']
+        
+        where_clause, params = self.source._build_where_clause('model-1', 'strategy-0', require_identifier=True)
+        plan = self.source._get_connection().execute(
+            f"EXPLAIN QUERY PLAN SELECT COUNT(*) FROM runs{where_clause}", params
+        ).fetchall()
+        assert 'COVERING INDEX vaitp_runs_filters' in plan[0][3]
+        assert self.source._count_reviewable_rows('model-1', 'strategy-0') == 5
+
+    def test_statistics_are_queried_once_per_database_state(self):
+        """Test that all counts come from one cached GROUP BY query."""
+        fd, self.temp_db = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        conn = sqlite3.connect(self.temp_db)
+        conn.execute("CREATE TABLE runs (identifier TEXT, generated_code TEXT, model TEXT, strategy TEXT)")
+        conn.executemany(
+            "INSERT INTO runs VALUES (?, ?, ?, ?)",
+            [(f'case_{i}' if i % 10 else None, f'print({i})', f'model-{i % 3}', f'strategy-{i % 2}')
+             for i in range(30)]
+        )
+        conn.commit()
+        conn.close()
+        
+        def configured_source():
+            source = SQLiteSource()
+            source._db_path = self.temp_db
+            source._table_name = 'runs'
+            source._identifier_column = 'identifier'
+            source._generated_code_column = 'generated_code'
+            source._model_column = 'model'
+            source._prompting_strategy_column = 'strategy'
+            source._configured = True
+            return source
+        
+        statistics = configured_source().get_statistics()
+        assert statistics.total == 30
+        assert statistics.model_counts() == {'model-0': 10, 'model-1': 10, 'model-2': 10}
+        assert statistics.filtered_count('model-0', 'strategy-0') == 5
+        assert statistics.reviewable_count('model-0', 'strategy-0') == 4
+        
+        # Another instance reuses the cached statistics for every count
+        source = configured_source()
+        with patch.object(source, '_get_connection', side_effect=AssertionError("queried again")):
+            assert source.get_total_count() == 30
+            assert source.get_filtered_count(selected_strategy='strategy-1') == 15
+            assert source._count_reviewable_rows() == 27
+        
+        # Changing the database invalidates the cache
+        conn = sqlite3.connect(self.temp_db)
+        conn.execute("INSERT INTO runs VALUES ('case_new', 'print()', 'model-3', 'strategy-0')")
+        conn.commit()
+        conn.close()
+        assert source.get_statistics().model_counts()['model-3'] == 1
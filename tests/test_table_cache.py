@@ -0,0 +1,158 @@
+"""
+Unit tests for the columnar table cache of spreadsheet sources.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from vaitp_auditor.data_sources.excel import ExcelSource
+from vaitp_auditor.data_sources.table_cache import ColumnarTableCache
+
+
+class TestColumnarTableCache:
+    """Test cases for ColumnarTableCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.cache = ColumnarTableCache(cache_dir=self.temp_path / "cache")
+        self.csv_path = self.temp_path / "results.csv"
+        self.csv_path.write_text("id,generated\na,1\n")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    def test_roundtrip_preserves_values_and_nulls(self):
+        """Test that written chunks are read back identically."""
+        chunks = [
+            pd.DataFrame({'id': ['a', None, 'ç'], 'code': ['x = 1', '', None]}, index=range(0, 3)),
+            pd.DataFrame({'id': ['d'], 'code': ['print("ü")\n']}, index=range(3, 4)),
+        ]
+        writer = self.cache.writer(str(self.csv_path), None, ['id', 'code'])
+        for chunk in chunks:
+            writer.append(chunk)
+        assert writer.commit() is True
+
+        table = self.cache.open(str(self.csv_path), None)
+        assert table.row_count == 4
+        assert table.has_columns(['id', 'code'])
+        assert not table.has_columns(['model'])
+        assert table.count_present(['id', 'code']) == 2
+
+        read_back = list(table.iter_chunks(['code', 'id'], chunksize=3))
+        assert [len(chunk) for chunk in read_back] == [3, 1]
+        assert list(read_back[1].index) == [3]
+        assert read_back[0]['id'].tolist() == ['a', None, 'ç']
+        assert read_back[0]['code'].tolist() == ['x = 1', '', None]
+        assert read_back[1]['code'].tolist() == ['print("ü")\n']
+
+    def test_columns_are_merged_into_entry(self):
+        """Test that columns written later are added to the same table."""
+        writer = self.cache.writer(str(self.csv_path), None, ['id'])
+        writer.append(pd.DataFrame({'id': ['a', 'b']}))
+        writer.commit()
+        writer = self.cache.writer(str(self.csv_path), None, ['model'])
+        writer.append(pd.DataFrame({'model': ['m1', None]}))
+        writer.commit()
+
+        table = self.cache.open(str(self.csv_path), None)
+        assert table.has_columns(['id', 'model'])
+        entry_files = list(table.directory.glob('column-*'))
+        assert len(entry_files) == 6
+
+    def test_aborted_writer_publishes_nothing(self):
+        """Test that an aborted write leaves no entry behind."""
+        writer = self.cache.writer(str(self.csv_path), None, ['id'])
+        writer.append(pd.DataFrame({'id': ['a']}))
+        writer.abort()
+
+        assert self.cache.open(str(self.csv_path), None) is None
+        assert list(self.cache.entry_dir(str(self.csv_path), None).glob('column-*')) == []
+
+    def test_digest_is_reused_for_unchanged_file(self):
+        """Test that an unchanged file is hashed only once."""
+        first = self.cache.file_digest(str(self.csv_path))
+        with patch('vaitp_auditor.data_sources.table_cache.hashlib.sha256') as mock_sha:
+            assert self.cache.file_digest(str(self.csv_path)) == first
+        mock_sha.assert_not_called()
+
+        self.csv_path.write_text("id,generated\nb,2\n")
+        assert self.cache.file_digest(str(self.csv_path)) != first
+
+    def test_sheets_have_separate_entries(self):
+        """Test that the sheet name is part of the key."""
+        assert self.cache.entry_dir(str(self.csv_path), 'A') != self.cache.entry_dir(str(self.csv_path), 'B')
+
+
+class TestExcelSourceTableCache:
+    """Test cases for ExcelSource reading through the table cache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.xlsx_path = str(self.temp_path / "results.xlsx")
+        pd.DataFrame({
+            'id': [f'case_{i}' for i in range(12)],
+            'generated': [f'print({i})' for i in range(12)],
+            'model': [f'model-{i % 2}' for i in range(12)],
+            'log': ['noise' for _ in range(12)],
+        }).to_excel(self.xlsx_path, index=False)
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    def _source(self) -> ExcelSource:
+        source = ExcelSource()
+        source._file_path = self.xlsx_path
+        source._identifier_column = 'id'
+        source._generated_code_column = 'generated'
+        source._model_column = 'model'
+        source._chunksize = 5
+        source._configured = True
+        source.table_cache = ColumnarTableCache(cache_dir=self.temp_path / "cache")
+        return source
+
+    def test_second_load_reads_cache(self):
+        """Test that a later session does not parse the workbook again."""
+        first = self._source().load_data(100)
+
+        source = self._source()
+        with patch.object(source, '_iter_source_chunks') as mock_parse:
+            second = source.load_data(100)
+            assert source.get_total_count() == 12
+            assert source.get_distinct_values(['model']) == {'model': ['model-0', 'model-1']}
+
+        mock_parse.assert_not_called()
+        assert [pair.identifier for pair in second] == [pair.identifier for pair in first]
+        assert [pair.source_info for pair in second] == [pair.source_info for pair in first]
+
+    def test_filter_options_fill_cache_for_load(self):
+        """Test that listing filter values caches the mapped columns too."""
+        assert self._source().get_distinct_values(['model']) == {'model': ['model-0', 'model-1']}
+
+        source = self._source()
+        with patch.object(source, '_iter_source_chunks') as mock_parse:
+            code_pairs = source.load_data(100, selected_model='model-1')
+
+        mock_parse.assert_not_called()
+        assert len(code_pairs) == 6
+
+    def test_changed_file_is_parsed_again(self):
+        """Test that the cache is keyed by file content."""
+        self._source().load_data(100)
+        pd.DataFrame({
+            'id': ['new'], 'generated': ['x = 1'], 'model': ['m'], 'log': ['']
+        }).to_excel(self.xlsx_path, index=False)
+        os.utime(self.xlsx_path, ns=(0, 0))
+
+        code_pairs = self._source().load_data(100)
+
+        assert [pair.identifier for pair in code_pairs] == ['new']
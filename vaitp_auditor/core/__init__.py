@@ -2,14 +2,26 @@
 Core components for VAITP-Auditor including data models and business logic.
 """
 
-from .models import CodePair, ReviewResult, DiffLine, SessionState, SessionConfig
+from .models import (
+    CodePair, DeferredContent, ReviewResult, DiffLine, DiffResult, LineModification, SessionState, SessionConfig, SampleSpec,
+    ReviewQueue, CompletedReviews
+)
 from .differ import CodeDiffer
+from .semantic import SemanticComparison, SemanticDiffer
 
 __all__ = [
     "CodePair",
+    "DeferredContent",
     "ReviewResult", 
     "DiffLine",
+    "DiffResult",
+    "LineModification",
     "SessionState",
     "SessionConfig",
-    "CodeDiffer"
+    "SampleSpec",
+    "ReviewQueue",
+    "CompletedReviews",
+    "CodeDiffer",
+    "SemanticComparison",
+    "SemanticDiffer"
 ]
\ No newline at end of file
@@ -3,15 +3,27 @@ Code difference computation engine for the VAITP-Auditor system.
 """
 
 import difflib
-import hashlib
-from typing import List, Optional
-from .models import DiffLine
+from typing import List, Optional, Tuple
+from .line_matcher import LineMatcher
+from .models import DiffLine, DiffResult
+from .semantic import SemanticComparison, SemanticDiffer
 from ..utils.performance import (
-    get_content_cache, get_performance_monitor, 
-    performance_monitor, cached_content
+    DiffCache, content_hash, get_content_cache, get_diff_cache,
+    get_performance_monitor, performance_monitor, cached_content
 )
 
 
+def _format_unified_range(start: int, stop: int) -> str:
+    """Format a hunk range like difflib.unified_diff."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
 class CodeDiffer:
     """
     Computes differences between code snippets using difflib.SequenceMatcher.
@@ -20,33 +32,43 @@ class CodeDiffer:
     text-based unified diff format for report storage.
     """
     
-    def __init__(self):
-        """Initialize the CodeDiffer."""
+    def __init__(self, diff_cache: Optional[DiffCache] = None):
+        """
+        Initialize the CodeDiffer.
+        
+        Args:
+            diff_cache: Cache for computed diffs, shared process-wide by default.
+        """
         self._cache = get_content_cache()
         self._monitor = get_performance_monitor()
-        self._diff_cache = {}  # Local cache for diff results
+        self._diff_cache = diff_cache if diff_cache is not None else get_diff_cache()
+        self._semantic_differ = SemanticDiffer(self._diff_cache)
     
     @performance_monitor("compute_diff")
-    def compute_diff(self, expected: Optional[str], generated: str) -> List[DiffLine]:
+    def compute_diff(self, expected: Optional[str], generated: str,
+                     content_hashes: Optional[Tuple[str, str]] = None) -> DiffResult:
         """
         Compute line-by-line differences between expected and generated code.
         
         Args:
             expected: The expected (ground-truth) code, can be None
             generated: The generated code to compare against
+            content_hashes: Precomputed content_hash() of expected and generated,
+                e.g. from CodePair.content_hash(); computed here if omitted
             
         Returns:
-            List of DiffLine objects with tags: 'equal', 'add', 'remove', 'modify'
+            DiffResult reading as a sequence of DiffLine objects with tags
+            'equal', 'add', 'remove', 'modify'; it may be shared with the diff cache.
         """
         if expected is None:
             expected = ""
         
         # Generate cache key for this diff computation
-        cache_key = self._generate_diff_cache_key(expected, generated)
+        cache_key = self._generate_diff_cache_key(expected, generated, content_hashes)
         
-        # Check local cache first
-        if cache_key in self._diff_cache:
-            return self._diff_cache[cache_key]
+        cached_diff = self._diff_cache.get(cache_key)
+        if cached_diff is not None:
+            return cached_diff
         
         # Check if content is large and should be processed differently
         expected_size = len(expected.encode('utf-8'))
@@ -58,181 +80,66 @@ class CodeDiffer:
         else:
             diff_lines = self._compute_standard_diff(expected, generated)
         
-        # Cache the result (limit cache size for memory management)
-        if len(self._diff_cache) < 100:  # Limit to 100 cached diffs
-            self._diff_cache[cache_key] = diff_lines
+        self._diff_cache.put(cache_key, diff_lines, self._estimate_diff_size(diff_lines))
         
         return diff_lines
     
-    def _compute_standard_diff(self, expected: str, generated: str) -> List[DiffLine]:
+    @performance_monitor("compare_semantics")
+    def compare_semantics(self, expected: Optional[str], generated: Optional[str],
+                          content_hashes: Optional[Tuple[str, str]] = None) -> SemanticComparison:
+        """
+        Compare code semantically, ignoring formatting, comments and quote style.
+        
+        Args:
+            expected: The code compared against, can be None
+            generated: The code compared, can be None
+            content_hashes: Precomputed content_hash() of expected and generated
+            
+        Returns:
+            SemanticComparison with the equivalence verdict and the changed tokens.
+        """
+        return self._semantic_differ.compare(expected, generated, content_hashes)
+    
+    def _compute_standard_diff(self, expected: str, generated: str) -> DiffResult:
         """Compute diff for standard-sized content."""
         # Split into lines for comparison
         expected_lines = expected.splitlines(keepends=False)
         generated_lines = generated.splitlines(keepends=False)
         
-        # Use SequenceMatcher for line-by-line comparison
+        # Use SequenceMatcher for line-by-line comparison; replaced blocks are
+        # reported as removed lines followed by added lines
         matcher = difflib.SequenceMatcher(None, expected_lines, generated_lines)
-        
-        diff_lines = []
-        line_number = 1
-        
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-            if tag == 'equal':
-                # Lines are identical
-                for i in range(i1, i2):
-                    diff_lines.append(DiffLine(
-                        tag='equal',
-                        line_content=expected_lines[i],
-                        line_number=line_number
-                    ))
-                    line_number += 1
-            
-            elif tag == 'delete':
-                # Lines removed from expected
-                for i in range(i1, i2):
-                    diff_lines.append(DiffLine(
-                        tag='remove',
-                        line_content=expected_lines[i],
-                        line_number=line_number
-                    ))
-                    line_number += 1
-            
-            elif tag == 'insert':
-                # Lines added in generated
-                for j in range(j1, j2):
-                    diff_lines.append(DiffLine(
-                        tag='add',
-                        line_content=generated_lines[j],
-                        line_number=line_number
-                    ))
-                    line_number += 1
-            
-            elif tag == 'replace':
-                # Lines modified - mark both removed and added
-                # First mark the removed lines
-                for i in range(i1, i2):
-                    diff_lines.append(DiffLine(
-                        tag='remove',
-                        line_content=expected_lines[i],
-                        line_number=line_number
-                    ))
-                    line_number += 1
-                
-                # Then mark the added lines
-                for j in range(j1, j2):
-                    diff_lines.append(DiffLine(
-                        tag='add',
-                        line_content=generated_lines[j],
-                        line_number=line_number
-                    ))
-                    line_number += 1
-        
-        return diff_lines
+        return DiffResult(expected_lines, generated_lines, matcher.get_opcodes())
     
-    def _compute_large_diff(self, expected: str, generated: str) -> List[DiffLine]:
-        """Compute diff for large content using chunked processing."""
-        from ..utils.performance import get_chunked_processor
-        
-        processor = get_chunked_processor()
-        
-        # Split into lines
+    def _compute_large_diff(self, expected: str, generated: str) -> DiffResult:
+        """Compute diff for large content with the near-linear LineMatcher."""
         expected_lines = expected.splitlines(keepends=False)
         generated_lines = generated.splitlines(keepends=False)
         
-        # For very large files, use a more memory-efficient approach
-        if len(expected_lines) > 10000 or len(generated_lines) > 10000:
-            return self._compute_chunked_diff(expected_lines, generated_lines)
-        else:
-            return self._compute_standard_diff(expected, generated)
+        matcher = LineMatcher(expected_lines, generated_lines)
+        return DiffResult(expected_lines, generated_lines, matcher.get_opcodes())
     
-    def _compute_chunked_diff(self, expected_lines: List[str], generated_lines: List[str]) -> List[DiffLine]:
-        """Compute diff in chunks for very large files."""
-        # For very large files, we'll use a simplified approach
-        # that processes the files in chunks to avoid memory issues
-        
-        chunk_size = 1000  # Process 1000 lines at a time
-        diff_lines = []
-        line_number = 1
-        
-        max_lines = max(len(expected_lines), len(generated_lines))
-        
-        for start in range(0, max_lines, chunk_size):
-            end = min(start + chunk_size, max_lines)
-            
-            expected_chunk = expected_lines[start:end] if start < len(expected_lines) else []
-            generated_chunk = generated_lines[start:end] if start < len(generated_lines) else []
-            
-            # Pad shorter chunk with empty lines for comparison
-            while len(expected_chunk) < len(generated_chunk):
-                expected_chunk.append("")
-            while len(generated_chunk) < len(expected_chunk):
-                generated_chunk.append("")
-            
-            # Compare chunk
-            matcher = difflib.SequenceMatcher(None, expected_chunk, generated_chunk)
-            
-            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-                if tag == 'equal':
-                    for i in range(i1, i2):
-                        if i < len(expected_chunk) and expected_chunk[i]:
-                            diff_lines.append(DiffLine(
-                                tag='equal',
-                                line_content=expected_chunk[i],
-                                line_number=line_number + i
-                            ))
-                
-                elif tag == 'delete':
-                    for i in range(i1, i2):
-                        if i < len(expected_chunk) and expected_chunk[i]:
-                            diff_lines.append(DiffLine(
-                                tag='remove',
-                                line_content=expected_chunk[i],
-                                line_number=line_number + i
-                            ))
-                
-                elif tag == 'insert':
-                    for j in range(j1, j2):
-                        if j < len(generated_chunk) and generated_chunk[j]:
-                            diff_lines.append(DiffLine(
-                                tag='add',
-                                line_content=generated_chunk[j],
-                                line_number=line_number + j
-                            ))
-                
-                elif tag == 'replace':
-                    for i in range(i1, i2):
-                        if i < len(expected_chunk) and expected_chunk[i]:
-                            diff_lines.append(DiffLine(
-                                tag='remove',
-                                line_content=expected_chunk[i],
-                                line_number=line_number + i
-                            ))
-                    
-                    for j in range(j1, j2):
-                        if j < len(generated_chunk) and generated_chunk[j]:
-                            diff_lines.append(DiffLine(
-                                tag='add',
-                                line_content=generated_chunk[j],
-                                line_number=line_number + j
-                            ))
-            
-            line_number += len(expected_chunk)
-        
-        return diff_lines
+    def _generate_diff_cache_key(self, expected: str, generated: str,
+                                 content_hashes: Optional[Tuple[str, str]] = None) -> Tuple[str, str]:
+        """Generate a cache key for diff computation from the documents' content hashes."""
+        if content_hashes is not None:
+            return tuple(content_hashes)
+        return (content_hash(expected), content_hash(generated))
     
-    def _generate_diff_cache_key(self, expected: str, generated: str) -> str:
-        """Generate a cache key for diff computation."""
-        content = f"{expected}|||{generated}"
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+    def _estimate_diff_size(self, diff_result: DiffResult) -> int:
+        """Estimate the memory footprint of a diff in bytes."""
+        return diff_result.estimated_size()
     
     @performance_monitor("get_diff_text")
-    def get_diff_text(self, expected: Optional[str], generated: str) -> str:
+    def get_diff_text(self, expected: Optional[str], generated: str,
+                      content_hashes: Optional[Tuple[str, str]] = None) -> str:
         """
         Generate unified diff format text for report storage.
         
         Args:
             expected: The expected (ground-truth) code, can be None
             generated: The generated code to compare against
+            content_hashes: Precomputed content_hash() of expected and generated
             
         Returns:
             Unified diff format string
@@ -241,7 +148,7 @@ class CodeDiffer:
             expected = ""
         
         # Generate cache key for text diff
-        cache_key = f"text_diff_{self._generate_diff_cache_key(expected, generated)}"
+        cache_key = "text_diff_{}_{}".format(*self._generate_diff_cache_key(expected, generated, content_hashes))
         
         # Check cache
         cached_result = self._cache.get(cache_key)
@@ -257,20 +164,8 @@ class CodeDiffer:
             # For large files, create a summary diff instead of full diff
             result = self._generate_summary_diff(expected, generated)
         else:
-            # Split into lines for difflib.unified_diff
-            expected_lines = expected.splitlines(keepends=True)
-            generated_lines = generated.splitlines(keepends=True)
-            
-            # Generate unified diff
-            diff_lines = list(difflib.unified_diff(
-                expected_lines,
-                generated_lines,
-                fromfile='expected_code',
-                tofile='generated_code',
-                lineterm=''
-            ))
-            
-            result = ''.join(diff_lines)
+            # Reuse the (cached) line diff instead of matching the documents again
+            result = self._format_unified_diff(self.compute_diff(expected, generated, content_hashes))
         
         # Cache the result if it's not too large
         if len(result) < 50000:  # Don't cache very large diffs
@@ -278,6 +173,29 @@ class CodeDiffer:
         
         return result
     
+    def _format_unified_diff(self, diff_result: DiffResult, context_lines: int = 3) -> str:
+        """Format a diff result as unified diff text, like difflib.unified_diff."""
+        lines = []
+        for group in diff_result.get_grouped_opcodes(context_lines):
+            if not lines:
+                lines.extend(['--- expected_code', '+++ generated_code'])
+            
+            first, last = group[0], group[-1]
+            lines.append(
+                f"@@ -{_format_unified_range(first[1], last[2])} "
+                f"+{_format_unified_range(first[3], last[4])} @@"
+            )
+            for tag, i1, i2, j1, j2 in group:
+                if tag == 'equal':
+                    lines.extend(' ' + line for line in diff_result.expected_lines[i1:i2])
+                    continue
+                if tag in ('replace', 'delete'):
+                    lines.extend('-' + line for line in diff_result.expected_lines[i1:i2])
+                if tag in ('replace', 'insert'):
+                    lines.extend('+' + line for line in diff_result.generated_lines[j1:j2])
+        
+        return '\n'.join(lines)
+    
     def _generate_summary_diff(self, expected: str, generated: str) -> str:
         """Generate a summary diff for large files."""
         expected_lines = expected.splitlines()
@@ -318,22 +236,3 @@ class CodeDiffer:
         summary.append("=== END SUMMARY ===")
         
         return '\n'.join(summary)
-    
-    def _detect_modifications(self, expected_lines: List[str], generated_lines: List[str]) -> List[DiffLine]:
-        """
-        Helper method to detect line modifications more granularly.
-        
-        This method could be extended in the future to provide more sophisticated
-        modification detection (e.g., word-level changes within lines).
-        
-        Args:
-            expected_lines: Lines from expected code
-            generated_lines: Lines from generated code
-            
-        Returns:
-            List of DiffLine objects with 'modify' tags where appropriate
-        """
-        # For now, this is a placeholder for future enhancement
-        # The current implementation in compute_diff handles replacements
-        # as separate remove/add operations, which is sufficient for the requirements
-        return []
\ No newline at end of file
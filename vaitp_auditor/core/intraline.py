@@ -0,0 +1,192 @@
+"""
+Intra-line differences of replaced lines.
+
+A line diff reports an edited line as a removed line followed by an added
+one. ModificationDetector pairs the removed and added lines of each
+replaced block by similarity and finds the changed token spans inside each
+pair, so views can highlight exactly what changed within a line. Pairing
+work is bounded: candidates are screened with the real_quick_ratio() and
+quick_ratio() upper bounds of SequenceMatcher before ratio() is computed,
+each removed line only considers a window of upcoming added lines, and a
+diff stops pairing once it has used its comparison budget.
+"""
+
+import difflib
+import re
+from itertools import accumulate
+from typing import List, Optional, Sequence, Tuple
+
+from .models import LineModification
+
+
+# Words, whitespace runs and single punctuation characters
+_TOKEN_PATTERN = re.compile(r"\w+|\s+|[^\w\s]")
+
+Span = Tuple[int, int]
+
+
+def tokenize_line(line: str) -> List[str]:
+    """Split a line into word, whitespace and punctuation tokens."""
+    return _TOKEN_PATTERN.findall(line)
+
+
+def changed_spans(old: str, new: str) -> Tuple[List[Span], List[Span]]:
+    """
+    Find the changed text of two versions of a line at token granularity.
+    
+    Args:
+        old: Line from the expected code.
+        new: Line from the generated code.
+    
+    Returns:
+        Tuple[List[Span], List[Span]]: (start, end) character offsets of the
+        changed text in old and in new. Changes separated only by whitespace
+        are merged into one span.
+    """
+    old_tokens = tokenize_line(old)
+    new_tokens = tokenize_line(new)
+    old_offsets = [0, *accumulate(len(token) for token in old_tokens)]
+    new_offsets = [0, *accumulate(len(token) for token in new_tokens)]
+    
+    old_spans: List[Span] = []
+    new_spans: List[Span] = []
+    matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        if i1 < i2:
+            _add_span(old_spans, old, old_offsets[i1], old_offsets[i2])
+        if j1 < j2:
+            _add_span(new_spans, new, new_offsets[j1], new_offsets[j2])
+    return old_spans, new_spans
+
+
+def _add_span(spans: List[Span], line: str, start: int, end: int) -> None:
+    """Append a span, merging it with the previous one if only whitespace separates them."""
+    if spans and (spans[-1][1] == start or line[spans[-1][1]:start].isspace()):
+        spans[-1] = (spans[-1][0], end)
+    else:
+        spans.append((start, end))
+
+
+class ModificationDetector:
+    """
+    Pairs removed and added lines of replaced blocks and computes their changed spans.
+    
+    A detector holds a comparison budget per detect() call; when it runs out,
+    the remaining replaced lines are left as plain removals and additions.
+    """
+    
+    def __init__(self, cutoff: float = 0.5, window: int = 32,
+                 max_comparisons: int = 4000, max_line_length: int = 1000):
+        """
+        Initialize the detector.
+        
+        Args:
+            cutoff: Minimum similarity ratio for two lines to be paired.
+            window: Number of upcoming added lines compared with each removed line.
+            max_comparisons: Line comparisons allowed per detect() call.
+            max_line_length: Longer lines (e.g. minified code) are never paired.
+        """
+        self.cutoff = cutoff
+        self.window = window
+        self.max_comparisons = max_comparisons
+        self.max_line_length = max_line_length
+    
+    def detect(self, expected_lines: Sequence[str], generated_lines: Sequence[str],
+               opcodes: Sequence[Tuple[str, int, int, int, int]]) -> List[LineModification]:
+        """
+        Find the modified lines of a line diff.
+        
+        Args:
+            expected_lines: Lines of the expected document.
+            generated_lines: Lines of the generated document.
+            opcodes: Line opcodes of the two documents, as from SequenceMatcher.get_opcodes().
+        
+        Returns:
+            List[LineModification]: Paired lines in document order.
+        """
+        modifications = []
+        budget = self.max_comparisons
+        
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag != 'replace':
+                continue
+            if budget <= 0:
+                break
+            
+            pairs, budget = self._pair_lines(expected_lines[i1:i2], generated_lines[j1:j2], budget)
+            for i, j in pairs:
+                old_spans, new_spans = changed_spans(expected_lines[i1 + i], generated_lines[j1 + j])
+                modifications.append(LineModification(i1 + i, j1 + j, tuple(old_spans), tuple(new_spans)))
+        
+        return modifications
+    
+    def _pair_lines(self, old_lines: Sequence[str], new_lines: Sequence[str],
+                    budget: int) -> Tuple[List[Tuple[int, int]], int]:
+        """
+        Pair lines of a replaced block in order.
+        
+        Each removed line is first compared with the added line at the same
+        offset after the last pair, which is accepted if similar enough, so
+        edited blocks of unchanged length pair up line by line. Otherwise the
+        most similar line of the window is taken.
+        
+        Returns:
+            Tuple[List[Tuple[int, int]], int]: (old index, new index) pairs and the remaining budget.
+        """
+        pairs = []
+        next_old = next_new = 0
+        matcher = difflib.SequenceMatcher(None, autojunk=False)
+        
+        for old_index, old in enumerate(old_lines):
+            if budget <= 0 or next_new >= len(new_lines):
+                break
+            if not self._comparable(old):
+                continue
+            
+            # The old line is the second sequence so that its index is built once
+            matcher.set_seq2(old)
+            aligned = next_new + (old_index - next_old)
+            best_index = None
+            if aligned < len(new_lines) and self._comparable(new_lines[aligned]):
+                budget -= 1
+                if self._similarity(matcher, new_lines[aligned], self.cutoff) is not None:
+                    best_index = aligned
+            
+            best_ratio = 0.0
+            window_end = min(len(new_lines), next_new + self.window)
+            for new_index in range(next_new, window_end if best_index is None else next_new):
+                if budget <= 0:
+                    break
+                if new_index == aligned or not self._comparable(new_lines[new_index]):
+                    continue
+                
+                budget -= 1
+                ratio = self._similarity(matcher, new_lines[new_index], max(self.cutoff, best_ratio))
+                if ratio is not None and (best_index is None or ratio > best_ratio):
+                    best_ratio, best_index = ratio, new_index
+            
+            if best_index is not None:
+                pairs.append((old_index, best_index))
+                next_old, next_new = old_index + 1, best_index + 1
+        
+        return pairs, budget
+    
+    def _comparable(self, line: str) -> bool:
+        """Check whether a line can be paired; blank and overlong lines never are."""
+        return bool(line.strip()) and len(line) <= self.max_line_length
+    
+    @staticmethod
+    def _similarity(matcher: difflib.SequenceMatcher, line: str, threshold: float) -> Optional[float]:
+        """
+        Compare a line with the matcher's second sequence.
+        
+        Returns:
+            Optional[float]: The similarity ratio, or None if it is below threshold.
+        """
+        matcher.set_seq1(line)
+        if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+            return None
+        ratio = matcher.ratio()
+        return ratio if ratio >= threshold else None
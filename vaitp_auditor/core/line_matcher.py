@@ -0,0 +1,206 @@
+"""
+Line matching for large documents.
+
+difflib.SequenceMatcher is quadratic in the worst case, and its autojunk
+heuristic ignores frequent lines of inputs over 200 lines, so CodeDiffer
+matches large files with LineMatcher instead. Lines are hashed to integers
+once and the documents are aligned by patience diff: the common prefix and
+suffix of a range are trimmed, and lines occurring exactly once on both
+sides anchor the alignment through a longest increasing subsequence. A
+range without such lines is split at its least frequent common line, as in
+histogram diff, and small leftover ranges are matched with SequenceMatcher.
+"""
+
+import difflib
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+
+# Ranges with at most this many line comparisons are matched by SequenceMatcher
+SMALL_RANGE_COMPARISONS = 64 * 1024
+
+
+def _longest_increasing_anchors(anchors: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Select the longest chain of anchors increasing on both sides (patience sorting).
+    
+    Args:
+        anchors: (expected index, generated index) pairs sorted by expected index.
+    
+    Returns:
+        List[Tuple[int, int]]: The anchors of the chain in order.
+    """
+    pile_tops: List[int] = []  # Generated index on top of each pile
+    pile_anchors: List[int] = []  # Anchor on top of each pile
+    previous: List[int] = []  # Back-pointer of each anchor into the pile to its left
+    
+    for position, (_, j) in enumerate(anchors):
+        pile = bisect_left(pile_tops, j)
+        previous.append(pile_anchors[pile - 1] if pile else -1)
+        if pile == len(pile_tops):
+            pile_tops.append(j)
+            pile_anchors.append(position)
+        else:
+            pile_tops[pile] = j
+            pile_anchors[pile] = position
+    
+    chain = []
+    position = pile_anchors[-1] if pile_anchors else -1
+    while position >= 0:
+        chain.append(anchors[position])
+        position = previous[position]
+    chain.reverse()
+    return chain
+
+
+class LineMatcher:
+    """
+    Aligns two lists of lines, with the get_opcodes() interface of SequenceMatcher.
+    
+    Runs in roughly linear time for typical edits of large files and never
+    falls back to quadratic matching of more than SMALL_RANGE_COMPARISONS
+    line pairs at once.
+    """
+    
+    def __init__(self, a: Sequence[str], b: Sequence[str]):
+        """
+        Initialize the matcher.
+        
+        Args:
+            a: Lines of the expected document.
+            b: Lines of the generated document.
+        """
+        line_ids: Dict[str, int] = {}
+        self._a = [line_ids.setdefault(line, len(line_ids)) for line in a]
+        self._b = [line_ids.setdefault(line, len(line_ids)) for line in b]
+        self._matching_blocks = None
+        self._opcodes = None
+    
+    def get_matching_blocks(self) -> List[Tuple[int, int, int]]:
+        """
+        Get the matched runs of lines.
+        
+        Returns:
+            List[Tuple[int, int, int]]: (i, j, size) triples meaning
+            a[i:i + size] == b[j:j + size], increasing in i and j and ending
+            with the (len(a), len(b), 0) sentinel, like SequenceMatcher.
+        """
+        if self._matching_blocks is None:
+            blocks = sorted(self._match_ranges())
+            
+            # Merge blocks that continue each other
+            merged: List[Tuple[int, int, int]] = []
+            for i, j, size in blocks:
+                if merged and merged[-1][0] + merged[-1][2] == i and merged[-1][1] + merged[-1][2] == j:
+                    previous_i, previous_j, previous_size = merged[-1]
+                    merged[-1] = (previous_i, previous_j, previous_size + size)
+                else:
+                    merged.append((i, j, size))
+            
+            merged.append((len(self._a), len(self._b), 0))
+            self._matching_blocks = merged
+        return self._matching_blocks
+    
+    def get_opcodes(self) -> List[Tuple[str, int, int, int, int]]:
+        """
+        Get the edit operations turning a into b.
+        
+        Returns:
+            List[Tuple[str, int, int, int, int]]: Opcodes in the format of
+            SequenceMatcher.get_opcodes().
+        """
+        if self._opcodes is None:
+            opcodes = []
+            i = j = 0
+            for block_i, block_j, size in self.get_matching_blocks():
+                if i < block_i and j < block_j:
+                    opcodes.append(('replace', i, block_i, j, block_j))
+                elif i < block_i:
+                    opcodes.append(('delete', i, block_i, j, block_j))
+                elif j < block_j:
+                    opcodes.append(('insert', i, block_i, j, block_j))
+                
+                i, j = block_i + size, block_j + size
+                if size:
+                    opcodes.append(('equal', block_i, i, block_j, j))
+            self._opcodes = opcodes
+        return self._opcodes
+    
+    def _match_ranges(self) -> List[Tuple[int, int, int]]:
+        """Match the documents range by range, returning unordered (i, j, size) blocks."""
+        a, b = self._a, self._b
+        blocks: List[Tuple[int, int, int]] = []
+        ranges = [(0, len(a), 0, len(b))]
+        
+        while ranges:
+            a_lo, a_hi, b_lo, b_hi = ranges.pop()
+            
+            # Trim the common prefix and suffix
+            start = a_lo
+            while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+                a_lo += 1
+                b_lo += 1
+            if a_lo > start:
+                blocks.append((start, b_lo - (a_lo - start), a_lo - start))
+            
+            end = a_hi
+            while a_lo < a_hi and b_lo < b_hi and a[a_hi - 1] == b[b_hi - 1]:
+                a_hi -= 1
+                b_hi -= 1
+            if a_hi < end:
+                blocks.append((a_hi, b_hi, end - a_hi))
+            
+            if a_lo == a_hi or b_lo == b_hi:
+                continue
+            
+            if (a_hi - a_lo) * (b_hi - b_lo) <= SMALL_RANGE_COMPARISONS:
+                matcher = difflib.SequenceMatcher(None, a[a_lo:a_hi], b[b_lo:b_hi], autojunk=False)
+                blocks.extend(
+                    (a_lo + i, b_lo + j, size) for i, j, size in matcher.get_matching_blocks() if size
+                )
+                continue
+            
+            anchors = self._find_anchors(a_lo, a_hi, b_lo, b_hi)
+            if not anchors:
+                continue  # Nothing in common: the whole range is replaced
+            
+            # Anchors match single lines; the ranges between them are matched next
+            previous_i, previous_j = a_lo, b_lo
+            for i, j in anchors:
+                blocks.append((i, j, 1))
+                ranges.append((previous_i, i, previous_j, j))
+                previous_i, previous_j = i + 1, j + 1
+            ranges.append((previous_i, a_hi, previous_j, b_hi))
+        
+        return blocks
+    
+    def _find_anchors(self, a_lo: int, a_hi: int, b_lo: int, b_hi: int) -> List[Tuple[int, int]]:
+        """
+        Find lines to align a range on.
+        
+        Returns:
+            List[Tuple[int, int]]: Increasing (i, j) pairs of equal lines; empty
+            if the two sides of the range have no line in common.
+        """
+        a, b = self._a, self._b
+        a_counts = Counter(a[a_lo:a_hi])
+        b_counts = Counter(b[b_lo:b_hi])
+        
+        # Patience: lines occurring exactly once on each side
+        unique_in_b = {b[j]: j for j in range(b_lo, b_hi) if b_counts[b[j]] == 1}
+        anchors = [
+            (i, unique_in_b[a[i]]) for i in range(a_lo, a_hi)
+            if a_counts[a[i]] == 1 and a[i] in unique_in_b
+        ]
+        if anchors:
+            return _longest_increasing_anchors(anchors)
+        
+        # Histogram: pair the occurrences of the least frequent common line in order
+        common = [line for line in a_counts if line in b_counts]
+        if not common:
+            return []
+        rarest = min(common, key=lambda line: (a_counts[line] + b_counts[line], line))
+        a_positions = [i for i in range(a_lo, a_hi) if a[i] == rarest]
+        b_positions = [j for j in range(b_lo, b_hi) if b[j] == rarest]
+        return list(zip(a_positions, b_positions))
@@ -2,19 +2,117 @@
 Core data models for the VAITP-Auditor system.
 """
 
-from dataclasses import dataclass
+import sys
+from array import array
+from bisect import bisect_right
+from collections import Counter, deque
+from dataclasses import dataclass, replace
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from itertools import groupby
+from typing import Callable, Deque, Dict, Any, Iterable, Iterator, Optional, List, Sequence, Tuple, Union
+
+from ..utils.performance import content_hash
+
+
+class DeferredContent:
+    """
+    Code content that is only loaded when it is first accessed.
+    
+    The loader must be picklable (e.g. a small callable object holding a
+    file path) so that code pairs with unloaded content can be saved with
+    the session. Loaded content is never pickled and can be released to
+    free memory; it is reloaded on the next access.
+    """
+    
+    def __init__(self, loader: Callable[[], Optional[str]], fallback: Optional[str] = None):
+        """
+        Initialize deferred content.
+        
+        Args:
+            loader: Callable returning the content, or None if it cannot be read.
+            fallback: Value returned when the loader yields None.
+        """
+        self._loader = loader
+        self._fallback = fallback
+        self._content: Optional[str] = None
+        self._loaded = False
+    
+    def load(self) -> Optional[str]:
+        """Get the content, loading it if necessary."""
+        if not self._loaded:
+            content = self._loader()
+            self._content = content if content is not None else self._fallback
+            self._loaded = True
+        return self._content
+    
+    def release(self) -> None:
+        """Drop the loaded content; it will be reloaded on next access."""
+        self._content = None
+        self._loaded = False
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Check if the content is currently loaded."""
+        return self._loaded
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the loader only, never the loaded content."""
+        state = self.__dict__.copy()
+        state['_content'] = None
+        state['_loaded'] = False
+        return state
+
+
+class _CodeField:
+    """
+    Data descriptor for CodePair code fields that may hold DeferredContent.
+    
+    The raw value (a string, None or a DeferredContent) is kept in the
+    instance ``__dict__`` under the field name, so pickles created before
+    deferred content existed still load unchanged.
+    """
+    
+    _NO_DEFAULT = object()
+    
+    def __init__(self, default: Any = _NO_DEFAULT):
+        self._default = default
+    
+    def __set_name__(self, owner, name: str) -> None:
+        self._name = name
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            # Tells dataclasses whether the field has a default value
+            if self._default is self._NO_DEFAULT:
+                raise AttributeError(self._name)
+            return self._default
+        value = instance.__dict__.get(self._name, self._default)
+        if isinstance(value, DeferredContent):
+            return value.load()
+        return value
+    
+    def __set__(self, instance, value) -> None:
+        instance.__dict__[self._name] = value
+        instance.__dict__.get('_content_hashes', {}).pop(self._name, None)
 
 
 @dataclass
 class CodePair:
-    """Represents a pair of code snippets for comparison."""
+    """
+    Represents a pair of code snippets for comparison.
+    
+    Any of the code fields may be given as DeferredContent, in which case the
+    content is read on first access and can be dropped again with
+    release_content() once the pair has been reviewed.
+    
+    content_hash() hashes a code field once and remembers the result, so
+    diff caches can be keyed by the pair's documents without rehashing them.
+    """
     identifier: str
-    expected_code: Optional[str]
-    generated_code: str
+    expected_code: Optional[str] = _CodeField()
+    generated_code: str = _CodeField()
     source_info: Dict[str, Any]
-    input_code: Optional[str] = None  # Original input code
+    input_code: Optional[str] = _CodeField(default=None)  # Original input code
 
     def __post_init__(self):
         """Validate required fields."""
@@ -22,8 +120,47 @@ class CodePair:
             raise ValueError("identifier cannot be empty")
         # Note: generated_code can be empty - it's a valid failure case for review
     
+    def _raw_code_field(self, name: str) -> Any:
+        """Get a code field without triggering deferred loading."""
+        return self.__dict__.get(name)
+    
+    def has_deferred_content(self) -> bool:
+        """Check if any code field is backed by deferred content."""
+        return any(
+            isinstance(self._raw_code_field(name), DeferredContent)
+            for name in ('expected_code', 'generated_code', 'input_code')
+        )
+    
+    def release_content(self) -> None:
+        """Release loaded deferred content to free memory (e.g. after a verdict)."""
+        hashes = self.__dict__.get('_content_hashes', {})
+        for name in ('expected_code', 'generated_code', 'input_code'):
+            value = self._raw_code_field(name)
+            if isinstance(value, DeferredContent):
+                value.release()
+                # The content is read again on next access and may have changed
+                hashes.pop(name, None)
+    
+    def content_hash(self, name: str) -> str:
+        """
+        Get the content hash of a code field, computing it on first use.
+        
+        Args:
+            name: Code field name ('expected_code', 'generated_code' or 'input_code').
+        
+        Returns:
+            str: Hash of the field content; a missing field hashes like empty code.
+        """
+        if name not in ('expected_code', 'generated_code', 'input_code'):
+            raise ValueError(f"Unknown code field: {name}")
+        
+        hashes = self.__dict__.setdefault('_content_hashes', {})
+        if name not in hashes:
+            hashes[name] = content_hash(getattr(self, name))
+        return hashes[name]
+    
     def validate_integrity(self) -> bool:
-        """Perform comprehensive data integrity validation."""
+        """Perform comprehensive data integrity validation without loading deferred content."""
         try:
             # Check identifier format (basic alphanumeric + underscore + dash)
             if not self.identifier.replace('_', '').replace('-', '').replace('.', '').isalnum():
@@ -33,14 +170,16 @@ class CodePair:
             if not isinstance(self.source_info, dict):
                 return False
             
-            # Check code content is string or None
-            if self.expected_code is not None and not isinstance(self.expected_code, str):
+            # Check code content is string or None (deferred content is checked on load)
+            expected_code = self._raw_code_field('expected_code')
+            if expected_code is not None and not isinstance(expected_code, (str, DeferredContent)):
                 return False
             
-            if not isinstance(self.generated_code, str):
+            if not isinstance(self._raw_code_field('generated_code'), (str, DeferredContent)):
                 return False
             
-            if self.input_code is not None and not isinstance(self.input_code, str):
+            input_code = self._raw_code_field('input_code')
+            if input_code is not None and not isinstance(input_code, (str, DeferredContent)):
                 return False
                 
             return True
@@ -132,6 +271,7 @@ class DiffLine:
     tag: str  # 'equal', 'add', 'remove', 'modify'
     line_content: str
     line_number: Optional[int] = None
+    spans: Optional[Tuple[Tuple[int, int], ...]] = None  # Changed (start, end) character ranges
 
     def __post_init__(self):
         """Validate tag values."""
@@ -140,15 +280,585 @@ class DiffLine:
             raise ValueError(f"tag must be one of {valid_tags}, got '{self.tag}'")
 
 
+
+@dataclass(frozen=True)
+class LineModification:
+    """A removed line paired with the added line replacing it, with the text that changed."""
+    expected_index: int  # Line index in the expected document
+    generated_index: int  # Line index in the generated document
+    expected_spans: Tuple[Tuple[int, int], ...]  # Changed (start, end) character ranges
+    generated_spans: Tuple[Tuple[int, int], ...]
+
+
+# Source document of each output tag in a DiffResult
+_TAG_FROM_GENERATED = {'equal': False, 'remove': False, 'add': True}
+
+
+class DiffResult(Sequence[DiffLine]):
+    """
+    Line diff of two documents stored as difflib opcode ranges.
+    
+    The result keeps the split lines of both documents and the opcodes of
+    difflib.SequenceMatcher instead of one DiffLine per output line, so
+    building it costs one tuple per block of equal or changed lines and no
+    line is copied. It reads as a sequence of DiffLine (created on access)
+    in the order CodeDiffer has always produced: a replaced block lists its
+    removed lines before its added lines, and line numbers count output
+    lines from 1. iter_rows(), tag_runs() and tag_counts() read the diff
+    without creating DiffLine objects.
+    
+    get_modifications() pairs removed and added lines of replaced blocks and
+    finds the changed text inside them; it runs on first use only, and
+    line_spans() and iter_span_rows() expose its spans per output line.
+    """
+    
+    __slots__ = ('expected_lines', 'generated_lines', 'opcodes', '_segments', '_segment_starts', '_length',
+                 '_modifications', '_spans_by_line')
+    
+    def __init__(self, expected_lines: List[str], generated_lines: List[str],
+                 opcodes: Iterable[Tuple[str, int, int, int, int]]):
+        """
+        Initialize the diff result.
+        
+        Args:
+            expected_lines: Lines of the expected document.
+            generated_lines: Lines of the generated document.
+            opcodes: Opcodes as returned by SequenceMatcher.get_opcodes(); adjacent
+                opcodes with the same tag (e.g. from chunked matching) are merged.
+        """
+        self.expected_lines = expected_lines
+        self.generated_lines = generated_lines
+        
+        merged: List[Tuple[str, int, int, int, int]] = []
+        for opcode in opcodes:
+            tag, i1, i2, j1, j2 = opcode
+            if i1 == i2 and j1 == j2:
+                continue
+            if merged and merged[-1][0] == tag and tag != 'replace':
+                previous = merged[-1]
+                merged[-1] = (tag, previous[1], i2, previous[3], j2)
+            else:
+                merged.append((tag, i1, i2, j1, j2))
+        self.opcodes = merged
+        
+        # Output segments: (tag, first line, end line) in the source document of the tag
+        self._segments: List[Tuple[str, int, int]] = []
+        for tag, i1, i2, j1, j2 in merged:
+            if tag == 'equal':
+                self._segments.append(('equal', i1, i2))
+                continue
+            if i1 < i2:
+                self._segments.append(('remove', i1, i2))
+            if j1 < j2:
+                self._segments.append(('add', j1, j2))
+        
+        self._segment_starts = array('q')
+        position = 0
+        for _, start, end in self._segments:
+            self._segment_starts.append(position)
+            position += end - start
+        self._length = position
+        self._modifications: Optional[List[LineModification]] = None
+        self._spans_by_line: Dict[Tuple[str, int], Tuple[Tuple[int, int], ...]] = {}
+    
+    def _source(self, tag: str) -> List[str]:
+        """Get the document lines a segment tag refers to."""
+        return self.generated_lines if _TAG_FROM_GENERATED[tag] else self.expected_lines
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("diff line index out of range")
+        
+        segment = bisect_right(self._segment_starts, index) - 1
+        tag, start, _ = self._segments[segment]
+        line = self._source(tag)[start + index - self._segment_starts[segment]]
+        return DiffLine(tag=tag, line_content=line, line_number=index + 1)
+    
+    def __iter__(self) -> Iterator[DiffLine]:
+        for tag, line, line_number in self.iter_rows():
+            yield DiffLine(tag=tag, line_content=line, line_number=line_number)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"DiffResult({len(self)} lines, {len(self.opcodes)} opcodes)"
+    
+    def iter_rows(self) -> Iterator[Tuple[str, str, int]]:
+        """Iterate (tag, line content, line number) without creating DiffLine objects."""
+        line_number = 1
+        for tag, start, end in self._segments:
+            lines = self._source(tag)
+            for index in range(start, end):
+                yield tag, lines[index], line_number
+                line_number += 1
+    
+    def tag_runs(self) -> Iterator[Tuple[str, int, int]]:
+        """Iterate (tag, start, stop) output positions of consecutive lines sharing a tag."""
+        for (tag, start, end), position in zip(self._segments, self._segment_starts):
+            yield tag, position, position + end - start
+    
+    def tag_counts(self) -> Counter:
+        """Count the output lines of each tag."""
+        counts = Counter()
+        for tag, start, end in self._segments:
+            counts[tag] += end - start
+        return counts
+    
+    def get_modifications(self) -> List[LineModification]:
+        """Get the modified lines of replaced blocks, detecting them on first use."""
+        if self._modifications is None:
+            from .intraline import ModificationDetector
+            
+            modifications = ModificationDetector().detect(self.expected_lines, self.generated_lines, self.opcodes)
+            spans_by_line = {}
+            for modification in modifications:
+                spans_by_line[('remove', modification.expected_index)] = modification.expected_spans
+                spans_by_line[('add', modification.generated_index)] = modification.generated_spans
+            self._spans_by_line = spans_by_line
+            self._modifications = modifications
+        return self._modifications
+    
+    def line_spans(self, index: int) -> Optional[Tuple[Tuple[int, int], ...]]:
+        """Get the changed character ranges of an output line, None if it is not a modified line."""
+        self.get_modifications()
+        segment = bisect_right(self._segment_starts, index) - 1
+        tag, start, _ = self._segments[segment]
+        return self._spans_by_line.get((tag, start + index - self._segment_starts[segment]))
+    
+    def iter_span_rows(self) -> Iterator[Tuple[str, str, int, Optional[Tuple[Tuple[int, int], ...]]]]:
+        """Iterate (tag, line content, line number, changed spans or None)."""
+        self.get_modifications()
+        spans_by_line = self._spans_by_line
+        line_number = 1
+        for tag, start, end in self._segments:
+            lines = self._source(tag)
+            for index in range(start, end):
+                yield tag, lines[index], line_number, spans_by_line.get((tag, index))
+                line_number += 1
+    
+    def get_grouped_opcodes(self, context_lines: int = 3) -> Iterator[List[Tuple[str, int, int, int, int]]]:
+        """
+        Group the opcodes into hunks with up to context_lines of context.
+        
+        Equivalent to SequenceMatcher.get_grouped_opcodes() on the same documents.
+        """
+        codes = list(self.opcodes) or [('equal', 0, 1, 0, 1)]
+        if codes[0][0] == 'equal':
+            tag, i1, i2, j1, j2 = codes[0]
+            codes[0] = (tag, max(i1, i2 - context_lines), i2, max(j1, j2 - context_lines), j2)
+        if codes[-1][0] == 'equal':
+            tag, i1, i2, j1, j2 = codes[-1]
+            codes[-1] = (tag, i1, min(i2, i1 + context_lines), j1, min(j2, j1 + context_lines))
+        
+        group = []
+        for tag, i1, i2, j1, j2 in codes:
+            # End the hunk in the middle of a long run of unchanged lines
+            if tag == 'equal' and i2 - i1 > 2 * context_lines:
+                group.append((tag, i1, min(i2, i1 + context_lines), j1, min(j2, j1 + context_lines)))
+                yield group
+                group = []
+                i1, j1 = max(i1, i2 - context_lines), max(j1, j2 - context_lines)
+            group.append((tag, i1, i2, j1, j2))
+        
+        if group and not (len(group) == 1 and group[0][0] == 'equal'):
+            yield group
+    
+    def estimated_size(self) -> int:
+        """Estimate the memory held by the result, including both documents' lines, in bytes."""
+        size = sys.getsizeof(self) + self._segment_starts.buffer_info()[1] * self._segment_starts.itemsize
+        size += sys.getsizeof(self.opcodes) + sys.getsizeof(self._segments)
+        size += (len(self.opcodes) + len(self._segments)) * sys.getsizeof((None,) * 5)
+        for lines in (self.expected_lines, self.generated_lines):
+            size += sys.getsizeof(lines) + sum(map(sys.getsizeof, lines))
+        return size
+
+
+def iter_diff_rows(diff_lines: Iterable[DiffLine]) -> Iterator[Tuple[str, str, Optional[int]]]:
+    """Iterate (tag, line content, line number) of a DiffResult or a list of DiffLine."""
+    if isinstance(diff_lines, DiffResult):
+        return diff_lines.iter_rows()
+    return ((line.tag, line.line_content, line.line_number) for line in diff_lines)
+
+
+def iter_diff_span_rows(diff_lines: Iterable[DiffLine]) -> Iterator[Tuple[str, str, Optional[int], Optional[Tuple[Tuple[int, int], ...]]]]:
+    """Iterate (tag, line content, line number, changed spans) of a DiffResult or a list of DiffLine."""
+    if isinstance(diff_lines, DiffResult):
+        return diff_lines.iter_span_rows()
+    return ((line.tag, line.line_content, line.line_number, line.spans) for line in diff_lines)
+
+
+def diff_tag_runs(diff_lines: Iterable[DiffLine]) -> Iterator[Tuple[str, int, int]]:
+    """Iterate (tag, start, stop) runs of a DiffResult or a list of DiffLine."""
+    if isinstance(diff_lines, DiffResult):
+        yield from diff_lines.tag_runs()
+        return
+    
+    position = 0
+    for tag, run in groupby(line.tag for line in diff_lines):
+        length = sum(1 for _ in run)
+        yield tag, position, position + length
+        position += length
+
+
+def count_diff_tags(diff_lines: Iterable[DiffLine]) -> Counter:
+    """Count the lines of each tag in a DiffResult or a list of DiffLine."""
+    if isinstance(diff_lines, DiffResult):
+        return diff_lines.tag_counts()
+    return Counter(line.tag for line in diff_lines)
+
+
+@dataclass(frozen=True)
+class SampleSpec:
+    """
+    Describes which code pairs of a data source make up a review sample.
+    
+    Loading the same source with the same spec always yields the same pairs
+    in the same order, which lets a session be re-derived from its spec.
+    """
+    percentage: float = 100.0
+    seed: Optional[int] = None
+    stratify_by: Tuple[str, ...] = ()  # source_info fields, e.g. ('model_name',)
+    selected_model: Optional[str] = None
+    selected_strategy: Optional[str] = None
+
+    def __post_init__(self):
+        """Validate sampling values."""
+        if not (1 <= self.percentage <= 100):
+            raise ValueError("percentage must be between 1 and 100")
+        
+        valid_fields = {'model_name', 'prompting_strategy'}
+        if not set(self.stratify_by) <= valid_fields:
+            raise ValueError(f"stratify_by fields must be in {valid_fields}")
+        object.__setattr__(self, 'stratify_by', tuple(self.stratify_by))
+    
+    def with_seed(self, seed: int) -> 'SampleSpec':
+        """Get a copy of the spec using the given seed."""
+        return replace(self, seed=seed)
+
+
+class ReviewQueue:
+    """
+    Queue of code pairs awaiting review.
+    
+    A deque with an identifier index, so taking the next pair, putting a
+    pair back at the front (undo), appending a replacement and checking
+    whether an identifier is queued are all O(1), however long the queue.
+    The list operations used on remaining_queue (pop(0), insert(0, ...),
+    indexing, len, iteration, comparison with lists) keep working, with
+    pop(0) and insert(0, ...) mapped to the constant-time deque operations.
+    Only the pairs are pickled; the index is rebuilt on load.
+    """
+    
+    def __init__(self, code_pairs: Iterable[CodePair] = ()):
+        """
+        Initialize the queue.
+        
+        Args:
+            code_pairs: Initial pairs, front of the queue first.
+        """
+        self._pairs: Deque[CodePair] = deque()
+        # Slot numbers only grow at the back and shrink at the front, so the
+        # position of a pair is its slot minus the slot of the front pair
+        self._slots: Dict[str, int] = {}
+        self._counts: Dict[str, int] = {}
+        self._head = 0
+        self.extend(code_pairs)
+    
+    def _index_pair(self, code_pair: CodePair, slot: int) -> None:
+        identifier = code_pair.identifier
+        self._slots[identifier] = slot
+        self._counts[identifier] = self._counts.get(identifier, 0) + 1
+    
+    def _unindex_pair(self, code_pair: CodePair) -> None:
+        identifier = code_pair.identifier
+        count = self._counts.get(identifier, 0) - 1
+        if count > 0:
+            self._counts[identifier] = count
+        else:
+            self._counts.pop(identifier, None)
+            self._slots.pop(identifier, None)
+    
+    def _rebuild(self, code_pairs: Iterable[CodePair]) -> None:
+        """Replace the contents, rebuilding the index (O(n))."""
+        pairs = list(code_pairs)
+        self._pairs.clear()
+        self._slots.clear()
+        self._counts.clear()
+        self._head = 0
+        self.extend(pairs)
+    
+    def append(self, code_pair: CodePair) -> None:
+        """Add a pair at the back of the queue."""
+        self._index_pair(code_pair, self._head + len(self._pairs))
+        self._pairs.append(code_pair)
+    
+    def extend(self, code_pairs: Iterable[CodePair]) -> None:
+        """Add pairs at the back of the queue, in order."""
+        for code_pair in code_pairs:
+            self.append(code_pair)
+    
+    def appendleft(self, code_pair: CodePair) -> None:
+        """Put a pair at the front of the queue (e.g. after an undo)."""
+        self._head -= 1
+        self._index_pair(code_pair, self._head)
+        self._pairs.appendleft(code_pair)
+    
+    def prepend(self, code_pairs: Iterable[CodePair]) -> None:
+        """Put pairs at the front of the queue, keeping their order."""
+        for code_pair in reversed(list(code_pairs)):
+            self.appendleft(code_pair)
+    
+    def popleft(self) -> CodePair:
+        """
+        Take the pair at the front of the queue.
+        
+        Raises:
+            IndexError: If the queue is empty.
+        """
+        code_pair = self._pairs.popleft()
+        self._head += 1
+        self._unindex_pair(code_pair)
+        return code_pair
+    
+    def pop(self, index: int = -1) -> CodePair:
+        """
+        Remove and return the pair at index (list semantics).
+        
+        Popping the front or the back is O(1), any other index O(n).
+        
+        Raises:
+            IndexError: If the queue is empty or index is out of range.
+        """
+        length = len(self._pairs)
+        if index < 0:
+            index += length
+        if index == 0 and length:
+            return self.popleft()
+        if index == length - 1 and length:
+            code_pair = self._pairs.pop()
+            self._unindex_pair(code_pair)
+            return code_pair
+        if not 0 <= index < length:
+            raise IndexError("pop index out of range")
+        pairs = list(self._pairs)
+        code_pair = pairs.pop(index)
+        self._rebuild(pairs)
+        return code_pair
+    
+    def insert(self, index: int, code_pair: CodePair) -> None:
+        """Insert a pair before index (list semantics); O(1) at the front or back."""
+        length = len(self._pairs)
+        if index <= -length or index == 0:
+            self.appendleft(code_pair)
+        elif index >= length:
+            self.append(code_pair)
+        else:
+            pairs = list(self._pairs)
+            pairs.insert(index, code_pair)
+            self._rebuild(pairs)
+    
+    def remove(self, item: Union[CodePair, str]) -> None:
+        """
+        Remove the first queued occurrence of a pair or identifier.
+        
+        Raises:
+            ValueError: If it is not queued.
+        """
+        identifier = item.identifier if isinstance(item, CodePair) else item
+        if identifier not in self._counts:
+            raise ValueError(f"{identifier} is not in the review queue")
+        if self._pairs[0].identifier == identifier:
+            self.popleft()
+            return
+        pairs = list(self._pairs)
+        for index, code_pair in enumerate(pairs):
+            if code_pair.identifier == identifier:
+                del pairs[index]
+                break
+        self._rebuild(pairs)
+    
+    def clear(self) -> None:
+        """Remove all pairs."""
+        self._rebuild(())
+    
+    def peek(self) -> Optional[CodePair]:
+        """Get the pair at the front of the queue without removing it."""
+        return self._pairs[0] if self._pairs else None
+    
+    def position(self, identifier: str) -> Optional[int]:
+        """
+        Get the position of a queued identifier in O(1).
+        
+        Args:
+            identifier: Pair identifier.
+            
+        Returns:
+            Optional[int]: 0 for the front of the queue, None if not queued.
+            For duplicated identifiers, the position of the most recently
+            queued occurrence.
+        """
+        slot = self._slots.get(identifier)
+        return None if slot is None else slot - self._head
+    
+    def identifiers(self) -> List[str]:
+        """Get the queued identifiers, front of the queue first."""
+        return [code_pair.identifier for code_pair in self._pairs]
+    
+    def __contains__(self, item: Union[CodePair, str]) -> bool:
+        """Check, by identifier, whether a pair is queued."""
+        identifier = item.identifier if isinstance(item, CodePair) else item
+        return identifier in self._counts
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._pairs)[index]
+        return self._pairs[index]
+    
+    def __len__(self) -> int:
+        return len(self._pairs)
+    
+    def __iter__(self) -> Iterator[CodePair]:
+        return iter(self._pairs)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ReviewQueue):
+            return list(self._pairs) == list(other._pairs)
+        if isinstance(other, (list, tuple)):
+            return list(self._pairs) == list(other)
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"ReviewQueue({list(self._pairs)!r})"
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the pairs only."""
+        return {'pairs': list(self._pairs)}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Rebuild the index from the pickled pairs."""
+        self.__init__(state['pairs'])
+
+
+class CompletedReviews(list):
+    """
+    List of reviewed identifiers with a set index for O(1) ``in`` checks.
+    
+    Pickles as a plain list of identifiers (the index is rebuilt on load).
+    """
+    
+    def __init__(self, identifiers: Iterable[str] = ()):
+        super().__init__(identifiers)
+        self._index: Counter = Counter(self)
+    
+    def _reindex(self) -> None:
+        self._index = Counter(self)
+    
+    def __contains__(self, identifier) -> bool:
+        return self._index.get(identifier, 0) > 0
+    
+    def append(self, identifier: str) -> None:
+        super().append(identifier)
+        self._index[identifier] += 1
+    
+    def extend(self, identifiers: Iterable[str]) -> None:
+        identifiers = list(identifiers)
+        super().extend(identifiers)
+        self._index.update(identifiers)
+    
+    def insert(self, index: int, identifier: str) -> None:
+        super().insert(index, identifier)
+        self._index[identifier] += 1
+    
+    def pop(self, index: int = -1) -> str:
+        identifier = super().pop(index)
+        self._index[identifier] -= 1
+        return identifier
+    
+    def remove(self, identifier: str) -> None:
+        super().remove(identifier)
+        self._index[identifier] -= 1
+    
+    def clear(self) -> None:
+        super().clear()
+        self._index.clear()
+    
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._reindex()
+    
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._reindex()
+    
+    def __iadd__(self, identifiers):
+        self.extend(identifiers)
+        return self
+    
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+
+class _CoercedField:
+    """
+    Data descriptor converting plain lists stored in a SessionState field.
+    
+    Lists passed to the constructor or assigned later are wrapped with the
+    factory (ReviewQueue, CompletedReviews). Pickles created before these
+    types existed hold plain lists in the instance ``__dict__``; they are
+    converted on first access. Values of other types are kept as they are
+    so validate_integrity() can still reject them.
+    """
+    
+    def __init__(self, factory: Callable[[Iterable], Any]):
+        self._factory = factory
+    
+    def __set_name__(self, owner, name: str) -> None:
+        self._name = name
+    
+    def _coerce(self, value):
+        if isinstance(value, (list, tuple)) and not isinstance(value, self._factory):
+            return self._factory(value)
+        return value
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            # No default value for dataclasses
+            raise AttributeError(self._name)
+        value = instance.__dict__[self._name]
+        coerced = self._coerce(value)
+        if coerced is not value:
+            instance.__dict__[self._name] = coerced
+        return coerced
+    
+    def __set__(self, instance, value) -> None:
+        instance.__dict__[self._name] = self._coerce(value)
+
+
 @dataclass
 class SessionState:
     """Represents the current state of a review session."""
     session_id: str
     experiment_name: str
     data_source_config: Dict[str, Any]
-    completed_reviews: List[str]
-    remaining_queue: List[CodePair]
+    completed_reviews: List[str] = _CoercedField(CompletedReviews)
+    remaining_queue: ReviewQueue = _CoercedField(ReviewQueue)
     created_timestamp: datetime
+    sample_spec: Optional[SampleSpec] = None  # Seeded spec the queue was drawn with
+    pending_count: Optional[int] = 0  # Sampled pairs not yet pulled into remaining_queue, None if unknown
 
     def __post_init__(self):
         """Validate required fields."""
@@ -169,7 +879,7 @@ class SessionState:
                 return False
             if not isinstance(self.completed_reviews, list):
                 return False
-            if not isinstance(self.remaining_queue, list):
+            if not isinstance(self.remaining_queue, ReviewQueue):
                 return False
             if not isinstance(self.created_timestamp, datetime):
                 return False
@@ -182,13 +892,27 @@ class SessionState:
             if not all(isinstance(pair, CodePair) for pair in self.remaining_queue):
                 return False
             
+            if self.sample_spec is not None and not isinstance(self.sample_spec, SampleSpec):
+                return False
+            
+            if self.pending_count is not None and (not isinstance(self.pending_count, int) or self.pending_count < 0):
+                return False
+            
             return True
         except Exception:
             return False
     
+    def is_completed(self, identifier: str) -> bool:
+        """Check if a pair has already been reviewed (O(1))."""
+        return identifier in self.completed_reviews
+    
+    def get_remaining_count(self) -> int:
+        """Get number of remaining reviews, including pairs not yet queued."""
+        return len(self.remaining_queue) + (self.pending_count or 0)
+    
     def get_total_reviews(self) -> int:
         """Get total number of reviews (completed + remaining)."""
-        return len(self.completed_reviews) + len(self.remaining_queue)
+        return len(self.completed_reviews) + self.get_remaining_count()
     
     def get_progress_percentage(self) -> float:
         """Get completion percentage."""
@@ -208,6 +932,8 @@ class SessionConfig:
     output_format: str  # 'excel', 'csv'
     selected_model: Optional[str] = None  # Optional model filtering
     selected_strategy: Optional[str] = None  # Optional prompting strategy filtering
+    sample_seed: Optional[int] = None  # Reproduce an earlier sample; drawn at random if omitted
+    stratify_by: Tuple[str, ...] = ()  # Sample each model/strategy separately
 
     def __post_init__(self):
         """Validate configuration values."""
@@ -223,4 +949,14 @@ class SessionConfig:
         
         valid_output_formats = {'excel', 'csv'}
         if self.output_format not in valid_output_formats:
-            raise ValueError(f"output_format must be one of {valid_output_formats}")
\ No newline at end of file
+            raise ValueError(f"output_format must be one of {valid_output_formats}")
+    
+    def to_sample_spec(self) -> SampleSpec:
+        """Get the sample spec described by this configuration."""
+        return SampleSpec(
+            percentage=self.sample_percentage,
+            seed=self.sample_seed,
+            stratify_by=tuple(self.stratify_by),
+            selected_model=self.selected_model,
+            selected_strategy=self.selected_strategy
+        )
\ No newline at end of file
@@ -0,0 +1,262 @@
+"""
+Semantic comparison of code for the VAITP-Auditor system.
+
+Line diffs report every reformatted line, requoted string and edited comment
+as a change, while reviewers mostly need to know whether the code behaves
+differently. SemanticDiffer compares normalized token streams instead:
+comments, blank lines and layout are dropped, statement separators and
+indentation are reduced to markers, and string and number literals are
+compared by value. Python code that parses on both sides is compared by its
+abstract syntax tree. Fingerprints and comparisons are cached per content
+hash in the diff cache.
+"""
+
+import ast
+import io
+import re
+import tokenize
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .line_matcher import LineMatcher
+from ..utils.performance import DiffCache, content_hash, get_diff_cache
+
+
+# (line, column) with 0-based lines, as displayed in the code panels
+Position = Tuple[int, int]
+
+# Token opcode in the format of SequenceMatcher.get_opcodes()
+TokenOpcode = Tuple[str, int, int, int, int]
+
+# Python tokens without meaning: comments, line continuations and blank lines
+_IGNORED_TOKEN_TYPES = {tokenize.COMMENT, tokenize.NL, tokenize.ENCODING, tokenize.ENDMARKER}
+
+# Tokens of code Python cannot tokenize: quoted strings, words and single symbols
+_GENERIC_TOKEN_PATTERN = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|\w+|\S')
+
+STATEMENT_END = ';'
+INDENT = '<indent>'
+DEDENT = '<dedent>'
+
+
+@dataclass(frozen=True)
+class SemanticToken:
+    """A token of code with its normalized text and its place in the code."""
+    text: str  # Normalized text compared between versions
+    start: Position
+    end: Position
+
+
+@dataclass(frozen=True)
+class SemanticFingerprint:
+    """Normalized form of a piece of code."""
+    tokens: Tuple[SemanticToken, ...]
+    syntax_tree: Optional[str] = None  # ast.dump() of Python code that parses
+    
+    def estimated_size(self) -> int:
+        """Estimate the memory footprint of the fingerprint in bytes."""
+        return 64 + 160 * len(self.tokens) + len(self.syntax_tree or "")
+
+
+@dataclass(frozen=True)
+class SemanticComparison:
+    """Result of comparing two pieces of code semantically."""
+    equivalent: bool
+    method: str  # 'ast' if both sides parse as Python, 'tokens' otherwise
+    expected_tokens: Tuple[SemanticToken, ...]
+    generated_tokens: Tuple[SemanticToken, ...]
+    changes: Tuple[TokenOpcode, ...]  # Non-equal token opcodes; empty if equivalent
+    
+    def changed_lines(self) -> Tuple[List[int], List[int]]:
+        """
+        Get the lines holding changed tokens.
+        
+        Returns:
+            Tuple[List[int], List[int]]: Sorted 0-based line numbers in the
+            expected and in the generated code.
+        """
+        expected_lines = set()
+        generated_lines = set()
+        for _, i1, i2, j1, j2 in self.changes:
+            for token in self.expected_tokens[i1:i2]:
+                expected_lines.update(range(token.start[0], token.end[0] + 1))
+            for token in self.generated_tokens[j1:j2]:
+                generated_lines.update(range(token.start[0], token.end[0] + 1))
+        return sorted(expected_lines), sorted(generated_lines)
+    
+    def estimated_size(self) -> int:
+        """Estimate the memory footprint of the comparison in bytes."""
+        return 64 + 160 * (len(self.expected_tokens) + len(self.generated_tokens)) + 80 * len(self.changes)
+
+
+def _literal_text(source: str) -> str:
+    """Normalize a string or number literal to the repr() of its value."""
+    try:
+        return repr(ast.literal_eval(source))
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        # f-strings and other literals that are not constants are kept as written
+        return source
+
+
+def _python_tokens(code: str) -> List[SemanticToken]:
+    """Tokenize Python code, raising tokenize.TokenError or SyntaxError if it cannot be tokenized."""
+    tokens: List[SemanticToken] = []
+    for token in tokenize.generate_tokens(io.StringIO(code).readline):
+        if token.type in _IGNORED_TOKEN_TYPES:
+            continue
+        
+        if token.type == tokenize.NEWLINE or (token.type == tokenize.OP and token.string == ';'):
+            # 'a; b' is the same as two lines; a trailing ';' adds nothing
+            if not tokens or tokens[-1].text == STATEMENT_END:
+                continue
+            text = STATEMENT_END
+        elif token.type == tokenize.INDENT:
+            text = INDENT
+        elif token.type == tokenize.DEDENT:
+            text = DEDENT
+        elif token.type in (tokenize.STRING, tokenize.NUMBER):
+            text = _literal_text(token.string)
+        else:
+            text = token.string
+        
+        start_line, start_column = token.start
+        end_line, end_column = token.end
+        tokens.append(SemanticToken(text, (start_line - 1, start_column), (end_line - 1, end_column)))
+    return tokens
+
+
+def _generic_tokens(code: str) -> List[SemanticToken]:
+    """Tokenize code of any language into words, quoted strings and symbols."""
+    tokens: List[SemanticToken] = []
+    for line_number, line in enumerate(code.split('\n')):
+        for match in _GENERIC_TOKEN_PATTERN.finditer(line):
+            text = match.group()
+            if text[0] == "'" and len(text) > 1:
+                text = f'"{text[1:-1]}"'
+            tokens.append(SemanticToken(text, (line_number, match.start()), (line_number, match.end())))
+    return tokens
+
+
+def compute_fingerprint(code: str) -> SemanticFingerprint:
+    """
+    Compute the normalized form of code.
+    
+    Args:
+        code: Code to normalize.
+    
+    Returns:
+        SemanticFingerprint: Python tokens of the code, and its syntax tree if
+        it parses; generic tokens if Python cannot tokenize it.
+    """
+    try:
+        tokens = _python_tokens(code)
+    except (tokenize.TokenError, SyntaxError):
+        return SemanticFingerprint(tuple(_generic_tokens(code)))
+    
+    try:
+        syntax_tree = ast.dump(ast.parse(code))
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        syntax_tree = None
+    return SemanticFingerprint(tuple(tokens), syntax_tree)
+
+
+class SemanticDiffer:
+    """
+    Compares code by meaning rather than by layout.
+    
+    Differences in formatting, comments and quote style are ignored; what
+    remains is reported as changed tokens.
+    """
+    
+    def __init__(self, diff_cache: Optional[DiffCache] = None):
+        """
+        Initialize the SemanticDiffer.
+        
+        Args:
+            diff_cache: Cache for fingerprints and comparisons, shared process-wide by default.
+        """
+        self._diff_cache = diff_cache if diff_cache is not None else get_diff_cache()
+    
+    def fingerprint(self, code: Optional[str], code_hash: Optional[str] = None) -> SemanticFingerprint:
+        """
+        Get the normalized form of code.
+        
+        Args:
+            code: Code to normalize, can be None
+            code_hash: Precomputed content_hash() of the code
+        
+        Returns:
+            SemanticFingerprint: Fingerprint of the code, possibly from the cache.
+        """
+        code = code or ""
+        cache_key = ('semantic', code_hash or content_hash(code))
+        
+        fingerprint = self._diff_cache.get(cache_key)
+        if fingerprint is None:
+            fingerprint = compute_fingerprint(code)
+            self._diff_cache.put(cache_key, fingerprint, fingerprint.estimated_size())
+        return fingerprint
+    
+    def compare(self, expected: Optional[str], generated: Optional[str],
+                content_hashes: Optional[Tuple[str, str]] = None) -> SemanticComparison:
+        """
+        Compare two pieces of code semantically.
+        
+        Args:
+            expected: The code compared against, can be None
+            generated: The code compared, can be None
+            content_hashes: Precomputed content_hash() of both pieces of code,
+                e.g. from CodePair.content_hash(); computed here if omitted
+        
+        Returns:
+            SemanticComparison: Whether the code is equivalent, and its changed tokens.
+        """
+        if content_hashes is None:
+            content_hashes = (content_hash(expected or ""), content_hash(generated or ""))
+        cache_key = ('semantic_diff', *content_hashes)
+        
+        comparison = self._diff_cache.get(cache_key)
+        if comparison is not None:
+            return comparison
+        
+        expected_print = self.fingerprint(expected, content_hashes[0])
+        generated_print = self.fingerprint(generated, content_hashes[1])
+        expected_texts = [token.text for token in expected_print.tokens]
+        generated_texts = [token.text for token in generated_print.tokens]
+        
+        if expected_print.syntax_tree is not None and generated_print.syntax_tree is not None:
+            method = 'ast'
+            equivalent = expected_print.syntax_tree == generated_print.syntax_tree
+        else:
+            method = 'tokens'
+            equivalent = expected_texts == generated_texts
+        
+        changes: Tuple[TokenOpcode, ...] = ()
+        if not equivalent:
+            opcodes = LineMatcher(expected_texts, generated_texts).get_opcodes()
+            changes = tuple(opcode for opcode in opcodes if opcode[0] != 'equal')
+        
+        comparison = SemanticComparison(
+            equivalent, method, expected_print.tokens, generated_print.tokens, changes
+        )
+        self._diff_cache.put(cache_key, comparison, comparison.estimated_size())
+        return comparison
+    
+    def generated_matches_input(self, code_pair) -> bool:
+        """
+        Check whether the generated code of a pair is semantically identical to its input code.
+        
+        Such pairs are candidates for the 'Failure - No Change' verdict.
+        
+        Args:
+            code_pair: CodePair to check.
+        
+        Returns:
+            bool: True if the pair has input code and generated code and both are equivalent.
+        """
+        if not code_pair.input_code or not code_pair.generated_code:
+            return False
+        return self.compare(
+            code_pair.input_code, code_pair.generated_code,
+            content_hashes=(code_pair.content_hash('input_code'), code_pair.content_hash('generated_code'))
+        ).equivalent
@@ -4,6 +4,8 @@ Data source implementations for loading code pairs from various sources.
 
 from .base import DataSource, DataSourceError, DataSourceConfigurationError, DataSourceConnectionError, DataSourceValidationError
 from .filesystem import FileSystemSource
+from .directory_index import DirectoryIndexCache
+from .table_cache import ColumnarTableCache
 from .sqlite import SQLiteSource
 from .excel import ExcelSource
 from .factory import DataSourceFactory
@@ -15,6 +17,8 @@ __all__ = [
     "DataSourceConnectionError",
     "DataSourceValidationError",
     "FileSystemSource",
+    "DirectoryIndexCache",
+    "ColumnarTableCache",
     "SQLiteSource",
     "ExcelSource",
     "DataSourceFactory"
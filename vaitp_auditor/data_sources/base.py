@@ -3,10 +3,10 @@ Abstract base class for data source implementations.
 """
 
 import logging
-import random
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
-from ..core.models import CodePair
+from typing import Collection, Iterable, Iterator, List, Optional, Dict, Any, Sequence, Tuple
+from ..core.models import CodePair, SampleSpec
+from .sampling import STRATIFY_FIELDS, new_seed, reservoir_sample, select_sample, stratum_of
 
 
 class DataSourceError(Exception):
@@ -42,6 +42,8 @@ class DataSource(ABC):
         self._configured = False
         self._logger = logging.getLogger(self.__class__.__name__)
         self._total_count: Optional[int] = None
+        self._last_sample_seed: Optional[int] = None
+        self._sample_size_hint: Optional[int] = None
 
     @abstractmethod
     def configure(self) -> bool:
@@ -58,6 +60,12 @@ class DataSource(ABC):
         """
         Load code pairs from the configured source.
         
+        Implementations accept the optional keyword arguments seed and
+        stratify_by: the same seed always selects the same code pairs in the
+        same order, and stratify_by samples each model and/or prompting
+        strategy separately (see _sample_data). Sources that can produce
+        pairs on demand implement iter_pairs() and collect it here.
+        
         Args:
             sample_percentage: Percentage of data to sample (1-100).
             
@@ -70,6 +78,135 @@ class DataSource(ABC):
         """
         pass
 
+    def iter_pairs(self, sample_spec: SampleSpec) -> Iterator[CodePair]:
+        """
+        Iterate over the code pairs of a sample.
+        
+        Pairs are produced as the iterator advances, so consumers can hold a
+        bounded window instead of the whole sample. Once the first pair has
+        been requested, sample_size_hint tells how many pairs to expect.
+        
+        The default implementation delegates to load_data() for sources that
+        only provide the list API.
+        
+        Args:
+            sample_spec: Sample to iterate over.
+            
+        Returns:
+            Iterator[CodePair]: Code pairs in sample order.
+            
+        Raises:
+            RuntimeError: If data source is not properly configured.
+        """
+        filters = {}
+        if sample_spec.selected_model:
+            filters['selected_model'] = sample_spec.selected_model
+        if sample_spec.selected_strategy:
+            filters['selected_strategy'] = sample_spec.selected_strategy
+        
+        code_pairs = self.load_data(sample_spec.percentage, seed=sample_spec.seed,
+                                    stratify_by=sample_spec.stratify_by, **filters)
+        self._sample_size_hint = len(code_pairs)
+        return iter(code_pairs)
+
+    def source_ref(self, code_pair: CodePair) -> Optional[Dict[str, Any]]:
+        """
+        Get a small reference locating a code pair in this source.
+        
+        Session snapshots store these references instead of the code, and
+        load_pairs_by_ref() turns them back into code pairs on resume.
+        
+        Args:
+            code_pair: Code pair produced by this source.
+            
+        Returns:
+            Optional[Dict[str, Any]]: Reference (e.g. file paths or a rowid),
+            or None if the pair can only be found again by its identifier.
+        """
+        return None
+
+    def load_pairs_by_ref(self, references: Sequence[Tuple[str, Optional[Dict[str, Any]]]],
+                          sample_spec: Optional[SampleSpec] = None) -> List[CodePair]:
+        """
+        Rehydrate code pairs from (identifier, source_ref) references.
+        
+        Pairs are loaded directly from their references where the source
+        supports it; the others are looked up by identifier while
+        re-streaming the sample described by sample_spec.
+        
+        Args:
+            references: Identifiers and source references, in queue order.
+            sample_spec: Sample the pairs were drawn from.
+            
+        Returns:
+            List[CodePair]: Found code pairs in reference order; pairs that no
+            longer exist in the source are left out.
+        """
+        self._validate_configured()
+        
+        found = self._load_referenced_pairs([ref for _, ref in references if ref])
+        missing = {identifier for identifier, _ in references if identifier not in found}
+        if missing and sample_spec is not None:
+            for code_pair in self.iter_pairs(sample_spec):
+                if code_pair.identifier in missing:
+                    found[code_pair.identifier] = code_pair
+                    missing.discard(code_pair.identifier)
+                    if not missing:
+                        break
+        
+        if missing:
+            self._logger.warning(f"{len(missing)} referenced code pair(s) could not be found in the data source")
+        return [found[identifier] for identifier, _ in references if identifier in found]
+
+    def _load_referenced_pairs(self, references: List[Dict[str, Any]]) -> Dict[str, CodePair]:
+        """
+        Load code pairs directly from source references.
+        
+        Args:
+            references: References returned by source_ref().
+            
+        Returns:
+            Dict[str, CodePair]: Loaded code pairs by identifier.
+        """
+        return {}
+
+    def sample_one_excluding(self, excluded_ids: Collection[str],
+                             sample_spec: Optional[SampleSpec] = None) -> Optional[CodePair]:
+        """
+        Draw one random code pair whose identifier is not excluded.
+        
+        Used to replace a code pair that was dropped from a review (e.g.
+        flagged as vulnerable). Only the model and strategy filters of
+        sample_spec apply; the pair is drawn from the whole filtered source.
+        
+        The default implementation streams every pair once through a
+        single-item reservoir; sources that can locate pairs without loading
+        them override it.
+        
+        Args:
+            excluded_ids: Identifiers that must not be drawn (reviewed,
+                queued or flagged pairs).
+            sample_spec: Optional sample whose filters restrict the draw.
+        
+        Returns:
+            Optional[CodePair]: Drawn code pair, or None if every pair is excluded.
+        
+        Raises:
+            RuntimeError: If data source is not properly configured.
+        """
+        self._validate_configured()
+        
+        spec = SampleSpec(
+            percentage=100.0,
+            selected_model=sample_spec.selected_model if sample_spec else None,
+            selected_strategy=sample_spec.selected_strategy if sample_spec else None
+        )
+        candidates = (
+            code_pair for code_pair in self.iter_pairs(spec) if code_pair.identifier not in excluded_ids
+        )
+        drawn = reservoir_sample(candidates, 1, new_seed())
+        return drawn[0] if drawn else None
+
     @abstractmethod
     def get_total_count(self) -> int:
         """
@@ -109,13 +246,83 @@ class DataSource(ABC):
         if not self._configured:
             raise RuntimeError(f"{self.__class__.__name__} is not properly configured")
 
-    def _sample_data(self, data: List[CodePair], sample_percentage: float) -> List[CodePair]:
+    def _build_sample_spec(self, sample_percentage: float, seed: Optional[int] = None,
+                           stratify_by: Sequence[str] = (), selected_model: Optional[str] = None,
+                           selected_strategy: Optional[str] = None) -> SampleSpec:
+        """
+        Validate load_data() arguments and turn them into a sample spec.
+        
+        Args:
+            sample_percentage: Percentage of data to sample (1-100).
+            seed: Optional sampling seed.
+            stratify_by: Optional source_info fields to stratify by.
+            selected_model: Optional specific model to filter by.
+            selected_strategy: Optional specific prompting strategy to filter by.
+            
+        Returns:
+            SampleSpec: Spec to pass to iter_pairs().
+            
+        Raises:
+            ValueError: If sample_percentage or stratify_by is invalid.
+            RuntimeError: If data source is not configured.
+        """
+        self._validate_configured()
+        self._validate_sample_percentage(sample_percentage)
+        self._validate_stratify_by(stratify_by)
+        return SampleSpec(
+            percentage=sample_percentage,
+            seed=seed,
+            stratify_by=tuple(stratify_by),
+            selected_model=selected_model,
+            selected_strategy=selected_strategy
+        )
+
+    def _validate_stratify_by(self, stratify_by: Sequence[str]) -> None:
+        """
+        Validate the fields a sample is stratified by.
+        
+        Args:
+            stratify_by: source_info fields to validate.
+            
+        Raises:
+            ValueError: If a field cannot be stratified by.
+        """
+        unknown = [field for field in stratify_by if field not in STRATIFY_FIELDS]
+        if unknown:
+            raise ValueError(f"Cannot stratify by {unknown}; supported fields are {list(STRATIFY_FIELDS)}")
+
+    def _resolve_seed(self, seed: Optional[int]) -> int:
+        """
+        Get the seed of a sampling run, drawing a new one if none was given.
+        
+        The seed is remembered in last_sample_seed so that callers can store
+        it and reproduce the sample later.
+        
+        Args:
+            seed: Requested seed, or None.
+            
+        Returns:
+            int: Seed to sample with.
+        """
+        if seed is None:
+            seed = new_seed()
+        self._last_sample_seed = seed
+        return seed
+
+    def _sample_data(self, data: List[CodePair], sample_percentage: float,
+                     seed: Optional[int] = None, stratify_by: Sequence[str] = ()) -> List[CodePair]:
         """
         Sample data based on the given percentage.
         
+        Every item is ranked by a key derived from the seed and its position,
+        and the items with the smallest keys are returned in key order.
+        
         Args:
             data: List of code pairs to sample from.
             sample_percentage: Percentage of data to sample (1-100).
+            seed: Optional sampling seed; a random seed is used if omitted.
+            stratify_by: Optional source_info fields; each combination of
+                their values is sampled separately.
             
         Returns:
             List[CodePair]: Sampled code pairs.
@@ -124,18 +331,31 @@ class DataSource(ABC):
             self._logger.debug(f"No sampling needed (100% requested): returning all {len(data)} items")
             return data
         
-        sample_size = max(1, int(len(data) * sample_percentage / 100))
-        self._logger.debug(f"Sampling {sample_percentage}% of {len(data)} items: "
-                          f"calculated sample_size = {sample_size}")
-        
-        if sample_size >= len(data):
-            self._logger.debug(f"Sample size ({sample_size}) >= data size ({len(data)}), returning all data")
-            return data
+        self._validate_stratify_by(stratify_by)
+        seed = self._resolve_seed(seed)
+        stratum = (lambda code_pair: stratum_of(code_pair, stratify_by)) if stratify_by else None
         
-        sampled_data = random.sample(data, sample_size)
-        self._logger.debug(f"Random sampling completed: selected {len(sampled_data)} items")
+        sampled_data = select_sample(data, sample_percentage, seed, stratum)
+        self._logger.debug(f"Sampled {len(sampled_data)} of {len(data)} items ({sample_percentage}%) "
+                          f"with seed {seed}" + (f", stratified by {list(stratify_by)}" if stratify_by else ""))
         return sampled_data
 
+    def _reservoir_sample(self, code_pairs: Iterable[CodePair], sample_size: int,
+                          seed: Optional[int] = None) -> List[CodePair]:
+        """
+        Sample a fixed number of code pairs from a stream in a single pass.
+        
+        Args:
+            code_pairs: Code pairs to sample from, e.g. a generator.
+            sample_size: Number of code pairs to keep.
+            seed: Optional sampling seed; a random seed is used if omitted.
+            
+        Returns:
+            List[CodePair]: Sampled code pairs, identical to what _sample_data
+            selects from the same pairs in list form.
+        """
+        return reservoir_sample(code_pairs, sample_size, self._resolve_seed(seed))
+
     def _handle_encoding_error(self, file_path: str, error: UnicodeError) -> Optional[str]:
         """
         Handle encoding errors with fallback strategy.
@@ -188,4 +408,14 @@ class DataSource(ABC):
     @property
     def is_configured(self) -> bool:
         """Check if the data source is configured."""
-        return self._configured
\ No newline at end of file
+        return self._configured
+
+    @property
+    def last_sample_seed(self) -> Optional[int]:
+        """Seed used by the most recent sampled load_data() call, if any."""
+        return self._last_sample_seed
+
+    @property
+    def sample_size_hint(self) -> Optional[int]:
+        """Number of code pairs the current iter_pairs() sample holds, once known."""
+        return self._sample_size_hint
\ No newline at end of file
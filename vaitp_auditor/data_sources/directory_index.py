@@ -0,0 +1,238 @@
+"""
+Persistent directory index for folder-based data sources.
+
+Scanning large experiment folders is dominated by directory listings. The
+index stores, per set of root folders, the listing of every directory
+together with its mtime, so later scans only list directories whose mtime
+changed and reuse the stored file entries (name, size, mtime) for the rest.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.logging_config import get_logger
+
+
+# Directory mtimes closer than this to the previous scan are not trusted,
+# since a change within the same timestamp tick would leave them unchanged.
+MTIME_GRANULARITY_NS = 2 * 1_000_000_000
+
+# Per directory: {"mtime_ns": int, "files": [[name, size, mtime_ns], ...], "subdirs": [name, ...]}
+DirectoryTree = Dict[str, Dict[str, Any]]
+
+
+def scan_directory_tree(root: Path,
+                        file_filter: Callable[[str], bool],
+                        previous: Optional[DirectoryTree] = None,
+                        trusted_before_ns: Optional[int] = None) -> Tuple[DirectoryTree, bool]:
+    """
+    Walk a folder with os.scandir, reusing unchanged directories from a previous walk.
+
+    Every directory is stat'ed, but only directories whose mtime differs from
+    the previous walk (or is too recent to be trusted) are listed again.
+    Symlinked directories are not followed.
+
+    Args:
+        root: Folder to walk.
+        file_filter: Predicate on file names selecting the files to record.
+        previous: Tree returned by an earlier call for the same root.
+        trusted_before_ns: Directory mtimes at or after this timestamp are
+            always listed again. Required for the previous tree to be reused.
+
+    Returns:
+        Tuple[DirectoryTree, bool]: The tree keyed by relative directory path
+        ('' for the root) and whether any directory was listed again.
+    """
+    previous = previous or {}
+    tree: DirectoryTree = {}
+    rescanned = False
+    pending = ['']
+
+    while pending:
+        relative_dir = pending.pop()
+        directory = os.path.join(root, relative_dir) if relative_dir else str(root)
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            rescanned = True
+            continue
+
+        entry = previous.get(relative_dir)
+        if (entry is None or trusted_before_ns is None or entry['mtime_ns'] != mtime_ns
+                or mtime_ns >= trusted_before_ns):
+            entry = _list_directory(directory, mtime_ns, file_filter)
+            rescanned = True
+
+        tree[relative_dir] = entry
+        pending.extend(os.path.join(relative_dir, name) if relative_dir else name
+                       for name in entry['subdirs'])
+
+    return tree, rescanned
+
+
+def _list_directory(directory: str, mtime_ns: int, file_filter: Callable[[str], bool]) -> Dict[str, Any]:
+    """List a single directory into a tree entry."""
+    logger = get_logger('directory_index')
+    files = []
+    subdirs = []
+
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif entry.is_file() and file_filter(entry.name):
+                        stat_result = entry.stat()
+                        files.append([entry.name, stat_result.st_size, stat_result.st_mtime_ns])
+                except OSError as e:
+                    logger.warning(f"Skipping {entry.path}: {e}")
+    except OSError as e:
+        logger.warning(f"Cannot scan directory {directory}: {e}")
+
+    files.sort()
+    subdirs.sort()
+    return {'mtime_ns': mtime_ns, 'files': files, 'subdirs': subdirs}
+
+
+def iter_tree_files(tree: DirectoryTree):
+    """
+    Iterate over the files recorded in a directory tree.
+
+    Args:
+        tree: Tree returned by scan_directory_tree.
+
+    Yields:
+        Tuple[str, int, int]: Relative file path, size and mtime in nanoseconds.
+    """
+    for relative_dir, entry in tree.items():
+        for name, size, mtime_ns in entry['files']:
+            relative_path = os.path.join(relative_dir, name) if relative_dir else name
+            yield relative_path, size, mtime_ns
+
+
+class DirectoryIndexCache:
+    """
+    On-disk store of directory trees and matched file triples.
+
+    Each set of root folders maps to one JSON file under
+    ~/.vaitp_auditor/index. Failing to read or write the index is never
+    fatal; the caller simply falls back to a full scan.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = 32):
+        """
+        Initialize the index cache.
+
+        Args:
+            cache_dir: Directory holding the index files.
+            max_entries: Number of index files kept; the least recently
+                written ones are removed first.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / '.vaitp_auditor' / 'index'
+        self.max_entries = max_entries
+        self._logger = get_logger('directory_index')
+
+    @staticmethod
+    def _root_keys(roots: Sequence[Optional[Path]]) -> List[Optional[str]]:
+        """Normalize root folders into the strings used as index keys."""
+        return [os.path.abspath(root) if root else None for root in roots]
+
+    def index_path(self, roots: Sequence[Optional[Path]]) -> Path:
+        """
+        Get the index file used for a set of root folders.
+
+        Args:
+            roots: Root folders, None for unused ones.
+
+        Returns:
+            Path: Location of the index file.
+        """
+        key = json.dumps(self._root_keys(roots))
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+        return self.cache_dir / f"{digest}.json"
+
+    def load(self, roots: Sequence[Optional[Path]]) -> Optional[Dict[str, Any]]:
+        """
+        Load the stored index for a set of root folders.
+
+        Args:
+            roots: Root folders, None for unused ones.
+
+        Returns:
+            Optional[Dict[str, Any]]: Index with 'scanned_at_ns', 'trees' (one
+            per root) and 'triples' (relative paths), or None if unavailable.
+        """
+        path = self.index_path(roots)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError) as e:
+            self._logger.warning(f"Ignoring unreadable directory index {path}: {e}")
+            return None
+
+        if (not isinstance(index, dict) or index.get('version') != self.VERSION
+                or index.get('roots') != self._root_keys(roots)):
+            return None
+
+        return index
+
+    def save(self, roots: Sequence[Optional[Path]], scanned_at_ns: int,
+             trees: Sequence[DirectoryTree], triples: List[List[Optional[str]]]) -> bool:
+        """
+        Store the index for a set of root folders.
+
+        Args:
+            roots: Root folders, None for unused ones.
+            scanned_at_ns: Time at which the scan started.
+            trees: Directory tree of each root.
+            triples: Matched (generated, expected, input) relative paths.
+
+        Returns:
+            bool: True if the index was written.
+        """
+        path = self.index_path(roots)
+        index = {
+            'version': self.VERSION,
+            'roots': self._root_keys(roots),
+            'scanned_at_ns': scanned_at_ns,
+            'trees': list(trees),
+            'triples': triples,
+        }
+
+        temp_path = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(index, f, separators=(',', ':'))
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            self._logger.warning(f"Could not write directory index {path}: {e}")
+            if temp_path and os.path.exists(temp_path):
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+            return False
+
+        self._prune()
+        return True
+
+    def _prune(self) -> None:
+        """Remove the oldest index files beyond max_entries."""
+        try:
+            index_files = sorted(self.cache_dir.glob('*.json'), key=lambda p: p.stat().st_mtime, reverse=True)
+            for stale in index_files[self.max_entries:]:
+                stale.unlink()
+        except OSError as e:
+            self._logger.debug(f"Directory index pruning failed: {e}")
@@ -2,11 +2,22 @@
 Excel/CSV data source implementation for the VAITP-Auditor system.
 """
 
+import codecs
+import itertools
+import numpy as np
 import pandas as pd
 import os
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Sequence, Tuple
 from .base import DataSource, DataSourceError, DataSourceConfigurationError, DataSourceValidationError
-from ..core.models import CodePair
+from .sampling import sample_keys, sample_size as compute_sample_size, stratum_of
+from .table_cache import CachedTable, ColumnarTableCache
+from ..core.models import CodePair, SampleSpec
+
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
 
 
 class ExcelSource(DataSource):
@@ -15,8 +26,16 @@ class ExcelSource(DataSource):
     
     Supports loading code pairs from Excel (.xlsx) and CSV files with configurable
     sheet and column selection, data validation, and proper error handling.
+    
+    CSV and .xlsx files are streamed in chunks restricted to the configured
+    columns (workbooks through openpyxl's read-only mode), so memory use does
+    not grow with unused columns such as logs or prompts. With a table cache,
+    the projected columns are stored on first read and memory-mapped later.
     """
 
+    # Bytes inspected to detect the encoding of CSV files
+    ENCODING_PROBE_BYTES = 64 * 1024
+
     def __init__(self):
         """Initialize Excel data source."""
         super().__init__()
@@ -29,6 +48,11 @@ class ExcelSource(DataSource):
         self._model_column: Optional[str] = None
         self._prompting_strategy_column: Optional[str] = None
         self._dataframe: Optional[pd.DataFrame] = None
+        self._dataframe_signature: Optional[Tuple[int, int]] = None
+        self._csv_encoding: Optional[str] = None
+        self._chunksize = 10000
+        self._distinct_values: Dict[str, List[str]] = {}
+        self.table_cache: Optional[ColumnarTableCache] = None
 
     def configure(self) -> bool:
         """
@@ -86,6 +110,10 @@ class ExcelSource(DataSource):
                 # CSV files don't have sheets
                 self._sheet_name = None
 
+            # Parsed columns are cached across sessions
+            if self.table_cache is None:
+                self.table_cache = ColumnarTableCache()
+
             # Load data to get column information
             try:
                 self._dataframe = self._load_dataframe()
@@ -140,14 +168,22 @@ class ExcelSource(DataSource):
             })
             return False
 
-    def load_data(self, sample_percentage: float, selected_model: Optional[str] = None, selected_strategy: Optional[str] = None) -> List[CodePair]:
+    def load_data(self, sample_percentage: float, selected_model: Optional[str] = None, selected_strategy: Optional[str] = None,
+                  seed: Optional[int] = None, stratify_by: Sequence[str] = ()) -> List[CodePair]:
         """
         Load code pairs from the configured Excel/CSV file.
         
+        Collects iter_pairs() into a list; prefer iter_pairs() for large files.
+        
         Args:
             sample_percentage: Percentage of data to sample (1-100).
             selected_model: Optional specific model to filter by.
             selected_strategy: Optional specific prompting strategy to filter by.
+            seed: Optional sampling seed. The same seed always selects the same
+                code pairs in the same order. A random seed is used if omitted.
+            stratify_by: Optional source_info fields ('model_name',
+                'prompting_strategy'); each combination of their values is
+                sampled separately, with at least one pair each.
             
         Returns:
             List[CodePair]: List of code pairs ready for review.
@@ -156,35 +192,83 @@ class ExcelSource(DataSource):
             ValueError: If sample_percentage is not between 1 and 100.
             RuntimeError: If data source is not properly configured.
         """
-        self._validate_configured()
-        self._validate_sample_percentage(sample_percentage)
+        sample_spec = self._build_sample_spec(sample_percentage, seed, stratify_by,
+                                              selected_model, selected_strategy)
+        return list(self.iter_pairs(sample_spec))
 
-        try:
-            # Always reload dataframe to ensure file still exists and is accessible
-            self._dataframe = self._load_dataframe()
-            
-            # Apply filtering if specified
-            filtered_df = self._apply_filtering(self._dataframe, selected_model, selected_strategy)
-            
-            all_data = self._convert_dataframe_to_code_pairs(filtered_df)
+    def iter_pairs(self, sample_spec: SampleSpec) -> Iterator[CodePair]:
+        """
+        Iterate over a sample of the configured Excel/CSV file.
+        
+        A full sample of a CSV or .xlsx file is converted chunk by chunk as
+        the iterator advances; a partial sample needs one streaming pass to
+        rank the pairs, after which only the sampled pairs are held.
+        
+        Args:
+            sample_spec: Sample to iterate over.
             
-            # Cache total count
-            self._total_count = len(all_data)
+        Returns:
+            Iterator[CodePair]: Code pairs in sample order.
             
-            # Sample data if needed
-            sampled_data = self._sample_data(all_data, sample_percentage)
+        Raises:
+            RuntimeError: If data source is not properly configured.
+        """
+        self._validate_configured()
+        return self._iter_sample(sample_spec)
+
+    def _iter_sample(self, sample_spec: SampleSpec) -> Iterator[CodePair]:
+        """Generator behind iter_pairs()."""
+        sample_percentage = sample_spec.percentage
+        selected_model = sample_spec.selected_model
+        selected_strategy = sample_spec.selected_strategy
+        
+        filter_info = []
+        if selected_model:
+            filter_info.append(f"model={selected_model}")
+        if selected_strategy:
+            filter_info.append(f"strategy={selected_strategy}")
+        filter_str = f" (filtered by {', '.join(filter_info)})" if filter_info else ""
+        
+        try:
+            if self._is_streamed_file() and sample_percentage >= 100:
+                # Convert the file chunk by chunk while the caller consumes it;
+                # the size is only known up front if the columns are cached
+                self._sample_size_hint = None
+                table = self._open_cached_table()
+                required_columns = [self._identifier_column, self._generated_code_column]
+                if not filter_info and table is not None and table.has_columns(required_columns):
+                    self._sample_size_hint = table.count_present(required_columns)
+                yield from self._iter_streamed_pairs(selected_model, selected_strategy)
+                self._logger.info(f"Streamed {self._total_count} code pairs from Excel/CSV file{filter_str}")
+                return
             
-            filter_info = []
-            if selected_model:
-                filter_info.append(f"model={selected_model}")
-            if selected_strategy:
-                filter_info.append(f"strategy={selected_strategy}")
-            filter_str = f" (filtered by {', '.join(filter_info)})" if filter_info else ""
+            if self._is_streamed_file():
+                # Stream the file; only sampled pairs are kept in memory
+                sampled_data, self._total_count = self._load_streamed_sample(
+                    sample_percentage, selected_model, selected_strategy,
+                    sample_spec.seed, sample_spec.stratify_by
+                )
+            else:
+                # Reload the dataframe only if the file changed on disk
+                dataframe = self._get_dataframe()
+                
+                # Apply filtering if specified
+                filtered_df = self._apply_filtering(dataframe, selected_model, selected_strategy)
+                
+                all_data = self._convert_dataframe_to_code_pairs(filtered_df)
+                
+                # Cache total count
+                self._total_count = len(all_data)
+                
+                # Sample data if needed
+                sampled_data = self._sample_data(all_data, sample_percentage,
+                                                 sample_spec.seed, sample_spec.stratify_by)
             
+            self._sample_size_hint = len(sampled_data)
             self._logger.info(f"Loaded {len(sampled_data)} code pairs from Excel/CSV file "
                             f"({sample_percentage}% of {self._total_count} total{filter_str})")
             
-            return sampled_data
+            yield from sampled_data
 
         except Exception as e:
             self._log_error_with_context(e, {
@@ -212,11 +296,21 @@ class ExcelSource(DataSource):
             return self._total_count
         
         try:
-            if self._dataframe is None:
-                self._dataframe = self._load_dataframe()
+            required_columns = [self._identifier_column, self._generated_code_column]
             
             # Count non-empty rows
-            count = len(self._dataframe.dropna(subset=[self._identifier_column, self._generated_code_column]))
+            table = self._open_cached_table() if self._is_streamed_file() else None
+            if table is not None and table.has_columns(required_columns):
+                count = table.count_present(required_columns)
+            elif self._is_streamed_file():
+                count = sum(
+                    len(chunk.dropna(subset=required_columns))
+                    for chunk in self._iter_chunks(list(dict.fromkeys(required_columns)))
+                )
+            else:
+                if self._dataframe is None:
+                    self._dataframe = self._load_dataframe()
+                count = len(self._dataframe.dropna(subset=required_columns))
             self._total_count = count
             return count
                 
@@ -256,20 +350,13 @@ class ExcelSource(DataSource):
             file_ext = os.path.splitext(self._file_path)[1].lower()
             
             if file_ext == '.csv':
-                # Try different encodings for CSV files
-                encodings = ['utf-8', 'latin-1', 'cp1252']
-                df = None
-                
-                for encoding in encodings:
-                    try:
-                        df = pd.read_csv(self._file_path, encoding=encoding)
-                        self._logger.info(f"Successfully loaded CSV with {encoding} encoding")
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                
-                if df is None:
-                    raise DataSourceError("Failed to load CSV file with any supported encoding")
+                try:
+                    df = pd.read_csv(self._file_path, encoding=self._get_csv_encoding())
+                except UnicodeDecodeError:
+                    # The probed prefix decoded as UTF-8 but a later part did not
+                    self._csv_encoding = 'latin-1'
+                    df = pd.read_csv(self._file_path, encoding=self._csv_encoding)
+                self._logger.info(f"Successfully loaded CSV with {self._csv_encoding} encoding")
                     
             elif file_ext in ['.xlsx', '.xls']:
                 if self._sheet_name:
@@ -287,6 +374,469 @@ class ExcelSource(DataSource):
         except Exception as e:
             raise DataSourceError(f"Failed to load data from file: {e}")
     
+    def _is_streamed_file(self) -> bool:
+        """Check whether the configured file is read in chunks (.csv and .xlsx)."""
+        return os.path.splitext(self._file_path)[1].lower() in ('.csv', '.xlsx')
+
+    def get_distinct_values(self, columns: List[str]) -> Dict[str, List[str]]:
+        """
+        Get the sorted distinct non-empty values of some columns.
+        
+        Used to list the models and prompting strategies available for
+        filtering. Values seen while streaming the file in load_data are
+        reused; otherwise only the requested columns are read.
+        
+        Args:
+            columns: Column names; columns missing from the file are ignored.
+            
+        Returns:
+            Dict[str, List[str]]: Distinct values per existing column.
+        """
+        columns = list(dict.fromkeys(column for column in columns if column))
+        if all(column in self._distinct_values for column in columns):
+            return {column: self._distinct_values[column] for column in columns}
+        
+        available = set(self._get_column_names())
+        columns = [column for column in columns if column in available]
+        if not columns:
+            return {}
+        
+        # When caching, read the mapped columns too so later loads hit the cache
+        read_columns = columns
+        if self.table_cache is not None:
+            read_columns = list(dict.fromkeys(
+                columns + [column for column in self._get_mapped_columns() if column in available]
+            ))
+        
+        distinct: Dict[str, set] = {column: set() for column in columns}
+        for chunk in self._iter_chunks(read_columns):
+            self._collect_distinct_values(chunk, distinct)
+        
+        self._distinct_values.update({column: sorted(values) for column, values in distinct.items()})
+        return {column: self._distinct_values[column] for column in columns}
+
+    @staticmethod
+    def _collect_distinct_values(chunk: pd.DataFrame, distinct: Dict[str, set]) -> None:
+        """Add the non-empty values of a chunk to per-column sets."""
+        for column, values in distinct.items():
+            values.update(str(value) for value in chunk[column].dropna().unique() if str(value).strip())
+
+    def _get_column_names(self) -> List[str]:
+        """
+        Read the column names of the file without loading its rows.
+        
+        Returns:
+            List[str]: Column names as strings.
+        """
+        file_ext = os.path.splitext(self._file_path)[1].lower()
+        if file_ext == '.csv':
+            header = pd.read_csv(self._file_path, encoding=self._get_csv_encoding(), nrows=0)
+        elif file_ext == '.xlsx':
+            workbook, worksheet = self._open_xlsx_worksheet()
+            try:
+                first_row = next(worksheet.iter_rows(max_row=1, values_only=True), ())
+                return self._xlsx_column_names(first_row)
+            finally:
+                workbook.close()
+        else:
+            header = pd.read_excel(self._file_path, sheet_name=self._sheet_name or 0, nrows=0)
+        return [str(column) for column in header.columns]
+
+    def _get_dataframe(self) -> pd.DataFrame:
+        """
+        Get the loaded dataframe, reloading it only if the file changed.
+        
+        Returns:
+            pd.DataFrame: Loaded data.
+            
+        Raises:
+            OSError: If the file no longer exists.
+            DataSourceError: If file loading fails.
+        """
+        stat_result = os.stat(self._file_path)
+        signature = (stat_result.st_mtime_ns, stat_result.st_size)
+        
+        if self._dataframe is None or self._dataframe_signature != signature:
+            self._dataframe = self._load_dataframe()
+            self._dataframe_signature = signature
+        
+        return self._dataframe
+
+    def _get_csv_encoding(self) -> str:
+        """
+        Detect the encoding of the CSV file once from a byte prefix.
+        
+        Returns:
+            str: 'utf-8' if the prefix decodes as UTF-8, 'latin-1' otherwise.
+        """
+        if self._csv_encoding is None:
+            with open(self._file_path, 'rb') as f:
+                prefix = f.read(self.ENCODING_PROBE_BYTES)
+            
+            try:
+                # Incremental decoding tolerates a character cut off by the prefix
+                codecs.getincrementaldecoder('utf-8')().decode(prefix, final=False)
+                self._csv_encoding = 'utf-8'
+            except UnicodeDecodeError:
+                self._csv_encoding = 'latin-1'
+            
+            self._logger.debug(f"Detected {self._csv_encoding} encoding for {self._file_path}")
+        
+        return self._csv_encoding
+
+    def _get_mapped_columns(self) -> List[str]:
+        """Get the configured columns, i.e. the only ones read when streaming."""
+        columns = [
+            self._identifier_column, self._generated_code_column, self._expected_code_column,
+            self._input_code_column, self._model_column, self._prompting_strategy_column
+        ]
+        return list(dict.fromkeys(column for column in columns if column))
+
+    def _iter_csv_chunks(self, columns: List[str]) -> Iterator[pd.DataFrame]:
+        """
+        Read the CSV file in chunks restricted to the given columns.
+        
+        Values are kept as strings so identifiers are rendered the same way
+        in every chunk. Row labels continue across chunks.
+        
+        Args:
+            columns: Columns to read.
+            
+        Yields:
+            pd.DataFrame: Successive chunks of the file.
+        """
+        reader = pd.read_csv(
+            self._file_path,
+            encoding=self._get_csv_encoding(),
+            usecols=columns,
+            dtype=str,
+            chunksize=self._chunksize
+        )
+        with reader:
+            for chunk in reader:
+                yield chunk
+
+    def _iter_chunks(self, columns: List[str]) -> Iterator[pd.DataFrame]:
+        """
+        Read the configured file in chunks restricted to the given columns.
+        
+        Args:
+            columns: Columns to read.
+            
+        Yields:
+            pd.DataFrame: Successive chunks of string values.
+        """
+        if self.table_cache is not None:
+            return self._iter_cached_chunks(columns)
+        return self._iter_source_chunks(columns)
+
+    def _open_cached_table(self) -> Optional[CachedTable]:
+        """Open the cached table of the configured file, None if unavailable."""
+        if self.table_cache is None:
+            return None
+        try:
+            return self.table_cache.open(self._file_path, self._sheet_name)
+        except OSError as e:
+            self._logger.warning(f"Table cache unavailable for {self._file_path}: {e}")
+            return None
+
+    def _iter_cached_chunks(self, columns: List[str]) -> Iterator[pd.DataFrame]:
+        """
+        Read chunks from the table cache, parsing the file on a cache miss.
+        
+        On a miss, the parsed chunks are written to the cache while they are
+        yielded; the entry is only published once the file was fully read.
+        
+        Args:
+            columns: Columns to read.
+            
+        Yields:
+            pd.DataFrame: Successive chunks of string values.
+        """
+        table = self._open_cached_table()
+        if table is not None and table.has_columns(columns):
+            self._logger.debug(f"Reading {self._file_path} from the table cache")
+            yield from table.iter_chunks(columns, self._chunksize)
+            return
+        
+        try:
+            writer = self.table_cache.writer(self._file_path, self._sheet_name, columns)
+        except OSError as e:
+            self._logger.warning(f"Table cache unavailable for {self._file_path}: {e}")
+            writer = None
+        
+        completed = False
+        try:
+            for chunk in self._iter_source_chunks(columns):
+                if writer is not None:
+                    writer.append(chunk)
+                yield chunk
+            completed = True
+        finally:
+            if writer is not None:
+                if completed:
+                    writer.commit()
+                else:
+                    writer.abort()
+
+    def _iter_source_chunks(self, columns: List[str]) -> Iterator[pd.DataFrame]:
+        """
+        Parse the configured file in chunks restricted to the given columns.
+        
+        Args:
+            columns: Columns to read.
+            
+        Returns:
+            Iterator[pd.DataFrame]: Successive chunks of string values.
+        """
+        if os.path.splitext(self._file_path)[1].lower() == '.xlsx':
+            return self._iter_xlsx_chunks(columns)
+        return self._iter_csv_chunks(columns)
+
+    def _open_xlsx_worksheet(self):
+        """
+        Open the configured sheet of an .xlsx workbook in read-only mode.
+        
+        Returns:
+            Tuple: The workbook, to be closed by the caller, and the worksheet.
+            
+        Raises:
+            DataSourceError: If openpyxl is not installed or the sheet does not exist.
+        """
+        if not OPENPYXL_AVAILABLE:
+            raise DataSourceError("openpyxl is required to read .xlsx files")
+        
+        workbook = openpyxl.load_workbook(self._file_path, read_only=True, data_only=True)
+        if self._sheet_name is None:
+            return workbook, workbook.worksheets[0]
+        if self._sheet_name not in workbook.sheetnames:
+            workbook.close()
+            raise DataSourceError(f"Worksheet '{self._sheet_name}' not found")
+        return workbook, workbook[self._sheet_name]
+
+    @staticmethod
+    def _xlsx_column_names(header_row: Tuple[Any, ...]) -> List[str]:
+        """Name worksheet columns from their header row like pandas does."""
+        return [str(value) if value is not None else f"Unnamed: {position}"
+                for position, value in enumerate(header_row)]
+
+    def _iter_xlsx_chunks(self, columns: List[str]) -> Iterator[pd.DataFrame]:
+        """
+        Stream an .xlsx worksheet row by row, keeping only the given columns.
+        
+        The workbook is opened with openpyxl in read-only mode, which parses
+        the sheet XML incrementally instead of building the whole document.
+        Row labels count data rows from 0 like pd.read_excel.
+        
+        Args:
+            columns: Columns to read.
+            
+        Yields:
+            pd.DataFrame: Successive chunks of string values.
+            
+        Raises:
+            DataSourceError: If a column does not exist in the worksheet.
+        """
+        workbook, worksheet = self._open_xlsx_worksheet()
+        try:
+            rows = worksheet.iter_rows(values_only=True)
+            header = self._xlsx_column_names(next(rows, ()))
+            
+            positions = []
+            for column in columns:
+                if column not in header:
+                    raise DataSourceError(f"Column '{column}' not found in worksheet")
+                positions.append(header.index(column))
+            
+            buffer = []
+            start = 0
+            for row in rows:
+                buffer.append([
+                    str(row[position]) if position < len(row) and row[position] is not None else None
+                    for position in positions
+                ])
+                if len(buffer) >= self._chunksize:
+                    yield pd.DataFrame(buffer, columns=columns, index=range(start, start + len(buffer)))
+                    start += len(buffer)
+                    buffer = []
+            
+            # Trailing rows without any value in the mapped columns are padding
+            while buffer and all(value is None for value in buffer[-1]):
+                buffer.pop()
+            if buffer:
+                yield pd.DataFrame(buffer, columns=columns, index=range(start, start + len(buffer)))
+        finally:
+            workbook.close()
+
+    def _scan_pairs(self, selected_model: Optional[str], selected_strategy: Optional[str],
+                        seed: int, threshold: int, stratify_by: Sequence[str] = ()
+                        ) -> Tuple[List[Tuple[int, CodePair]], np.ndarray, List[Tuple]]:
+        """
+        Stream the file, assigning a sample key to every valid code pair.
+        
+        Keys are sampling.sample_key(seed, position) for the position of the
+        pair among the valid pairs, so a second scan with the same seed
+        assigns the same keys. The distinct model and strategy values are
+        collected in the same pass.
+        
+        Args:
+            selected_model: Optional specific model to filter by.
+            selected_strategy: Optional specific prompting strategy to filter by.
+            seed: Sampling seed.
+            threshold: Only pairs with a key <= threshold are kept.
+            stratify_by: Optional source_info fields whose values are recorded per pair.
+            
+        Returns:
+            Tuple: (key, code pair) candidates in file order, the keys of all
+            pairs and, when stratifying, the stratum of every pair.
+        """
+        try:
+            candidates = []
+            key_chunks = []
+            strata: List[Tuple] = []
+            position = 0
+            distinct: Dict[str, set] = {
+                column: set() for column in (self._model_column, self._prompting_strategy_column) if column
+            }
+            
+            for chunk in self._iter_chunks(self._get_mapped_columns()):
+                self._collect_distinct_values(chunk, distinct)
+                chunk = self._apply_filtering(chunk, selected_model, selected_strategy)
+                chunk_pairs = self._convert_dataframe_to_code_pairs(chunk)
+                chunk_keys = sample_keys(seed, position, len(chunk_pairs))
+                position += len(chunk_pairs)
+                key_chunks.append(chunk_keys)
+                if stratify_by:
+                    strata.extend(stratum_of(code_pair, stratify_by) for code_pair in chunk_pairs)
+                candidates.extend(
+                    (key, code_pair) for key, code_pair in zip(chunk_keys.tolist(), chunk_pairs)
+                    if key <= threshold
+                )
+            
+            self._distinct_values.update({column: sorted(values) for column, values in distinct.items()})
+            all_keys = np.concatenate(key_chunks) if key_chunks else np.empty(0, dtype=np.uint64)
+            return candidates, all_keys, strata
+            
+        except UnicodeDecodeError:
+            if not self._file_path.lower().endswith('.csv') or self._csv_encoding == 'latin-1':
+                raise
+            # The probed prefix decoded as UTF-8 but a later part did not
+            self._logger.warning(f"UTF-8 decoding failed past the probed prefix of {self._file_path}, using latin-1")
+            self._csv_encoding = 'latin-1'
+            return self._scan_pairs(selected_model, selected_strategy, seed, threshold, stratify_by)
+
+    def _iter_streamed_pairs(self, selected_model: Optional[str],
+                             selected_strategy: Optional[str]) -> Iterator[CodePair]:
+        """
+        Stream all valid code pairs of a CSV or .xlsx file in file order.
+        
+        The number of pairs and the distinct model and strategy values are
+        stored once the file has been read to the end.
+        
+        Args:
+            selected_model: Optional specific model to filter by.
+            selected_strategy: Optional specific prompting strategy to filter by.
+            
+        Yields:
+            CodePair: Valid code pairs.
+        """
+        count = 0
+        distinct: Dict[str, set] = {
+            column: set() for column in (self._model_column, self._prompting_strategy_column) if column
+        }
+        try:
+            for chunk in self._iter_chunks(self._get_mapped_columns()):
+                self._collect_distinct_values(chunk, distinct)
+                chunk = self._apply_filtering(chunk, selected_model, selected_strategy)
+                for code_pair in self._convert_dataframe_to_code_pairs(chunk):
+                    count += 1
+                    yield code_pair
+        except UnicodeDecodeError:
+            if not self._file_path.lower().endswith('.csv') or self._csv_encoding == 'latin-1':
+                raise
+            # The probed prefix decoded as UTF-8 but a later part did not: read
+            # the file again as latin-1, skipping the pairs already produced
+            self._logger.warning(f"UTF-8 decoding failed past the probed prefix of {self._file_path}, using latin-1")
+            self._csv_encoding = 'latin-1'
+            remaining = self._iter_streamed_pairs(selected_model, selected_strategy)
+            yield from itertools.islice(remaining, count, None)
+            return
+        self._distinct_values.update({column: sorted(values) for column, values in distinct.items()})
+        self._total_count = count
+
+    @staticmethod
+    def _kth_smallest_key(keys: np.ndarray, k: int) -> int:
+        """Get the k-th smallest (1-based) of the sample keys."""
+        return int(np.partition(keys, k - 1)[k - 1])
+
+    def _load_streamed_sample(self, sample_percentage: float, selected_model: Optional[str] = None,
+                         selected_strategy: Optional[str] = None, seed: Optional[int] = None,
+                         stratify_by: Sequence[str] = ()) -> Tuple[List[CodePair], int]:
+        """
+        Sample code pairs from a CSV or .xlsx file while streaming it.
+        
+        Filtering and conversion happen per chunk. Each pair receives a seeded
+        key and the sample is made of the pairs with the smallest keys (per
+        stratum when stratifying), the same pairs sampling.select_sample picks
+        from the fully loaded list. Only pairs whose key falls below a
+        threshold slightly above the sampling fraction are kept while
+        streaming; in the rare case the sample reaches beyond that threshold
+        the file is scanned a second time.
+        
+        Args:
+            sample_percentage: Percentage of data to sample (1-100).
+            selected_model: Optional specific model to filter by.
+            selected_strategy: Optional specific prompting strategy to filter by.
+            seed: Optional sampling seed; a random seed is used if omitted.
+            stratify_by: Optional source_info fields to stratify by.
+            
+        Returns:
+            Tuple[List[CodePair], int]: Sampled code pairs in key order and the
+            number of valid pairs in the file.
+        """
+        if sample_percentage >= 100:
+            candidates, all_keys, _ = self._scan_pairs(selected_model, selected_strategy, 0, 2 ** 64)
+            return [code_pair for _, code_pair in candidates], len(all_keys)
+        
+        seed = self._resolve_seed(seed)
+        fraction = sample_percentage / 100
+        threshold = int(min(1.0, fraction * 1.25 + 0.01) * 2 ** 63)
+        
+        candidates, all_keys, strata = self._scan_pairs(
+            selected_model, selected_strategy, seed, threshold, stratify_by
+        )
+        total = len(all_keys)
+        if total == 0:
+            return [], 0
+        
+        # Sample size and largest selected key of every stratum
+        if stratify_by:
+            positions_by_stratum: Dict[Tuple, List[int]] = {}
+            for position, stratum in enumerate(strata):
+                positions_by_stratum.setdefault(stratum, []).append(position)
+            sizes = {}
+            cutoffs = {}
+            for stratum, positions in positions_by_stratum.items():
+                sizes[stratum] = compute_sample_size(len(positions), sample_percentage)
+                cutoffs[stratum] = self._kth_smallest_key(all_keys[positions], sizes[stratum])
+        else:
+            sizes = {(): compute_sample_size(total, sample_percentage)}
+            cutoffs = {(): self._kth_smallest_key(all_keys, sizes[()])}
+        
+        max_cutoff = max(cutoffs.values())
+        if max_cutoff > threshold:
+            self._logger.debug("Sample exceeds the streaming threshold, rescanning file")
+            candidates, _, _ = self._scan_pairs(selected_model, selected_strategy, seed, max_cutoff)
+        
+        selected = []
+        taken = dict.fromkeys(sizes, 0)
+        for key, code_pair in sorted(candidates, key=lambda item: item[0]):
+            stratum = stratum_of(code_pair, stratify_by)
+            if key <= cutoffs[stratum] and taken[stratum] < sizes[stratum]:
+                taken[stratum] += 1
+                selected.append(code_pair)
+        return selected, total
+
     def _apply_filtering(self, df: pd.DataFrame, selected_model: Optional[str] = None, selected_strategy: Optional[str] = None) -> pd.DataFrame:
         """
         Apply model and strategy filtering to the dataframe.
@@ -412,10 +962,35 @@ class ExcelSource(DataSource):
             print(f"Error: Configuration validation failed: {e}")
             return False
 
+    def _clean_text_column(self, df: pd.DataFrame, column: Optional[str]) -> np.ndarray:
+        """
+        Convert a column to stripped strings, with None for null or empty cells.
+        
+        Args:
+            df: DataFrame holding the column.
+            column: Column name, or None for an unconfigured optional column.
+            
+        Returns:
+            np.ndarray: Object array aligned with the rows of df.
+        """
+        values = np.full(len(df), None, dtype=object)
+        if not column:
+            return values
+        
+        series = df[column]
+        present = series.notna().to_numpy()
+        if present.any():
+            values[present] = series[present].astype(str).str.strip().to_numpy(dtype=object)
+            values[values == ''] = None
+        return values
+
     def _convert_dataframe_to_code_pairs(self, df: pd.DataFrame) -> List[CodePair]:
         """
         Convert pandas DataFrame to list of CodePair objects.
         
+        Cells are cleaned column by column and pairs are built by zipping the
+        resulting arrays, which avoids boxing every row into a Series.
+        
         Args:
             df: DataFrame to convert.
             
@@ -424,65 +999,34 @@ class ExcelSource(DataSource):
         """
         code_pairs = []
         
-        for index, row in df.iterrows():
+        try:
+            identifiers = self._clean_text_column(df, self._identifier_column)
+            generated_codes = self._clean_text_column(df, self._generated_code_column)
+            expected_codes = self._clean_text_column(df, self._expected_code_column)
+            input_codes = self._clean_text_column(df, self._input_code_column)
+            model_names = self._clean_text_column(df, self._model_column)
+            prompting_strategies = self._clean_text_column(df, self._prompting_strategy_column)
+        except Exception as e:
+            self._logger.error(f"Error processing rows: {e}")
+            return code_pairs
+        
+        # Skip rows with null/empty required fields
+        valid = pd.notna(identifiers) & pd.notna(generated_codes)
+        skipped = len(df) - int(valid.sum())
+        if skipped:
+            self._logger.warning(f"Skipping {skipped} row(s) with null or empty identifier or generated code")
+        
+        row_numbers = (df.index.to_numpy()[valid] + 1).tolist()
+        rows = zip(row_numbers, identifiers[valid], generated_codes[valid], expected_codes[valid],
+                   input_codes[valid], model_names[valid], prompting_strategies[valid])
+        
+        for row_number, identifier, generated_code, expected_code, input_code, model_name, prompting_strategy in rows:
             try:
-                # Get identifier and generated code (required)
-                identifier = row[self._identifier_column]
-                generated_code = row[self._generated_code_column]
-                
-                # Skip rows with null/empty required fields
-                if pd.isna(identifier) or pd.isna(generated_code):
-                    self._logger.warning(f"Skipping row {index + 1} with null identifier or generated code")
-                    continue
-                
-                identifier = str(identifier).strip()
-                generated_code = str(generated_code).strip()
-                
-                if not identifier or not generated_code:
-                    self._logger.warning(f"Skipping row {index + 1} with empty identifier or generated code")
-                    continue
-                
-                # Get expected code (optional)
-                expected_code = None
-                if self._expected_code_column:
-                    expected_value = row[self._expected_code_column]
-                    if pd.notna(expected_value):
-                        expected_code = str(expected_value).strip()
-                        if not expected_code:  # Empty string
-                            expected_code = None
-                
-                # Get input code (optional)
-                input_code = None
-                if self._input_code_column:
-                    input_value = row[self._input_code_column]
-                    if pd.notna(input_value):
-                        input_code = str(input_value).strip()
-                        if not input_code:  # Empty string
-                            input_code = None
-                
-                # Get model name (optional)
-                model_name = None
-                if self._model_column:
-                    model_value = row[self._model_column]
-                    if pd.notna(model_value):
-                        model_name = str(model_value).strip()
-                        if not model_name:  # Empty string
-                            model_name = None
-                
-                # Get prompting strategy (optional)
-                prompting_strategy = None
-                if self._prompting_strategy_column:
-                    strategy_value = row[self._prompting_strategy_column]
-                    if pd.notna(strategy_value):
-                        prompting_strategy = str(strategy_value).strip()
-                        if not prompting_strategy:  # Empty string
-                            prompting_strategy = None
-                
                 source_info = {
                     'source_type': 'excel',
                     'file_path': self._file_path,
                     'sheet_name': self._sheet_name,
-                    'row_number': index + 1,
+                    'row_number': row_number,
                     'identifier_column': self._identifier_column,
                     'generated_code_column': self._generated_code_column,
                     'expected_code_column': self._expected_code_column,
@@ -504,10 +1048,10 @@ class ExcelSource(DataSource):
                 if self._validate_code_pair(code_pair):
                     code_pairs.append(code_pair)
                 else:
-                    self._logger.warning(f"Skipping invalid code pair at row {index + 1} with identifier: {identifier}")
+                    self._logger.warning(f"Skipping invalid code pair at row {row_number} with identifier: {identifier}")
                     
             except Exception as e:
-                self._logger.error(f"Error processing row {index + 1}: {e}")
+                self._logger.error(f"Error processing row {row_number}: {e}")
                 continue
         
         return code_pairs
\ No newline at end of file
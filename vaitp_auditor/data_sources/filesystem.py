@@ -4,12 +4,62 @@ File system data source implementation for folder-based code pairs.
 
 import os
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Collection, Iterator, List, Optional, Dict, Any, Sequence, Tuple
 
 from .base import DataSource, DataSourceConfigurationError, DataSourceValidationError
-from ..core.models import CodePair
-from ..utils.performance import LazyLoader, get_chunked_processor, performance_monitor
+from .directory_index import (
+    DirectoryIndexCache, DirectoryTree, MTIME_GRANULARITY_NS, iter_tree_files, scan_directory_tree
+)
+from .sampling import ShuffledIndex, select_sample
+from ..core.models import CodePair, DeferredContent, SampleSpec
+from ..utils.performance import get_chunked_processor, performance_monitor
+
+
+class FileContentLoader:
+    """
+    Picklable loader reading a code file on demand.
+    
+    Used as the loader of DeferredContent so that code pairs backed by large
+    files only hold a path until their content is actually needed.
+    """
+
+    def __init__(self, file_path: Path):
+        """
+        Initialize the loader.
+        
+        Args:
+            file_path: Path to the file to read.
+        """
+        self.file_path = Path(file_path)
+
+    def __call__(self) -> Optional[str]:
+        """
+        Read the file with UTF-8 encoding and fallback to latin-1 if needed.
+        
+        Returns:
+            Optional[str]: File content or None if reading failed.
+        """
+        logger = logging.getLogger(FileSystemSource.__name__)
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except UnicodeDecodeError as e:
+            logger.warning(f"UTF-8 encoding failed for {self.file_path}: {e}")
+            try:
+                with open(self.file_path, 'r', encoding='latin-1') as f:
+                    return f.read()
+            except Exception as fallback_error:
+                logger.error(f"Failed to read {self.file_path} with latin-1 fallback: {fallback_error}")
+                return None
+        except Exception as e:
+            logger.error(f"Failed to read file {self.file_path}: {e}")
+            return None
+
+    def __repr__(self) -> str:
+        return f"FileContentLoader({str(self.file_path)!r})"
 
 
 class FileSystemSource(DataSource):
@@ -18,10 +68,23 @@ class FileSystemSource(DataSource):
     
     Matches files between generated and expected code folders based on base names,
     ignoring file extensions. Handles encoding fallback from UTF-8 to latin-1.
+    
+    The folders are scanned concurrently with os.scandir and files are read
+    by a thread pool, which matters most on network-mounted folders. Results
+    are always returned in sorted path order. With an index cache, unchanged
+    directories are not listed again on later scans.
     """
 
-    def __init__(self):
-        """Initialize the file system data source."""
+    def __init__(self, max_workers: Optional[int] = None,
+                 index_cache: Optional[DirectoryIndexCache] = None):
+        """
+        Initialize the file system data source.
+        
+        Args:
+            max_workers: Number of threads used to read files. Defaults to the
+                ThreadPoolExecutor default; 1 disables parallel reading.
+            index_cache: Persistent directory index used by _discover_file_pairs.
+        """
         super().__init__()
         self.generated_folder: Optional[Path] = None
         self.expected_folder: Optional[Path] = None
@@ -29,6 +92,10 @@ class FileSystemSource(DataSource):
         self._file_pairs: List[Tuple[Path, Optional[Path], Optional[Path]]] = []
         self._chunked_processor = get_chunked_processor()
         self._lazy_loading_threshold = 100 * 1024  # 100KB threshold for lazy loading
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.index_cache = index_cache
+        self._file_sizes: Dict[Path, int] = {}
+        self._replacement_index: Optional[ShuffledIndex] = None
 
     def configure(self) -> bool:
         """
@@ -93,7 +160,9 @@ class FileSystemSource(DataSource):
             else:
                 self.input_folder = None
 
-            # Discover and match files
+            # Discover and match files, reusing the index of a previous run
+            if self.index_cache is None:
+                self.index_cache = DirectoryIndexCache()
             self._discover_file_pairs()
             
             if not self._file_pairs:
@@ -115,12 +184,18 @@ class FileSystemSource(DataSource):
             return False
 
     @performance_monitor("load_data")
-    def load_data(self, sample_percentage: float) -> List[CodePair]:
+    def load_data(self, sample_percentage: float, seed: Optional[int] = None,
+                  stratify_by: Sequence[str] = ()) -> List[CodePair]:
         """
         Load code pairs from the configured folders with performance optimizations.
         
+        Collects iter_pairs() into a list; prefer iter_pairs() for large folders.
+        
         Args:
             sample_percentage: Percentage of data to sample (1-100).
+            seed: Optional sampling seed. The same seed always selects the same
+                code pairs in the same order. A random seed is used if omitted.
+            stratify_by: Optional source_info fields to sample separately.
             
         Returns:
             List[CodePair]: List of code pairs ready for review.
@@ -129,54 +204,197 @@ class FileSystemSource(DataSource):
             ValueError: If sample_percentage is not between 1 and 100.
             RuntimeError: If data source is not properly configured.
         """
+        sample_spec = self._build_sample_spec(sample_percentage, seed, stratify_by)
+        sampled_pairs = list(self.iter_pairs(sample_spec))
+        
+        if not sampled_pairs:
+            raise DataSourceValidationError("No valid code pairs could be loaded")
+        
+        self._logger.info(f"Loaded {len(sampled_pairs)} code pairs ({sample_percentage}% of {len(self._file_pairs)} total)")
+        return sampled_pairs
+    
+    def iter_pairs(self, sample_spec: SampleSpec) -> Iterator[CodePair]:
+        """
+        Iterate over a sample of the discovered file pairs.
+        
+        The sample is drawn from the discovered file triples, so only the
+        files of sampled pairs are ever read. Files are read chunk by chunk,
+        in parallel within a chunk, as the iterator advances. Folder pairs
+        carry no model or strategy, so stratification has a single stratum.
+        
+        Args:
+            sample_spec: Sample to iterate over.
+            
+        Returns:
+            Iterator[CodePair]: Code pairs in sample order; triples that
+            cannot be loaded are skipped.
+            
+        Raises:
+            RuntimeError: If data source is not properly configured.
+        """
         self._validate_configured()
-        self._validate_sample_percentage(sample_percentage)
+        
+        file_pairs = self._file_pairs
+        if sample_spec.percentage < 100:
+            file_pairs = select_sample(file_pairs, sample_spec.percentage, self._resolve_seed(sample_spec.seed))
+        self._sample_size_hint = len(file_pairs)
+        return self._iter_file_pairs(file_pairs)
+    
+    def _iter_file_pairs(self, file_pairs: List[Tuple[Path, Optional[Path], Optional[Path]]]) -> Iterator[CodePair]:
+        """
+        Load file triples into code pairs as the iterator advances.
+        
+        Args:
+            file_pairs: (generated, expected, input) file paths to load.
+            
+        Yields:
+            CodePair: Valid code pairs in input order.
+        """
+        # Process file pairs in chunks for better memory management, reading
+        # the files of each chunk in parallel (map() keeps the input order)
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            def process_file_chunk(file_chunk: List[Tuple[Path, Optional[Path], Optional[Path]]]) -> List[CodePair]:
+                if self.max_workers > 1:
+                    results = executor.map(self._load_file_pair, file_chunk)
+                else:
+                    results = map(self._load_file_pair, file_chunk)
+                return [code_pair for code_pair in results if code_pair is not None]
 
-        # Process file pairs in chunks for better memory management
-        def process_file_chunk(file_chunk: List[Tuple[Path, Optional[Path], Optional[Path]]]) -> List[CodePair]:
-            chunk_pairs = []
+            yield from self._chunked_processor.iter_chunks(file_pairs, process_file_chunk)
+    
+    def source_ref(self, code_pair: CodePair) -> Optional[Dict[str, Any]]:
+        """
+        Get the file paths of a code pair.
+        
+        Args:
+            code_pair: Code pair produced by this source.
             
-            for generated_file, expected_file, input_file in file_chunk:
-                try:
-                    # Check file sizes first to determine loading strategy
-                    generated_size = generated_file.stat().st_size if generated_file.exists() else 0
-                    expected_size = expected_file.stat().st_size if expected_file and expected_file.exists() else 0
-                    input_size = input_file.stat().st_size if input_file and input_file.exists() else 0
-                    
-                    # Use lazy loading for large files
-                    max_size = max(generated_size, expected_size, input_size)
-                    if max_size > self._lazy_loading_threshold:
-                        code_pair = self._create_lazy_code_pair(generated_file, expected_file, input_file)
-                    else:
-                        code_pair = self._create_standard_code_pair(generated_file, expected_file, input_file)
-                    
-                    if code_pair and self._validate_code_pair(code_pair):
-                        chunk_pairs.append(code_pair)
-                    elif code_pair:
-                        self._logger.warning(f"Skipping invalid code pair: {code_pair.identifier}")
-
-                except Exception as e:
-                    self._log_error_with_context(e, {
-                        "generated_file": str(generated_file),
-                        "expected_file": str(expected_file) if expected_file else None,
-                        "input_file": str(input_file) if input_file else None
-                    })
-                    continue
+        Returns:
+            Optional[Dict[str, Any]]: Generated, expected and input file paths.
+        """
+        source_info = code_pair.source_info or {}
+        if not source_info.get("generated_file"):
+            return None
+        return {
+            "generated_file": source_info["generated_file"],
+            "expected_file": source_info.get("expected_file"),
+            "input_file": source_info.get("input_file")
+        }
+    
+    def _load_referenced_pairs(self, references: List[Dict[str, Any]]) -> Dict[str, CodePair]:
+        """
+        Reload code pairs from their file paths without rescanning the folders.
+        
+        Args:
+            references: References returned by source_ref().
             
-            return chunk_pairs
-
-        # Process all file pairs in chunks
-        all_code_pairs = self._chunked_processor.process_chunks(self._file_pairs, process_file_chunk)
+        Returns:
+            Dict[str, CodePair]: Loaded code pairs by identifier.
+        """
+        file_pairs = [
+            (
+                Path(reference["generated_file"]),
+                Path(reference["expected_file"]) if reference.get("expected_file") else None,
+                Path(reference["input_file"]) if reference.get("input_file") else None
+            )
+            for reference in references if reference.get("generated_file")
+        ]
+        return {code_pair.identifier: code_pair for code_pair in self._iter_file_pairs(file_pairs)}
+    
+    def sample_one_excluding(self, excluded_ids: Collection[str],
+                             sample_spec: Optional[SampleSpec] = None) -> Optional[CodePair]:
+        """
+        Draw one random code pair from a shuffled index of the discovered files.
+        
+        Identifiers are derived from the file paths, so excluded triples are
+        skipped without reading them and only the drawn pair is loaded.
+        Folder pairs carry no model or strategy, so sample_spec is ignored.
+        
+        Args:
+            excluded_ids: Identifiers that must not be drawn.
+            sample_spec: Unused; folder pairs cannot be filtered.
+            
+        Returns:
+            Optional[CodePair]: Drawn code pair, or None if every pair is excluded.
+            
+        Raises:
+            RuntimeError: If data source is not properly configured.
+        """
+        self._validate_configured()
+        
+        if self._replacement_index is None or self._replacement_index.size != len(self._file_pairs):
+            self._replacement_index = ShuffledIndex(len(self._file_pairs))
+        
+        loaded: Dict[int, CodePair] = {}
+        
+        def accept(position: int) -> bool:
+            file_pair = self._file_pairs[position]
+            if self._get_file_identifier(*file_pair) in excluded_ids:
+                return False
+            code_pair = self._load_file_pair(file_pair)
+            if code_pair is None:
+                return False
+            loaded[position] = code_pair
+            return True
+        
+        position = self._replacement_index.draw(accept)
+        return loaded[position] if position is not None else None
+    
+    def _load_file_pair(self, file_pair: Tuple[Path, Optional[Path], Optional[Path]]) -> Optional[CodePair]:
+        """
+        Load a single file triple into a validated code pair.
+        
+        Args:
+            file_pair: (generated, expected, input) file paths.
+            
+        Returns:
+            Optional[CodePair]: The code pair, or None if it could not be loaded.
+        """
+        generated_file, expected_file, input_file = file_pair
+        try:
+            # Check file sizes first to determine loading strategy
+            generated_size = self._get_file_size(generated_file)
+            expected_size = self._get_file_size(expected_file)
+            input_size = self._get_file_size(input_file)
+            
+            # Use lazy loading for large files
+            max_size = max(generated_size, expected_size, input_size)
+            if max_size > self._lazy_loading_threshold:
+                code_pair = self._create_lazy_code_pair(generated_file, expected_file, input_file)
+            else:
+                code_pair = self._create_standard_code_pair(generated_file, expected_file, input_file)
+            
+            if code_pair and self._validate_code_pair(code_pair):
+                return code_pair
+            elif code_pair:
+                self._logger.warning(f"Skipping invalid code pair: {code_pair.identifier}")
+            return None
 
-        if not all_code_pairs:
-            raise DataSourceValidationError("No valid code pairs could be loaded")
+        except Exception as e:
+            self._log_error_with_context(e, {
+                "generated_file": str(generated_file),
+                "expected_file": str(expected_file) if expected_file else None,
+                "input_file": str(input_file) if input_file else None
+            })
+            return None
 
-        # Apply sampling
-        sampled_pairs = self._sample_data(all_code_pairs, sample_percentage)
+    def _get_file_size(self, file_path: Optional[Path]) -> int:
+        """
+        Get a file size, using the size recorded during discovery when known.
         
-        self._logger.info(f"Loaded {len(sampled_pairs)} code pairs ({sample_percentage}% of {len(all_code_pairs)} total)")
-        return sampled_pairs
-    
+        Args:
+            file_path: File to check, or None.
+            
+        Returns:
+            int: Size in bytes, 0 if the file is missing.
+        """
+        if file_path is None:
+            return 0
+        size = self._file_sizes.get(file_path)
+        if size is not None:
+            return size
+        return file_path.stat().st_size if file_path.exists() else 0
+
     def _create_standard_code_pair(self, generated_file: Path, expected_file: Optional[Path], input_file: Optional[Path] = None) -> Optional[CodePair]:
         """Create a code pair with immediate loading for standard-sized files."""
         # Load generated code (mandatory)
@@ -220,41 +438,31 @@ class FileSystemSource(DataSource):
         )
     
     def _create_lazy_code_pair(self, generated_file: Path, expected_file: Optional[Path], input_file: Optional[Path] = None) -> Optional[CodePair]:
-        """Create a code pair with lazy loading for large files."""
-        # Create lazy loaders
-        generated_loader = LazyLoader(lambda: self._read_file_with_fallback(generated_file))
-        expected_loader = None
-        if expected_file and expected_file.exists():
-            expected_loader = LazyLoader(lambda: self._read_file_with_fallback(expected_file))
+        """
+        Create a code pair with deferred loading for large files.
         
-        input_loader = None
-        if input_file and input_file.exists():
-            input_loader = LazyLoader(lambda: self._read_file_with_fallback(input_file))
-
-        # Check if we can at least read the files
-        try:
-            # Test read a small portion to ensure files are accessible
-            with open(generated_file, 'r', encoding='utf-8') as f:
-                f.read(100)  # Read first 100 chars to test
-        except Exception as e:
-            self._logger.warning(f"Cannot access generated file {generated_file}: {e}")
+        No file content is read here: the code fields are DeferredContent
+        backed by FileContentLoader, so the files are only read when the pair
+        is displayed and can be released again after the verdict.
+        """
+        # Check that the files are readable without reading them
+        if not os.access(generated_file, os.R_OK):
+            self._logger.warning(f"Cannot access generated file {generated_file}")
             return None
 
+        expected_content = None
         if expected_file and expected_file.exists():
-            try:
-                with open(expected_file, 'r', encoding='utf-8') as f:
-                    f.read(100)  # Read first 100 chars to test
-            except Exception as e:
-                self._logger.warning(f"Cannot access expected file {expected_file}: {e}")
-                expected_loader = None
+            if os.access(expected_file, os.R_OK):
+                expected_content = DeferredContent(FileContentLoader(expected_file))
+            else:
+                self._logger.warning(f"Cannot access expected file {expected_file}")
 
+        input_content = None
         if input_file and input_file.exists():
-            try:
-                with open(input_file, 'r', encoding='utf-8') as f:
-                    f.read(100)  # Read first 100 chars to test
-            except Exception as e:
-                self._logger.warning(f"Cannot access input file {input_file}: {e}")
-                input_loader = None
+            if os.access(input_file, os.R_OK):
+                input_content = DeferredContent(FileContentLoader(input_file))
+            else:
+                self._logger.warning(f"Cannot access input file {input_file}")
 
         # Create code pair with lazy content
         identifier = self._get_file_identifier(generated_file, expected_file, input_file)
@@ -273,10 +481,10 @@ class FileSystemSource(DataSource):
 
         return CodePair(
             identifier=identifier,
-            expected_code=expected_loader.content if expected_loader else None,
-            generated_code=generated_loader.content,
+            expected_code=expected_content,
+            generated_code=DeferredContent(FileContentLoader(generated_file), fallback=""),
             source_info=source_info,
-            input_code=input_loader.content if input_loader else None
+            input_code=input_content
         )
 
     def get_total_count(self) -> int:
@@ -299,39 +507,45 @@ class FileSystemSource(DataSource):
         Matches files by base name (ignoring extensions) and creates pairs.
         """
         self._file_pairs = []
+        self._replacement_index = None
 
         if not self.generated_folder:
             return
 
-        # Get all files from generated folder
-        generated_files = []
-        for file_path in self.generated_folder.rglob('*'):
-            if file_path.is_file() and self._is_code_file(file_path):
-                generated_files.append(file_path)
-
-        # Create mapping of base names to expected files
-        expected_files_map = {}
-        if self.expected_folder:
-            for file_path in self.expected_folder.rglob('*'):
-                if file_path.is_file() and self._is_code_file(file_path):
-                    base_name = self._get_base_name(file_path)
-                    expected_files_map[base_name] = file_path
+        roots = [self.generated_folder, self.expected_folder, self.input_folder]
+        index = self.index_cache.load(roots) if self.index_cache else None
+        previous_trees = index['trees'] if index else [None, None, None]
+        trusted_before_ns = index['scanned_at_ns'] - MTIME_GRANULARITY_NS if index else None
+        scanned_at_ns = time.time_ns()
+
+        # Scan the three folders concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            scans = list(executor.map(
+                lambda root, previous: self._scan_tree(root, previous, trusted_before_ns) if root else ({}, False),
+                roots, previous_trees
+            ))
+        trees = [tree for tree, _ in scans]
+        rescanned = any(changed for _, changed in scans)
+
+        self._file_sizes = {}
+        for root, tree in zip(roots, trees):
+            for relative_path, size, _ in iter_tree_files(tree):
+                self._file_sizes[root / relative_path] = size
+
+        if index and not rescanned:
+            # Nothing changed since the index was written, reuse its matching
+            triples = index['triples']
+        else:
+            triples = self._match_relative_paths(trees)
+            if self.index_cache:
+                self.index_cache.save(roots, scanned_at_ns, trees, triples)
 
-        # Create mapping of base names to input files
-        input_files_map = {}
-        if self.input_folder:
-            for file_path in self.input_folder.rglob('*'):
-                if file_path.is_file() and self._is_code_file(file_path):
-                    base_name = self._get_base_name(file_path)
-                    input_files_map[base_name] = file_path
-
-        # Match generated files with expected and input files
-        for generated_file in generated_files:
-            base_name = self._get_base_name(generated_file)
-            expected_file = expected_files_map.get(base_name)
-            input_file = input_files_map.get(base_name)
-            
-            self._file_pairs.append((generated_file, expected_file, input_file))
+        self._file_pairs = [
+            (self.generated_folder / generated,
+             self.expected_folder / expected if expected else None,
+             self.input_folder / input_path if input_path else None)
+            for generated, expected, input_path in triples
+        ]
 
         self._logger.info(f"Discovered {len(self._file_pairs)} file pairs")
         if self.expected_folder:
@@ -341,6 +555,72 @@ class FileSystemSource(DataSource):
             matched_input_count = sum(1 for _, _, input_file in self._file_pairs if input_file is not None)
             self._logger.info(f"Matched {matched_input_count} files with input counterparts")
 
+    def _scan_tree(self, root: Path, previous: Optional[DirectoryTree] = None,
+                   trusted_before_ns: Optional[int] = None) -> Tuple[DirectoryTree, bool]:
+        """
+        Walk a folder recording its code files.
+        
+        Args:
+            root: Folder to scan.
+            previous: Tree from the index cache, reused for unchanged directories.
+            trusted_before_ns: Directory mtimes at or after this time are listed again.
+            
+        Returns:
+            Tuple[DirectoryTree, bool]: The tree and whether any directory was listed.
+        """
+        return scan_directory_tree(
+            root, lambda name: self._is_code_file(Path(name)), previous, trusted_before_ns
+        )
+
+    def _scan_code_files(self, root: Path) -> List[Tuple[str, Path]]:
+        """
+        Recursively list the code files below a folder using os.scandir.
+        
+        Args:
+            root: Folder to scan.
+            
+        Returns:
+            List[Tuple[str, Path]]: (base name, file path) pairs sorted by
+            relative path, with base names as returned by _get_base_name.
+        """
+        tree, _ = self._scan_tree(root)
+        return [(self._relative_base_name(relative_path), root / relative_path)
+                for relative_path in sorted(path for path, _, _ in iter_tree_files(tree))]
+
+    @staticmethod
+    def _relative_base_name(relative_path: str) -> str:
+        """Strip the extension from a path relative to its root folder."""
+        return str(Path(relative_path).with_suffix(''))
+
+    def _match_relative_paths(self, trees: List[DirectoryTree]) -> List[List[Optional[str]]]:
+        """
+        Match generated files with expected and input files by base name.
+        
+        Args:
+            trees: Directory trees of the generated, expected and input folders.
+            
+        Returns:
+            List[List[Optional[str]]]: (generated, expected, input) paths relative
+            to their roots, sorted by generated path.
+        """
+        generated_tree, expected_tree, input_tree = trees
+        
+        # Later entries in sorted order win when several files share a base name
+        expected_files_map = {
+            self._relative_base_name(path): path
+            for path in sorted(path for path, _, _ in iter_tree_files(expected_tree))
+        }
+        input_files_map = {
+            self._relative_base_name(path): path
+            for path in sorted(path for path, _, _ in iter_tree_files(input_tree))
+        }
+        
+        triples = []
+        for generated in sorted(path for path, _, _ in iter_tree_files(generated_tree)):
+            base_name = self._relative_base_name(generated)
+            triples.append([generated, expected_files_map.get(base_name), input_files_map.get(base_name)])
+        return triples
+
     def _get_base_name(self, file_path: Path) -> str:
         """
         Get the base name of a file (without extension and relative to its root folder).
@@ -352,14 +632,17 @@ class FileSystemSource(DataSource):
             str: Base name for matching purposes.
         """
         # Get relative path from the appropriate root folder
-        if self.expected_folder and self.expected_folder in file_path.parents:
-            relative_path = file_path.relative_to(self.expected_folder)
-        elif self.input_folder and self.input_folder in file_path.parents:
-            relative_path = file_path.relative_to(self.input_folder)
-        elif self.generated_folder and self.generated_folder in file_path.parents:
-            relative_path = file_path.relative_to(self.generated_folder)
-        else:
-            relative_path = file_path
+        relative_path = file_path
+        for root in (self.expected_folder, self.input_folder, self.generated_folder):
+            if root is None:
+                continue
+            try:
+                candidate = file_path.relative_to(root)
+            except ValueError:
+                continue
+            if candidate.parts:
+                relative_path = candidate
+                break
 
         # Remove extension and return as string
         return str(relative_path.with_suffix(''))
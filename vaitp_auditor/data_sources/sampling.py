@@ -0,0 +1,216 @@
+"""
+Reproducible sampling primitives shared by the data sources.
+
+Every item is ranked by a deterministic pseudo-random key derived from the
+sampling seed and the item's position, and a sample is the set of items with
+the smallest keys. The same seed therefore selects the same items, in the
+same order, on any machine, whether the items come from a list, a stream or
+a database query ordering by the same key.
+"""
+
+import heapq
+import random
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+from ..core.models import CodePair
+
+
+T = TypeVar('T')
+
+# source_info fields a sample can be stratified by
+STRATIFY_FIELDS = ('model_name', 'prompting_strategy')
+
+
+def new_seed() -> int:
+    """
+    Draw a fresh sampling seed.
+
+    Returns:
+        int: Non-negative 63-bit seed.
+    """
+    return random.SystemRandom().randrange(2 ** 63)
+
+
+def sample_key(seed: int, position: int) -> int:
+    """
+    Deterministic pseudo-random sort key of an item (splitmix64 finalizer).
+
+    Args:
+        seed: Sampling seed.
+        position: Position of the item (or a database rowid).
+
+    Returns:
+        int: Non-negative 63-bit sort key.
+    """
+    mask = 0xFFFFFFFFFFFFFFFF
+    z = (seed * 0x9E3779B97F4A7C15 + position) & mask
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & mask
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & mask
+    return (z ^ (z >> 31)) >> 1
+
+
+def sample_keys(seed: int, start: int, count: int) -> np.ndarray:
+    """
+    Vectorised sample_key for a run of consecutive positions.
+
+    Args:
+        seed: Sampling seed.
+        start: Position of the first item.
+        count: Number of items.
+
+    Returns:
+        np.ndarray: uint64 keys, equal to sample_key(seed, start + i).
+    """
+    positions = np.arange(start, start + count, dtype=np.uint64)
+    z = np.uint64((seed * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) + positions
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return (z ^ (z >> np.uint64(31))) >> np.uint64(1)
+
+
+def sample_size(total: int, percentage: float) -> int:
+    """
+    Number of items sampled from a population.
+
+    Args:
+        total: Population size.
+        percentage: Percentage to sample (1-100).
+
+    Returns:
+        int: At least one item for a non-empty population, at most total.
+    """
+    if total <= 0:
+        return 0
+    if percentage >= 100:
+        return total
+    return min(total, max(1, int(total * percentage / 100)))
+
+
+def reservoir_sample(items: Iterable[T], size: int, seed: int) -> List[T]:
+    """
+    Sample a fixed number of items from an iterable in a single pass.
+
+    Only size items are held at any time (a bottom-k reservoir on the item
+    keys), so the iterable may be a stream far larger than memory.
+
+    Args:
+        items: Items to sample from.
+        size: Number of items to keep.
+        seed: Sampling seed.
+
+    Returns:
+        List[T]: Sampled items ordered by key.
+    """
+    if size <= 0:
+        return []
+
+    # Max-heap on the key through negation; the position breaks ties
+    reservoir: List[Tuple[int, int, T]] = []
+    for position, item in enumerate(items):
+        entry = (-sample_key(seed, position), position, item)
+        if len(reservoir) < size:
+            heapq.heappush(reservoir, entry)
+        elif entry[0] > reservoir[0][0]:
+            heapq.heapreplace(reservoir, entry)
+
+    return [item for _, _, item in sorted(reservoir, key=lambda entry: (-entry[0], entry[1]))]
+
+
+def stratum_of(code_pair: CodePair, stratify_by: Sequence[str]) -> Tuple:
+    """
+    Get the stratum of a code pair.
+
+    Args:
+        code_pair: Code pair to classify.
+        stratify_by: source_info fields defining the strata.
+
+    Returns:
+        Tuple: Values of the fields, None where missing.
+    """
+    source_info = code_pair.source_info or {}
+    return tuple(source_info.get(field) for field in stratify_by)
+
+
+def select_sample(items: Sequence[T], percentage: float, seed: int,
+                  stratum: Optional[Callable[[T], Hashable]] = None) -> List[T]:
+    """
+    Sample a percentage of a sequence, optionally per stratum.
+
+    With a stratum function, every stratum contributes the same percentage
+    of its own items (at least one), so small models or strategies are not
+    crowded out by large ones.
+
+    Args:
+        items: Items to sample from.
+        percentage: Percentage to sample (1-100).
+        seed: Sampling seed.
+        stratum: Optional function mapping an item to its stratum.
+
+    Returns:
+        List[T]: Sampled items ordered by key.
+    """
+    if stratum is None:
+        return reservoir_sample(items, sample_size(len(items), percentage), seed)
+
+    strata: Dict[Hashable, List[int]] = {}
+    for position, item in enumerate(items):
+        strata.setdefault(stratum(item), []).append(position)
+
+    selected = []
+    for positions in strata.values():
+        keyed = ((sample_key(seed, position), position) for position in positions)
+        selected.extend(heapq.nsmallest(sample_size(len(positions), percentage), keyed))
+
+    selected.sort()
+    return [items[position] for _, position in selected]
+
+
+class ShuffledIndex:
+    """
+    Positions 0..size-1 in a random order, drawn one at a time.
+
+    The order is precomputed once (the positions sorted by their sample
+    keys), so every draw only inspects the positions it skips. Rejected
+    positions are passed over for good; once the order is exhausted it is
+    reshuffled and scanned one more time.
+    """
+
+    def __init__(self, size: int, seed: Optional[int] = None):
+        """
+        Initialize the index.
+
+        Args:
+            size: Number of positions.
+            seed: Shuffling seed; a fresh seed is drawn if omitted.
+        """
+        self.size = size
+        self._order = self._shuffle(seed)
+        self._cursor = 0
+
+    def _shuffle(self, seed: Optional[int]) -> np.ndarray:
+        """Get the positions ordered by their sample keys."""
+        seed = new_seed() if seed is None else seed
+        return np.argsort(sample_keys(seed, 0, self.size), kind='stable')
+
+    def draw(self, accept: Callable[[int], bool]) -> Optional[int]:
+        """
+        Draw the next position accepted by a predicate.
+
+        Args:
+            accept: Predicate deciding whether a position can be returned.
+
+        Returns:
+            Optional[int]: Drawn position, or None if no position is accepted.
+        """
+        for rescan in (False, True):
+            if rescan:
+                self._order = self._shuffle(None)
+                self._cursor = 0
+            while self._cursor < self.size:
+                position = int(self._order[self._cursor])
+                self._cursor += 1
+                if accept(position):
+                    return position
+        return None
@@ -2,12 +2,63 @@
 SQLite data source implementation for the VAITP-Auditor system.
 """
 
+import os
+import re
 import sqlite3
+import threading
 import time
 import logging
-from typing import List, Optional, Dict, Any, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar, Collection, Iterator, List, Optional, Dict, Any, Sequence, Tuple
 from .base import DataSource, DataSourceError, DataSourceConnectionError, DataSourceConfigurationError
-from ..core.models import CodePair
+from .sampling import sample_key, sample_size as compute_sample_size
+from ..core.models import CodePair, SampleSpec
+
+
+@dataclass(frozen=True)
+class TableStatistics:
+    """
+    Row counts of a table per model and prompting strategy.
+    
+    Collected by one GROUP BY query; every filtered count is derived from it.
+    """
+    groups: Dict[Tuple[Optional[str], Optional[str]], Tuple[int, int]]  # (model, strategy) -> (rows, reviewable rows)
+    
+    @property
+    def total(self) -> int:
+        """Number of rows in the table."""
+        return sum(rows for rows, _ in self.groups.values())
+    
+    def filtered_count(self, selected_model: Optional[str] = None, selected_strategy: Optional[str] = None) -> int:
+        """Number of rows matching the model/strategy filters (None matches all)."""
+        return sum(rows for rows, _ in self._matching(selected_model, selected_strategy))
+    
+    def reviewable_count(self, selected_model: Optional[str] = None, selected_strategy: Optional[str] = None) -> int:
+        """Number of filtered rows that have an identifier."""
+        return sum(reviewable for _, reviewable in self._matching(selected_model, selected_strategy))
+    
+    def model_counts(self) -> Dict[str, int]:
+        """Number of rows per model, sorted by model."""
+        return self._counts_by(0)
+    
+    def strategy_counts(self) -> Dict[str, int]:
+        """Number of rows per prompting strategy, sorted by strategy."""
+        return self._counts_by(1)
+    
+    def _matching(self, selected_model: Optional[str], selected_strategy: Optional[str]) -> Iterator[Tuple[int, int]]:
+        for (model, strategy), counts in self.groups.items():
+            if (selected_model is None or model == selected_model) and \
+                    (selected_strategy is None or strategy == selected_strategy):
+                yield counts
+    
+    def _counts_by(self, field: int) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for key, (rows, _) in self.groups.items():
+            if key[field] is not None and key[field].strip():
+                counts[key[field]] = counts.get(key[field], 0) + rows
+        return dict(sorted(counts.items()))
 
 
 class SQLiteSource(DataSource):
@@ -16,7 +67,17 @@ class SQLiteSource(DataSource):
     
     Supports loading code pairs from SQLite databases with configurable
     table and column selection, connection retry logic, and proper error handling.
+    
+    All queries share one pooled read-only connection tuned for scans, which
+    also keeps the prepared statements of repeated queries cached. Filtered
+    counts and model/strategy listings can be sped up with the opt-in
+    create_covering_indexes(). The counts come from a single statistics query
+    per database state, shared by all instances (see get_statistics()).
     """
+    
+    _statistics_cache: ClassVar['OrderedDict[Tuple, TableStatistics]'] = OrderedDict()
+    _statistics_cache_lock: ClassVar[threading.Lock] = threading.Lock()
+    _statistics_cache_size: ClassVar[int] = 16
 
     def __init__(self):
         """Initialize SQLite data source."""
@@ -30,8 +91,14 @@ class SQLiteSource(DataSource):
         self._model_column: Optional[str] = None
         self._prompting_strategy_column: Optional[str] = None
         self._connection: Optional[sqlite3.Connection] = None
+        self._connection_key: Optional[Tuple[str, int, int]] = None  # (path, st_dev, st_ino) of the open file
+        self._connection_lock = threading.Lock()
+        self._cache_size_kib = 64 * 1024  # PRAGMA cache_size of the pooled connection
+        self._mmap_size = 256 * 1024 * 1024  # PRAGMA mmap_size of the pooled connection
+        self._cached_statements = 256
         self._max_retries = 3
         self._retry_delay = 1.0  # seconds
+        self._fetch_batch_size = 500  # Rows per fetchmany() / rowid IN (...) batch
 
     def configure(self) -> bool:
         """
@@ -114,14 +181,23 @@ class SQLiteSource(DataSource):
             })
             return False
 
-    def load_data(self, sample_percentage: float, selected_model: Optional[str] = None, selected_strategy: Optional[str] = None) -> List[CodePair]:
+    def load_data(self, sample_percentage: float, selected_model: Optional[str] = None,
+                  selected_strategy: Optional[str] = None, seed: Optional[int] = None,
+                  stratify_by: Sequence[str] = ()) -> List[CodePair]:
         """
         Load code pairs from the configured SQLite database.
         
+        Collects iter_pairs() into a list; prefer iter_pairs() for large samples.
+        
         Args:
             sample_percentage: Percentage of data to sample (1-100).
             selected_model: Optional specific model to filter by.
             selected_strategy: Optional specific prompting strategy to filter by.
+            seed: Optional sampling seed. The same seed always selects the same
+                records in the same order. A random seed is used if omitted.
+            stratify_by: Optional source_info fields ('model_name',
+                'prompting_strategy'); each combination of their values is
+                sampled separately, with at least one record each.
             
         Returns:
             List[CodePair]: List of code pairs ready for review.
@@ -130,9 +206,37 @@ class SQLiteSource(DataSource):
             ValueError: If sample_percentage is not between 1 and 100.
             RuntimeError: If data source is not properly configured.
         """
+        sample_spec = self._build_sample_spec(sample_percentage, seed, stratify_by,
+                                              selected_model, selected_strategy)
+        return list(self.iter_pairs(sample_spec))
+
+    def iter_pairs(self, sample_spec: SampleSpec) -> Iterator[CodePair]:
+        """
+        Iterate over a sample of the configured SQLite database.
+        
+        Sampling is done inside SQLite: only the rowids of the sampled records
+        are selected (ordered by a seeded hash of the rowid), and the rows
+        themselves are fetched in batches as the iterator advances, so memory
+        use is proportional to the batch size rather than to the table size.
+        
+        Args:
+            sample_spec: Sample to iterate over.
+            
+        Returns:
+            Iterator[CodePair]: Code pairs in sample order.
+            
+        Raises:
+            RuntimeError: If data source is not properly configured.
+        """
         self._validate_configured()
-        self._validate_sample_percentage(sample_percentage)
+        return self._iter_sample(sample_spec)
 
+    def _iter_sample(self, sample_spec: SampleSpec) -> Iterator[CodePair]:
+        """Generator behind iter_pairs()."""
+        sample_percentage = sample_spec.percentage
+        selected_model = sample_spec.selected_model
+        selected_strategy = sample_spec.selected_strategy
+        
         try:
             # Get counts for better logging
             total_count = self.get_total_count()
@@ -153,63 +257,79 @@ class SQLiteSource(DataSource):
             else:
                 self._logger.info(f"No filtering applied - using all {total_count} records")
             
-            # Load all data first (with optional filtering)
-            all_data = self._load_all_data(selected_model, selected_strategy)
+            # Count the records that can be reviewed (filtered, with an identifier)
+            available_count = self._count_reviewable_rows(selected_model, selected_strategy)
             
             # Cache total count
-            self._total_count = len(all_data)
+            self._total_count = available_count
             
-            # Debug logging for sampling
-            self._logger.info(f"After loading and validation: {len(all_data)} valid records available")
+            self._logger.info(f"After filtering and validation: {available_count} valid records available")
             
-            # Sample data if needed
-            sampled_data = self._sample_data(all_data, sample_percentage)
-            
-            # Debug logging for sampling result
-            expected_sample_size = max(1, int(len(all_data) * sample_percentage / 100))
-            self._logger.info(f"Sampling {sample_percentage}% of {len(all_data)} records: "
-                            f"expected {expected_sample_size}, got {len(sampled_data)}")
+            # Select the sample inside SQLite; rows are streamed while iterating
+            if sample_percentage >= 100:
+                sample_size = available_count
+                code_pairs = self._iter_all_pairs(selected_model, selected_strategy)
+            else:
+                seed = self._resolve_seed(sample_spec.seed)
+                sampled_rowids = self._select_sample_rowids(
+                    selected_model, selected_strategy, sample_percentage, seed,
+                    sample_spec.stratify_by, available_count
+                )
+                if sampled_rowids is None:
+                    sampled_data = self._sample_data(
+                        self._load_all_data(selected_model, selected_strategy),
+                        sample_percentage, seed, sample_spec.stratify_by
+                    )
+                    sample_size = len(sampled_data)
+                    code_pairs = iter(sampled_data)
+                else:
+                    sample_size = len(sampled_rowids)
+                    code_pairs = self._iter_pairs_by_rowid(sampled_rowids)
+                
+                self._logger.info(f"Sampling {sample_percentage}% of {available_count} records with seed {seed}: "
+                                f"selected {sample_size}")
+            self._sample_size_hint = sample_size
             
-            self._logger.info(f"Final result: loaded {len(sampled_data)} code pairs from SQLite database "
-                            f"({sample_percentage}% of {len(all_data)} valid records{filter_str})")
+            self._logger.info(f"Final result: selected {sample_size} code pairs from SQLite database "
+                            f"({sample_percentage}% of {available_count} valid records{filter_str})")
             
             # Add explanation if the result is different from what might be expected
-            if filter_info and len(all_data) < filtered_count:
+            if filter_info and available_count < filtered_count:
                 self._logger.warning(f"Note: Some records were excluded during validation. "
                                    f"Started with {filtered_count} filtered records, "
-                                   f"but only {len(all_data)} passed validation.")
+                                   f"but only {available_count} passed validation.")
             
             if sample_percentage < 100:
                 naive_expectation = max(1, int(total_count * sample_percentage / 100))
-                if len(sampled_data) != naive_expectation:
+                if sample_size != naive_expectation:
                     self._logger.info(f"Sampling explanation: {sample_percentage}% of {total_count} total records would be {naive_expectation}, "
-                                    f"but filtering and validation resulted in {len(sampled_data)} records")
+                                    f"but filtering and validation resulted in {sample_size} records")
                     
             # Print user-friendly summary
             print(f"\n📊 Data Loading Summary:")
             print(f"   • Total records in database: {total_count}")
             if filter_info:
                 print(f"   • Records after filtering{filter_str}: {filtered_count}")
-                if len(all_data) < filtered_count:
-                    excluded_count = filtered_count - len(all_data)
+                if available_count < filtered_count:
+                    excluded_count = filtered_count - available_count
                     print(f"   • Records excluded (empty/invalid data): {excluded_count}")
-                    print(f"   • Valid records after validation: {len(all_data)}")
+                    print(f"   • Valid records after validation: {available_count}")
             print(f"   • Sample percentage requested: {sample_percentage}%")
-            print(f"   • Final records selected for review: {len(sampled_data)}")
+            print(f"   • Final records selected for review: {sample_size}")
             
             # Explain why the result might be different from expectations
             if filter_info:
                 naive_expectation = max(1, int(total_count * sample_percentage / 100))
-                if len(sampled_data) != naive_expectation:
-                    print(f"   • Note: Expected {sample_percentage}% of {total_count} total = {naive_expectation}, but got {len(sampled_data)}")
+                if sample_size != naive_expectation:
+                    print(f"   • Note: Expected {sample_percentage}% of {total_count} total = {naive_expectation}, but got {sample_size}")
                     print(f"     This is because filtering reduced the available dataset")
                     
-                if len(all_data) < filtered_count:
+                if available_count < filtered_count:
                     print(f"   • Note: {excluded_count} records were excluded due to missing identifiers")
                     print(f"     Empty generated_code is included as reviewable failure cases")
             print()
             
-            return sampled_data
+            yield from code_pairs
 
         except Exception as e:
             self._log_error_with_context(e, {
@@ -237,12 +357,8 @@ class SQLiteSource(DataSource):
             return self._total_count
         
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"SELECT COUNT(*) FROM {self._table_name}")
-                count = cursor.fetchone()[0]
-                self._total_count = count
-                return count
+            self._total_count = self.get_statistics().total
+            return self._total_count
                 
         except Exception as e:
             self._log_error_with_context(e, {
@@ -265,32 +381,9 @@ class SQLiteSource(DataSource):
         self._validate_configured()
         
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Build WHERE clause for filtering
-                where_conditions = []
-                query_params = []
-                
-                if selected_model and self._model_column:
-                    where_conditions.append(f"{self._model_column} = ?")
-                    query_params.append(selected_model)
-                
-                if selected_strategy and self._prompting_strategy_column:
-                    where_conditions.append(f"{self._prompting_strategy_column} = ?")
-                    query_params.append(selected_strategy)
-                
-                where_clause = f" WHERE {' AND '.join(where_conditions)}" if where_conditions else ""
-                query = f"SELECT COUNT(*) FROM {self._table_name}{where_clause}"
-                
-                cursor.execute(query, query_params)
-                count = cursor.fetchone()[0]
-                
-                self._logger.debug(f"Filtered count query: {query}")
-                self._logger.debug(f"Query parameters: {query_params}")
-                self._logger.debug(f"Filtered count result: {count}")
-                
-                return count
+            count = self.get_statistics().filtered_count(*self._statistics_filters(selected_model, selected_strategy))
+            self._logger.debug(f"Filtered count result: {count}")
+            return count
                 
         except Exception as e:
             self._log_error_with_context(e, {
@@ -301,9 +394,167 @@ class SQLiteSource(DataSource):
             })
             raise DataSourceError(f"Failed to get filtered count from SQLite database: {e}")
 
+    def get_statistics(self) -> TableStatistics:
+        """
+        Get the row counts of the table per model and prompting strategy.
+        
+        A single GROUP BY pass (an index scan with covering indexes) yields
+        the total, filtered and reviewable counts for every filter. The result
+        is cached per configuration fingerprint - database file state, table
+        and columns - and shared by all SQLiteSource instances, so the setup
+        wizard, the loading summary and the sampler query the table once.
+        
+        Returns:
+            TableStatistics: Row counts of the configured table.
+            
+        Raises:
+            DataSourceError: If the statistics cannot be queried.
+        """
+        fingerprint = self._statistics_fingerprint()
+        with self._statistics_cache_lock:
+            statistics = self._statistics_cache.get(fingerprint)
+            if statistics is not None:
+                self._statistics_cache.move_to_end(fingerprint)
+                return statistics
+        
+        model_expr = self._model_column or 'NULL'
+        strategy_expr = self._prompting_strategy_column or 'NULL'
+        if self._identifier_column:
+            reviewable_expr = f"SUM({self._identifier_column} IS NOT NULL AND {self._identifier_column} != '')"
+        else:
+            reviewable_expr = "COUNT(*)"
+        query = (f"SELECT {model_expr}, {strategy_expr}, COUNT(*), {reviewable_expr} "
+                 f"FROM {self._table_name} GROUP BY 1, 2")
+        
+        try:
+            cursor = self._get_connection().cursor()
+            try:
+                cursor.execute(query)
+                groups = {
+                    (None if model is None else str(model), None if strategy is None else str(strategy)):
+                        (rows, reviewable or 0)
+                    for model, strategy, rows, reviewable in cursor.fetchall()
+                }
+            finally:
+                cursor.close()
+        except sqlite3.Error as e:
+            raise DataSourceError(f"Failed to query table statistics: {e}")
+        
+        statistics = TableStatistics(groups)
+        self._logger.debug(f"Table statistics of {self._table_name}: {statistics.total} rows in {len(groups)} groups")
+        with self._statistics_cache_lock:
+            self._statistics_cache[fingerprint] = statistics
+            while len(self._statistics_cache) > self._statistics_cache_size:
+                self._statistics_cache.popitem(last=False)
+        return statistics
+
+    def _statistics_fingerprint(self) -> Tuple:
+        """
+        Identify the table contents and the columns the statistics depend on.
+        
+        Returns:
+            Tuple: Database file (and WAL file) state, table and columns.
+        """
+        db_path = os.path.abspath(self._db_path)
+        file_states = []
+        for path in (db_path, f"{db_path}-wal"):
+            try:
+                file_stat = os.stat(path)
+                file_states.append((file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns))
+            except FileNotFoundError:
+                file_states.append(None)
+        return (db_path, *file_states, self._table_name, self._model_column,
+                self._prompting_strategy_column, self._identifier_column)
+
+    def _statistics_filters(self, selected_model: Optional[str],
+                            selected_strategy: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Drop the filters on columns that are not configured, as _build_where_clause does."""
+        return (selected_model if self._model_column else None,
+                selected_strategy if self._prompting_strategy_column else None)
+
+    def get_distinct_values(self, columns: List[str]) -> Dict[str, List[str]]:
+        """
+        Get the sorted distinct non-empty values of some columns.
+        
+        Used to list the models and prompting strategies available for
+        filtering; with covering indexes these are index scans.
+        
+        Args:
+            columns: Column names; columns missing from the table are ignored.
+        
+        Returns:
+            Dict[str, List[str]]: Distinct values per existing column.
+        """
+        available = set(self._get_table_columns(self._table_name))
+        columns = [column for column in dict.fromkeys(columns) if column and column in available]
+        
+        distinct = {}
+        cursor = self._get_connection().cursor()
+        try:
+            for column in columns:
+                cursor.execute(
+                    f"SELECT DISTINCT {column} FROM {self._table_name} WHERE {column} IS NOT NULL ORDER BY {column}"
+                )
+                distinct[column] = [str(row[0]) for row in cursor.fetchall() if str(row[0]).strip()]
+        finally:
+            cursor.close()
+        return distinct
+
+    def create_covering_indexes(self) -> List[str]:
+        """
+        Create indexes covering the model/strategy filters and the identifier.
+        
+        Opt-in, as it writes to the database: filtered counts and distinct
+        model/strategy listings then scan an index instead of the table.
+        Indexes that already exist are kept.
+        
+        Returns:
+            List[str]: Names of the covering indexes.
+        
+        Raises:
+            DataSourceError: If the indexes cannot be created (e.g. the
+            database file is read-only).
+        """
+        if not self._db_path or not self._table_name or not self._identifier_column:
+            raise DataSourceConfigurationError("Database, table and identifier column must be configured")
+        
+        if self._model_column:
+            indexed = {'filters': [self._model_column, self._prompting_strategy_column, self._identifier_column]}
+        else:
+            indexed = {'identifier': [self._identifier_column]}
+        if self._prompting_strategy_column:
+            indexed['strategy'] = [self._prompting_strategy_column, self._identifier_column]
+        
+        table_slug = re.sub(r'\W', '_', self._table_name)
+        statements = {}
+        for kind, columns in indexed.items():
+            column_list = ', '.join(f'"{column}"' for column in columns if column)
+            statements[f"vaitp_{table_slug}_{kind}"] = column_list
+        
+        try:
+            conn = sqlite3.connect(self._db_path)
+            try:
+                for index_name, column_list in statements.items():
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{self._table_name}" ({column_list})')
+                conn.commit()
+                conn.execute("PRAGMA optimize")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            raise DataSourceError(f"Failed to create covering indexes: {e}")
+        
+        # The pooled connection may be immutable and miss the new schema
+        self.close()
+        self._logger.info(f"Covering indexes on {self._table_name}: {', '.join(statements)}")
+        return list(statements)
+
     def _get_connection(self) -> sqlite3.Connection:
         """
-        Get database connection with retry logic.
+        Get the pooled read-only database connection, connecting with retry logic.
+        
+        The connection is opened once and shared by all queries; it is
+        reopened when the database file is replaced or removed. Callers must
+        not close it.
         
         Returns:
             sqlite3.Connection: Database connection.
@@ -311,20 +562,62 @@ class SQLiteSource(DataSource):
         Raises:
             DataSourceConnectionError: If connection fails after retries.
         """
-        for attempt in range(self._max_retries):
+        with self._connection_lock:
+            for attempt in range(self._max_retries):
+                try:
+                    file_stat = os.stat(self._db_path)
+                    key = (self._db_path, file_stat.st_dev, file_stat.st_ino)
+                    if self._connection is None or self._connection_key != key:
+                        self._close_connection()
+                        self._connection = self._open_read_only_connection()
+                        self._connection_key = key
+                    return self._connection
+                    
+                except (OSError, sqlite3.Error) as e:
+                    if attempt < self._max_retries - 1:
+                        self._logger.warning(f"Database connection attempt {attempt + 1} failed: {e}. "
+                                           f"Retrying in {self._retry_delay} seconds...")
+                        time.sleep(self._retry_delay)
+                        self._retry_delay *= 2  # Exponential backoff
+                    else:
+                        raise DataSourceConnectionError(f"Failed to connect to database after {self._max_retries} attempts: {e}")
+
+    def _open_read_only_connection(self) -> sqlite3.Connection:
+        """
+        Open the database read-only and tune the connection for large scans.
+        
+        The file is opened as immutable, which skips locking altogether, only
+        if nothing can change it: it is not writable and has no WAL file.
+        
+        Returns:
+            sqlite3.Connection: New connection.
+        """
+        uri = Path(self._db_path).resolve().as_uri() + "?mode=ro"
+        if not os.access(self._db_path, os.W_OK) and not os.path.exists(f"{self._db_path}-wal"):
+            uri += "&immutable=1"
+        
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                               cached_statements=self._cached_statements)
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        conn.execute(f"PRAGMA cache_size = -{self._cache_size_kib}")
+        conn.execute(f"PRAGMA mmap_size = {self._mmap_size}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    def _close_connection(self) -> None:
+        """Close the pooled connection, if open."""
+        if self._connection is not None:
             try:
-                conn = sqlite3.connect(self._db_path)
-                conn.row_factory = sqlite3.Row  # Enable column access by name
-                return conn
-                
-            except sqlite3.Error as e:
-                if attempt < self._max_retries - 1:
-                    self._logger.warning(f"Database connection attempt {attempt + 1} failed: {e}. "
-                                       f"Retrying in {self._retry_delay} seconds...")
-                    time.sleep(self._retry_delay)
-                    self._retry_delay *= 2  # Exponential backoff
-                else:
-                    raise DataSourceConnectionError(f"Failed to connect to database after {self._max_retries} attempts: {e}")
+                self._connection.close()
+            except sqlite3.Error:
+                pass  # Ignore cleanup errors
+            self._connection = None
+            self._connection_key = None
+
+    def close(self) -> None:
+        """Close the pooled database connection; it is reopened on the next query."""
+        with self._connection_lock:
+            self._close_connection()
 
     def _get_available_tables(self) -> List[str]:
         """
@@ -454,6 +747,220 @@ class SQLiteSource(DataSource):
             print(f"Error: Configuration validation failed: {e}")
             return False
 
+    def _get_select_columns(self) -> List[str]:
+        """
+        Get the configured columns in the order expected by _row_to_code_pair.
+        
+        Returns:
+            List[str]: Column names to select.
+        """
+        columns = [self._identifier_column, self._generated_code_column]
+        if self._expected_code_column:
+            columns.append(self._expected_code_column)
+        if self._input_code_column:
+            columns.append(self._input_code_column)
+        if self._model_column:
+            columns.append(self._model_column)
+        if self._prompting_strategy_column:
+            columns.append(self._prompting_strategy_column)
+        return columns
+
+    def _build_where_clause(self, selected_model: Optional[str] = None, selected_strategy: Optional[str] = None,
+                            require_identifier: bool = False) -> Tuple[str, List[Any]]:
+        """
+        Build the WHERE clause for the model/strategy filters.
+        
+        Args:
+            selected_model: Optional specific model to filter by.
+            selected_strategy: Optional specific prompting strategy to filter by.
+            require_identifier: Also exclude rows with an empty identifier.
+            
+        Returns:
+            Tuple[str, List[Any]]: WHERE clause (possibly empty) and its parameters.
+        """
+        where_conditions = []
+        query_params = []
+        
+        if selected_model and self._model_column:
+            where_conditions.append(f"{self._model_column} = ?")
+            query_params.append(selected_model)
+        
+        if selected_strategy and self._prompting_strategy_column:
+            where_conditions.append(f"{self._prompting_strategy_column} = ?")
+            query_params.append(selected_strategy)
+        
+        if require_identifier:
+            where_conditions.append(f"{self._identifier_column} IS NOT NULL AND {self._identifier_column} != ''")
+        
+        where_clause = f" WHERE {' AND '.join(where_conditions)}" if where_conditions else ""
+        return where_clause, query_params
+
+    def _count_reviewable_rows(self, selected_model: Optional[str] = None, selected_strategy: Optional[str] = None) -> int:
+        """
+        Count filtered rows that have an identifier and can therefore be reviewed.
+        
+        Args:
+            selected_model: Optional specific model to filter by.
+            selected_strategy: Optional specific prompting strategy to filter by.
+            
+        Returns:
+            int: Number of reviewable rows.
+        """
+        return self.get_statistics().reviewable_count(*self._statistics_filters(selected_model, selected_strategy))
+
+    @staticmethod
+    def _seeded_sample_key(seed: int, rowid: int) -> int:
+        """
+        Deterministic pseudo-random sort key for a row (splitmix64 finalizer).
+        
+        Registered as an SQL function so that ORDER BY ... LIMIT selects a
+        reproducible random sample for a given seed on any machine.
+        
+        Args:
+            seed: Sampling seed.
+            rowid: SQLite rowid of the record.
+            
+        Returns:
+            int: Non-negative 63-bit sort key.
+        """
+        return sample_key(seed, rowid)
+
+    def _iter_rows(self, cursor: sqlite3.Cursor) -> Iterator[sqlite3.Row]:
+        """
+        Stream rows from an executed cursor in fetchmany() batches.
+        
+        Args:
+            cursor: Cursor with an executed SELECT statement.
+            
+        Yields:
+            sqlite3.Row: Result rows.
+        """
+        while True:
+            rows = cursor.fetchmany(self._fetch_batch_size)
+            if not rows:
+                break
+            yield from rows
+
+    def _row_to_code_pair(self, row: sqlite3.Row, row_number: int) -> Optional[CodePair]:
+        """
+        Convert a result row (columns as in _get_select_columns) to a CodePair.
+        
+        Args:
+            row: Result row.
+            row_number: Position of the row in the result, for logging.
+            
+        Returns:
+            Optional[CodePair]: The code pair, or None if the row is invalid.
+        """
+        # Get row data by column name (row is a sqlite3.Row object)
+        identifier = str(row[0]) if row[0] else ""  # First column is identifier
+        generated_code = str(row[1]) if row[1] else ""  # Second column is generated code
+        expected_code = None
+        input_code = None
+        
+        # Handle expected code (third column if present)
+        col_index = 2
+        if self._expected_code_column and len(row) > col_index:
+            if row[col_index]:
+                expected_code = str(row[col_index])
+            col_index += 1
+        
+        # Handle input code (fourth column if present)
+        if self._input_code_column and len(row) > col_index:
+            if row[col_index]:
+                input_code = str(row[col_index])
+            col_index += 1
+        
+        # Handle model column (fifth column if present)
+        model_name = None
+        if self._model_column and len(row) > col_index:
+            if row[col_index]:
+                model_name = str(row[col_index])
+            col_index += 1
+        
+        # Handle prompting strategy column (sixth column if present)
+        prompting_strategy = None
+        if self._prompting_strategy_column and len(row) > col_index:
+            if row[col_index]:
+                prompting_strategy = str(row[col_index])
+        
+        # Skip rows with empty identifier (but allow empty generated_code for review)
+        if not identifier:
+            self._logger.warning(f"Skipping row {row_number} with empty identifier")
+            return None
+        
+        # Allow empty generated_code - it's a valid failure case for review
+        if not generated_code:
+            generated_code = ""  # Ensure it's an empty string, not None
+            self._logger.debug(f"Row {row_number} has empty generated_code - including for review as failure case")
+        
+        source_info = {
+            'source_type': 'sqlite',
+            'database_path': self._db_path,
+            'table_name': self._table_name,
+            'identifier_column': self._identifier_column,
+            'generated_code_column': self._generated_code_column,
+            'expected_code_column': self._expected_code_column,
+            'input_code_column': self._input_code_column,
+            'model_column': self._model_column,
+            'prompting_strategy_column': self._prompting_strategy_column,
+            'model_name': model_name,
+            'prompting_strategy': prompting_strategy
+        }
+        
+        code_pair = CodePair(
+            identifier=identifier,
+            expected_code=expected_code,
+            generated_code=generated_code,
+            source_info=source_info,
+            input_code=input_code
+        )
+        
+        if not self._validate_code_pair(code_pair):
+            self._logger.warning(f"Skipping invalid code pair with identifier: {identifier} "
+                               f"(validation failed)")
+            return None
+        
+        return code_pair
+
+    def _iter_code_pairs(self, rows: Iterator[sqlite3.Row], source: str,
+                         with_rowid: bool = False) -> Iterator[CodePair]:
+        """
+        Convert streamed rows to code pairs, skipping invalid rows.
+        
+        Args:
+            rows: Row iterator.
+            source: Name of the calling loader, for logging.
+            with_rowid: Whether the rows start with their rowid, which is
+                recorded in the source_info of the code pairs.
+            
+        Yields:
+            CodePair: Valid code pairs in row order.
+        """
+        skipped_count = 0
+        processed_count = 0
+        
+        for row in rows:
+            processed_count += 1
+            rowid = None
+            try:
+                if with_rowid:
+                    rowid, row = row[0], row[1:]
+                code_pair = self._row_to_code_pair(row, processed_count)
+            except Exception as e:
+                self._logger.error(f"Error processing row {processed_count}: {e}")
+                code_pair = None
+            
+            if code_pair is None:
+                skipped_count += 1
+            else:
+                if rowid is not None:
+                    code_pair.source_info['rowid'] = rowid
+                yield code_pair
+        
+        self._logger.info(f"{source} completed: processed {processed_count} rows, "
+                          f"loaded {processed_count - skipped_count} valid code pairs, skipped {skipped_count} invalid rows")
+
     def _load_all_data(self, selected_model: Optional[str] = None, selected_strategy: Optional[str] = None) -> List[CodePair]:
         """
         Load all data from the configured database table.
@@ -465,138 +972,237 @@ class SQLiteSource(DataSource):
         Returns:
             List[CodePair]: List of all code pairs.
         """
-        code_pairs = []
-        skipped_count = 0
-        processed_count = 0
+        return list(self._iter_all_pairs(selected_model, selected_strategy))
+
+    def _iter_all_pairs(self, selected_model: Optional[str] = None,
+                        selected_strategy: Optional[str] = None) -> Iterator[CodePair]:
+        """
+        Stream all code pairs of the configured database table.
+        
+        Rows are fetched with fetchmany() as the iterator advances.
+        
+        Args:
+            selected_model: Optional specific model to filter by.
+            selected_strategy: Optional specific prompting strategy to filter by.
         
+        Yields:
+            CodePair: Valid code pairs in table order.
+        """
+        cursor = None
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Build query with all configured columns
-                columns = [self._identifier_column, self._generated_code_column]
-                if self._expected_code_column:
-                    columns.append(self._expected_code_column)
-                if self._input_code_column:
-                    columns.append(self._input_code_column)
-                if self._model_column:
-                    columns.append(self._model_column)
-                if self._prompting_strategy_column:
-                    columns.append(self._prompting_strategy_column)
-                
-                # Build WHERE clause for filtering
-                where_conditions = []
-                query_params = []
-                
-                if selected_model and self._model_column:
-                    where_conditions.append(f"{self._model_column} = ?")
-                    query_params.append(selected_model)
-                
-                if selected_strategy and self._prompting_strategy_column:
-                    where_conditions.append(f"{self._prompting_strategy_column} = ?")
-                    query_params.append(selected_strategy)
-                
-                where_clause = f" WHERE {' AND '.join(where_conditions)}" if where_conditions else ""
-                query = f"SELECT {', '.join(columns)} FROM {self._table_name}{where_clause}"
-                
-                # Debug logging for query
-                self._logger.debug(f"Executing query: {query}")
-                self._logger.debug(f"Query parameters: {query_params}")
-                
-                cursor.execute(query, query_params)
-                
-                for row in cursor.fetchall():
-                    processed_count += 1
-                    try:
-                        # Get row data by column name (row is a sqlite3.Row object)
-                        identifier = str(row[0]) if row[0] else ""  # First column is identifier
-                        generated_code = str(row[1]) if row[1] else ""  # Second column is generated code
-                        expected_code = None
-                        input_code = None
-                        
-                        # Handle expected code (third column if present)
-                        col_index = 2
-                        if self._expected_code_column and len(row) > col_index:
-                            if row[col_index]:
-                                expected_code = str(row[col_index])
-                            col_index += 1
-                        
-                        # Handle input code (fourth column if present)
-                        if self._input_code_column and len(row) > col_index:
-                            if row[col_index]:
-                                input_code = str(row[col_index])
-                            col_index += 1
-                        
-                        # Handle model column (fifth column if present)
-                        model_name = None
-                        if self._model_column and len(row) > col_index:
-                            if row[col_index]:
-                                model_name = str(row[col_index])
-                            col_index += 1
-                        
-                        # Handle prompting strategy column (sixth column if present)
-                        prompting_strategy = None
-                        if self._prompting_strategy_column and len(row) > col_index:
-                            if row[col_index]:
-                                prompting_strategy = str(row[col_index])
-                        
-                        # Skip rows with empty identifier (but allow empty generated_code for review)
-                        if not identifier:
-                            skipped_count += 1
-                            self._logger.warning(f"Skipping row {processed_count} with empty identifier")
-                            continue
-                        
-                        # Allow empty generated_code - it's a valid failure case for review
-                        if not generated_code:
-                            generated_code = ""  # Ensure it's an empty string, not None
-                            self._logger.debug(f"Row {processed_count} has empty generated_code - including for review as failure case")
-                        
-                        # Debug logging for input code
-                        if input_code:
-                            self._logger.debug(f"Loaded input code for {identifier}: {len(input_code)} characters")
-                        else:
-                            self._logger.debug(f"No input code for {identifier}")
-                        
-                        source_info = {
-                            'source_type': 'sqlite',
-                            'database_path': self._db_path,
-                            'table_name': self._table_name,
-                            'identifier_column': self._identifier_column,
-                            'generated_code_column': self._generated_code_column,
-                            'expected_code_column': self._expected_code_column,
-                            'input_code_column': self._input_code_column,
-                            'model_column': self._model_column,
-                            'prompting_strategy_column': self._prompting_strategy_column,
-                            'model_name': model_name,
-                            'prompting_strategy': prompting_strategy
-                        }
-                        
-                        code_pair = CodePair(
-                            identifier=identifier,
-                            expected_code=expected_code,
-                            generated_code=generated_code,
-                            source_info=source_info,
-                            input_code=input_code
-                        )
-                        
-                        if self._validate_code_pair(code_pair):
-                            code_pairs.append(code_pair)
-                        else:
-                            skipped_count += 1
-                            self._logger.warning(f"Skipping invalid code pair with identifier: {identifier} "
-                                               f"(validation failed)")
-                            
-                    except Exception as e:
-                        skipped_count += 1
-                        self._logger.error(f"Error processing row {processed_count}: {e}")
-                        continue
+            cursor = self._get_connection().cursor()
+            
+            where_clause, query_params = self._build_where_clause(selected_model, selected_strategy)
+            query = f"SELECT {', '.join(self._get_select_columns())} FROM {self._table_name}{where_clause}"
+            
+            # Debug logging for query
+            self._logger.debug(f"Executing query: {query}")
+            self._logger.debug(f"Query parameters: {query_params}")
+            
+            cursor.execute(query, query_params)
+            yield from self._iter_code_pairs(self._iter_rows(cursor), "_load_all_data")
                         
         except Exception as e:
             raise DataSourceError(f"Failed to load data from database: {e}")
+        finally:
+            if cursor is not None:
+                cursor.close()
+
+    def _select_sample_rowids(self, selected_model: Optional[str], selected_strategy: Optional[str],
+                              sample_percentage: float, seed: int, stratify_by: Sequence[str],
+                              available_count: int) -> Optional[List[int]]:
+        """
+        Select the rowids of a reproducible random sample inside SQLite.
+        
+        Rows are ordered by a seeded hash of the rowid and the first ones are
+        kept. When stratifying, a window function ranks the rows of every
+        model/strategy partition by the same key and the rows ranked within
+        the partition's share are kept, at least one per partition.
+        
+        Args:
+            selected_model: Optional specific model to filter by.
+            selected_strategy: Optional specific prompting strategy to filter by.
+            sample_percentage: Percentage of data (of every stratum) to sample.
+            seed: Sampling seed.
+            stratify_by: Optional source_info fields defining the strata.
+            available_count: Number of reviewable rows.
+            
+        Returns:
+            Optional[List[int]]: Rowids in sample order, or None if the table
+            cannot be sampled by rowid (WITHOUT ROWID tables, or SQLite builds
+            without window functions).
+        """
+        field_columns = {'model_name': self._model_column, 'prompting_strategy': self._prompting_strategy_column}
+        partition_columns = [field_columns[field] for field in stratify_by if field_columns[field]]
+        
+        where_clause, query_params = self._build_where_clause(
+            selected_model, selected_strategy, require_identifier=True
+        )
+        if partition_columns:
+            partition = ', '.join(partition_columns)
+            query = (
+                f"SELECT rowid FROM ("
+                f"SELECT rowid, vaitp_sample_key(rowid) AS sample_key, "
+                f"ROW_NUMBER() OVER (PARTITION BY {partition} ORDER BY vaitp_sample_key(rowid), rowid) AS stratum_rank, "
+                f"COUNT(*) OVER (PARTITION BY {partition}) AS stratum_size "
+                f"FROM {self._table_name}{where_clause}"
+                f") WHERE stratum_rank <= MAX(1, CAST(stratum_size * ? / 100 AS INTEGER)) "
+                f"ORDER BY sample_key, rowid"
+            )
+            query_params = query_params + [float(sample_percentage)]
+        else:
+            # Every record falls into the same stratum
+            sample_size = compute_sample_size(available_count, sample_percentage)
+            if sample_size <= 0:
+                return []
+            query = (f"SELECT rowid FROM {self._table_name}{where_clause} "
+                     f"ORDER BY vaitp_sample_key(rowid) LIMIT ?")
+            query_params = query_params + [sample_size]
+        
+        conn = self._get_connection()
+        conn.create_function(
+            'vaitp_sample_key', 1,
+            lambda rowid: self._seeded_sample_key(seed, rowid),
+            deterministic=True
+        )
+        cursor = conn.cursor()
+        try:
+            try:
+                cursor.execute(query, query_params)
+            except sqlite3.OperationalError as e:
+                self._logger.warning(f"Sampling by rowid unavailable ({e}), sampling in memory instead")
+                return None
+            
+            sampled_rowids = [row[0] for row in self._iter_rows(cursor)]
+            self._logger.debug(f"Selected {len(sampled_rowids)} sampled rowids with seed {seed}")
+            return sampled_rowids
+        finally:
+            cursor.close()
+
+    def _iter_pairs_by_rowid(self, rowids: List[int]) -> Iterator[CodePair]:
+        """
+        Fetch rows in batches of rowids as the iterator advances, keeping the rowid order.
+        
+        Args:
+            rowids: Rowids of the rows to fetch.
+            
+        Yields:
+            CodePair: Valid code pairs in rowid list order.
+        """
+        columns = ', '.join(self._get_select_columns())
+        cursor = self._get_connection().cursor()
+        try:
+            
+            def iter_rows_by_id() -> Iterator[sqlite3.Row]:
+                for start in range(0, len(rowids), self._fetch_batch_size):
+                    batch = rowids[start:start + self._fetch_batch_size]
+                    placeholders = ', '.join('?' * len(batch))
+                    cursor.execute(
+                        f"SELECT rowid, {columns} FROM {self._table_name} WHERE rowid IN ({placeholders})",
+                        batch
+                    )
+                    rows_by_id = {row[0]: row for row in self._iter_rows(cursor)}
+                    for rowid in batch:
+                        if rowid in rows_by_id:
+                            yield rows_by_id[rowid]
+            
+            yield from self._iter_code_pairs(iter_rows_by_id(), "_load_sampled_data", with_rowid=True)
+        finally:
+            cursor.close()
+
+    def source_ref(self, code_pair: CodePair) -> Optional[Dict[str, Any]]:
+        """
+        Get the rowid of a sampled code pair.
+        
+        Args:
+            code_pair: Code pair produced by this source.
+            
+        Returns:
+            Optional[Dict[str, Any]]: The rowid, or None for pairs loaded by a
+            full table scan.
+        """
+        rowid = (code_pair.source_info or {}).get('rowid')
+        return {'rowid': rowid} if rowid is not None else None
+
+    def _load_referenced_pairs(self, references: List[Dict[str, Any]]) -> Dict[str, CodePair]:
+        """
+        Fetch code pairs by rowid.
+        
+        Args:
+            references: References returned by source_ref().
+            
+        Returns:
+            Dict[str, CodePair]: Loaded code pairs by identifier.
+        """
+        rowids = [reference['rowid'] for reference in references if reference.get('rowid') is not None]
+        if not rowids:
+            return {}
+        return {code_pair.identifier: code_pair for code_pair in self._iter_pairs_by_rowid(rowids)}
+
+    def sample_one_excluding(self, excluded_ids: Collection[str],
+                             sample_spec: Optional[SampleSpec] = None) -> Optional[CodePair]:
+        """
+        Draw one random code pair inside SQLite.
+        
+        The excluded identifiers are loaded into a temporary table and a
+        single row is selected with ORDER BY random() LIMIT 1, so no other
+        row leaves the database. Invalid rows are excluded and drawn again.
+        
+        Args:
+            excluded_ids: Identifiers that must not be drawn.
+            sample_spec: Optional sample whose model/strategy filters restrict the draw.
+        
+        Returns:
+            Optional[CodePair]: Drawn code pair, or None if every row is excluded.
+        
+        Raises:
+            RuntimeError: If data source is not properly configured.
+        """
+        self._validate_configured()
+        
+        where_clause, query_params = self._build_where_clause(
+            sample_spec.selected_model if sample_spec else None,
+            sample_spec.selected_strategy if sample_spec else None,
+            require_identifier=True
+        )
+        query = (
+            f"SELECT rowid, {', '.join(self._get_select_columns())} FROM {self._table_name}{where_clause} "
+            f"AND CAST({self._identifier_column} AS TEXT) NOT IN (SELECT identifier FROM temp.vaitp_excluded_ids) "
+            f"ORDER BY random() LIMIT 1"
+        )
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS vaitp_excluded_ids (identifier TEXT PRIMARY KEY) WITHOUT ROWID")
+            cursor.execute("DELETE FROM temp.vaitp_excluded_ids")
+            cursor.executemany(
+                "INSERT OR IGNORE INTO temp.vaitp_excluded_ids VALUES (?)",
+                ((str(identifier),) for identifier in excluded_ids)
+            )
+        
+            for attempt in range(self._max_retries):
+                try:
+                    cursor.execute(query, query_params)
+                except sqlite3.OperationalError as e:
+                    self._logger.warning(f"Random row selection unavailable ({e}), scanning the table instead")
+                    return super().sample_one_excluding(excluded_ids, sample_spec)
+        
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+        
+                code_pair = self._row_to_code_pair(row[1:], attempt + 1)
+                if code_pair is not None:
+                    code_pair.source_info['rowid'] = row[0]
+                    return code_pair
+                cursor.execute("INSERT OR IGNORE INTO temp.vaitp_excluded_ids VALUES (?)", (str(row[1]),))
         
-        self._logger.info(f"_load_all_data completed: processed {processed_count} rows, "
-                          f"loaded {len(code_pairs)} valid code pairs, skipped {skipped_count} invalid rows")
-        return code_pairs
+            self._logger.warning(f"No valid replacement row found after {self._max_retries} attempts")
+            return None
+        finally:
+            cursor.close()
+            conn.commit()  # End the transaction opened by the temporary table inserts
 
     def __del__(self):
         """Clean up database connection on destruction."""
@@ -604,4 +1210,4 @@ class SQLiteSource(DataSource):
             try:
                 self._connection.close()
             except Exception:
-                pass  # Ignore cleanup errors
\ No newline at end of file
+                pass  # Ignore cleanup errors
@@ -0,0 +1,370 @@
+"""
+Content-addressed columnar cache of parsed spreadsheet sources.
+
+Parsing a large workbook dominates the time needed to open it. The first
+streamed read of a file stores the projected columns beside the session
+directory (~/.vaitp_auditor/table_cache), keyed by the SHA-256 of the file
+content and the sheet name. Each column is kept Arrow-style as a UTF-8 data
+buffer, an int64 offsets array and a null mask, all of which are
+memory-mapped by later reads instead of parsing the file again.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..utils.logging_config import get_logger
+
+
+class CachedTable:
+    """Read access to the memory-mapped columns of a cached table."""
+
+    def __init__(self, directory: Path, manifest: Dict[str, Any]):
+        """
+        Initialize the table.
+
+        Args:
+            directory: Entry directory holding the column files.
+            manifest: Parsed manifest of the entry.
+        """
+        self.directory = directory
+        self.row_count: int = manifest['row_count']
+        self._files: Dict[str, str] = manifest['columns']
+        self._mapped: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def has_columns(self, columns: List[str]) -> bool:
+        """Check whether all given columns are cached."""
+        return all(column in self._files for column in columns)
+
+    def _column(self, column: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Memory-map the data buffer, offsets and null mask of a column."""
+        if column not in self._mapped:
+            stem = self.directory / self._files[column]
+            offsets = np.load(f"{stem}.offsets.npy", mmap_mode='r')
+            nulls = np.load(f"{stem}.nulls.npy", mmap_mode='r')
+            if offsets[-1] > 0:
+                data = np.memmap(f"{stem}.data", dtype=np.uint8, mode='r')
+            else:
+                data = np.empty(0, dtype=np.uint8)
+            self._mapped[column] = (data, offsets, nulls)
+        return self._mapped[column]
+
+    def count_present(self, columns: List[str]) -> int:
+        """
+        Count the rows where none of the given columns is null.
+
+        Args:
+            columns: Cached columns to check.
+
+        Returns:
+            int: Number of rows with a value in every column.
+        """
+        present = np.ones(self.row_count, dtype=bool)
+        for column in columns:
+            present &= ~self._column(column)[2]
+        return int(np.count_nonzero(present))
+
+    def _decode(self, column: str, start: int, stop: int) -> List[Optional[str]]:
+        """Decode the values of rows [start, stop) of a column."""
+        data, offsets, nulls = self._column(column)
+        bounds = offsets[start:stop + 1].tolist()
+        buffer = data[bounds[0]:bounds[-1]].tobytes()
+        base = bounds[0]
+        return [
+            None if is_null else buffer[begin - base:end - base].decode('utf-8', 'surrogatepass')
+            for begin, end, is_null in zip(bounds[:-1], bounds[1:], nulls[start:stop].tolist())
+        ]
+
+    def iter_chunks(self, columns: List[str], chunksize: int) -> Iterator[pd.DataFrame]:
+        """
+        Iterate over the table in chunks, like the streamed source readers.
+
+        Args:
+            columns: Cached columns to read.
+            chunksize: Number of rows per chunk.
+
+        Yields:
+            pd.DataFrame: Chunks of string values labelled by row position.
+        """
+        for start in range(0, self.row_count, chunksize):
+            stop = min(start + chunksize, self.row_count)
+            yield pd.DataFrame(
+                {column: self._decode(column, start, stop) for column in columns},
+                columns=columns,
+                index=range(start, stop),
+                dtype=object
+            )
+
+
+class TableCacheWriter:
+    """
+    Stores the columns of a table while its chunks are being streamed.
+
+    Nothing becomes visible to readers before commit(). Write errors disable
+    the writer instead of interrupting the read it piggybacks on.
+    """
+
+    def __init__(self, cache: 'ColumnarTableCache', entry_dir: Path, columns: List[str]):
+        """
+        Initialize the writer.
+
+        Args:
+            cache: Owning cache.
+            entry_dir: Entry directory of the table.
+            columns: Columns that will be appended.
+        """
+        self._cache = cache
+        self._entry_dir = entry_dir
+        self._columns = columns
+        self._row_count = 0
+        self._files: Dict[str, Tuple[str, Any]] = {}
+        self._offsets: Dict[str, List[np.ndarray]] = {column: [np.zeros(1, dtype=np.int64)] for column in columns}
+        self._nulls: Dict[str, List[np.ndarray]] = {column: [] for column in columns}
+        self._positions: Dict[str, int] = {column: 0 for column in columns}
+        self.failed = False
+
+        try:
+            entry_dir.mkdir(parents=True, exist_ok=True)
+            for column in columns:
+                fd, stem = tempfile.mkstemp(dir=entry_dir, prefix='column-', suffix='.data')
+                self._files[column] = (stem[:-len('.data')], os.fdopen(fd, 'wb'))
+        except OSError as e:
+            self._fail(e)
+
+    def _fail(self, error: Exception) -> None:
+        """Disable the writer and remove what it wrote."""
+        self._cache._logger.warning(f"Disabling table cache write to {self._entry_dir}: {error}")
+        self.failed = True
+        self.abort()
+
+    def append(self, chunk: pd.DataFrame) -> None:
+        """
+        Append a chunk of rows.
+
+        Args:
+            chunk: Chunk containing at least the writer's columns.
+        """
+        if self.failed:
+            return
+
+        try:
+            for column in self._columns:
+                values = chunk[column].tolist()
+                nulls = np.fromiter((value is None or value != value for value in values),
+                                    dtype=bool, count=len(values))
+                encoded = [b'' if is_null else str(value).encode('utf-8', 'surrogatepass')
+                           for value, is_null in zip(values, nulls.tolist())]
+                lengths = np.fromiter((len(item) for item in encoded), dtype=np.int64, count=len(encoded))
+
+                self._files[column][1].write(b''.join(encoded))
+                self._offsets[column].append(self._positions[column] + np.cumsum(lengths))
+                self._positions[column] += int(lengths.sum())
+                self._nulls[column].append(nulls)
+            self._row_count += len(chunk)
+        except (OSError, KeyError) as e:
+            self._fail(e)
+
+    def commit(self) -> bool:
+        """
+        Publish the written columns.
+
+        Returns:
+            bool: True if the columns were stored.
+        """
+        if self.failed:
+            return False
+
+        try:
+            columns = {}
+            for column, (stem, handle) in self._files.items():
+                handle.close()
+                np.save(f"{stem}.offsets.npy", np.concatenate(self._offsets[column]))
+                nulls = self._nulls[column]
+                np.save(f"{stem}.nulls.npy", np.concatenate(nulls) if nulls else np.zeros(0, dtype=bool))
+                columns[column] = os.path.basename(stem)
+            self._cache._publish(self._entry_dir, self._row_count, columns)
+            return True
+        except OSError as e:
+            self._fail(e)
+            return False
+
+    def abort(self) -> None:
+        """Discard the written columns."""
+        for stem, handle in self._files.values():
+            try:
+                handle.close()
+            except OSError:
+                pass
+            for suffix in ('.data', '.offsets.npy', '.nulls.npy'):
+                try:
+                    os.unlink(stem + suffix)
+                except OSError:
+                    pass
+        self._files = {}
+
+
+class ColumnarTableCache:
+    """
+    On-disk cache of column-projected tables keyed by file content.
+
+    Failing to read or write the cache is never fatal; callers fall back to
+    parsing the source file.
+    """
+
+    VERSION = 1
+    HASH_BLOCK_SIZE = 1024 * 1024
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = 16):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cached tables.
+            max_entries: Number of tables kept; the least recently written
+                ones are removed first.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / '.vaitp_auditor' / 'table_cache'
+        self.max_entries = max_entries
+        self._logger = get_logger('table_cache')
+
+    def file_digest(self, file_path: str) -> str:
+        """
+        Get the SHA-256 of a file's content.
+
+        The digest is remembered together with the file's mtime and size, so
+        an unchanged file is only hashed once.
+
+        Args:
+            file_path: File to hash.
+
+        Returns:
+            str: Hex digest.
+        """
+        path = os.path.abspath(file_path)
+        stat_result = os.stat(path)
+        signature = [stat_result.st_mtime_ns, stat_result.st_size]
+
+        digests_path = self.cache_dir / 'digests.json'
+        try:
+            with open(digests_path, 'r', encoding='utf-8') as f:
+                digests = json.load(f)
+        except (OSError, ValueError):
+            digests = {}
+
+        known = digests.get(path)
+        if isinstance(known, list) and known[:2] == signature:
+            return known[2]
+
+        sha256 = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(self.HASH_BLOCK_SIZE), b''):
+                sha256.update(block)
+        digest = sha256.hexdigest()
+
+        digests[path] = signature + [digest]
+        self._write_json(digests_path, digests)
+        return digest
+
+    def entry_dir(self, file_path: str, sheet_name: Optional[str]) -> Path:
+        """
+        Get the entry directory of a file's sheet.
+
+        Args:
+            file_path: Source file.
+            sheet_name: Sheet of a workbook, None for CSV files or the first sheet.
+
+        Returns:
+            Path: Entry directory.
+        """
+        sheet_key = hashlib.sha256((sheet_name or '').encode('utf-8')).hexdigest()[:8]
+        return self.cache_dir / f"{self.file_digest(file_path)[:40]}-{sheet_key}"
+
+    def open(self, file_path: str, sheet_name: Optional[str]) -> Optional[CachedTable]:
+        """
+        Open the cached table of a file's sheet.
+
+        Args:
+            file_path: Source file.
+            sheet_name: Sheet of a workbook, None for CSV files or the first sheet.
+
+        Returns:
+            Optional[CachedTable]: Cached table, or None if nothing is cached.
+        """
+        entry_dir = self.entry_dir(file_path, sheet_name)
+        manifest = self._read_manifest(entry_dir)
+        return CachedTable(entry_dir, manifest) if manifest else None
+
+    def writer(self, file_path: str, sheet_name: Optional[str], columns: List[str]) -> TableCacheWriter:
+        """
+        Create a writer storing columns of a file's sheet.
+
+        Args:
+            file_path: Source file.
+            sheet_name: Sheet of a workbook, None for CSV files or the first sheet.
+            columns: Columns that will be written.
+
+        Returns:
+            TableCacheWriter: Writer to feed with the streamed chunks.
+        """
+        return TableCacheWriter(self, self.entry_dir(file_path, sheet_name), columns)
+
+    def _read_manifest(self, entry_dir: Path) -> Optional[Dict[str, Any]]:
+        """Read the manifest of an entry, None if missing or unusable."""
+        try:
+            with open(entry_dir / 'manifest.json', 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(manifest, dict) or manifest.get('version') != self.VERSION:
+            return None
+        return manifest
+
+    def _publish(self, entry_dir: Path, row_count: int, columns: Dict[str, str]) -> None:
+        """Merge freshly written columns into an entry's manifest."""
+        manifest = self._read_manifest(entry_dir)
+        if manifest is None or manifest['row_count'] != row_count:
+            manifest = {'version': self.VERSION, 'row_count': row_count, 'columns': {}}
+        manifest['columns'].update(columns)
+        self._write_json(entry_dir / 'manifest.json', manifest)
+
+        # Remove column files no longer referenced by the manifest
+        referenced = set(manifest['columns'].values())
+        for path in entry_dir.glob('column-*'):
+            if path.name.split('.', 1)[0] not in referenced:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+        self._prune()
+
+    def _write_json(self, path: Path, content: Dict[str, Any]) -> None:
+        """Atomically write a JSON file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(content, f)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def _prune(self) -> None:
+        """Remove the least recently written tables beyond max_entries."""
+        try:
+            entries = [path for path in self.cache_dir.iterdir() if (path / 'manifest.json').exists()]
+            entries.sort(key=lambda path: (path / 'manifest.json').stat().st_mtime, reverse=True)
+            for stale in entries[self.max_entries:]:
+                shutil.rmtree(stale, ignore_errors=True)
+        except OSError as e:
+            self._logger.debug(f"Table cache pruning failed: {e}")
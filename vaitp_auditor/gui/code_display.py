@@ -15,7 +15,7 @@ from pygments.token import Token
 import re
 import time
 
-from ..core.models import DiffLine
+from ..core.models import DiffLine, diff_tag_runs, iter_diff_span_rows
 from .performance_optimizer import (
     get_performance_optimizer, LazyCodeLoader, 
     performance_optimized
@@ -149,6 +149,12 @@ class DiffHighlighter:
             'modify': '#4a4a2d',   # Dark yellow background
             'equal': None          # No special highlighting
         }
+        # Stronger backgrounds for the changed text inside a line
+        self.change_colors = {
+            'add': '#3f7a3f',
+            'remove': '#7a3f3f',
+            'modify': '#7a7a3f',
+        }
     
     def configure_diff_tags(self, textbox: ctk.CTkTextbox) -> None:
         """Configure text tags for diff highlighting in a textbox."""
@@ -156,6 +162,10 @@ class DiffHighlighter:
         textbox.tag_config("diff_add", background=self.diff_colors['add'])
         textbox.tag_config("diff_remove", background=self.diff_colors['remove'])
         textbox.tag_config("diff_modify", background=self.diff_colors['modify'])
+        
+        # Configured last so that they take priority over the line tags
+        for tag, color in self.change_colors.items():
+            textbox.tag_config(f"diff_{tag}_change", background=color)
     
     def apply_diff_tags(self, textbox: ctk.CTkTextbox, diff_lines: List[DiffLine]) -> None:
         """
@@ -169,21 +179,19 @@ class DiffHighlighter:
         textbox.tag_remove("diff_add", "1.0", "end")
         textbox.tag_remove("diff_remove", "1.0", "end")
         textbox.tag_remove("diff_modify", "1.0", "end")
+        for tag in self.change_colors:
+            textbox.tag_remove(f"diff_{tag}_change", "1.0", "end")
         
-        # Apply tags based on diff lines
-        current_line = 1
+        # Apply one tag per run of consecutive lines sharing a diff tag
+        for tag, start, stop in diff_tag_runs(diff_lines):
+            if tag in ['add', 'remove', 'modify']:
+                textbox.tag_add(f"diff_{tag}", f"{start + 1}.0", f"{stop}.end")
         
-        for diff_line in diff_lines:
-            if diff_line.tag in ['add', 'remove', 'modify']:
-                # Calculate line positions
-                line_start = f"{current_line}.0"
-                line_end = f"{current_line}.end"
-                
-                # Apply appropriate tag
-                tag_name = f"diff_{diff_line.tag}"
-                textbox.tag_add(tag_name, line_start, line_end)
-            
-            current_line += 1
+        # Highlight the changed text inside modified lines
+        for current_line, (tag, _, _, spans) in enumerate(iter_diff_span_rows(diff_lines), 1):
+            if spans and tag in self.change_colors:
+                for start, end in spans:
+                    textbox.tag_add(f"diff_{tag}_change", f"{current_line}.{start}", f"{current_line}.{end}")
     
     def create_diff_view(self, expected_code: Optional[str], generated_code: str) -> Tuple[List[DiffLine], List[DiffLine]]:
         """
@@ -212,37 +220,39 @@ class DiffHighlighter:
         expected_line_num = 1
         generated_line_num = 1
         
-        for diff_line in diff_lines:
-            if diff_line.tag == 'equal':
+        for tag, line_content, _, spans in iter_diff_span_rows(diff_lines):
+            if tag == 'equal':
                 # Line appears in both panels
                 expected_diff_lines.append(DiffLine(
                     tag='equal',
-                    line_content=diff_line.line_content,
+                    line_content=line_content,
                     line_number=expected_line_num
                 ))
                 generated_diff_lines.append(DiffLine(
                     tag='equal',
-                    line_content=diff_line.line_content,
+                    line_content=line_content,
                     line_number=generated_line_num
                 ))
                 expected_line_num += 1
                 generated_line_num += 1
                 
-            elif diff_line.tag == 'remove':
-                # Line only appears in expected panel (removed in generated)
+            elif tag == 'remove':
+                # Line only appears in expected panel (removed or modified in generated)
                 expected_diff_lines.append(DiffLine(
-                    tag='remove',
-                    line_content=diff_line.line_content,
-                    line_number=expected_line_num
+                    tag='remove' if spans is None else 'modify',
+                    line_content=line_content,
+                    line_number=expected_line_num,
+                    spans=spans
                 ))
                 expected_line_num += 1
                 
-            elif diff_line.tag == 'add':
-                # Line only appears in generated panel (added in generated)
+            elif tag == 'add':
+                # Line only appears in generated panel (added or modified in generated)
                 generated_diff_lines.append(DiffLine(
-                    tag='add',
-                    line_content=diff_line.line_content,
-                    line_number=generated_line_num
+                    tag='add' if spans is None else 'modify',
+                    line_content=line_content,
+                    line_number=generated_line_num,
+                    spans=spans
                 ))
                 generated_line_num += 1
         
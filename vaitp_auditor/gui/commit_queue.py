@@ -0,0 +1,167 @@
+"""
+Background persistence of submitted verdicts.
+
+The review window records a verdict in the in-memory session and moves on
+to the next code pair right away; appending the review to the report and
+journaling it in the session is handed to a VerdictCommitQueue. The queue is
+a bounded FIFO serviced by a single writer thread, so commits are persisted
+one at a time in submission order. When it is full, wait_for_slot() blocks
+until the writer catches up (back-pressure), and drain() waits for every
+pending commit, e.g. before an undo or when the application shuts down.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+
+class VerdictCommitQueue:
+    """
+    Bounded, ordered queue of commits run by a background writer thread.
+    
+    A commit is any callable; exceptions it raises are logged and kept until
+    take_failures() is called, and do not stop the commits after it.
+    """
+    
+    def __init__(self, max_pending: int = 8):
+        """
+        Initialize the queue; the writer thread starts with the first commit.
+        
+        Args:
+            max_pending: Maximum number of queued or running commits.
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        
+        self.logger = logging.getLogger(__name__)
+        self.max_pending = max_pending
+        self._commits: Deque[Tuple[str, Callable[[], None]]] = deque()
+        self._pending = 0  # Queued commits plus the running one
+        self._failures: List[Tuple[str, Exception]] = []
+        self._condition = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+    
+    @property
+    def pending(self) -> int:
+        """Number of commits not yet persisted (queued or running)."""
+        with self._condition:
+            return self._pending
+    
+    @property
+    def is_full(self) -> bool:
+        """Check if submitting would have to wait for the writer."""
+        return self.pending >= self.max_pending
+    
+    def wait_for_slot(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until a commit can be submitted without exceeding max_pending.
+        
+        Args:
+            timeout: Maximum seconds to wait, None to wait for a free slot.
+        
+        Returns:
+            bool: True if a slot is free.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending < self.max_pending, timeout)
+    
+    def submit(self, description: str, commit: Callable[[], None]) -> None:
+        """
+        Queue a commit, waiting for a free slot if the queue is full.
+        
+        Args:
+            description: Short description used in logs and failure reports
+                (e.g. the identifier of the reviewed code pair).
+            commit: Callable persisting the change.
+        
+        Raises:
+            RuntimeError: If the queue has been shut down.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Verdict commit queue has been shut down")
+            self._condition.wait_for(lambda: self._pending < self.max_pending)
+            
+            self._commits.append((description, commit))
+            self._pending += 1
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="verdict-commit-writer", daemon=True)
+                self._writer.start()
+            self._condition.notify_all()
+    
+    def _run(self) -> None:
+        """Writer thread: run commits in order until the queue is shut down."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._commits or self._closed)
+                if not self._commits:
+                    return
+                description, commit = self._commits.popleft()
+            
+            try:
+                commit()
+            except Exception as e:
+                self.logger.error(f"Failed to persist verdict commit {description}: {e}")
+                with self._condition:
+                    self._failures.append((description, e))
+            
+            with self._condition:
+                self._pending -= 1
+                self._condition.notify_all()
+    
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every submitted commit has run.
+        
+        Must not be called from a commit.
+        
+        Args:
+            timeout: Maximum seconds to wait, None to wait until drained.
+        
+        Returns:
+            bool: True if no commits are pending.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending == 0, timeout)
+    
+    def take_failures(self) -> List[Tuple[str, Exception]]:
+        """
+        Get and clear the commits that failed since the last call.
+        
+        Returns:
+            List[Tuple[str, Exception]]: (description, exception) of each failure.
+        """
+        with self._condition:
+            failures, self._failures = self._failures, []
+        return failures
+    
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        Drain the queue and stop the writer thread.
+        
+        The queue can be used again afterwards if the writer stopped.
+        
+        Args:
+            timeout: Maximum seconds to wait for pending commits.
+        
+        Returns:
+            bool: True if all commits were persisted.
+        """
+        drained = self.drain(timeout)
+        
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            writer = self._writer
+        
+        if writer is not None:
+            writer.join(timeout)
+            if writer.is_alive():
+                return False
+        
+        with self._condition:
+            self._writer = None
+            self._closed = False
+        return drained
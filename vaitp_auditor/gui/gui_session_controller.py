@@ -6,17 +6,22 @@ and the existing SessionManager, following the MVC pattern.
 """
 
 import logging
+from functools import partial
 from typing import Optional, Dict, Any, Callable
 from datetime import datetime, timezone
 from pathlib import Path
 
-from ..core.models import CodePair, ReviewResult, SessionConfig
+from ..core.models import CodePair, ReviewResult, SessionConfig, iter_diff_rows
 from ..session_manager import SessionManager
+from ..session_journal import FLAG, REPLACEMENT, VERDICT
 from ..data_sources.factory import DataSourceFactory
 from ..reporting.report_manager import ReportManager
 from ..core.differ import CodeDiffer
+from ..core.semantic import SemanticDiffer
 from .models import GUIConfig, ProgressInfo
 from .error_handler import GUIErrorHandler
+from .prefetch import CodePairPrefetcher, PreparedCodePair
+from .commit_queue import VerdictCommitQueue
 
 
 class GUISessionController:
@@ -43,7 +48,14 @@ class GUISessionController:
         self._data_source_factory = DataSourceFactory()
         self._report_manager: Optional[ReportManager] = None
         self._code_differ = CodeDiffer()
+        self._semantic_differ = SemanticDiffer()
         
+        # Prepares upcoming code pairs (content, highlighting, diffs) off the Tk thread
+        self._prefetcher = CodePairPrefetcher(self.gui_config.prefetch_depth, self._code_differ)
+        
+        # Persists submitted verdicts (report row, session journal) on a writer thread
+        self._commit_queue = VerdictCommitQueue()
+        self._commit_poll_scheduled = False
 
         
         # GUI components (will be set by the application)
@@ -255,8 +267,10 @@ class GUISessionController:
             data_source_config = session_info['data_source_config']
             data_source = self._recreate_data_source_from_session_config(data_source_config)
             
-            # Set the data source in session manager
+            # Set the data source in session manager and reopen the sample stream
             self._session_manager._data_source = data_source
+            if self._session_manager._current_session.pending_count != 0:
+                self._session_manager.rederive_queue(data_source)
             
             # Try to find and resume existing report file
             existing_report_path = self._find_existing_report_file(session_id)
@@ -315,6 +329,7 @@ class GUISessionController:
         # Configure the data source based on type
         if data_source_type == 'folders':
             from pathlib import Path
+            from ..data_sources.directory_index import DirectoryIndexCache
             data_source.generated_folder = Path(data_source_config.get('generated_code_path', ''))
             expected_path = data_source_config.get('expected_code_path')
             if expected_path:
@@ -323,7 +338,9 @@ class GUISessionController:
             if input_path:
                 data_source.input_folder = Path(input_path)
             
-            # Discover file pairs and mark as configured
+            # Discover file pairs (revalidating the persistent directory
+            # index of earlier runs) and mark as configured
+            data_source.index_cache = DirectoryIndexCache()
             data_source._discover_file_pairs()
             if data_source._file_pairs:
                 data_source._configured = True
@@ -348,7 +365,9 @@ class GUISessionController:
             self.logger.info(f"SQLiteSource recreated for database: {data_source._db_path}")
         
         elif data_source_type == 'excel':
+            from ..data_sources.table_cache import ColumnarTableCache
             data_source._file_path = data_source_config.get('file_path', '')
+            data_source.table_cache = ColumnarTableCache()
             sheet_name = data_source_config.get('sheet_name')
             if sheet_name:
                 data_source._sheet_name = sheet_name
@@ -417,7 +436,9 @@ class GUISessionController:
             sample_percentage=float(config.get('sampling_percentage', 100)),
             output_format=config.get('output_format', 'excel'),
             selected_model=config.get('selected_model'),
-            selected_strategy=config.get('selected_strategy')
+            selected_strategy=config.get('selected_strategy'),
+            sample_seed=config.get('sample_seed'),
+            stratify_by=tuple(config.get('stratify_by') or ())
         )
     
     def _create_data_source_from_config(self, config: Dict[str, Any]):
@@ -438,6 +459,7 @@ class GUISessionController:
         # Configure the data source based on type
         if data_source_type == 'folders':
             from pathlib import Path
+            from ..data_sources.directory_index import DirectoryIndexCache
             data_source.generated_folder = Path(config.get('generated_code_path', ''))
             expected_path = config.get('expected_code_path')
             if expected_path:
@@ -446,7 +468,9 @@ class GUISessionController:
             if input_path:
                 data_source.input_folder = Path(input_path)
             
-            # Discover file pairs and mark as configured
+            # Discover file pairs (revalidating the persistent directory
+            # index of earlier runs) and mark as configured
+            data_source.index_cache = DirectoryIndexCache()
             data_source._discover_file_pairs()
             if data_source._file_pairs:
                 data_source._configured = True
@@ -477,7 +501,9 @@ class GUISessionController:
             self.logger.info(f"SQLiteSource configured for database: {data_source._db_path}")
         
         elif data_source_type == 'excel':
+            from ..data_sources.table_cache import ColumnarTableCache
             data_source._file_path = config.get('file_path', '')
+            data_source.table_cache = ColumnarTableCache()
             sheet_name = config.get('sheet_name')
             if sheet_name:
                 data_source._sheet_name = sheet_name
@@ -539,6 +565,7 @@ class GUISessionController:
         
         try:
             # Check if there are more items in the queue
+            self._session_manager.refill_queue()
             if not self._session_manager._current_session.remaining_queue:
                 self.logger.info("Review queue is empty - session complete")
                 self._handle_session_completion()
@@ -556,13 +583,19 @@ class GUISessionController:
             # Update progress information
             progress_info = self._get_current_progress()
             
-            # Load code pair in the main window with syntax highlighting and diff
-            self._load_code_pair_with_enhancements(code_pair)
+            # Load code pair in the main window with syntax highlighting and diff,
+            # using the display data prepared in the background if available
+            prepared = self._prefetcher.get(code_pair)
+            self._load_code_pair_with_enhancements(code_pair, prepared)
+            self._suggest_verdict(code_pair, prepared)
             self._main_window.update_progress(progress_info)
             
             # Update button states based on session state
             self._update_button_states()
             
+            # Start preparing the pairs that follow
+            self._prefetch_upcoming_pairs()
+            
             self.logger.debug(f"Loaded code pair: {code_pair.identifier}")
             
         except Exception as e:
@@ -597,6 +630,7 @@ class GUISessionController:
             self.logger.info(f"Verdict submitted: {verdict_id}, Comment: '{comment}'")
             
             # Get the current code pair
+            self._session_manager.refill_queue()
             if not self._session_manager._current_session.remaining_queue:
                 self.logger.warning("No code pair to submit verdict for")
                 if self._main_window:
@@ -604,59 +638,74 @@ class GUISessionController:
                     self._main_window.set_processing_state(False)
                 return
             
-            code_pair = self._session_manager._current_session.remaining_queue.pop(0)
-            
-            # Calculate effective review time (excluding paused time)
-            review_time = self.get_effective_review_time()
+            # Wait for a free slot in the commit queue before touching the
+            # session (back-pressure when the writer falls behind)
+            self._commit_queue.wait_for_slot()
             
-            # Generate code diff for the review result
-            code_diff = ""
-            if code_pair.expected_code and code_pair.generated_code:
-                try:
-                    diff_lines = self._code_differ.compute_diff(
-                        code_pair.expected_code, 
-                        code_pair.generated_code
-                    )
-                    code_diff = "\n".join([line.line_content for line in diff_lines])
-                except Exception as diff_error:
-                    self.logger.warning(f"Failed to compute diff: {diff_error}")
-                    code_diff = "Diff computation failed"
-            
-            # Convert verdict_id to proper display text for validation
-            verdict_display_text = self._get_verdict_display_text(verdict_id)
-            
-            # Extract model and strategy information from source_info
-            model_name = code_pair.source_info.get('model_name') if code_pair.source_info else None
-            prompting_strategy = code_pair.source_info.get('prompting_strategy') if code_pair.source_info else None
-            
-            # Create complete ReviewResult
-            review_result = ReviewResult(
-                review_id=len(self._session_manager._current_session.completed_reviews) + 1,
-                source_identifier=code_pair.identifier,
-                experiment_name=self._session_manager._current_session.experiment_name,
-                review_timestamp_utc=datetime.now(timezone.utc),
-                reviewer_verdict=verdict_display_text,
-                reviewer_comment=comment,
-                time_to_review_seconds=review_time,
-                expected_code=code_pair.expected_code or "",
-                generated_code=code_pair.generated_code,
-                code_diff=code_diff,
-                model_name=model_name,
-                prompting_strategy=prompting_strategy
-            )
-            
-            # Add to completed reviews
-            self._session_manager._current_session.completed_reviews.append(code_pair.identifier)
-            
-            # Store the reviewed pair for potential undo
-            self._session_manager._last_reviewed_pair = code_pair
-            
-            # Save to report
-            if self._report_manager:
-                self._report_manager.append_review_result(review_result)
-            
-            # Save session state to prevent data loss
-            self._session_manager.save_session_state()
+            # Taking the pair and recording it as reviewed is atomic for the
+            # background writer, which persists the session under the same lock
+            with self._session_manager.state_lock:
+                code_pair = self._session_manager._current_session.remaining_queue.pop(0)
+                
+                # Calculate effective review time (excluding paused time)
+                review_time = self.get_effective_review_time()
+                
+                # Generate code diff for the review result
+                code_diff = ""
+                prepared = self._prefetcher.get(code_pair, timeout=0)
+                if prepared and prepared.code_diff is not None:
+                    code_diff = prepared.code_diff
+                elif code_pair.expected_code and code_pair.generated_code:
+                    try:
+                        diff_lines = self._code_differ.compute_diff(
+                            code_pair.expected_code, 
+                            code_pair.generated_code,
+                            content_hashes=(
+                                code_pair.content_hash('expected_code'),
+                                code_pair.content_hash('generated_code')
+                            )
+                        )
+                        code_diff = "\n".join(line_content for _, line_content, _ in iter_diff_rows(diff_lines))
+                    except Exception as diff_error:
+                        self.logger.warning(f"Failed to compute diff: {diff_error}")
+                        code_diff = "Diff computation failed"
+                
+                # Convert verdict_id to proper display text for validation
+                verdict_display_text = self._get_verdict_display_text(verdict_id)
+                
+                # Extract model and strategy information from source_info
+                model_name = code_pair.source_info.get('model_name') if code_pair.source_info else None
+                prompting_strategy = code_pair.source_info.get('prompting_strategy') if code_pair.source_info else None
+                
+                # Create complete ReviewResult
+                review_result = ReviewResult(
+                    review_id=len(self._session_manager._current_session.completed_reviews) + 1,
+                    source_identifier=code_pair.identifier,
+                    experiment_name=self._session_manager._current_session.experiment_name,
+                    review_timestamp_utc=datetime.now(timezone.utc),
+                    reviewer_verdict=verdict_display_text,
+                    reviewer_comment=comment,
+                    time_to_review_seconds=review_time,
+                    expected_code=code_pair.expected_code or "",
+                    generated_code=code_pair.generated_code,
+                    code_diff=code_diff,
+                    model_name=model_name,
+                    prompting_strategy=prompting_strategy
+                )
+                
+                # Add to completed reviews
+                self._session_manager._current_session.completed_reviews.append(code_pair.identifier)
+                
+                # Store the reviewed pair for potential undo
+                self._session_manager._last_reviewed_pair = code_pair
+                
+                # Persist the review in the background, in submission order
+                self._commit_queue.submit(
+                    code_pair.identifier,
+                    partial(self._commit_verdict, self._session_manager, self._report_manager,
+                            review_result, code_pair)
+                )
+            self._watch_commit_queue()
             
             # Show success feedback
             if self._main_window:
@@ -683,6 +732,72 @@ class GUISessionController:
             
             self._handle_session_error(f"Error submitting verdict: {str(e)}", e)
     
+    def _commit_verdict(self, session_manager: SessionManager, report_manager: Optional[ReportManager],
+                        review_result: ReviewResult, code_pair: CodePair) -> None:
+        """
+        Persist a submitted verdict; runs on the commit queue's writer thread.
+        
+        Args:
+            session_manager: Session manager of the reviewed session
+            report_manager: Report manager of the session, if any
+            review_result: Review result to append to the report
+            code_pair: Reviewed code pair
+        """
+        if report_manager:
+            report_manager.append_review_result(review_result)
+        
+        # The journal is only compacted into a snapshot once no other verdict
+        # is waiting, since the in-memory session already includes those
+        with session_manager.state_lock:
+            session_manager.record_event(VERDICT, code_pair, compact=self._commit_queue.pending <= 1)
+        
+        # Drop deferred file content; it is reloaded if the review is undone
+        code_pair.release_content()
+    
+    def _watch_commit_queue(self) -> None:
+        """Show pending commits and poll the writer until they are flushed."""
+        self._poll_commit_queue()
+        
+        root_window = self._get_root_window()
+        if root_window is not None and not self._commit_poll_scheduled and self._commit_queue.pending:
+            self._commit_poll_scheduled = True
+            root_window.after(100, self._on_commit_poll)
+    
+    def _on_commit_poll(self) -> None:
+        """Tk timer callback of _watch_commit_queue()."""
+        self._commit_poll_scheduled = False
+        self._watch_commit_queue()
+    
+    def _poll_commit_queue(self) -> None:
+        """Update the pending commit indicator and report failed commits."""
+        if self._main_window and hasattr(self._main_window, 'set_pending_commits'):
+            try:
+                self._main_window.set_pending_commits(self._commit_queue.pending, self._commit_queue.max_pending)
+            except Exception as e:
+                self.logger.debug(f"Failed to update pending commit indicator: {e}")
+        
+        for identifier, error in self._commit_queue.take_failures():
+            self._handle_session_error(f"Error saving verdict for {identifier}: {str(error)}", error)
+    
+    def flush_pending_commits(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all submitted verdicts are persisted.
+        
+        Called before anything that reads or rewrites the persisted session
+        (undo, flags, saving, quitting, completing the session).
+        
+        Args:
+            timeout: Maximum seconds to wait, None to wait until flushed
+            
+        Returns:
+            bool: True if no commits are pending anymore
+        """
+        flushed = self._commit_queue.drain(timeout)
+        if not flushed:
+            self.logger.warning(f"{self._commit_queue.pending} verdict commits still pending")
+        self._poll_commit_queue()
+        return flushed
+    
     def pause_session(self) -> bool:
         """
         Pause the current review session.
@@ -804,6 +919,9 @@ class GUISessionController:
         try:
             self.logger.info("Undo requested")
             
+            # Earlier verdicts must be persisted first
+            self.flush_pending_commits()
+            
             # Check if undo is possible (edge case: first review, empty session)
             if not self._session_manager.can_undo():
                 self.logger.info("No reviews to undo - edge case handled")
@@ -1068,6 +1186,10 @@ class GUISessionController:
         """
         try:
             self.logger.info("Session completed")
+            self._prefetcher.clear()
+            
+            # The report is finalized from the persisted verdicts
+            self.flush_pending_commits()
             
             # Update session state
             self._is_session_active = False
@@ -1138,6 +1260,9 @@ class GUISessionController:
         try:
             self.logger.info("Performing quit operation")
             
+            # Wait for submitted verdicts to be written
+            self.flush_pending_commits()
+            
             # Save session state if active
             if self._is_session_active and self._session_manager:
                 self._session_manager.save_session_state()
@@ -1164,20 +1289,34 @@ class GUISessionController:
             except:
                 pass
     
-    def _load_code_pair_with_enhancements(self, code_pair: CodePair) -> None:
+    def _prefetch_upcoming_pairs(self) -> None:
+        """Schedule background preparation of the pairs at the head of the queue."""
+        try:
+            session = self._session_manager._current_session if self._session_manager else None
+            if session is not None:
+                self._prefetcher.prefetch(session.remaining_queue)
+        except Exception as e:
+            self.logger.debug(f"Code pair prefetch skipped: {e}")
+    
+    def _load_code_pair_with_enhancements(self, code_pair: CodePair,
+                                          prepared: Optional[PreparedCodePair] = None) -> None:
         """
         Load code pair with syntax highlighting and diff enhancements.
         
         Args:
             code_pair: Code pair to load
+            prepared: Display data prepared in the background, if available
         """
         try:
+            code_panels = getattr(self._main_window, 'code_panels_frame', None)
+            if code_panels is not None and hasattr(code_panels, 'use_prepared'):
+                code_panels.use_prepared(prepared)
+            
             # Load basic code pair
             self._main_window.load_code_pair(code_pair)
             
             # Apply syntax highlighting and diff highlighting if code display supports it
-            if hasattr(self._main_window, 'code_panels_frame'):
-                code_panels = self._main_window.code_panels_frame
+            if code_panels is not None:
                 
                 # Apply syntax highlighting if available
                 if hasattr(code_panels, 'apply_syntax_highlighting'):
@@ -1188,30 +1327,39 @@ class GUISessionController:
                     except Exception as highlight_error:
                         self.logger.warning(f"Syntax highlighting failed: {highlight_error}")
                 
-                # Apply diff highlighting between expected and generated code only
-                if hasattr(code_panels, 'apply_diff_highlighting'):
-                    try:
-                        self.logger.debug("Computing expected-generated diff for highlighting")
-                        
-                        # Compute expected-generated diff only
-                        expected_generated_diff = None
-                        if code_pair.expected_code and code_pair.generated_code:
-                            expected_generated_diff = self._code_differ.compute_diff(
-                                code_pair.expected_code, 
-                                code_pair.generated_code
-                            )
-                        
-                        # Note: Automatic diff highlighting disabled - users can manually toggle diff buttons
-                        # code_panels.apply_diff_highlighting(expected_generated_diff, self.gui_config)
-                        self.logger.debug("Automatic diff highlighting disabled - manual toggle only")
-                    except Exception as diff_error:
-                        self.logger.warning(f"Diff highlighting failed: {diff_error}")
+                # Note: Automatic diff highlighting disabled - users can manually toggle diff
+                # buttons, which use the diffs prepared in the background
+                self.logger.debug("Automatic diff highlighting disabled - manual toggle only")
             
         except Exception as e:
             self.logger.warning(f"Enhanced code loading failed, using basic loading: {e}")
             # Fallback to basic loading
             self._main_window.load_code_pair(code_pair)
     
+    def _suggest_verdict(self, code_pair: CodePair, prepared: Optional[PreparedCodePair] = None) -> None:
+        """
+        Flag code pairs whose generated code is semantically identical to the input code.
+        
+        The 'Failure - No Change' button is outlined for such pairs; the
+        reviewer still submits the verdict.
+        
+        Args:
+            code_pair: Loaded code pair
+            prepared: Display data prepared in the background, if available
+        """
+        try:
+            if prepared is not None:
+                unchanged = prepared.generated_matches_input
+            else:
+                unchanged = self._semantic_differ.generated_matches_input(code_pair)
+            
+            if hasattr(self._main_window, 'set_suggested_verdict'):
+                self._main_window.set_suggested_verdict("FAILURE_NO_CHANGE" if unchanged else None)
+            if unchanged:
+                self.logger.debug(f"Generated code of {code_pair.identifier} matches its input code")
+        except Exception as e:
+            self.logger.debug(f"Verdict suggestion skipped: {e}")
+    
     def _update_button_states(self) -> None:
         """
         Update button states based on current session state.
@@ -1345,6 +1493,10 @@ class GUISessionController:
         try:
             self.logger.info("Cleaning up GUI session controller")
             
+            # Let submitted verdicts be written before saving
+            if not self._commit_queue.shutdown(timeout=30.0):
+                self.logger.warning("Not all submitted verdicts could be written during cleanup")
+            
             # Save session state if active
             if self._session_manager and self._is_session_active:
                 try:
@@ -1353,6 +1505,9 @@ class GUISessionController:
                 except Exception as save_error:
                     self.logger.warning(f"Failed to save session state during cleanup: {save_error}")
             
+            # Stop preparing code pairs
+            self._prefetcher.shutdown()
+            
             # Clear session manager reference (SessionManager handles cleanup internally)
             self._session_manager = None
             self._report_manager = None
@@ -1395,7 +1550,7 @@ class GUISessionController:
             session = self._session_manager._current_session
             completed = len(session.completed_reviews)
             total = session.get_total_reviews()
-            remaining = len(session.remaining_queue)
+            remaining = total - completed
             
             return {
                 'active': self._is_session_active,
@@ -1477,6 +1632,7 @@ class GUISessionController:
             return False
         
         try:
+            self.flush_pending_commits()
             self._session_manager.save_session_state()
             self.logger.debug("Session state saved successfully")
             return True
@@ -1504,7 +1660,7 @@ class GUISessionController:
                 'created_timestamp': session.created_timestamp.isoformat() if session.created_timestamp else None,
                 'data_source_config': session.data_source_config,
                 'completed_reviews': len(session.completed_reviews),
-                'remaining_reviews': len(session.remaining_queue),
+                'remaining_reviews': session.get_total_reviews() - len(session.completed_reviews),
                 'total_reviews': session.get_total_reviews(),
                 'is_paused': self._session_paused,
                 'current_code_pair': self._current_code_pair.identifier if self._current_code_pair else None,
@@ -1652,7 +1808,11 @@ class GUISessionController:
         try:
             self.logger.info(f"Flagging current input as vulnerable. Comment: '{comment}'")
             
+            # Earlier verdicts must be persisted first
+            self.flush_pending_commits()
+            
             # Get the current code pair
+            self._session_manager.refill_queue()
             if not self._session_manager._current_session.remaining_queue:
                 self.logger.warning("No code pair to flag as vulnerable")
                 if self._main_window:
@@ -1687,39 +1847,22 @@ class GUISessionController:
             
             # Save flagged entry to separate file
             self._save_flagged_entry(flagged_entry)
+            self._session_manager.record_event(FLAG, flagged_code_pair, kind='vulnerable')
             
-            # If using percentage sampling, try to load a replacement from the original dataset
-            if hasattr(self._session_manager._current_session, 'data_source') and self._session_manager._current_session.data_source:
-                try:
-                    # Get a new random sample to replace the flagged one
-                    replacement_pairs = self._session_manager._current_session.data_source.load_data(1.0)  # Load all data
-                    
-                    # Filter out already reviewed and flagged items
-                    completed_ids = set(self._session_manager._current_session.completed_reviews)
-                    flagged_ids = set(entry['source_identifier'] for entry in self._session_manager._current_session.flagged_entries)
-                    remaining_ids = set(pair.identifier for pair in self._session_manager._current_session.remaining_queue)
-                    
-                    available_pairs = [
-                        pair for pair in replacement_pairs 
-                        if pair.identifier not in completed_ids 
-                        and pair.identifier not in flagged_ids 
-                        and pair.identifier not in remaining_ids
-                    ]
-                    
-                    if available_pairs:
-                        # Add a random replacement to the queue
-                        import random
-                        replacement_pair = random.choice(available_pairs)
+            # Draw a replacement that is neither reviewed, queued nor flagged
+            try:
+                flagged_ids = {entry['source_identifier'] for entry in self._session_manager._current_session.flagged_entries}
+                replacement_pair = self._session_manager.draw_replacement(flagged_ids)
+                
+                if replacement_pair is not None:
+                    with self._session_manager.state_lock:
                         self._session_manager._current_session.remaining_queue.append(replacement_pair)
-                        self.logger.info(f"Added replacement code pair: {replacement_pair.identifier}")
-                    else:
-                        self.logger.warning("No replacement code pairs available")
-                        
-                except Exception as replacement_error:
-                    self.logger.warning(f"Failed to load replacement code pair: {replacement_error}")
-            
-            # Save session state to preserve flagged entries
-            self._session_manager.save_session_state()
+                    self._session_manager.record_event(REPLACEMENT, replacement_pair)
+                    self.logger.info(f"Added replacement code pair: {replacement_pair.identifier}")
+                else:
+                    self.logger.warning("No replacement code pairs available")
+            except Exception as replacement_error:
+                self.logger.warning(f"Failed to load replacement code pair: {replacement_error}")
             
             # Show success feedback
             if self._main_window:
@@ -1824,7 +1967,11 @@ class GUISessionController:
         try:
             self.logger.info(f"Flagging current expected code as NOT vulnerable. Comment: '{comment}'")
             
+            # Earlier verdicts must be persisted first
+            self.flush_pending_commits()
+            
             # Get the current code pair
+            self._session_manager.refill_queue()
             if not self._session_manager._current_session.remaining_queue:
                 self.logger.warning("No code pair to flag as NOT vulnerable")
                 if self._main_window:
@@ -1861,8 +2008,8 @@ class GUISessionController:
             # Save NOT vulnerable entry to separate file
             self._save_not_vulnerable_entry(not_vulnerable_entry)
             
-            # Save session state to preserve NOT vulnerable entries
-            self._session_manager.save_session_state()
+            # Journal the flag to preserve NOT vulnerable entries
+            self._session_manager.record_event(FLAG, current_code_pair, kind='not_vulnerable')
             
             # Show success feedback
             if self._main_window:
@@ -9,8 +9,13 @@ import customtkinter as ctk
 import tkinter as tk
 from typing import Optional, Dict, Any, Callable
 from ..core.models import CodePair
+from ..core.semantic import SemanticDiffer
 from .models import GUIConfig, ProgressInfo, VerdictButtonConfig, get_default_verdict_buttons
 from .accessibility import AccessibilityManager, AccessibilityConfig, create_accessibility_manager
+from .prefetch import (
+    DIFF_COMPARISONS, NO_EXPECTED_CODE, NO_GENERATED_CODE, NO_INPUT_CODE, PreparedCodePair,
+    compute_diff_spans, compute_semantic_diff_spans, compute_syntax_spans, normalize_code_for_diff
+)
 
 
 class HeaderFrame(ctk.CTkFrame):
@@ -29,6 +34,7 @@ class HeaderFrame(ctk.CTkFrame):
         self.grid_columnconfigure(1, weight=1)  # Progress bar (center, expanding)
         self.grid_columnconfigure(2, weight=0)  # Pause indicator (center-right)
         self.grid_columnconfigure(3, weight=0)  # Progress text (right)
+        self.grid_columnconfigure(4, weight=0)  # Pending verdict commits (far right)
         
         # Current file label
         self.current_file_label = ctk.CTkLabel(
@@ -67,6 +73,16 @@ class HeaderFrame(ctk.CTkFrame):
         )
         self.progress_text_label.grid(row=0, column=3, padx=(20, 10), pady=10, sticky="e")
         
+        # Pending verdict commits indicator (initially hidden)
+        self.saving_indicator = ctk.CTkLabel(
+            self,
+            text="",
+            font=ctk.CTkFont(size=12, weight="normal"),
+            anchor="e"
+        )
+        self.saving_indicator.grid(row=0, column=4, padx=(0, 10), pady=10, sticky="e")
+        self.saving_indicator.grid_remove()  # Hide initially
+        
         # Register widgets for accessibility
         if self.accessibility_manager:
             self.accessibility_manager.register_widget(
@@ -164,6 +180,22 @@ class HeaderFrame(ctk.CTkFrame):
         else:
             self.pause_indicator.grid_remove()  # Hide the pause indicator
     
+    def set_pending_commits(self, pending: int, capacity: int) -> None:
+        """Show how many submitted verdicts are still being saved.
+        
+        Args:
+            pending: Verdicts not yet written
+            capacity: Pending verdicts at which submitting has to wait
+        """
+        if pending <= 0:
+            self.saving_indicator.grid_remove()
+            return
+        
+        # Highlight back-pressure: the next verdict waits for the writer
+        text_color = "#ff6b35" if pending >= capacity else "#9ca3af"
+        self.saving_indicator.configure(text=f"Saving {pending}/{capacity}", text_color=text_color)
+        self.saving_indicator.grid()
+    
     def set_static_progress(self, text: str) -> None:
         """Set static progress text (temporary method for minimal implementation).
         
@@ -202,6 +234,13 @@ class CodePanelsFrame(ctk.CTkFrame):
         self.diff_input_generated = False
         self.diff_input_expected = False
         
+        # Semantic mode ignores formatting, comments and quote style; it stays on across pairs
+        self.semantic_diff = False
+        self._semantic_differ = SemanticDiffer()
+        
+        # Display data prepared in the background for the next loaded pair
+        self._prepared: Optional[PreparedCodePair] = None
+        
         # Expected code label and panel
         self.expected_label = ctk.CTkLabel(
             self,
@@ -345,10 +384,25 @@ class CodePanelsFrame(ctk.CTkFrame):
         )
         self.diff_inp_gen_button.pack(side="left", padx=1)
         
+        # Semantic mode button (applies to all comparisons)
+        self.semantic_diff_button = ctk.CTkButton(
+            buttons_frame,
+            text="≈",  # Almost equal
+            width=24,  # Smaller width
+            height=20,  # Smaller height
+            font=ctk.CTkFont(size=10),  # Smaller font
+            fg_color="#6b7280",  # Gray-500
+            hover_color="#4b5563",  # Gray-600
+            command=self._toggle_semantic_diff
+        )
+        self.semantic_diff_button.pack(side="left", padx=(8, 1))
+        
         # Add tooltips
         self._add_tooltip(self.diff_inp_exp_button, "Toggle diff between Input and Expected code")
         self._add_tooltip(self.diff_exp_gen_button, "Toggle diff between Expected and Generated code")
         self._add_tooltip(self.diff_inp_gen_button, "Toggle diff between Input and Generated code")
+        self._add_tooltip(self.semantic_diff_button,
+                          "Toggle semantic diffs, ignoring formatting, comments and quote style")
     
 
     
@@ -423,6 +477,19 @@ class CodePanelsFrame(ctk.CTkFrame):
         # Apply diff highlighting
         self._apply_intelligent_diff()
     
+    def _toggle_semantic_diff(self) -> None:
+        """Toggle between line diffs and semantic diffs for all comparisons."""
+        self.semantic_diff = not self.semantic_diff
+        
+        # Update button appearance with gray tones
+        if self.semantic_diff:
+            self.semantic_diff_button.configure(fg_color="#1f2937", text="≈✓")  # Gray-800 active
+        else:
+            self.semantic_diff_button.configure(fg_color="#6b7280", text="≈")  # Gray-500 inactive
+        
+        # Apply diff highlighting
+        self._apply_intelligent_diff()
+    
     def _reset_diff_buttons(self) -> None:
         """Reset all diff buttons to off state and clear highlighting."""
         try:
@@ -529,30 +596,40 @@ class CodePanelsFrame(ctk.CTkFrame):
         self.input_textbox.delete("1.0", "end")
         self.input_textbox.insert("1.0", placeholder_text)
     
+    def use_prepared(self, prepared: Optional[PreparedCodePair]) -> None:
+        """Use background-prepared display data for the next load_code_pair() call.
+        
+        Args:
+            prepared: Prepared data of the pair about to be loaded, or None
+        """
+        self._prepared = prepared
+    
+    def _get_prepared(self, code_pair: Optional[CodePair] = None) -> Optional[PreparedCodePair]:
+        """Get the prepared data if it belongs to the given (or loaded) code pair."""
+        prepared = self._prepared
+        if prepared is None or (code_pair is not None and prepared.code_pair is not code_pair):
+            return None
+        return prepared
+    
     def load_code_pair(self, code_pair: CodePair) -> None:
         """Load a code pair into the display panels."""
+        if self._prepared is not None and self._prepared.code_pair is not code_pair:
+            self._prepared = None
+        prepared = self._get_prepared(code_pair)
+        
         # Clear existing content
         self.expected_textbox.delete("1.0", "end")
         self.generated_textbox.delete("1.0", "end")
         self.input_textbox.delete("1.0", "end")
         
-        # Load expected code
-        if code_pair.expected_code:
-            self.expected_textbox.insert("1.0", code_pair.expected_code)
-        else:
-            self.expected_textbox.insert("1.0", "# No expected code available")
-        
-        # Load generated code
-        if code_pair.generated_code:
-            self.generated_textbox.insert("1.0", code_pair.generated_code)
-        else:
-            self.generated_textbox.insert("1.0", "# No generated code available")
-        
-        # Load input code
-        if code_pair.input_code:
-            self.input_textbox.insert("1.0", code_pair.input_code)
+        if prepared:
+            self.expected_textbox.insert("1.0", prepared.texts['expected'])
+            self.generated_textbox.insert("1.0", prepared.texts['generated'])
+            self.input_textbox.insert("1.0", prepared.texts['input'])
         else:
-            self.input_textbox.insert("1.0", "# No input code available")
+            self.expected_textbox.insert("1.0", code_pair.expected_code or NO_EXPECTED_CODE)
+            self.generated_textbox.insert("1.0", code_pair.generated_code or NO_GENERATED_CODE)
+            self.input_textbox.insert("1.0", code_pair.input_code or NO_INPUT_CODE)
         
         # Reset diff buttons to off state when loading new code
         self._reset_diff_buttons()
@@ -591,6 +668,12 @@ class CodePanelsFrame(ctk.CTkFrame):
             # Configure text tags for syntax highlighting
             self._configure_syntax_tags()
             
+            prepared = self._get_prepared(code_pair)
+            if prepared:
+                for panel, textbox in self._panel_textboxes().items():
+                    self._apply_spans(textbox, prepared.syntax_spans.get(panel, []))
+                return
+            
             # Apply basic Python syntax highlighting
             if code_pair.expected_code:
                 self._highlight_python_syntax(self.expected_textbox, code_pair.expected_code)
@@ -655,41 +738,25 @@ class CodePanelsFrame(ctk.CTkFrame):
             textbox: The textbox widget to highlight
             code: The code content to analyze
         """
-        import re
-        
-        # Python keywords
-        keywords = r'\b(def|class|if|elif|else|for|while|try|except|finally|with|import|from|as|return|yield|break|continue|pass|raise|assert|del|global|nonlocal|lambda|and|or|not|in|is|True|False|None)\b'
-        
-        # Find and highlight keywords
-        for match in re.finditer(keywords, code):
-            start_line = code[:match.start()].count('\n') + 1
-            start_char = match.start() - code.rfind('\n', 0, match.start()) - 1
-            end_line = code[:match.end()].count('\n') + 1
-            end_char = match.end() - code.rfind('\n', 0, match.end()) - 1
-            
-            textbox.tag_add("keyword", f"{start_line}.{start_char}", f"{end_line}.{end_char}")
-        
-        # Highlight strings
-        string_pattern = r'(["\'])(?:(?=(\\?))\2.)*?\1'
-        for match in re.finditer(string_pattern, code):
-            start_line = code[:match.start()].count('\n') + 1
-            start_char = match.start() - code.rfind('\n', 0, match.start()) - 1
-            end_line = code[:match.end()].count('\n') + 1
-            end_char = match.end() - code.rfind('\n', 0, match.end()) - 1
-            
-            textbox.tag_add("string", f"{start_line}.{start_char}", f"{end_line}.{end_char}")
-        
-        # Highlight comments
-        comment_pattern = r'#.*$'
-        for match in re.finditer(comment_pattern, code, re.MULTILINE):
-            start_line = code[:match.start()].count('\n') + 1
-            start_char = match.start() - code.rfind('\n', 0, match.start()) - 1
-            end_line = code[:match.end()].count('\n') + 1
-            end_char = match.end() - code.rfind('\n', 0, match.end()) - 1
-            
-            textbox.tag_add("comment", f"{start_line}.{start_char}", f"{end_line}.{end_char}")
+        self._apply_spans(textbox, compute_syntax_spans(code))
+    
+    def _panel_textboxes(self) -> Dict[str, Any]:
+        """Get the text boxes by panel name."""
+        return {
+            'expected': self.expected_textbox,
+            'generated': self.generated_textbox,
+            'input': self.input_textbox
+        }
     
-
+    def _apply_spans(self, textbox, spans) -> None:
+        """Add precomputed (tag, start, end) spans to a textbox.
+        
+        Args:
+            textbox: The textbox widget to tag
+            spans: Spans from compute_syntax_spans() or compute_diff_spans()
+        """
+        for tag, start, end in spans:
+            textbox.tag_add(tag, start, end)
     
     def _clear_diff_highlighting(self) -> None:
         """Clear all existing diff highlighting from text boxes."""
@@ -768,22 +835,36 @@ class CodePanelsFrame(ctk.CTkFrame):
             self._configure_intelligent_diff_tags()
             
             # Get code content
-            input_content = self.input_textbox.get("1.0", "end-1c")
-            expected_content = self.expected_textbox.get("1.0", "end-1c")
-            generated_content = self.generated_textbox.get("1.0", "end-1c")
+            textboxes = self._panel_textboxes()
+            contents = {panel: textbox.get("1.0", "end-1c") for panel, textbox in textboxes.items()}
             
-            # Apply diffs based on toggle states
-            if self.diff_expected_generated:
-                self._apply_smart_diff(expected_content, generated_content, 
-                                     self.expected_textbox, self.generated_textbox, "exp_gen")
+            # Prepared diffs are only valid while the panels show the prepared text
+            prepared = self._get_prepared()
+            if prepared and prepared.texts != contents:
+                prepared = None
             
-            if self.diff_input_generated:
-                self._apply_smart_diff(input_content, generated_content,
-                                     self.input_textbox, self.generated_textbox, "inp_gen")
-            
-            if self.diff_input_expected:
-                self._apply_smart_diff(input_content, expected_content,
-                                     self.input_textbox, self.expected_textbox, "inp_exp")
+            # Apply diffs based on toggle states
+            toggles = {
+                'exp_gen': self.diff_expected_generated,
+                'inp_gen': self.diff_input_generated,
+                'inp_exp': self.diff_input_expected
+            }
+            for diff_type, (first, second) in DIFF_COMPARISONS.items():
+                if not toggles[diff_type]:
+                    continue
+                prepared_spans = None
+                if prepared:
+                    prepared_spans = prepared.semantic_diff_spans if self.semantic_diff else prepared.diff_spans
+                if prepared_spans:
+                    spans1, spans2 = prepared_spans[diff_type]
+                    self._apply_spans(textboxes[first], spans1)
+                    self._apply_spans(textboxes[second], spans2)
+                elif self.semantic_diff:
+                    self._apply_semantic_diff(contents[first], contents[second],
+                                              textboxes[first], textboxes[second], diff_type)
+                else:
+                    self._apply_smart_diff(contents[first], contents[second],
+                                           textboxes[first], textboxes[second], diff_type)
                 
         except Exception as e:
             # Diff highlighting is optional, don't fail if it doesn't work
@@ -808,13 +889,18 @@ class CodePanelsFrame(ctk.CTkFrame):
             textbox.tag_config("inp_exp_added", background="#e6ffe6", foreground="#00cc00")
             textbox.tag_config("inp_exp_removed", background="#f0fff0", foreground="#009900")
             textbox.tag_config("inp_exp_changed", background="#f5fff5", foreground="#006600")
+            
+            # Changed text inside changed lines, configured last to take priority
+            textbox.tag_config("exp_gen_changed_text", background="#ffd9b3", foreground="#994d00")
+            textbox.tag_config("inp_gen_changed_text", background="#ffcc99", foreground="#993d00")
+            textbox.tag_config("inp_exp_changed_text", background="#ccf5cc", foreground="#004d00")
     
     def _clear_all_diff_highlighting(self) -> None:
         """Clear all diff highlighting from all textboxes."""
         textboxes = [self.expected_textbox, self.generated_textbox, self.input_textbox]
-        tags = ["exp_gen_added", "exp_gen_removed", "exp_gen_changed",
-                "inp_gen_added", "inp_gen_removed", "inp_gen_changed", 
-                "inp_exp_added", "inp_exp_removed", "inp_exp_changed",
+        tags = ["exp_gen_added", "exp_gen_removed", "exp_gen_changed", "exp_gen_changed_text",
+                "inp_gen_added", "inp_gen_removed", "inp_gen_changed", "inp_gen_changed_text",
+                "inp_exp_added", "inp_exp_removed", "inp_exp_changed", "inp_exp_changed_text",
                 "diff_added", "diff_removed", "diff_changed"]
         
         for textbox in textboxes:
@@ -833,29 +919,7 @@ class CodePanelsFrame(ctk.CTkFrame):
         Returns:
             List of normalized lines
         """
-        import re
-        
-        lines = code.split('\n')
-        normalized_lines = []
-        
-        for line in lines:
-            # Remove leading/trailing whitespace
-            normalized = line.strip()
-            
-            # Skip empty lines and comments for diff purposes
-            if not normalized or normalized.startswith('#'):
-                normalized_lines.append('')
-                continue
-            
-            # Normalize whitespace within the line
-            normalized = re.sub(r'\s+', ' ', normalized)
-            
-            # Remove trailing semicolons and commas for comparison
-            normalized = normalized.rstrip(';,')
-            
-            normalized_lines.append(normalized)
-        
-        return normalized_lines
+        return normalize_code_for_diff(code)
     
     def _apply_smart_diff(self, code1: str, code2: str, textbox1, textbox2, diff_type: str) -> None:
         """Apply smart diff highlighting between two code snippets.
@@ -868,58 +932,32 @@ class CodePanelsFrame(ctk.CTkFrame):
             diff_type: Type of diff (exp_gen, inp_gen, inp_exp)
         """
         try:
-            import difflib
-            
-            # Get original lines for display
-            lines1 = code1.split('\n')
-            lines2 = code2.split('\n')
-            
-            # Get normalized lines for comparison
-            norm_lines1 = self._normalize_code_for_diff(code1)
-            norm_lines2 = self._normalize_code_for_diff(code2)
-            
-            # Create diff matcher on normalized content
-            matcher = difflib.SequenceMatcher(None, norm_lines1, norm_lines2)
-            
-            # Apply highlighting based on diff results
-            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-                if tag == 'equal':
-                    continue
-                
-                elif tag == 'delete':
-                    # Lines removed from first code
-                    for i in range(i1, i2):
-                        line_num = i + 1
-                        if line_num <= len(lines1) and lines1[i].strip():  # Don't highlight empty lines
-                            textbox1.tag_add(f"{diff_type}_removed", 
-                                            f"{line_num}.0", f"{line_num}.end")
-                
-                elif tag == 'insert':
-                    # Lines added in second code
-                    for j in range(j1, j2):
-                        line_num = j + 1
-                        if line_num <= len(lines2) and lines2[j].strip():  # Don't highlight empty lines
-                            textbox2.tag_add(f"{diff_type}_added", 
-                                           f"{line_num}.0", f"{line_num}.end")
-                
-                elif tag == 'replace':
-                    # Lines modified - highlight both sides
-                    for i in range(i1, i2):
-                        line_num = i + 1
-                        if line_num <= len(lines1) and lines1[i].strip():
-                            textbox1.tag_add(f"{diff_type}_changed", 
-                                            f"{line_num}.0", f"{line_num}.end")
-                    
-                    for j in range(j1, j2):
-                        line_num = j + 1
-                        if line_num <= len(lines2) and lines2[j].strip():
-                            textbox2.tag_add(f"{diff_type}_changed", 
-                                           f"{line_num}.0", f"{line_num}.end")
-                            
+            spans1, spans2 = compute_diff_spans(code1, code2, diff_type, intraline=True)
+            self._apply_spans(textbox1, spans1)
+            self._apply_spans(textbox2, spans2)
         except Exception as e:
             # If smart diff fails, continue without it
             pass
     
+    def _apply_semantic_diff(self, code1: str, code2: str, textbox1, textbox2, diff_type: str) -> None:
+        """Apply semantic diff highlighting between two code snippets.
+        
+        Args:
+            code1: First code snippet
+            code2: Second code snippet
+            textbox1: First textbox widget
+            textbox2: Second textbox widget
+            diff_type: Type of diff (exp_gen, inp_gen, inp_exp)
+        """
+        try:
+            comparison = self._semantic_differ.compare(code1, code2)
+            spans1, spans2 = compute_semantic_diff_spans(comparison, diff_type)
+            self._apply_spans(textbox1, spans1)
+            self._apply_spans(textbox2, spans2)
+        except Exception as e:
+            # If semantic diff fails, continue without it
+            pass
+    
     def increase_font_size(self) -> None:
         """Increase the font size of all code panels."""
         if self.current_font_size < self.max_font_size:
@@ -1869,6 +1907,22 @@ class ActionsFrame(ctk.CTkFrame):
         """Enable or disable the undo button based on session state."""
         self.undo_button.configure(state="normal" if enabled else "disabled")
     
+    def set_suggested_verdict(self, verdict_id: Optional[str]) -> None:
+        """Outline the verdict button suggested for the current code pair.
+        
+        Args:
+            verdict_id: Suggested verdict, or None to clear the suggestion
+        """
+        for button_id, button in self.verdict_buttons.items():
+            suggested = button_id == verdict_id
+            button.configure(border_width=2 if suggested else 0, border_color="#ffc107")
+        
+        if verdict_id in self.verdict_configs and self.accessibility_manager:
+            self.accessibility_manager.announce(
+                f"Suggested verdict: {self.verdict_configs[verdict_id].display_text}",
+                priority="normal"
+            )
+    
     def set_processing_state(self, processing: bool) -> None:
         """Set the UI to processing state to prevent user interaction during operations.
         
@@ -2147,6 +2201,15 @@ class MainReviewContent(ctk.CTkFrame):
         # Delegate to actions frame
         self.actions_frame.set_paused_state(is_paused)
     
+    def set_pending_commits(self, pending: int, capacity: int) -> None:
+        """Show the number of verdicts still being saved in the header.
+        
+        Args:
+            pending: Verdicts not yet written
+            capacity: Pending verdicts at which submitting has to wait
+        """
+        self.header_frame.set_pending_commits(pending, capacity)
+    
     def set_buttons_enabled(self, enabled: bool) -> None:
         """Enable or disable verdict buttons.
         
@@ -2201,6 +2264,10 @@ class MainReviewContent(ctk.CTkFrame):
         """Enable or disable the undo button based on session state."""
         self.actions_frame.set_undo_enabled(enabled)
     
+    def set_suggested_verdict(self, verdict_id: Optional[str]) -> None:
+        """Outline the verdict button suggested for the current code pair."""
+        self.actions_frame.set_suggested_verdict(verdict_id)
+    
     def set_processing_state(self, processing: bool) -> None:
         """Set the UI to processing state to prevent user interaction during operations."""
         self.actions_frame.set_processing_state(processing)
@@ -2561,6 +2628,15 @@ Please provide a brief summary comparing the three code snippets and any overall
         else:
             self.title("VAITP-Auditor - Main Review")
     
+    def set_pending_commits(self, pending: int, capacity: int) -> None:
+        """Show the number of verdicts still being saved in the header.
+        
+        Args:
+            pending: Verdicts not yet written
+            capacity: Pending verdicts at which submitting has to wait
+        """
+        self.header_frame.set_pending_commits(pending, capacity)
+    
     def get_current_progress(self) -> Optional[ProgressInfo]:
         """Get current progress information from header frame.
         
@@ -2616,6 +2692,10 @@ Please provide a brief summary comparing the three code snippets and any overall
         """Enable or disable the undo button based on session state."""
         self.actions_frame.set_undo_enabled(enabled)
     
+    def set_suggested_verdict(self, verdict_id: Optional[str]) -> None:
+        """Outline the verdict button suggested for the current code pair."""
+        self.actions_frame.set_suggested_verdict(verdict_id)
+    
     def set_processing_state(self, processing: bool) -> None:
         """Set the UI to processing state to prevent user interaction during operations."""
         self.actions_frame.set_processing_state(processing)
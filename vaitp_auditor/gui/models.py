@@ -30,6 +30,7 @@ class GUIConfig:
     show_line_numbers: bool = True
     wrap_text: bool = False
     enable_diff_highlighting: bool = True
+    prefetch_depth: int = 3  # Code pairs prepared in the background ahead of the current one
     
     def __post_init__(self):
         """Validate configuration values after initialization."""
@@ -74,6 +75,9 @@ class GUIConfig:
         
         if not isinstance(self.enable_diff_highlighting, bool):
             raise ValueError("enable_diff_highlighting must be a boolean")
+        
+        if not isinstance(self.prefetch_depth, int) or self.prefetch_depth < 0 or self.prefetch_depth > 50:
+            raise ValueError("prefetch_depth must be an integer between 0 and 50")
     
     def is_valid_dimensions(self) -> bool:
         """Check if the current dimensions are valid for the display."""
@@ -100,7 +104,8 @@ class GUIConfig:
             'auto_scroll': self.auto_scroll,
             'show_line_numbers': self.show_line_numbers,
             'wrap_text': self.wrap_text,
-            'enable_diff_highlighting': self.enable_diff_highlighting
+            'enable_diff_highlighting': self.enable_diff_highlighting,
+            'prefetch_depth': self.prefetch_depth
         }
     
     @classmethod
@@ -0,0 +1,332 @@
+"""
+Background preparation of upcoming code pairs for the review window.
+
+After every verdict the review window needs the next pair's code, its syntax
+highlighting spans and the line and semantic diffs behind the diff toggles. The
+CodePairPrefetcher prepares these for the next few queued pairs on a worker
+thread, so the Tk thread only has to insert text and apply tags when the
+reviewer moves on.
+"""
+
+import difflib
+import itertools
+import logging
+import re
+from bisect import bisect_right
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..core.differ import CodeDiffer
+from ..core.intraline import ModificationDetector
+from ..core.models import CodePair, iter_diff_rows
+from ..core.semantic import SemanticComparison, SemanticToken
+
+
+# Text shown in place of missing code; diffs are computed on the displayed text
+NO_EXPECTED_CODE = "# No expected code available"
+NO_GENERATED_CODE = "# No generated code available"
+NO_INPUT_CODE = "# No input code available"
+
+# (tag name, start index, end index) in Tk text index notation
+TextSpan = Tuple[str, str, str]
+
+# Diff toggles: comparison name -> (first panel, second panel)
+DIFF_COMPARISONS: Dict[str, Tuple[str, str]] = {
+    'exp_gen': ('expected', 'generated'),
+    'inp_gen': ('input', 'generated'),
+    'inp_exp': ('input', 'expected'),
+}
+
+_SYNTAX_PATTERNS = (
+    ('keyword', re.compile(
+        r'\b(def|class|if|elif|else|for|while|try|except|finally|with|import|from|as|return|yield|break|'
+        r'continue|pass|raise|assert|del|global|nonlocal|lambda|and|or|not|in|is|True|False|None)\b'
+    )),
+    ('string', re.compile(r'(["\'])(?:(?=(\\?))\2.)*?\1')),
+    ('comment', re.compile(r'#.*$', re.MULTILINE)),
+)
+
+
+def compute_syntax_spans(code: str) -> List[TextSpan]:
+    """
+    Compute the keyword, string and comment tag spans of Python code.
+    
+    Args:
+        code: Code as displayed in the text box.
+    
+    Returns:
+        List[TextSpan]: Spans for the 'keyword', 'string' and 'comment' tags.
+    """
+    line_starts = [0] + [match.end() for match in re.finditer('\n', code)]
+    
+    def to_index(offset: int) -> str:
+        line = bisect_right(line_starts, offset) - 1
+        return f"{line + 1}.{offset - line_starts[line]}"
+    
+    spans = []
+    for tag, pattern in _SYNTAX_PATTERNS:
+        for match in pattern.finditer(code):
+            spans.append((tag, to_index(match.start()), to_index(match.end())))
+    return spans
+
+
+def normalize_code_for_diff(code: str) -> List[str]:
+    """
+    Normalize code lines for the diff toggles.
+    
+    Blank and comment lines compare equal, whitespace runs are collapsed and
+    trailing semicolons and commas are ignored.
+    
+    Args:
+        code: Raw code string
+    
+    Returns:
+        List of normalized lines
+    """
+    normalized_lines = []
+    for line in code.split('\n'):
+        normalized = line.strip()
+        if not normalized or normalized.startswith('#'):
+            normalized_lines.append('')
+            continue
+        normalized = re.sub(r'\s+', ' ', normalized)
+        normalized_lines.append(normalized.rstrip(';,'))
+    return normalized_lines
+
+
+def compute_diff_spans(code1: str, code2: str, diff_type: str,
+                       intraline: bool = False) -> Tuple[List[TextSpan], List[TextSpan]]:
+    """
+    Compute the line tag spans of a diff toggle.
+    
+    Args:
+        code1: Code of the first panel
+        code2: Code of the second panel
+        diff_type: Comparison name (exp_gen, inp_gen, inp_exp), used as tag prefix
+        intraline: Also tag the changed text of paired changed lines with
+            the '<diff_type>_changed_text' tag
+    
+    Returns:
+        Tuple of the spans for the first and the second panel.
+    """
+    lines1 = code1.split('\n')
+    lines2 = code2.split('\n')
+    matcher = difflib.SequenceMatcher(None, normalize_code_for_diff(code1), normalize_code_for_diff(code2))
+    opcodes = matcher.get_opcodes()
+    
+    spans1: List[TextSpan] = []
+    spans2: List[TextSpan] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'equal':
+            continue
+        # Empty lines are never highlighted
+        if tag in ('delete', 'replace'):
+            suffix = 'removed' if tag == 'delete' else 'changed'
+            spans1.extend((f"{diff_type}_{suffix}", f"{i + 1}.0", f"{i + 1}.end")
+                          for i in range(i1, i2) if lines1[i].strip())
+        if tag in ('insert', 'replace'):
+            suffix = 'added' if tag == 'insert' else 'changed'
+            spans2.extend((f"{diff_type}_{suffix}", f"{j + 1}.0", f"{j + 1}.end")
+                          for j in range(j1, j2) if lines2[j].strip())
+    
+    if intraline:
+        # Normalization keeps one entry per line, so the opcodes index the raw lines
+        text_tag = f"{diff_type}_changed_text"
+        for modification in ModificationDetector().detect(lines1, lines2, opcodes):
+            i, j = modification.expected_index + 1, modification.generated_index + 1
+            spans1.extend((text_tag, f"{i}.{start}", f"{i}.{end}") for start, end in modification.expected_spans)
+            spans2.extend((text_tag, f"{j}.{start}", f"{j}.{end}") for start, end in modification.generated_spans)
+    return spans1, spans2
+
+
+def compute_semantic_diff_spans(comparison: SemanticComparison,
+                                diff_type: str) -> Tuple[List[TextSpan], List[TextSpan]]:
+    """
+    Compute the tag spans of a diff toggle in semantic mode.
+    
+    Lines holding changed tokens get the line tags of compute_diff_spans()
+    and the changed tokens the '<diff_type>_changed_text' tag; equivalent
+    code gets no spans.
+    
+    Args:
+        comparison: Semantic comparison of the first and the second panel's code
+        diff_type: Comparison name (exp_gen, inp_gen, inp_exp), used as tag prefix
+    
+    Returns:
+        Tuple of the spans for the first and the second panel.
+    """
+    text_tag = f"{diff_type}_changed_text"
+    spans1: List[TextSpan] = []
+    spans2: List[TextSpan] = []
+    tagged1 = set()
+    tagged2 = set()
+    
+    def add_token_spans(spans: List[TextSpan], tagged_lines: set,
+                        tokens: Tuple[SemanticToken, ...], line_tag: str) -> None:
+        for token in tokens:
+            (start_line, start_column), (end_line, end_column) = token.start, token.end
+            for line in range(start_line + 1, end_line + 2):
+                if line not in tagged_lines:
+                    tagged_lines.add(line)
+                    spans.append((line_tag, f"{line}.0", f"{line}.end"))
+            if token.start != token.end:
+                spans.append((text_tag, f"{start_line + 1}.{start_column}", f"{end_line + 1}.{end_column}"))
+    
+    for tag, i1, i2, j1, j2 in comparison.changes:
+        add_token_spans(spans1, tagged1, comparison.expected_tokens[i1:i2],
+                        f"{diff_type}_{'removed' if tag == 'delete' else 'changed'}")
+        add_token_spans(spans2, tagged2, comparison.generated_tokens[j1:j2],
+                        f"{diff_type}_{'added' if tag == 'insert' else 'changed'}")
+    return spans1, spans2
+
+
+@dataclass
+class PreparedCodePair:
+    """Display data of a code pair, computed off the Tk thread."""
+    code_pair: CodePair
+    texts: Dict[str, str]  # panel ('expected', 'generated', 'input') -> displayed text
+    syntax_spans: Dict[str, List[TextSpan]]  # panel -> syntax spans (panels with code only)
+    diff_spans: Dict[str, Tuple[List[TextSpan], List[TextSpan]]]  # comparison -> spans of its two panels
+    code_diff: Optional[str] = None  # Expected/generated diff text for the review result
+    semantic_diff_spans: Optional[Dict[str, Tuple[List[TextSpan], List[TextSpan]]]] = None  # Semantic mode
+    generated_matches_input: bool = False  # Generated code is semantically identical to the input code
+
+
+def prepare_code_pair(code_pair: CodePair, differ: CodeDiffer) -> PreparedCodePair:
+    """
+    Load the content of a code pair and compute everything the window displays.
+    
+    Args:
+        code_pair: Code pair to prepare.
+        differ: Differ used for the review result diff and the semantic comparisons.
+    
+    Returns:
+        PreparedCodePair: Prepared display data.
+    """
+    # Reading the fields loads deferred content
+    codes = {
+        'expected': code_pair.expected_code,
+        'generated': code_pair.generated_code,
+        'input': code_pair.input_code,
+    }
+    texts = {
+        'expected': codes['expected'] or NO_EXPECTED_CODE,
+        'generated': codes['generated'] or NO_GENERATED_CODE,
+        'input': codes['input'] or NO_INPUT_CODE,
+    }
+    syntax_spans = {panel: compute_syntax_spans(code) for panel, code in codes.items() if code}
+    diff_spans = {
+        diff_type: compute_diff_spans(texts[first], texts[second], diff_type, intraline=True)
+        for diff_type, (first, second) in DIFF_COMPARISONS.items()
+    }
+    semantic_comparisons = {
+        diff_type: differ.compare_semantics(texts[first], texts[second])
+        for diff_type, (first, second) in DIFF_COMPARISONS.items()
+    }
+    semantic_diff_spans = {
+        diff_type: compute_semantic_diff_spans(comparison, diff_type)
+        for diff_type, comparison in semantic_comparisons.items()
+    }
+    # With both codes present the panels show them unchanged
+    generated_matches_input = (
+        bool(codes['input'] and codes['generated']) and semantic_comparisons['inp_gen'].equivalent
+    )
+    
+    code_diff = None
+    if codes['expected'] and codes['generated']:
+        diff_lines = differ.compute_diff(
+            codes['expected'], codes['generated'],
+            content_hashes=(code_pair.content_hash('expected_code'), code_pair.content_hash('generated_code'))
+        )
+        code_diff = "\n".join(line_content for _, line_content, _ in iter_diff_rows(diff_lines))
+    
+    return PreparedCodePair(code_pair, texts, syntax_spans, diff_spans, code_diff,
+                            semantic_diff_spans, generated_matches_input)
+
+
+class CodePairPrefetcher:
+    """
+    Prepares the next queued code pairs on a background thread.
+    
+    prefetch() is called from the Tk thread with the head of the review
+    queue; pairs that left the window are dropped, so at most depth + 1
+    prepared pairs are held. get() returns the prepared data of a pair,
+    waiting for it if its preparation is still running.
+    """
+    
+    def __init__(self, depth: int = 3, differ: Optional[CodeDiffer] = None):
+        """
+        Initialize the prefetcher.
+        
+        Args:
+            depth: Number of pairs prepared ahead of the current one.
+            differ: Differ used for review result diffs.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.depth = depth
+        self._differ = differ or CodeDiffer()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+    
+    def prefetch(self, code_pairs: Iterable[CodePair]) -> None:
+        """
+        Schedule the preparation of the current and the next depth pairs.
+        
+        Args:
+            code_pairs: Review queue, current pair first.
+        """
+        window = list(itertools.islice(code_pairs, self.depth + 1))
+        identifiers = {code_pair.identifier for code_pair in window}
+        
+        for identifier in list(self._futures):
+            if identifier not in identifiers:
+                self._futures.pop(identifier).cancel()
+        
+        for code_pair in window:
+            future = self._futures.get(code_pair.identifier)
+            if future is not None and not future.cancelled():
+                continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="code-pair-prefetch")
+            self._futures[code_pair.identifier] = self._executor.submit(prepare_code_pair, code_pair, self._differ)
+    
+    def get(self, code_pair: CodePair, timeout: Optional[float] = None) -> Optional[PreparedCodePair]:
+        """
+        Get the prepared data of a code pair.
+        
+        Args:
+            code_pair: Code pair to look up.
+            timeout: Seconds to wait for a running preparation, None to wait
+                until it finishes.
+        
+        Returns:
+            Optional[PreparedCodePair]: Prepared data, or None if the pair was
+            not scheduled or its preparation failed or timed out.
+        """
+        future = self._futures.get(code_pair.identifier)
+        if future is None:
+            return None
+        try:
+            prepared = future.result(timeout=timeout)
+        except (CancelledError, FutureTimeoutError):
+            return None
+        except Exception as e:
+            self.logger.warning(f"Failed to prepare code pair {code_pair.identifier}: {e}")
+            self._futures.pop(code_pair.identifier, None)
+            return None
+        return prepared if prepared.code_pair is code_pair else None
+    
+    def clear(self) -> None:
+        """Drop all prepared and scheduled pairs."""
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+    
+    def shutdown(self) -> None:
+        """Drop all pairs and stop the worker thread."""
+        self.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -7,7 +7,7 @@ in the VAITP-Auditor GUI application.
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, List
 from datetime import datetime
 
 try:
@@ -2337,11 +2337,8 @@ class SessionResumptionStep(SetupStep):
         
         def do_delete():
             try:
-                # Delete session file
-                from pathlib import Path
-                session_file = Path.home() / '.vaitp_auditor' / 'sessions' / f"{session_id}.pkl"
-                if session_file.exists():
-                    session_file.unlink()
+                # Delete session snapshot, journal and store entry
+                self.session_manager.delete_session(session_id)
                 
                 # Update available sessions
                 self.available_sessions = self.session_manager.list_available_sessions()
@@ -2448,6 +2445,7 @@ class FilteringStep(SetupStep):
         self.strategy_dropdown: Optional[ctk.CTkComboBox] = None
         self.available_models: list = []
         self.available_strategies: list = []
+        self.table_statistics = None  # TableStatistics of a SQLite source, reused by the summary
     
     def create_widgets(self, parent: ctk.CTkFrame) -> None:
         """Create widgets for filtering step."""
@@ -2600,28 +2598,40 @@ class FilteringStep(SetupStep):
             if not db_path or not table_name:
                 return
             
-            import sqlite3
+            from ..data_sources.sqlite import SQLiteSource
             
-            with sqlite3.connect(db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Load available models
-                if model_column and model_column != "(None)":
-                    cursor.execute(f"SELECT DISTINCT {model_column} FROM {table_name} WHERE {model_column} IS NOT NULL ORDER BY {model_column}")
-                    models = [row[0] for row in cursor.fetchall() if row[0]]
-                    if models:
-                        self.available_models = models
-                        model_values = ["All Models"] + models
-                        self.model_dropdown.configure(values=model_values)
-                
-                # Load available strategies
-                if strategy_column and strategy_column != "(None)":
-                    cursor.execute(f"SELECT DISTINCT {strategy_column} FROM {table_name} WHERE {strategy_column} IS NOT NULL ORDER BY {strategy_column}")
-                    strategies = [row[0] for row in cursor.fetchall() if row[0]]
-                    if strategies:
-                        self.available_strategies = strategies
-                        strategy_values = ["All Strategies"] + strategies
-                        self.strategy_dropdown.configure(values=strategy_values)
+            if model_column == "(None)":
+                model_column = None
+            if strategy_column == "(None)":
+                strategy_column = None
+            
+            # One GROUP BY pass yields the values and the counts shown in the
+            # summary; the session's data source reuses the cached result
+            database_config = config_step._get_database_data()
+            sqlite_source = SQLiteSource()
+            sqlite_source._db_path = db_path
+            sqlite_source._table_name = table_name
+            sqlite_source._identifier_column = database_config.get("identifier_column")
+            sqlite_source._model_column = model_column
+            sqlite_source._prompting_strategy_column = strategy_column
+            try:
+                self.table_statistics = sqlite_source.get_statistics()
+            finally:
+                sqlite_source.close()
+            
+            # Load available models
+            models = list(self.table_statistics.model_counts()) if model_column else None
+            if models:
+                self.available_models = models
+                model_values = ["All Models"] + models
+                self.model_dropdown.configure(values=model_values)
+            
+            # Load available strategies
+            strategies = list(self.table_statistics.strategy_counts()) if strategy_column else None
+            if strategies:
+                self.available_strategies = strategies
+                strategy_values = ["All Strategies"] + strategies
+                self.strategy_dropdown.configure(values=strategy_values)
             
             self.logger.info(f"Loaded {len(self.available_models)} models and {len(self.available_strategies)} strategies from SQLite")
             
@@ -2643,44 +2653,49 @@ class FilteringStep(SetupStep):
             
             # Get Excel configuration
             file_path = config_step.excel_file_var.get() if config_step.excel_file_var else None
-            sheet_name = config_step.sheet_var.get() if config_step.sheet_var else None
             model_column = config_step.excel_model_column_var.get() if config_step.excel_model_column_var else None
             strategy_column = config_step.excel_prompting_strategy_column_var.get() if config_step.excel_prompting_strategy_column_var else None
             
             if not file_path:
                 return
             
-            import pandas as pd
-            import os
+            from ..data_sources.excel import ExcelSource
+            from ..data_sources.table_cache import ColumnarTableCache
             
-            # Load data
-            file_ext = os.path.splitext(file_path)[1].lower()
-            if file_ext == '.csv':
-                df = pd.read_csv(file_path)
-            else:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
+            placeholders = ["None (skip)", "Select file first..."]
+            if model_column in placeholders:
+                model_column = None
+            if strategy_column in placeholders:
+                strategy_column = None
+            if not model_column and not strategy_column:
+                return
+            
+            # Stream the mapped columns once, computing both value sets and
+            # filling the table cache used when the session loads the file
+            excel_config = config_step._get_excel_data()
+            excel_source = ExcelSource()
+            excel_source._file_path = file_path
+            excel_source._sheet_name = excel_config.get("sheet_name")
+            excel_source._identifier_column = excel_config.get("identifier_column") or None
+            excel_source._generated_code_column = excel_config.get("generated_code_column") or None
+            excel_source._expected_code_column = excel_config.get("expected_code_column")
+            excel_source._input_code_column = excel_config.get("input_code_column")
+            excel_source.table_cache = ColumnarTableCache()
+            distinct_values = excel_source.get_distinct_values([model_column, strategy_column])
             
             # Load available models
-            if model_column and model_column not in ["None (skip)", "Select file first..."]:
-                if model_column in df.columns:
-                    models = df[model_column].dropna().unique().tolist()
-                    models = [str(m) for m in models if str(m).strip()]
-                    if models:
-                        models.sort()
-                        self.available_models = models
-                        model_values = ["All Models"] + models
-                        self.model_dropdown.configure(values=model_values)
+            models = distinct_values.get(model_column) if model_column else None
+            if models:
+                self.available_models = models
+                model_values = ["All Models"] + models
+                self.model_dropdown.configure(values=model_values)
             
             # Load available strategies
-            if strategy_column and strategy_column not in ["None (skip)", "Select file first..."]:
-                if strategy_column in df.columns:
-                    strategies = df[strategy_column].dropna().unique().tolist()
-                    strategies = [str(s) for s in strategies if str(s).strip()]
-                    if strategies:
-                        strategies.sort()
-                        self.available_strategies = strategies
-                        strategy_values = ["All Strategies"] + strategies
-                        self.strategy_dropdown.configure(values=strategy_values)
+            strategies = distinct_values.get(strategy_column) if strategy_column else None
+            if strategies:
+                self.available_strategies = strategies
+                strategy_values = ["All Strategies"] + strategies
+                self.strategy_dropdown.configure(values=strategy_values)
             
             self.logger.info(f"Loaded {len(self.available_models)} models and {len(self.available_strategies)} strategies from Excel")
             
@@ -2941,6 +2956,7 @@ class FinalizationStep(SetupStep):
                                 summary_lines.append(f"  Expected Column: {expected_col}")
                             else:
                                 summary_lines.append("  Expected Column: Not specified")
+                            summary_lines.extend(self._get_sqlite_record_counts())
                         
                         elif data_source_type == "excel":
                             summary_lines.append("Excel/CSV Configuration:")
@@ -2991,6 +3007,21 @@ class FinalizationStep(SetupStep):
                 except Exception as text_error:
                     self.logger.error(f"Error updating summary text widget: {text_error}")
     
+    def _get_sqlite_record_counts(self) -> List[str]:
+        """Get summary lines with the record counts cached by the filtering step."""
+        for step in self.wizard.steps:
+            if isinstance(step, FilteringStep) and step.table_statistics is not None:
+                filters = step.get_data()
+                selected_model = filters.get("selected_model")
+                selected_strategy = filters.get("selected_strategy")
+                statistics = step.table_statistics
+                return [
+                    f"  Records: {statistics.total}",
+                    f"  Records after filtering: {statistics.filtered_count(selected_model, selected_strategy)} "
+                    f"({statistics.reviewable_count(selected_model, selected_strategy)} reviewable)"
+                ]
+        return []
+    
     def _get_data_source_type(self) -> str:
         """Get the data source type from previous steps."""
         for step in self.wizard.steps:
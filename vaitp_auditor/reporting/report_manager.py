@@ -3,6 +3,7 @@ Report manager for output file generation and management.
 """
 
 import csv
+import io
 import os
 import tempfile
 import threading
@@ -34,12 +35,33 @@ except ImportError:
     PANDAS_AVAILABLE = False
 
 
+# Column order shared by the review journal and the final report
+REPORT_COLUMNS = [
+    'review_id',
+    'source_identifier',
+    'experiment_name',
+    'review_timestamp_utc',
+    'reviewer_verdict',
+    'reviewer_comment',
+    'time_to_review_seconds',
+    'model_name',
+    'prompting_strategy',
+    'expected_code',
+    'generated_code',
+    'code_diff'
+]
+
+
 class ReportManager:
     """
     Manages output file generation with atomic writes.
     
     Handles both Excel and CSV formats with proper data integrity.
-    Supports atomic result appending and undo functionality.
+    While a session is running, results are kept in an append-only CSV
+    journal (the temporary file): each verdict appends one fsync'd record
+    and undo truncates back to the previous record offset. The final
+    report, including any Excel workbook, is only materialised in
+    finalize_report().
     """
 
     def __init__(self):
@@ -51,13 +73,13 @@ class ReportManager:
         self._lock = threading.Lock()
         self._review_data: List[Dict[str, Any]] = []
         self._last_review_id: Optional[int] = None
+        self._record_offsets: List[int] = []  # Journal byte offset of each record
         self._manual_verification_stats: Dict[str, int] = {
             'successful_injections': 0,
             'unsuccessful_injections': 0,
             'total_manual_verifications': 0
         }
 
-
     def initialize_report(self, session_id: str, output_format: str = 'excel') -> None:
         """
         Initialize a new report file for the session.
@@ -81,6 +103,7 @@ class ReportManager:
             self._output_format = output_format
             self._review_data = []
             self._last_review_id = None
+            self._record_offsets = []
             self._manual_verification_stats = {
                 'successful_injections': 0,
                 'unsuccessful_injections': 0,
@@ -118,12 +141,12 @@ class ReportManager:
             filename = f"{session_id}_{timestamp}.{file_extension}"
             self._output_file_path = output_dir / filename
             
-            # Create temporary file for atomic operations
+            # Create the temporary journal file (always CSV, see class docstring)
             temp_dir = output_dir / "temp"
             try:
                 temp_dir.mkdir(exist_ok=True)
                 temp_fd, self._temp_file_path = tempfile.mkstemp(
-                    suffix=f".{file_extension}",
+                    suffix=".csv",
                     prefix=f"{session_id}_temp_",
                     dir=temp_dir
                 )
@@ -132,8 +155,8 @@ class ReportManager:
                 raise OSError(f"Unable to create temporary file in {temp_dir}. Error: {e}. "
                             f"Please ensure the directory is writable or try a different location.")
             
-            # Initialize the file with headers
-            self._write_headers()
+            # Initialize the journal with headers
+            self._rewrite_journal()
 
     def resume_report(self, session_id: str, existing_file_path: str, output_format: str = 'excel') -> None:
         """
@@ -166,12 +189,12 @@ class ReportManager:
             # Load existing data from the file
             self._load_existing_data()
             
-            # Create temporary file for atomic operations
+            # Create the temporary journal file (always CSV, see class docstring)
             temp_dir = existing_path.parent / "temp"
             try:
                 temp_dir.mkdir(exist_ok=True)
                 temp_fd, self._temp_file_path = tempfile.mkstemp(
-                    suffix=f".{existing_path.suffix.lstrip('.')}",
+                    suffix=".csv",
                     prefix=f"{session_id}_temp_",
                     dir=temp_dir
                 )
@@ -180,8 +203,8 @@ class ReportManager:
                 raise OSError(f"Unable to create temporary file in {temp_dir}. Error: {e}. "
                             f"Please ensure the directory is writable or try a different location.")
             
-            # Write current data to temp file to ensure consistency
-            self._write_data_to_temp_file()
+            # Seed the journal with the existing reviews
+            self._rewrite_journal()
 
     def _load_existing_data(self) -> None:
         """Load existing data from the report file."""
@@ -293,29 +316,22 @@ class ReportManager:
                     print("Applying data sanitization to make it Excel-compatible...")
                     # Continue with Excel format but with sanitized data
             
-            # Write to temporary file atomically with locking
-            success = self._write_data_to_temp_file_with_locking()
-            if not success:
-                # Fallback to basic write method
-                try:
-                    self._write_data_to_temp_file()
-                except Exception as e:
-                    # If both methods fail, remove the added data and raise
-                    self._review_data.pop()
-                    if self._review_data:
-                        self._last_review_id = self._review_data[-1]['review_id']
-                    else:
-                        self._last_review_id = None
-                    
-                    # Provide more specific error message for Excel compatibility issues
-                    error_msg = str(e)
-                    if "cannot be used in worksheets" in error_msg or "openpyxl" in error_msg:
-                        raise OSError(f"Failed to write review result to Excel file due to incompatible content. "
-                                    f"The generated code contains characters or data that Excel cannot handle even after sanitization. "
-                                    f"To continue this session, please restart and select CSV format in the wizard. "
-                                    f"Original error: {error_msg}")
-                    else:
-                        raise OSError(f"Failed to write review result to file: {error_msg}")
+            # Append a single durable record to the journal
+            if self._append_journal_record(result_dict):
+                return
+            
+            # Fallback: rebuild the journal from memory
+            try:
+                self._rewrite_journal()
+            except Exception as e:
+                # If both methods fail, remove the added data and raise
+                self._review_data.pop()
+                self._reverse_manual_verification_stats(result.reviewer_verdict)
+                if self._review_data:
+                    self._last_review_id = self._review_data[-1]['review_id']
+                else:
+                    self._last_review_id = None
+                raise OSError(f"Failed to write review result to file: {e}")
 
     def get_last_review_id(self) -> Optional[int]:
         """
@@ -331,8 +347,8 @@ class ReportManager:
         """
         Remove the last review from the report (for undo functionality).
         
-        Implements atomic undo operations with proper error recovery and
-        file locking to handle concurrent access gracefully.
+        Truncates the journal back to the offset at which the last record
+        started, with rollback of the in-memory state on failure.
         
         Returns:
             bool: True if removal was successful, False otherwise.
@@ -344,6 +360,7 @@ class ReportManager:
             # Create backup of current state for rollback
             backup_data = self._review_data.copy()
             backup_last_id = self._last_review_id
+            backup_stats = self._manual_verification_stats.copy()
             
             try:
                 # Remove the last review
@@ -358,21 +375,27 @@ class ReportManager:
                 else:
                     self._last_review_id = None
                 
-                # Attempt to rewrite the temporary file with file locking
-                success = self._write_data_to_temp_file_with_locking()
+                # Truncate the journal to where the removed record started
+                if self._record_offsets:
+                    success = self._truncate_journal(self._record_offsets[-1])
+                else:
+                    success = False
                 
                 if not success:
                     # Rollback on failure
                     self._review_data = backup_data
                     self._last_review_id = backup_last_id
+                    self._manual_verification_stats = backup_stats
                     return False
                 
+                self._record_offsets.pop()
                 return True
                 
             except Exception as e:
                 # Rollback on any exception
                 self._review_data = backup_data
                 self._last_review_id = backup_last_id
+                self._manual_verification_stats = backup_stats
                 # Log the error but don't raise to maintain graceful degradation
                 print(f"Warning: Failed to remove last review due to error: {e}")
                 return False
@@ -411,16 +434,11 @@ class ReportManager:
                     file_extension = 'xlsx' if final_format == 'excel' else 'csv'
                     self._output_file_path = self._output_file_path.with_suffix(f'.{file_extension}')
                 
-                # Move temp file to final location
-                if Path(self._temp_file_path).exists():
-                    # If format conversion is needed, do it now
-                    if final_format != self._output_format:
-                        self._convert_format(self._temp_file_path, self._output_file_path, final_format)
-                    else:
-                        # Simple move
-                        Path(self._temp_file_path).rename(self._output_file_path)
+                if final_format == 'csv' and Path(self._temp_file_path).exists():
+                    # The journal already is the CSV report, just move it
+                    os.replace(self._temp_file_path, self._output_file_path)
                 else:
-                    # Create final file directly if temp doesn't exist
+                    # Materialise the workbook (or a missing journal) from memory
                     self._write_final_file(final_format)
                 
                 # Add statistics in the requested format only
@@ -442,144 +460,118 @@ class ReportManager:
             except Exception as e:
                 raise OSError(f"Failed to finalize report: {e}")
 
-    def _write_headers(self) -> None:
-        """Write column headers to the temporary file."""
-        headers = [
-            'review_id',
-            'source_identifier', 
-            'experiment_name',
-            'review_timestamp_utc',
-            'reviewer_verdict',
-            'reviewer_comment',
-            'time_to_review_seconds',
-            'model_name',
-            'prompting_strategy',
-            'expected_code',
-            'generated_code',
-            'code_diff'
-        ]
-        
-        if self._output_format == 'csv':
-            with open(self._temp_file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(headers)
-        elif self._output_format == 'excel' and PANDAS_AVAILABLE:
-            # Create empty DataFrame with headers for Excel
-            df = pd.DataFrame(columns=headers)
-            df.to_excel(self._temp_file_path, index=False, engine='openpyxl')
-
-    def _write_data_to_temp_file(self) -> None:
-        """Write all current data to the temporary file."""
-        if self._output_format == 'csv':
-            self._write_csv_data()
-        elif self._output_format == 'excel' and PANDAS_AVAILABLE:
-            self._write_excel_data()
-
-    def _write_data_to_temp_file_with_locking(self) -> bool:
+    def _serialize_journal_record(self, row_data: Dict[str, Any]) -> bytes:
         """
-        Write all current data to the temporary file with file locking.
-        
-        Implements proper file locking and permission error handling
-        to support concurrent access and graceful degradation.
+        Serialize a single review row as an encoded CSV record.
         
+        Args:
+            row_data: Review data dictionary.
+            
         Returns:
-            bool: True if write was successful, False otherwise.
+            bytes: UTF-8 encoded CSV line in report column order.
         """
-        try:
-            if self._output_format == 'csv':
-                return self._write_csv_data_with_locking()
-            elif self._output_format == 'excel' and PANDAS_AVAILABLE:
-                return self._write_excel_data_with_locking()
-            else:
-                return False
-        except (OSError, IOError, PermissionError) as e:
-            print(f"Warning: Failed to write to temporary file: {e}")
-            if e.errno == errno.EACCES:
-                print("Suggestion: Check file permissions or try running with appropriate privileges")
-            elif e.errno == errno.ENOSPC:
-                print("Suggestion: Free up disk space and try again")
-            elif e.errno == errno.EROFS:
-                print("Suggestion: The file system is read-only, try a different output directory")
-            return False
-        except Exception as e:
-            print(f"Warning: Unexpected error writing to temporary file: {e}")
-            return False
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow([row_data.get(header, '') for header in REPORT_COLUMNS])
+        return buffer.getvalue().encode('utf-8')
 
-    def _write_csv_data(self) -> None:
-        """Write data to CSV format."""
-        headers = [
-            'review_id',
-            'source_identifier', 
-            'experiment_name',
-            'review_timestamp_utc',
-            'reviewer_verdict',
-            'reviewer_comment',
-            'time_to_review_seconds',
-            'model_name',
-            'prompting_strategy',
-            'expected_code',
-            'generated_code',
-            'code_diff'
-        ]
+    def _rewrite_journal(self) -> None:
+        """
+        Rewrite the whole journal (headers plus all in-memory rows).
         
-        with open(self._temp_file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            
+        Only used when a journal is created or resumed, or as a recovery
+        path when appending fails. Record offsets are rebuilt as it is written.
+        """
+        offsets = []
+        writing_path = f"{self._temp_file_path}.writing"
+        with open(writing_path, 'wb') as f:
+            f.write(self._serialize_journal_record({header: header for header in REPORT_COLUMNS}))
             for row_data in self._review_data:
-                row = [row_data.get(header, '') for header in headers]
-                writer.writerow(row)
+                offsets.append(f.tell())
+                f.write(self._serialize_journal_record(row_data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(writing_path, self._temp_file_path)
+        self._record_offsets = offsets
 
-    def _write_excel_data(self) -> None:
-        """Write data to Excel format."""
-        if not PANDAS_AVAILABLE:
-            raise ValueError("Pandas required for Excel output")
-        
-        # Sanitize data for Excel compatibility
-        sanitized_data = self._sanitize_data_for_excel(self._review_data)
+    def _append_journal_record(self, row_data: Dict[str, Any]) -> bool:
+        """
+        Append one durable record to the journal.
         
-        df = pd.DataFrame(sanitized_data)
+        The cost is independent of the number of reviews already written:
+        only the new record is written and fsync'd, and its starting offset
+        is remembered so that undo can truncate back to it.
         
-        # Ensure proper column order
-        column_order = [
-            'review_id',
-            'source_identifier', 
-            'experiment_name',
-            'review_timestamp_utc',
-            'reviewer_verdict',
-            'reviewer_comment',
-            'time_to_review_seconds',
-            'model_name',
-            'prompting_strategy',
-            'expected_code',
-            'generated_code',
-            'code_diff'
-        ]
+        Args:
+            row_data: Review data dictionary to append.
+            
+        Returns:
+            bool: True if the record was written, False otherwise.
+        """
+        record = self._serialize_journal_record(row_data)
+        max_retries = 3
+        retry_delay = 0.1
         
-        # Reorder columns and fill missing ones
-        for col in column_order:
-            if col not in df.columns:
-                df[col] = ''
+        for attempt in range(max_retries):
+            offset = None
+            try:
+                with open(self._temp_file_path, 'ab') as f:
+                    # Attempt to acquire exclusive lock (platform-specific)
+                    if not self._acquire_file_lock(f):
+                        if attempt < max_retries - 1:
+                            time.sleep(retry_delay * (2 ** attempt))  # Exponential backoff
+                            continue
+                        return False
+                    
+                    offset = f.seek(0, os.SEEK_END)
+                    f.write(record)
+                    f.flush()
+                    os.fsync(f.fileno())
+                
+                self._record_offsets.append(offset)
+                return True
+                
+            except (OSError, IOError) as e:
+                # Drop any partially written record before retrying
+                if offset is not None:
+                    try:
+                        os.truncate(self._temp_file_path, offset)
+                    except OSError:
+                        pass
+                
+                if attempt < max_retries - 1:
+                    time.sleep(retry_delay * (2 ** attempt))
+                    continue
+                
+                print(f"Warning: Failed to append to report journal: {e}")
+                if getattr(e, 'errno', None) == errno.ENOSPC:
+                    print("Suggestion: Free up disk space and try again")
+                elif getattr(e, 'errno', None) == errno.EROFS:
+                    print("Suggestion: The file system is read-only, try a different output directory")
+                return False
         
-        df = df[column_order]
-        df.to_excel(self._temp_file_path, index=False, engine='openpyxl')
+        return False
 
-    def _convert_format(self, source_path: str, target_path: Path, target_format: str) -> None:
-        """Convert between CSV and Excel formats."""
-        if target_format == 'csv':
-            # Convert Excel to CSV
-            if PANDAS_AVAILABLE:
-                df = pd.read_excel(source_path, engine='openpyxl')
-                df.to_csv(target_path, index=False)
-            else:
-                raise ValueError("Pandas required for format conversion")
-        elif target_format == 'excel':
-            # Convert CSV to Excel
-            if PANDAS_AVAILABLE:
-                df = pd.read_csv(source_path)
-                df.to_excel(target_path, index=False, engine='openpyxl')
-            else:
-                raise ValueError("Pandas required for Excel output")
+    def _truncate_journal(self, offset: int) -> bool:
+        """
+        Truncate the journal to the given record offset (used by undo).
+        
+        Args:
+            offset: Byte offset at which the removed record started.
+            
+        Returns:
+            bool: True if the journal was truncated, False otherwise.
+        """
+        try:
+            with open(self._temp_file_path, 'r+b') as f:
+                if not self._acquire_file_lock(f):
+                    return False
+                f.truncate(offset)
+                f.flush()
+                os.fsync(f.fileno())
+            return True
+        except (OSError, IOError) as e:
+            print(f"Warning: Failed to truncate report journal: {e}")
+            return False
 
     def _write_final_file(self, output_format: str) -> None:
         """Write final file directly from in-memory data."""
@@ -590,20 +582,7 @@ class ReportManager:
 
     def _write_csv_data_to_path(self, file_path: Path) -> None:
         """Write CSV data to specified path."""
-        headers = [
-            'review_id',
-            'source_identifier', 
-            'experiment_name',
-            'review_timestamp_utc',
-            'reviewer_verdict',
-            'reviewer_comment',
-            'time_to_review_seconds',
-            'model_name',
-            'prompting_strategy',
-            'expected_code',
-            'generated_code',
-            'code_diff'
-        ]
+        headers = REPORT_COLUMNS
         
         with open(file_path, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
@@ -624,20 +603,7 @@ class ReportManager:
         df = pd.DataFrame(sanitized_data)
         
         # Ensure proper column order
-        column_order = [
-            'review_id',
-            'source_identifier', 
-            'experiment_name',
-            'review_timestamp_utc',
-            'reviewer_verdict',
-            'reviewer_comment',
-            'time_to_review_seconds',
-            'model_name',
-            'prompting_strategy',
-            'expected_code',
-            'generated_code',
-            'code_diff'
-        ]
+        column_order = REPORT_COLUMNS
         
         # Reorder columns and fill missing ones
         for col in column_order:
@@ -647,62 +613,6 @@ class ReportManager:
         df = df[column_order]
         df.to_excel(file_path, index=False, engine='openpyxl')
 
-    def _write_csv_data_with_locking(self) -> bool:
-        """
-        Write CSV data to temporary file with file locking.
-        
-        Returns:
-            bool: True if write was successful, False otherwise.
-        """
-        headers = [
-            'review_id',
-            'source_identifier', 
-            'experiment_name',
-            'review_timestamp_utc',
-            'reviewer_verdict',
-            'reviewer_comment',
-            'time_to_review_seconds',
-            'model_name',
-            'prompting_strategy',
-            'expected_code',
-            'generated_code',
-            'code_diff'
-        ]
-        
-        max_retries = 3
-        retry_delay = 0.1
-        
-        for attempt in range(max_retries):
-            try:
-                with open(self._temp_file_path, 'w', newline='', encoding='utf-8') as f:
-                    # Attempt to acquire exclusive lock (platform-specific)
-                    lock_acquired = self._acquire_file_lock(f)
-                    if not lock_acquired:
-                        if attempt < max_retries - 1:
-                            time.sleep(retry_delay * (2 ** attempt))  # Exponential backoff
-                            continue
-                        else:
-                            return False
-                    
-                    writer = csv.writer(f)
-                    writer.writerow(headers)
-                    
-                    for row_data in self._review_data:
-                        row = [row_data.get(header, '') for header in headers]
-                        writer.writerow(row)
-                    
-                    # Lock is automatically released when file is closed
-                    return True
-                    
-            except (OSError, IOError, PermissionError):
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay * (2 ** attempt))
-                    continue
-                else:
-                    return False
-        
-        return False
-
     def _sanitize_data_for_excel(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Sanitize data for Excel compatibility by handling problematic characters and content.
@@ -793,88 +703,6 @@ class ReportManager:
         
         return True, ""
 
-    def _write_excel_data_with_locking(self) -> bool:
-        """
-        Write Excel data to temporary file with file locking.
-        
-        Returns:
-            bool: True if write was successful, False otherwise.
-        """
-        if not PANDAS_AVAILABLE:
-            return False
-        
-        max_retries = 3
-        retry_delay = 0.1
-        
-        for attempt in range(max_retries):
-            try:
-                # Sanitize data for Excel compatibility
-                sanitized_data = self._sanitize_data_for_excel(self._review_data)
-                
-                # Create DataFrame
-                df = pd.DataFrame(sanitized_data)
-                
-                # Ensure proper column order
-                column_order = [
-                    'review_id',
-                    'source_identifier', 
-                    'experiment_name',
-                    'review_timestamp_utc',
-                    'reviewer_verdict',
-                    'reviewer_comment',
-                    'time_to_review_seconds',
-                    'model_name',
-                    'prompting_strategy',
-                    'expected_code',
-                    'generated_code',
-                    'code_diff'
-                ]
-                
-                # Reorder columns and fill missing ones
-                for col in column_order:
-                    if col not in df.columns:
-                        df[col] = ''
-                
-                df = df[column_order]
-                
-                # Write to temporary file first, then move to avoid corruption
-                # Use .xlsx extension for pandas compatibility
-                temp_excel_path = f"{self._temp_file_path}.writing.xlsx"
-                
-                try:
-                    df.to_excel(temp_excel_path, index=False, engine='openpyxl')
-                    
-                    # Remove existing temp file if it exists
-                    if os.path.exists(self._temp_file_path):
-                        os.unlink(self._temp_file_path)
-                    
-                    # Atomic move to final temp location
-                    os.rename(temp_excel_path, self._temp_file_path)
-                    return True
-                    
-                except (OSError, IOError, PermissionError):
-                    # Clean up temporary file if it exists
-                    if os.path.exists(temp_excel_path):
-                        try:
-                            os.unlink(temp_excel_path)
-                        except:
-                            pass
-                    
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delay * (2 ** attempt))
-                        continue
-                    else:
-                        return False
-                        
-            except Exception:
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay * (2 ** attempt))
-                    continue
-                else:
-                    return False
-        
-        return False
-
     def _acquire_file_lock(self, file_obj) -> bool:
         """
         Acquire an exclusive file lock in a cross-platform manner.
@@ -0,0 +1,204 @@
+"""
+Write-ahead journal of session events.
+
+Instead of rewriting the session snapshot after every verdict, the session
+manager appends one small record per event (verdict, undo, flag,
+replacement) to ``<session_id>.journal`` next to the snapshot, and compacts
+the journal into a new snapshot every few events. Each record carries a
+sequence number and a CRC32 checksum, so replaying a journal after a crash is
+deterministic: records are applied in order up to the first torn or corrupted
+one, and records already contained in the snapshot are skipped.
+
+Record format (one line per record)::
+
+    <crc32 as 8 hex digits> <json {"seq": int, "event": str, "data": {...}}>
+"""
+
+import json
+import os
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .core.models import SessionState
+from .utils.logging_config import get_logger
+
+
+# Event types
+VERDICT = 'verdict'  # Pair left the queue and was reviewed
+UNDO = 'undo'  # Last review was undone, pair is back at the front of the queue
+FLAG = 'flag'  # Pair was flagged; data['kind'] is 'vulnerable' (leaves the queue) or 'not_vulnerable'
+REPLACEMENT = 'replacement'  # Pair was appended to the queue to replace a flagged one
+
+EVENT_TYPES = (VERDICT, UNDO, FLAG, REPLACEMENT)
+
+# Queued pair as stored in snapshots: (identifier, data source reference)
+QueuedRef = Tuple[str, Optional[Dict[str, Any]]]
+
+
+@dataclass
+class JournalRecord:
+    """A single journaled session event."""
+    seq: int
+    event: str
+    data: Dict[str, Any]
+
+    def __post_init__(self):
+        """Validate the event type."""
+        if self.event not in EVENT_TYPES:
+            raise ValueError(f"event must be one of {EVENT_TYPES}, got '{self.event}'")
+
+
+class SessionJournal:
+    """
+    Append-only, checksummed event log of one session.
+
+    Appending is constant-time (one fsync'd line); reset() empties the
+    journal once its events have been compacted into a snapshot.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialize the journal.
+
+        Args:
+            path: Journal file, created on first append.
+        """
+        self.path = Path(path)
+        self.logger = get_logger('session_journal')
+
+    @staticmethod
+    def _encode(record: JournalRecord) -> bytes:
+        """Serialize a record to a checksummed line."""
+        payload = json.dumps(
+            {'seq': record.seq, 'event': record.event, 'data': record.data},
+            separators=(',', ':'), sort_keys=True, default=str
+        ).encode('utf-8')
+        return b'%08x ' % zlib.crc32(payload) + payload + b'\n'
+
+    @staticmethod
+    def _decode(line: bytes) -> Optional[JournalRecord]:
+        """Parse a checksummed line, returning None if it is torn or corrupted."""
+        if not line.endswith(b'\n') or len(line) < 10 or line[8:9] != b' ':
+            return None
+        payload = line[9:-1]
+        try:
+            if int(line[:8], 16) != zlib.crc32(payload):
+                return None
+            raw = json.loads(payload.decode('utf-8'))
+            return JournalRecord(seq=int(raw['seq']), event=raw['event'], data=dict(raw['data']))
+        except (ValueError, KeyError, TypeError, UnicodeDecodeError):
+            return None
+
+    def append(self, record: JournalRecord) -> None:
+        """
+        Durably append a record.
+
+        Args:
+            record: Record to append.
+
+        Raises:
+            OSError: If the record could not be written; a partially written
+                record is truncated away.
+        """
+        line = self._encode(record)
+        with open(self.path, 'ab') as f:
+            offset = f.seek(0, os.SEEK_END)
+            try:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            except OSError:
+                f.truncate(offset)
+                raise
+
+    def read(self) -> List[JournalRecord]:
+        """
+        Read the valid prefix of the journal.
+
+        Returns:
+            List[JournalRecord]: Records up to (excluding) the first torn or
+            corrupted one, empty if the journal does not exist.
+        """
+        if not self.path.exists():
+            return []
+
+        records = []
+        with open(self.path, 'rb') as f:
+            for line_number, line in enumerate(f, 1):
+                record = self._decode(line)
+                if record is None:
+                    self.logger.warning(f"Session journal {self.path.name} is damaged at record {line_number}; "
+                                        f"ignoring it and everything after it")
+                    break
+                records.append(record)
+        return records
+
+    def is_empty(self) -> bool:
+        """Check if the journal holds no data."""
+        return not self.path.exists() or self.path.stat().st_size == 0
+
+    def reset(self) -> None:
+        """Empty the journal after its events were compacted into a snapshot."""
+        with open(self.path, 'wb') as f:
+            f.flush()
+            os.fsync(f.fileno())
+
+    def delete(self) -> None:
+        """Remove the journal file."""
+        if self.path.exists():
+            self.path.unlink()
+
+
+def replay_record(session: SessionState, queued_refs: List[QueuedRef], record: JournalRecord) -> None:
+    """
+    Apply a journaled event to a session restored from a reference snapshot.
+
+    The snapshot counts queued pairs as pending, so pending_count (when
+    known) goes down for every pair leaving the queue and up for every pair
+    entering it, wherever in the sample the pair came from.
+
+    Args:
+        session: Session state loaded from the snapshot.
+        queued_refs: Queued pair references of the snapshot, updated in place.
+        record: Event to apply.
+    """
+    identifier = record.data['identifier']
+    reference = (identifier, record.data.get('ref'))
+
+    def take_from_queue() -> None:
+        for index, (queued_identifier, _) in enumerate(queued_refs):
+            if queued_identifier == identifier:
+                del queued_refs[index]
+                break
+        if session.pending_count:
+            session.pending_count -= 1
+
+    def put_in_queue(index: Optional[int] = None) -> None:
+        if index is None:
+            queued_refs.append(reference)
+        else:
+            queued_refs.insert(index, reference)
+        if session.pending_count is not None:
+            session.pending_count += 1
+
+    if record.event == VERDICT:
+        take_from_queue()
+        session.completed_reviews.append(identifier)
+    elif record.event == UNDO:
+        if session.completed_reviews and session.completed_reviews[-1] == identifier:
+            session.completed_reviews.pop()
+        put_in_queue(0)
+    elif record.event == FLAG:
+        vulnerable = record.data.get('kind') == 'vulnerable'
+        if vulnerable:
+            take_from_queue()
+        # Flag entries are kept in their own output files; the session only
+        # needs their identifiers to avoid serving flagged pairs again
+        attribute = 'flagged_entries' if vulnerable else 'not_vulnerable_entries'
+        if not hasattr(session, attribute):
+            setattr(session, attribute, [])
+        getattr(session, attribute).append({'source_identifier': identifier})
+    elif record.event == REPLACEMENT:
+        put_in_queue()
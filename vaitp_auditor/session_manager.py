@@ -3,16 +3,24 @@ Session manager for orchestrating the review workflow.
 """
 
 import gc
+import itertools
 import json
 import os
 import pickle
+import threading
+from dataclasses import fields, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, Iterable, Iterator, Optional, List, Tuple
 from uuid import uuid4
 
-from .core.models import CodePair, ReviewResult, SessionState, SessionConfig
+from .core.models import CodePair, ReviewResult, SampleSpec, SessionState, SessionConfig
 from .data_sources.base import DataSource
+from .data_sources.sampling import new_seed
+from .session_journal import (
+    FLAG, REPLACEMENT, UNDO, VERDICT, JournalRecord, SessionJournal, replay_record
+)
+from .session_store import SessionStore
 from .ui.review_controller import ReviewUIController
 from .reporting.report_manager import ReportManager
 from .utils.logging_config import get_logger, log_exception
@@ -32,16 +40,36 @@ class SessionManager:
     
     The SessionManager coordinates between data sources, UI components, and
     reporting to provide a complete review experience.
+    
+    Code pairs are pulled from the data source's iter_pairs() stream into a
+    bounded window (remaining_queue) of at most prefetch_window pairs, which
+    is refilled as reviews complete.
+    
+    Session snapshots hold no code: queued pairs are saved as identifiers
+    and data source references, and are rehydrated from the data source
+    when the session is resumed. Between snapshots, review events are
+    appended to a write-ahead SessionJournal (see record_event()), which is
+    compacted into a new snapshot every JOURNAL_COMPACT_EVERY events. A
+    SQLite SessionStore mirrors every session's metadata, queue and verdicts
+    so that sessions can be listed without reading their snapshots.
     """
 
+    # Number of code pairs held in the remaining queue
+    PREFETCH_WINDOW = 32
+    
+    # Number of journaled events after which a new snapshot is written
+    JOURNAL_COMPACT_EVERY = 100
+
     def __init__(self, ui_controller: Optional[ReviewUIController] = None, 
-                 report_manager: Optional[ReportManager] = None):
+                 report_manager: Optional[ReportManager] = None,
+                 prefetch_window: Optional[int] = None):
         """
         Initialize the session manager.
         
         Args:
             ui_controller: UI controller for displaying code pairs (optional for testing).
             report_manager: Report manager for output generation (optional for testing).
+            prefetch_window: Number of code pairs held in memory (default PREFETCH_WINDOW).
         """
         self.logger = get_logger('session_manager')
         self.resource_manager = get_resource_manager()
@@ -51,6 +79,9 @@ class SessionManager:
         
         self._current_session: Optional[SessionState] = None
         self._data_source: Optional[DataSource] = None
+        self._pair_stream: Optional[Iterator[CodePair]] = None
+        self._queued_refs: List[Tuple[str, Optional[Dict[str, Any]]]] = []  # Queued pairs not yet rehydrated
+        self.prefetch_window = max(1, prefetch_window or self.PREFETCH_WINDOW)
         self._ui_controller = ui_controller or ReviewUIController(undo_callback=self.undo_last_review)
         self._report_manager = report_manager or ReportManager()
         self._session_dir = Path.home() / '.vaitp_auditor' / 'sessions'
@@ -63,8 +94,16 @@ class SessionManager:
             self.logger.error(f"Failed to create session directory: {e}")
             raise SessionError(f"Cannot create session directory: {e}")
         
+        self._session_store = SessionStore(self._session_dir / 'sessions.db')
+        
         self._next_review_id = 1
         self._last_reviewed_pair: Optional[CodePair] = None  # Store last reviewed pair for undo
+        self._journal: Optional[SessionJournal] = None
+        self._journal_seq = 0  # Sequence number of the last journaled event
+        self._journal_events = 0  # Events journaled since the last snapshot
+        # Held while the session state is changed or persisted, so background
+        # commit threads never snapshot a half-updated session
+        self.state_lock = threading.RLock()
         
         # Set up undo callback if UI controller was provided without it
         if hasattr(self._ui_controller, 'undo_callback') and self._ui_controller.undo_callback is None:
@@ -96,21 +135,17 @@ class SessionManager:
         session_id = f"{config.experiment_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid4())[:8]}"
         self.logger.debug(f"Generated session ID: {session_id}")
         
+        # Fix the seed up front so that the sample can be re-derived later
+        sample_spec = config.to_sample_spec()
+        if sample_spec.seed is None:
+            sample_spec = sample_spec.with_seed(new_seed())
+        
         # Load data from source with comprehensive error handling
         try:
-            self.logger.info("Loading data from configured source")
-            
-            # Check if data source supports filtering (SQLite and Excel)
-            if hasattr(data_source, 'load_data') and config.data_source_type in ['sqlite', 'excel']:
-                # Pass filtering parameters for SQLite and Excel sources
-                code_pairs = data_source.load_data(
-                    config.sample_percentage,
-                    selected_model=config.selected_model,
-                    selected_strategy=config.selected_strategy
-                )
-            else:
-                # Folder sources don't support filtering
-                code_pairs = data_source.load_data(config.sample_percentage)
+            self.logger.info(f"Loading data from configured source (sample seed {sample_spec.seed})")
+            
+            pair_stream = data_source.iter_pairs(sample_spec)
+            code_pairs = list(itertools.islice(pair_stream, self.prefetch_window))
             
             if not code_pairs:
                 error_msg = "No code pairs loaded from data source"
@@ -124,7 +159,16 @@ class SessionManager:
                 filter_info.append(f"strategy={config.selected_strategy}")
             filter_str = f" (filtered by {', '.join(filter_info)})" if filter_info else ""
             
-            self.logger.info(f"Successfully loaded {len(code_pairs)} code pairs{filter_str}")
+            # Pairs beyond the window stay in the stream until they are needed
+            if len(code_pairs) < self.prefetch_window:
+                pair_stream, pending_count = None, 0
+            elif data_source.sample_size_hint is not None:
+                pending_count = max(0, data_source.sample_size_hint - len(code_pairs))
+            else:
+                pending_count = None
+            
+            self.logger.info(f"Successfully loaded {len(code_pairs)} code pairs{filter_str}"
+                             + (f", {pending_count} more pending" if pending_count else ""))
             
         except Exception as e:
             error_msg = f"Failed to load data from source: {e}"
@@ -143,17 +187,22 @@ class SessionManager:
                 data_source_config=data_source_config,
                 completed_reviews=[],
                 remaining_queue=code_pairs,
-                created_timestamp=datetime.utcnow()
+                created_timestamp=datetime.utcnow(),
+                sample_spec=sample_spec,
+                pending_count=pending_count
             )
             
             self._data_source = data_source
+            self._pair_stream = pair_stream
             
             # Initialize report manager
             self.logger.debug("Initializing report manager")
             self._report_manager.initialize_report(session_id, config.output_format)
             
-            # Save initial session state
+            # Save initial session state and start an empty journal
             self.logger.debug("Saving initial session state")
+            self._journal = SessionJournal(self._journal_path(session_id))
+            self._journal_seq = 0
             self.save_session_state()
             
             self.logger.info(f"Session {session_id} started successfully")
@@ -165,6 +214,138 @@ class SessionManager:
             log_exception(self.logger, e, {'session_id': session_id, 'config': str(config)})
             raise SessionError(error_msg)
 
+    def refill_queue(self) -> bool:
+        """
+        Top up the remaining queue from the sample stream.
+        
+        Returns:
+            bool: True if the remaining queue holds at least one code pair.
+        """
+        with self.state_lock:
+            return self._refill_queue()
+    
+    def _refill_queue(self) -> bool:
+        """Top up the remaining queue; the caller holds state_lock."""
+        session = self._current_session
+        if not session:
+            return False
+        
+        if self._queued_refs and self._data_source is not None:
+            self._restore_queued_pairs(self._data_source)
+        
+        missing = self.prefetch_window - len(session.remaining_queue)
+        if self._pair_stream is not None and missing > 0:
+            try:
+                pulled = list(itertools.islice(self._pair_stream, missing))
+            except Exception as e:
+                self.logger.error(f"Failed to read further code pairs from the data source: {e}")
+                log_exception(self.logger, e, {'operation': 'refill_queue', 'session_id': session.session_id})
+                pulled = []
+            
+            # A pair drawn earlier as a replacement may come up in the stream again
+            session.remaining_queue.extend(
+                code_pair for code_pair in pulled
+                if code_pair not in session.remaining_queue and not session.is_completed(code_pair.identifier)
+            )
+            if len(pulled) < missing:
+                # Stream exhausted: whatever was estimated as pending is not coming
+                self._pair_stream = None
+                session.pending_count = 0
+            elif session.pending_count is not None:
+                session.pending_count = max(0, session.pending_count - len(pulled))
+        
+        return bool(session.remaining_queue)
+
+    def draw_replacement(self, excluded_ids: Iterable[str] = ()) -> Optional[CodePair]:
+        """
+        Draw a random code pair of the data source that is new to the session.
+        
+        Reviewed and queued pairs are never drawn. The data source picks the
+        pair itself (see DataSource.sample_one_excluding), so the cost does
+        not grow with the size of the dataset.
+        
+        Args:
+            excluded_ids: Further identifiers to exclude (e.g. flagged pairs).
+            
+        Returns:
+            Optional[CodePair]: Drawn code pair, or None if there is no data
+            source or every pair is excluded.
+        """
+        session = self._current_session
+        if not session or self._data_source is None:
+            return None
+        
+        with self.state_lock:
+            excluded = set(session.completed_reviews)
+            excluded.update(session.remaining_queue.identifiers())
+        excluded.update(excluded_ids)
+        return self._data_source.sample_one_excluding(excluded, session.sample_spec)
+    
+    def _restore_queued_pairs(self, data_source: DataSource) -> None:
+        """
+        Rehydrate the queued code pairs of a resumed session from the data source.
+        
+        Args:
+            data_source: Configured data source of the session.
+        """
+        session = self._current_session
+        references, self._queued_refs = self._queued_refs, []
+        
+        try:
+            restored = data_source.load_pairs_by_ref(references, session.sample_spec)
+        except Exception as e:
+            self.logger.error(f"Failed to rehydrate queued code pairs: {e}")
+            log_exception(self.logger, e, {'operation': 'restore_queued_pairs', 'session_id': session.session_id})
+            restored = []
+        
+        session.remaining_queue.prepend(restored)
+        if session.pending_count is not None:
+            # The snapshot counted the queued pairs as pending
+            session.pending_count = max(0, session.pending_count - len(references))
+        
+        self.logger.info(f"Rehydrated {len(restored)} of {len(references)} queued code pairs")
+
+    def rederive_queue(self, data_source: DataSource) -> bool:
+        """
+        Reopen the sample stream of the current session from its sample spec.
+        
+        The queued pairs of the snapshot are rehydrated first. The data source
+        then draws the same sample again from the stored seed; the code pairs
+        that were already reviewed or are still queued are skipped and the
+        queue is topped up.
+        
+        Args:
+            data_source: Configured data source of the session.
+            
+        Returns:
+            bool: True if the stream was reopened, False if the session has
+            no sample spec (sessions saved by older versions) or nothing was
+            left to stream.
+        """
+        session = self._current_session
+        if not session:
+            return False
+        if self._queued_refs:
+            self._restore_queued_pairs(data_source)
+        if session.sample_spec is None:
+            return False
+        if session.pending_count == 0 and session.remaining_queue:
+            return False
+        
+        # Both membership checks are O(1) on the live session containers
+        self._pair_stream = (
+            code_pair for code_pair in data_source.iter_pairs(session.sample_spec)
+            if not session.is_completed(code_pair.identifier) and code_pair not in session.remaining_queue
+        )
+        if session.pending_count == 0:
+            # Rebuilding an empty queue; the size is known once streaming starts
+            session.pending_count = None
+        self.refill_queue()
+        
+        self.logger.info(f"Re-derived sample stream from seed {session.sample_spec.seed}: "
+                         f"{len(session.remaining_queue)} code pairs queued")
+        return True
+
     def resume_session(self, session_id: str) -> bool:
         """
         Resume an existing session from saved state.
@@ -196,14 +377,24 @@ class SessionManager:
             if not all(key in session_data for key in required_keys):
                 raise ValueError("Missing required session data")
             
-            # Restore session state
+            # Restore session state; queued pairs are rehydrated once the
+            # data source is available (snapshots without queued_refs hold
+            # the queue itself)
             self._current_session = session_data['session_state']
             self._next_review_id = session_data['next_review_id']
+            self._queued_refs = list(session_data.get('queued_refs', []))
+            self._pair_stream = None
             
             # Validate session state integrity
             if not self._current_session.validate_integrity():
                 raise ValueError("Session state failed integrity validation")
             
+            # Replay the events journaled after the snapshot
+            self._journal = SessionJournal(self._journal_path(session_id))
+            self._journal_seq = session_data.get('journal_seq', 0)
+            self._journal_events = 0
+            self._replay_journal()
+            
             # Note: Data source will need to be reconfigured by caller
             # as it may contain non-serializable objects
             
@@ -308,8 +499,10 @@ class SessionManager:
             # Attempt to resume the session
             success = self.resume_session(session_id)
             if success:
-                # Restore data source
+                # Restore data source and the pairs beyond the saved window
                 self._data_source = data_source
+                if self._current_session.pending_count != 0:
+                    self.rederive_queue(data_source)
                 
                 # Initialize report manager for resumed session
                 self._report_manager.initialize_report(session_id, 'excel')
@@ -382,6 +575,9 @@ class SessionManager:
         """
         Attempt to recover partial data from a corrupted session.
         
+        The completed reviews are rebuilt deterministically from whatever part
+        of the snapshot can be read plus the valid prefix of the journal.
+        
         Args:
             session_id: The session ID to attempt recovery for.
             
@@ -393,29 +589,42 @@ class SessionManager:
         try:
             print("Attempting partial data recovery...")
             
-            # Try to read raw file data
-            with open(session_file, 'rb') as f:
-                raw_data = f.read()
+            session_state = None
+            queued_refs = []
+            journal_seq = 0
+            try:
+                with open(session_file, 'rb') as f:
+                    recovered_data = pickle.load(f)
+                if isinstance(recovered_data, dict) and isinstance(recovered_data.get('session_state'), SessionState):
+                    session_state = recovered_data['session_state']
+                    queued_refs = list(recovered_data.get('queued_refs', []))
+                    journal_seq = recovered_data.get('journal_seq', 0)
+            except Exception as e:
+                print(f"Session snapshot is unreadable ({e}), recovering from the session journal only.")
             
-            # Try different recovery strategies
-            recovered_data = None
+            if session_state is None:
+                session_state = SessionState(
+                    session_id=session_id,
+                    experiment_name=session_id.split('_')[0] or 'recovered_session',
+                    data_source_config={},
+                    completed_reviews=[],
+                    remaining_queue=[],
+                    created_timestamp=datetime.utcnow(),
+                    pending_count=None
+                )
             
-            # Strategy 1: Try to load with different pickle protocols
-            for protocol in [pickle.HIGHEST_PROTOCOL, 4, 3, 2]:
-                try:
-                    recovered_data = pickle.loads(raw_data)
-                    break
-                except Exception:
-                    continue
+            records = [
+                record for record in SessionJournal(self._journal_path(session_id)).read()
+                if record.seq > journal_seq
+            ]
+            for record in records:
+                replay_record(session_state, queued_refs, record)
             
-            if recovered_data and isinstance(recovered_data, dict):
-                # Try to extract what we can
-                experiment_name = recovered_data.get('session_state', {}).get('experiment_name', 'recovered_session')
-                completed_reviews = recovered_data.get('session_state', {}).get('completed_reviews', [])
-                
+            if session_state.completed_reviews or records:
                 print(f"Partial recovery successful!")
-                print(f"Experiment name: {experiment_name}")
-                print(f"Completed reviews found: {len(completed_reviews)}")
+                print(f"Experiment name: {session_state.experiment_name}")
+                print(f"Completed reviews found: {len(session_state.completed_reviews)}")
+                print(f"Journaled events replayed: {len(records)}")
                 print("Note: You will need to start a new session, but completed review data may be available in reports.")
                 
                 return False
@@ -444,7 +653,7 @@ class SessionManager:
         
         if confirm == 'yes':
             try:
-                session_file.unlink()
+                self.delete_session(session_id)
                 print("Corrupted session file deleted successfully.")
                 return False
             except Exception as e:
@@ -473,9 +682,14 @@ class SessionManager:
         try:
             for session_file in self._session_dir.glob("*.pkl"):
                 try:
-                    # Check file modification time
-                    if session_file.stat().st_mtime < cutoff_time:
-                        session_file.unlink()
+                    # Check file modification time (the journal is written
+                    # more often than the snapshot)
+                    journal = SessionJournal(self._journal_path(session_file.stem))
+                    last_modified = session_file.stat().st_mtime
+                    if journal.path.exists():
+                        last_modified = max(last_modified, journal.path.stat().st_mtime)
+                    if last_modified < cutoff_time:
+                        self.delete_session(session_file.stem)
                         cleaned_count += 1
                 except Exception:
                     # Skip files we can't process
@@ -503,6 +717,9 @@ class SessionManager:
                 # Clear references
                 self._current_session = None
                 self._data_source = None
+                self._pair_stream = None
+                self._queued_refs = []
+                self._journal = None
                 self._last_reviewed_pair = None
                 
                 self.logger.debug("Session resources cleaned up successfully")
@@ -532,7 +749,7 @@ class SessionManager:
         error_count = 0
         
         try:
-            while self._current_session.remaining_queue:
+            while self.refill_queue():
                 # Check memory usage periodically
                 if processed_count % 10 == 0:
                     if not self.resource_manager.check_memory_limit(1000.0):  # 1GB limit
@@ -541,7 +758,7 @@ class SessionManager:
                         self.logger.info(f"Garbage collection stats: {gc_stats}")
                 
                 # Get next code pair
-                code_pair = self._current_session.remaining_queue.pop(0)
+                code_pair = self._current_session.remaining_queue.popleft()
                 
                 try:
                     # Get review from UI
@@ -556,7 +773,7 @@ class SessionManager:
                     if review_result.reviewer_verdict == 'Undo':
                         self.logger.debug("Undo command processed")
                         # Put the current item back in the queue and continue
-                        self._current_session.remaining_queue.insert(0, code_pair)
+                        self._current_session.remaining_queue.appendleft(code_pair)
                         continue
                     
                     # Process the review result
@@ -566,8 +783,11 @@ class SessionManager:
                     # Store the reviewed pair for potential undo
                     self._last_reviewed_pair = code_pair
                     
-                    # Save state after each review to prevent data loss
-                    self.save_session_state()
+                    # Journal the review to prevent data loss
+                    self.record_event(VERDICT, code_pair)
+                    
+                    # Drop deferred file content; it is reloaded if the review is undone
+                    code_pair.release_content()
                     
                     processed_count += 1
                     
@@ -576,7 +796,7 @@ class SessionManager:
                     
                 except KeyboardInterrupt:
                     # Put the item back in the queue since it wasn't completed
-                    self._current_session.remaining_queue.insert(0, code_pair)
+                    self._current_session.remaining_queue.appendleft(code_pair)
                     self.logger.info("Session interrupted by user. Progress has been saved.")
                     break
                 except Exception as e:
@@ -684,14 +904,14 @@ class SessionManager:
             return False
         
         # Add the code pair back to the front of the queue
-        self._current_session.remaining_queue.insert(0, self._last_reviewed_pair)
+        self._current_session.remaining_queue.appendleft(self._last_reviewed_pair)
+        
+        # Journal the undo before the pair reference is dropped
+        self.record_event(UNDO, self._last_reviewed_pair)
         
         # Clear the last reviewed pair since it's back in the queue
         self._last_reviewed_pair = None
         
-        # Save the updated session state
-        self.save_session_state()
-        
         return True
 
     def can_undo(self) -> bool:
@@ -725,16 +945,131 @@ class SessionManager:
             'review_count': len(self._current_session.completed_reviews)
         }
 
+    def _journal_path(self, session_id: str) -> Path:
+        """Get the journal file of a session."""
+        return self._session_dir / f"{session_id}.journal"
+
+    def _replay_journal(self) -> None:
+        """
+        Apply the events journaled after the loaded snapshot.
+        
+        Replay stops at the first damaged record. If the journal held any
+        data, it is compacted into a fresh snapshot right away, so new
+        events are never appended behind a damaged record.
+        """
+        records = [record for record in self._journal.read() if record.seq > self._journal_seq]
+        for record in records:
+            replay_record(self._current_session, self._queued_refs, record)
+            self._journal_seq = record.seq
+        
+        if records:
+            self.logger.info(f"Replayed {len(records)} journaled events for session {self._current_session.session_id}")
+        if not self._journal.is_empty():
+            self.save_session_state()
+
+    def record_event(self, event: str, code_pair: CodePair, compact: bool = True, **data) -> None:
+        """
+        Journal a change of the current session.
+        
+        Appending the event costs the same regardless of the session size;
+        every JOURNAL_COMPACT_EVERY events the journal is compacted into a
+        new snapshot.
+        
+        Args:
+            event: Event type (session_journal.VERDICT, UNDO, FLAG or REPLACEMENT).
+            code_pair: Code pair the event applies to.
+            compact: Whether the journal may be compacted now. Background
+                committers pass False while the in-memory session is ahead
+                of the journal (more commits pending).
+            **data: Additional event data (e.g. kind='vulnerable' for flags).
+            
+        Raises:
+            RuntimeError: If no active session exists.
+        """
+        if not self._current_session:
+            raise RuntimeError("No active session to record events for")
+        
+        if self._journal is None:
+            self._journal = SessionJournal(self._journal_path(self._current_session.session_id))
+        
+        ref = self._data_source.source_ref(code_pair) if self._data_source is not None else None
+        record = JournalRecord(
+            seq=self._journal_seq + 1,
+            event=event,
+            data={'identifier': code_pair.identifier, 'ref': ref, **data}
+        )
+        
+        try:
+            self._journal.append(record)
+        except OSError as e:
+            # The snapshot captures the event as well
+            self.logger.warning(f"Failed to append to session journal, saving a snapshot instead: {e}")
+            self.save_session_state()
+            return
+        
+        with self.state_lock:
+            self._journal_seq = record.seq
+            self._journal_events += 1
+            if compact and self._journal_events >= self.JOURNAL_COMPACT_EVERY:
+                self.save_session_state()
+            else:
+                # Only the last verdict (if any) changed
+                completed_count = len(self._current_session.completed_reviews)
+                self._sync_session_store(completed_count - 1 if event == VERDICT else completed_count)
+
+    def _sync_session_store(self, verdicts_from: int = 0) -> None:
+        """
+        Mirror the current session in the session store.
+        
+        The store only serves listings, so failures are logged and ignored.
+        
+        Args:
+            verdicts_from: Position of the first verdict that may have changed.
+        """
+        session = self._current_session
+        try:
+            queued_refs, pending_count = self._queued_references()
+            self._session_store.save_session(session, queued_refs, pending_count,
+                                             datetime.utcnow(), verdicts_from)
+        except Exception as e:
+            self.logger.warning(f"Failed to update session store for {session.session_id}: {e}")
+
+    def _queued_references(self) -> Tuple[List[Tuple[str, Optional[Dict[str, Any]]]], Optional[int]]:
+        """
+        Get the references of all queued pairs and the number of pairs beyond them.
+        
+        Returns:
+            Tuple: (identifier, source reference) of the queued pairs, including
+            those not rehydrated yet, and the pending count excluding them.
+        """
+        session = self._current_session
+        source_ref = self._data_source.source_ref if self._data_source is not None else (lambda code_pair: None)
+        queued_refs = [(code_pair.identifier, source_ref(code_pair)) for code_pair in session.remaining_queue]
+        queued_refs.extend(self._queued_refs)
+        
+        # Pairs that are not rehydrated yet are counted as pending as well
+        pending_count = session.pending_count
+        if pending_count is not None:
+            pending_count = max(0, pending_count - len(self._queued_refs))
+        return queued_refs, pending_count
+
     def save_session_state(self) -> None:
         """
         Save the current session state to prevent data loss.
         
-        Uses atomic write operations to ensure data integrity.
+        Writes a new snapshot and compacts the journal, whose events the
+        snapshot now contains. Uses atomic write operations to ensure data
+        integrity.
         
         Raises:
             RuntimeError: If no active session exists.
             OSError: If file operations fail.
         """
+        with self.state_lock:
+            self._write_snapshot()
+    
+    def _write_snapshot(self) -> None:
+        """Write the snapshot and compact the journal; the caller holds state_lock."""
         if not self._current_session:
             raise RuntimeError("No active session to save")
         
@@ -743,12 +1078,7 @@ class SessionManager:
         
         try:
             # Prepare session data for serialization
-            session_data = {
-                'session_state': self._current_session,
-                'data_source_config': self._current_session.data_source_config,
-                'next_review_id': self._next_review_id,
-                'saved_timestamp': datetime.utcnow()
-            }
+            session_data = self._build_snapshot()
             
             # Write to temporary file first (atomic operation)
             with open(temp_file, 'wb') as f:
@@ -757,12 +1087,52 @@ class SessionManager:
             # Atomic rename to final file
             temp_file.replace(session_file)
             
+            # Journaled events up to journal_seq are part of the snapshot now;
+            # a crash before the reset is harmless since replay skips them
+            if self._journal is not None:
+                self._journal.reset()
+            self._journal_events = 0
+            
+            self._sync_session_store()
+            
         except Exception as e:
             # Clean up temporary file if it exists
             if temp_file.exists():
                 temp_file.unlink()
             raise OSError(f"Failed to save session state: {e}")
 
+    def _build_snapshot(self) -> Dict[str, Any]:
+        """
+        Build the reference-based snapshot of the current session.
+        
+        The queue is stored as (identifier, source reference) pairs and the
+        queued pairs are counted as pending, so a snapshot stays a few
+        kilobytes regardless of the size of the code under review.
+        
+        Returns:
+            Dict[str, Any]: Picklable session data.
+        """
+        session = self._current_session
+        field_names = {field.name for field in fields(SessionState)}
+        queued_refs, pending_count = self._queued_references()
+        if pending_count is not None:
+            pending_count += len(queued_refs)
+        
+        snapshot_state = replace(session, remaining_queue=[], pending_count=pending_count)
+        # Keep attributes added at runtime (e.g. flagged_entries)
+        for name, value in vars(session).items():
+            if name not in field_names:
+                setattr(snapshot_state, name, value)
+        
+        return {
+            'session_state': snapshot_state,
+            'queued_refs': queued_refs,
+            'journal_seq': self._journal_seq,
+            'data_source_config': session.data_source_config,
+            'next_review_id': self._next_review_id,
+            'saved_timestamp': datetime.utcnow()
+        }
+
     def finalize_session(self) -> Optional[str]:
         """
         Finalize the current session and clean up resources.
@@ -777,15 +1147,20 @@ class SessionManager:
             # Finalize the report
             report_path = self._report_manager.finalize_report('excel')
             
-            # Clean up session file
+            # Clean up session file and journal
             session_file = self._session_dir / f"{self._current_session.session_id}.pkl"
             if session_file.exists():
                 session_file.unlink()
+            SessionJournal(self._journal_path(self._current_session.session_id)).delete()
+            self._forget_stored_session(self._current_session.session_id)
+            self._journal = None
             
             # Clear current session
             session_id = self._current_session.session_id
             self._current_session = None
             self._data_source = None
+            self._pair_stream = None
+            self._queued_refs = []
             self._next_review_id = 1
             
             return report_path
@@ -809,7 +1184,7 @@ class SessionManager:
             'experiment_name': self._current_session.experiment_name,
             'total_reviews': self._current_session.get_total_reviews(),
             'completed_reviews': len(self._current_session.completed_reviews),
-            'remaining_reviews': len(self._current_session.remaining_queue),
+            'remaining_reviews': self._current_session.get_remaining_count(),
             'progress_percentage': self._current_session.get_progress_percentage(),
             'created_timestamp': self._current_session.created_timestamp
         }
@@ -818,16 +1193,31 @@ class SessionManager:
         """
         List all available session files for resumption.
         
+        Sessions come from the session store, most recently saved first,
+        followed by snapshots the store does not know yet (e.g. written by
+        older versions).
+        
         Returns:
             List[str]: List of session IDs that can be resumed.
         """
-        session_files = list(self._session_dir.glob("*.pkl"))
-        return [f.stem for f in session_files]
+        snapshot_ids = {f.stem for f in self._session_dir.glob("*.pkl")}
+        try:
+            stored_ids = [info['session_id'] for info in self._session_store.list_sessions()]
+        except Exception as e:
+            self.logger.warning(f"Failed to list sessions from session store: {e}")
+            stored_ids = []
+        
+        session_ids = [session_id for session_id in stored_ids if session_id in snapshot_ids]
+        session_ids.extend(sorted(snapshot_ids.difference(stored_ids)))
+        return session_ids
 
     def get_session_info(self, session_id: str) -> Optional[dict]:
         """
         Get information about a specific session without loading it.
         
+        The information comes from the session store; sessions missing from
+        the store are read from their snapshot and journal once and added.
+        
         Args:
             session_id: The session ID to get information for.
             
@@ -839,17 +1229,43 @@ class SessionManager:
         if not session_file.exists():
             return None
         
+        try:
+            session_info = self._session_store.get_session(session_id)
+            if session_info is not None:
+                return session_info
+        except Exception as e:
+            self.logger.warning(f"Failed to read session {session_id} from session store: {e}")
+        
         try:
             with open(session_file, 'rb') as f:
                 session_data = pickle.load(f)
             
             session_state = session_data['session_state']
+            queued_refs = list(session_data.get('queued_refs', []))
+            for record in SessionJournal(self._journal_path(session_id)).read():
+                if record.seq > session_data.get('journal_seq', 0):
+                    replay_record(session_state, queued_refs, record)
+            
+            # Register the session so that it is listed from the store next time
+            pending_count = session_state.pending_count
+            if pending_count is not None:
+                pending_count = max(0, pending_count - len(queued_refs))
+            try:
+                self._session_store.save_session(
+                    session_state,
+                    [(code_pair.identifier, None) for code_pair in session_state.remaining_queue] + queued_refs,
+                    pending_count,
+                    session_data.get('saved_timestamp') or datetime.utcnow()
+                )
+            except Exception as e:
+                self.logger.warning(f"Failed to add session {session_id} to session store: {e}")
+            
             return {
                 'session_id': session_state.session_id,
                 'experiment_name': session_state.experiment_name,
                 'total_reviews': session_state.get_total_reviews(),
                 'completed_reviews': len(session_state.completed_reviews),
-                'remaining_reviews': len(session_state.remaining_queue),
+                'remaining_reviews': session_state.get_remaining_count(),
                 'progress_percentage': session_state.get_progress_percentage(),
                 'created_timestamp': session_state.created_timestamp,
                 'saved_timestamp': session_data.get('saved_timestamp'),
@@ -857,4 +1273,29 @@ class SessionManager:
             }
             
         except Exception:
-            return None
\ No newline at end of file
+            return None
+
+    def delete_session(self, session_id: str) -> bool:
+        """
+        Delete a saved session: its snapshot, journal and session store entry.
+        
+        Args:
+            session_id: The session ID to delete.
+            
+        Returns:
+            bool: True if a snapshot was deleted.
+        """
+        session_file = self._session_dir / f"{session_id}.pkl"
+        existed = session_file.exists()
+        if existed:
+            session_file.unlink()
+        SessionJournal(self._journal_path(session_id)).delete()
+        self._forget_stored_session(session_id)
+        return existed
+
+    def _forget_stored_session(self, session_id: str) -> None:
+        """Remove a session from the session store, logging failures."""
+        try:
+            self._session_store.delete_session(session_id)
+        except Exception as e:
+            self.logger.warning(f"Failed to remove session {session_id} from session store: {e}")
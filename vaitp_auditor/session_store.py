@@ -0,0 +1,199 @@
+"""
+Embedded SQLite catalog of review sessions.
+
+The store lives next to the session snapshots (``sessions.db``, WAL mode) and
+mirrors, per session, its metadata, its queued pairs (identifier and data
+source reference) and its verdicts. Listing sessions is a single indexed
+query and progress counts are aggregates, so the resume picker never has to
+unpickle snapshots. Snapshots and the session journal remain the source of
+truth for resuming; the store is kept in sync with them and can be rebuilt
+from them.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .core.models import SessionState
+from .utils.logging_config import get_logger
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    experiment_name TEXT NOT NULL,
+    created_timestamp TEXT NOT NULL,
+    saved_timestamp TEXT NOT NULL,
+    pending_count INTEGER,
+    data_source_config TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_saved ON sessions (saved_timestamp DESC);
+CREATE TABLE IF NOT EXISTS queue_entries (
+    session_id TEXT NOT NULL REFERENCES sessions (session_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    identifier TEXT NOT NULL,
+    source_ref TEXT,
+    PRIMARY KEY (session_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS verdicts (
+    session_id TEXT NOT NULL REFERENCES sessions (session_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    identifier TEXT NOT NULL,
+    PRIMARY KEY (session_id, position)
+) WITHOUT ROWID;
+"""
+
+# Progress of every session, counted through the primary key indexes
+_SUMMARY_QUERY = """
+SELECT s.session_id, s.experiment_name, s.created_timestamp, s.saved_timestamp,
+       s.pending_count, s.data_source_config,
+       (SELECT COUNT(*) FROM verdicts v WHERE v.session_id = s.session_id) AS completed_count,
+       (SELECT COUNT(*) FROM queue_entries q WHERE q.session_id = s.session_id) AS queued_count
+FROM sessions s
+"""
+
+
+class SessionStore:
+    """
+    SQLite (WAL) catalog of sessions, queue entries and verdicts.
+
+    A single connection is shared behind a lock, so the store can be used
+    from GUI worker threads.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the store; the database is created on first use.
+
+        Args:
+            db_path: SQLite database file.
+        """
+        self.db_path = Path(db_path)
+        self.logger = get_logger('session_store')
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the shared connection, creating the database if needed."""
+        if self._connection is None:
+            connection = sqlite3.connect(str(self.db_path), timeout=5.0, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def save_session(self, session: SessionState, queued_refs: Sequence[Tuple[str, Optional[Dict[str, Any]]]],
+                     pending_count: Optional[int], saved_timestamp: datetime, verdicts_from: int = 0) -> None:
+        """
+        Mirror the state of a session in one transaction.
+
+        Verdicts before verdicts_from are assumed to be stored already, so a
+        single review only rewrites the tail of the verdict list.
+
+        Args:
+            session: Session state.
+            queued_refs: (identifier, source reference) of every queued pair.
+            pending_count: Sampled pairs beyond the queued ones, None if unknown.
+            saved_timestamp: Time of the save.
+            verdicts_from: Position of the first verdict to rewrite.
+        """
+        verdicts_from = max(0, min(verdicts_from, len(session.completed_reviews)))
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT INTO sessions (session_id, experiment_name, created_timestamp, saved_timestamp, "
+                    "pending_count, data_source_config) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (session_id) DO UPDATE SET saved_timestamp = excluded.saved_timestamp, "
+                    "pending_count = excluded.pending_count, data_source_config = excluded.data_source_config",
+                    (session.session_id, session.experiment_name, session.created_timestamp.isoformat(),
+                     saved_timestamp.isoformat(), pending_count,
+                     json.dumps(session.data_source_config, default=str))
+                )
+                connection.execute("DELETE FROM queue_entries WHERE session_id = ?", (session.session_id,))
+                connection.executemany(
+                    "INSERT INTO queue_entries (session_id, position, identifier, source_ref) VALUES (?, ?, ?, ?)",
+                    [
+                        (session.session_id, position, identifier,
+                         json.dumps(ref, default=str) if ref is not None else None)
+                        for position, (identifier, ref) in enumerate(queued_refs)
+                    ]
+                )
+                connection.execute("DELETE FROM verdicts WHERE session_id = ? AND position >= ?",
+                                   (session.session_id, verdicts_from))
+                connection.executemany(
+                    "INSERT INTO verdicts (session_id, position, identifier) VALUES (?, ?, ?)",
+                    [
+                        (session.session_id, position, identifier)
+                        for position, identifier in enumerate(session.completed_reviews[verdicts_from:], verdicts_from)
+                    ]
+                )
+
+    @staticmethod
+    def _summary_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        """Build a session summary from a _SUMMARY_QUERY row."""
+        completed = row['completed_count']
+        remaining = row['queued_count'] + (row['pending_count'] or 0)
+        total = completed + remaining
+        return {
+            'session_id': row['session_id'],
+            'experiment_name': row['experiment_name'],
+            'total_reviews': total,
+            'completed_reviews': completed,
+            'remaining_reviews': remaining,
+            'progress_percentage': (completed / total) * 100.0 if total else 100.0,
+            'created_timestamp': datetime.fromisoformat(row['created_timestamp']),
+            'saved_timestamp': datetime.fromisoformat(row['saved_timestamp']),
+            'data_source_config': json.loads(row['data_source_config'])
+        }
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        """
+        Get the summaries of all stored sessions.
+
+        Returns:
+            List[Dict[str, Any]]: Session summaries (same keys as
+            SessionManager.get_session_info), most recently saved first.
+        """
+        with self._lock:
+            rows = self._connect().execute(_SUMMARY_QUERY + " ORDER BY s.saved_timestamp DESC").fetchall()
+        return [self._summary_from_row(row) for row in rows]
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the summary of a stored session.
+
+        Args:
+            session_id: Session to look up.
+
+        Returns:
+            Optional[Dict[str, Any]]: Session summary, or None if not stored.
+        """
+        with self._lock:
+            row = self._connect().execute(_SUMMARY_QUERY + " WHERE s.session_id = ?", (session_id,)).fetchone()
+        return self._summary_from_row(row) if row is not None else None
+
+    def delete_session(self, session_id: str) -> None:
+        """
+        Remove a session with its queue entries and verdicts.
+
+        Args:
+            session_id: Session to remove.
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -2,26 +2,39 @@
 Diff renderer for color-coded code differences.
 """
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from rich.console import Console
 from rich.text import Text
 from rich.panel import Panel
 from rich.columns import Columns
 from rich.align import Align
 
-from vaitp_auditor.core.models import DiffLine
+from vaitp_auditor.core.models import DiffLine, DiffResult, count_diff_tags, diff_tag_runs, iter_diff_span_rows
 
 
 class DiffRenderer:
     """
     Renders code differences with color highlighting.
     
-    Interprets DiffLine tags and applies appropriate color coding:
+    Interprets DiffLine tags and applies appropriate color coding (diffs may
+    be given as a DiffResult, which is read without creating DiffLine objects):
     - Green for added lines
     - Red for removed lines  
     - Yellow for modified lines
     - White for equal lines
+    
+    The changed text inside modified lines (DiffLine.spans, or the spans
+    a DiffResult detects for its paired removed and added lines) is shown
+    in a stronger style.
     """
+    
+    # tag -> (diff marker, line style, changed text style)
+    LINE_STYLES = {
+        'add': ("+", "bold green on dark_green", "bold white on green"),
+        'remove': ("-", "bold red on dark_red", "bold white on red"),
+        'modify': ("~", "bold yellow on #3a3a00", "bold black on yellow"),
+        'equal': (" ", "white", "white"),
+    }
 
     def __init__(self, console: Console = None):
         """
@@ -44,33 +57,47 @@ class DiffRenderer:
         """
         text = Text()
         
-        for diff_line in diff_lines:
-            line_text = diff_line.line_content
-            
+        for tag, line_text, line_number, spans in iter_diff_span_rows(diff_lines):
             # Add line number if available
-            if diff_line.line_number is not None:
-                line_prefix = f"{diff_line.line_number:4d}: "
+            if line_number is not None:
+                line_prefix = f"{line_number:4d}: "
             else:
                 line_prefix = "     "
             
-            # Apply color based on tag
-            if diff_line.tag == 'add':
-                text.append(line_prefix, style="dim")
-                text.append(f"+ {line_text}", style="bold green on dark_green")
-            elif diff_line.tag == 'remove':
-                text.append(line_prefix, style="dim")
-                text.append(f"- {line_text}", style="bold red on dark_red")
-            elif diff_line.tag == 'modify':
-                text.append(line_prefix, style="dim")
-                text.append(f"~ {line_text}", style="bold yellow on #3a3a00")
-            else:  # equal
-                text.append(line_prefix, style="dim")
-                text.append(f"  {line_text}", style="white")
-            
-            text.append("\n")
+            self._append_diff_line(text, line_prefix, tag, line_text, spans)
         
         return text
 
+    def _append_diff_line(
+        self,
+        text: Text,
+        line_prefix: str,
+        tag: str,
+        line_text: str,
+        spans: Optional[Tuple[Tuple[int, int], ...]] = None
+    ) -> None:
+        """
+        Append one styled diff line, emphasizing its changed spans.
+        
+        Args:
+            text: Text to append to.
+            line_prefix: Line number column.
+            tag: Diff tag of the line.
+            line_text: Line content.
+            spans: Changed (start, end) character ranges, if known.
+        """
+        marker, line_style, change_style = self.LINE_STYLES.get(tag, self.LINE_STYLES['equal'])
+        text.append(line_prefix, style="dim")
+        text.append(f"{marker} ", style=line_style)
+        
+        position = 0
+        for start, end in spans or ():
+            text.append(line_text[position:start], style=line_style)
+            text.append(line_text[start:end], style=change_style)
+            position = end
+        text.append(line_text[position:], style=line_style)
+        text.append("\n")
+
     def render_side_by_side_diff(
         self, 
         expected_lines: List[DiffLine], 
@@ -134,10 +161,11 @@ class DiffRenderer:
         Returns:
             Rich Text object with diff summary.
         """
-        add_count = sum(1 for line in diff_lines if line.tag == 'add')
-        remove_count = sum(1 for line in diff_lines if line.tag == 'remove')
-        modify_count = sum(1 for line in diff_lines if line.tag == 'modify')
-        equal_count = sum(1 for line in diff_lines if line.tag == 'equal')
+        counts = count_diff_tags(diff_lines)
+        add_count = counts['add']
+        remove_count = counts['remove']
+        modify_count = counts['modify']
+        equal_count = counts['equal']
         
         summary = Text()
         summary.append("Diff Summary: ", style="bold")
@@ -174,20 +202,17 @@ class DiffRenderer:
         if not diff_lines:
             return Text("No differences found", style="dim italic")
         
-        # Find lines with changes
-        change_indices = []
-        for i, line in enumerate(diff_lines):
-            if line.tag != 'equal':
-                change_indices.append(i)
+        # Find runs of changed lines
+        change_runs = [(start, stop) for tag, start, stop in diff_tag_runs(diff_lines) if tag != 'equal']
         
-        if not change_indices:
+        if not change_runs:
             return Text("No differences found", style="dim italic")
         
         # Determine which lines to include with context
         lines_to_include = set()
-        for idx in change_indices:
-            start = max(0, idx - context_lines)
-            end = min(len(diff_lines), idx + context_lines + 1)
+        for run_start, run_stop in change_runs:
+            start = max(0, run_start - context_lines)
+            end = min(len(diff_lines), run_stop + context_lines)
             lines_to_include.update(range(start, end))
         
         # Render selected lines
@@ -200,7 +225,7 @@ class DiffRenderer:
                 text.append("...\n", style="dim")
             
             line = diff_lines[i]
-            line_text = line.line_content
+            spans = diff_lines.line_spans(i) if isinstance(diff_lines, DiffResult) else line.spans
             
             # Add line number if available
             if line.line_number is not None:
@@ -208,21 +233,7 @@ class DiffRenderer:
             else:
                 line_prefix = f"{i+1:4d}: "
             
-            # Apply color based on tag
-            if line.tag == 'add':
-                text.append(line_prefix, style="dim")
-                text.append(f"+ {line_text}", style="bold green on dark_green")
-            elif line.tag == 'remove':
-                text.append(line_prefix, style="dim")
-                text.append(f"- {line_text}", style="bold red on dark_red")
-            elif line.tag == 'modify':
-                text.append(line_prefix, style="dim")
-                text.append(f"~ {line_text}", style="bold yellow on #3a3a00")
-            else:  # equal
-                text.append(line_prefix, style="dim")
-                text.append(f"  {line_text}", style="white")
-            
-            text.append("\n")
+            self._append_diff_line(text, line_prefix, line.tag, line.line_content, spans)
             prev_line = i
         
         return text
@@ -9,6 +9,7 @@ from rich.console import Console
 
 from ..core.models import CodePair, ReviewResult
 from ..core.differ import CodeDiffer
+from ..core.semantic import SemanticDiffer
 from .display_manager import DisplayManager
 from .input_handler import InputHandler
 from .diff_renderer import DiffRenderer
@@ -38,6 +39,7 @@ class ReviewUIController:
         self.input_handler = InputHandler(self.console, self.scroll_manager)
         self.diff_renderer = DiffRenderer(self.console)
         self.code_differ = CodeDiffer()
+        self.semantic_differ = SemanticDiffer()
         self.enable_scrolling = enable_scrolling
         self.undo_callback = undo_callback
         
@@ -240,6 +242,7 @@ class ReviewUIController:
                 progress_info=progress_info,
                 source_identifier=code_pair.identifier
             )
+            self._show_verdict_suggestion(code_pair)
 
     def _render_scrollable_code_pair_display(self, code_pair: CodePair, progress_info: dict) -> None:
         """
@@ -255,6 +258,25 @@ class ReviewUIController:
             progress_info=progress_info,
             source_identifier=code_pair.identifier
         )
+        self._show_verdict_suggestion(code_pair)
+
+    def _show_verdict_suggestion(self, code_pair: CodePair) -> None:
+        """
+        Flag a code pair whose generated code is semantically identical to its input code.
+        
+        Args:
+            code_pair: The displayed code pair.
+        """
+        try:
+            unchanged = self.semantic_differ.generated_matches_input(code_pair)
+        except Exception:
+            # The suggestion is optional, don't fail the display if it doesn't work
+            return
+        if unchanged:
+            self.display_manager.show_warning(
+                "Generated code is semantically identical to the input code "
+                "(suggested verdict: Failure - No Change)"
+            )
 
     def _render_fallback_display(self, code_pair: CodePair, progress_info: dict) -> None:
         """
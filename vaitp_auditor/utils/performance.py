@@ -6,8 +6,9 @@ import gc
 import hashlib
 import time
 import weakref
+from collections import OrderedDict
 from functools import lru_cache, wraps
-from typing import Any, Dict, List, Optional, Tuple, Callable
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Callable
 from dataclasses import dataclass
 from threading import Lock
 import os
@@ -49,6 +50,7 @@ class PerformanceMonitor:
     def __init__(self):
         self.logger = get_logger('performance')
         self.metrics: List[PerformanceMetrics] = []
+        self.counters: Dict[str, int] = {}
         self._lock = Lock()
     
     def start_operation(self, operation: str) -> Dict[str, Any]:
@@ -86,6 +88,16 @@ class PerformanceMonitor:
         
         return metrics
     
+    def increment_counter(self, name: str, amount: int = 1) -> None:
+        """Add to a named event counter (e.g. cache hits)."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def get_counters(self, prefix: str = "") -> Dict[str, int]:
+        """Get a snapshot of the event counters whose names start with prefix."""
+        with self._lock:
+            return {name: value for name, value in self.counters.items() if name.startswith(prefix)}
+    
     def _get_memory_usage(self) -> float:
         """Get current memory usage in MB."""
         if not HAS_PSUTIL:
@@ -268,6 +280,121 @@ class ContentCache:
             }
 
 
+def content_hash(content: Optional[str]) -> str:
+    """
+    Hash a document for use in cache keys.
+    
+    None hashes like the empty string, matching how the differ treats a
+    missing expected code.
+    """
+    return hashlib.blake2b((content or "").encode('utf-8'), digest_size=16).hexdigest()
+
+
+class DiffCache:
+    """
+    LRU cache of computed diffs bounded by their estimated size in bytes.
+    
+    Keys are tuples of document content hashes (see content_hash()), so a
+    lookup never copies the compared documents. Hits, misses and evictions
+    are counted on the performance monitor as ``<name>.hits``,
+    ``<name>.misses`` and ``<name>.evictions``.
+    """
+    
+    def __init__(self, max_size_mb: float = 32, name: str = 'diff_cache',
+                 monitor: Optional['PerformanceMonitor'] = None):
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.name = name
+        self._monitor = monitor
+        self._entries: 'OrderedDict[Tuple[Any, ...], Tuple[Any, int]]' = OrderedDict()  # key -> (value, size)
+        self._size_bytes = 0
+        self._lock = Lock()
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @property
+    def monitor(self) -> 'PerformanceMonitor':
+        """Performance monitor receiving the counters (the global one by default)."""
+        return self._monitor or get_performance_monitor()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    
+    @property
+    def size_bytes(self) -> int:
+        """Estimated size of the cached values in bytes."""
+        with self._lock:
+            return self._size_bytes
+    
+    def get(self, key: Tuple[Any, ...]) -> Optional[Any]:
+        """Get a cached value and mark it as most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        
+        self.monitor.increment_counter(f"{self.name}.hits" if entry is not None else f"{self.name}.misses")
+        return entry[0] if entry is not None else None
+    
+    def put(self, key: Tuple[Any, ...], value: Any, size_bytes: int) -> bool:
+        """
+        Cache a value, evicting least recently used entries to make room.
+        
+        Args:
+            key: Cache key.
+            value: Value to cache.
+            size_bytes: Estimated memory footprint of the value.
+        
+        Returns:
+            bool: False if the value is larger than the whole cache and was not stored.
+        """
+        if size_bytes > self.max_size_bytes:
+            return False
+        
+        evicted = 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= previous[1]
+            
+            while self._entries and self._size_bytes + size_bytes > self.max_size_bytes:
+                _, (_, lru_size) = self._entries.popitem(last=False)
+                self._size_bytes -= lru_size
+                evicted += 1
+            
+            self._entries[key] = (value, size_bytes)
+            self._size_bytes += size_bytes
+            self.evictions += evicted
+        
+        if evicted:
+            self.monitor.increment_counter(f"{self.name}.evictions", evicted)
+        return True
+    
+    def clear(self) -> None:
+        """Clear the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                'items': len(self._entries),
+                'size_mb': self._size_bytes / 1024 / 1024,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / (self.hits + self.misses) if (self.hits + self.misses) > 0 else 0
+            }
+
+
 class ChunkedProcessor:
     """Process large datasets in chunks to manage memory."""
     
@@ -278,7 +405,10 @@ class ChunkedProcessor:
     
     def process_chunks(self, items: List[Any], processor_func: Callable[[List[Any]], List[Any]]) -> List[Any]:
         """Process items in chunks with memory monitoring."""
-        results = []
+        return list(self.iter_chunks(items, processor_func))
+    
+    def iter_chunks(self, items: List[Any], processor_func: Callable[[List[Any]], List[Any]]) -> Iterator[Any]:
+        """Process items in chunks with memory monitoring, yielding results as each chunk completes."""
         total_items = len(items)
         
         for i in range(0, total_items, self.chunk_size):
@@ -293,7 +423,6 @@ class ChunkedProcessor:
             
             try:
                 chunk_results = processor_func(chunk)
-                results.extend(chunk_results)
                 
                 # Check memory after processing
                 memory_after = self._get_memory_usage()
@@ -311,8 +440,8 @@ class ChunkedProcessor:
                 self.logger.error(f"Error processing chunk {chunk_start}-{chunk_end}: {e}")
                 # Continue with next chunk rather than failing entirely
                 continue
-        
-        return results
+            
+            yield from chunk_results
     
     def _get_memory_usage(self) -> float:
         """Get current memory usage in MB."""
@@ -376,6 +505,7 @@ def cached_content(cache_instance: ContentCache, key_func: Callable = None):
 # Global instances
 _performance_monitor = PerformanceMonitor()
 _content_cache = ContentCache()
+_diff_cache = DiffCache()
 _chunked_processor = ChunkedProcessor()
 
 
@@ -389,6 +519,11 @@ def get_content_cache() -> ContentCache:
     return _content_cache
 
 
+def get_diff_cache() -> DiffCache:
+    """Get the global diff cache instance."""
+    return _diff_cache
+
+
 def get_chunked_processor() -> ChunkedProcessor:
     """Get the global chunked processor instance."""
     return _chunked_processor
\ No newline at end of file